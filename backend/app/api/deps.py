@@ -5,7 +5,10 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 
 # Database session dependency
 DbSession = Annotated[Session, Depends(get_db)]
+
+# Session that reads from a replica (if configured) until it writes
+ReadDbSession = Annotated[Session, Depends(get_read_db)]
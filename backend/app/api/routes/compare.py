@@ -1,168 +1,637 @@
 """Price comparison API routes."""
 
-from fastapi import APIRouter, HTTPException, status
+import time
+from collections.abc import Iterator, Mapping
+from typing import Annotated, Optional
+
+import numpy as np
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import DbSession
+from app.api.deps import ReadDbSession
+from app.config import get_settings
+from app.core.compression import IDENTITY, negotiate_encoding
+from app.core.metrics import (
+    COMPARE_AGGREGATION,
+    COMPARE_LIST_LOAD,
+    COMPARE_MATCHING,
+    COMPARE_PRICE_RESOLUTION,
+    COMPARE_SERIALIZATION,
+    COMPARE_STORE_LOOKUP,
+    observe_since,
+)
+from app.core.responses import PydanticJSONResponse
+from app.db.queries import grocery_list_by_id, grocery_list_item_batch, grocery_lists_with_items
+from app.db.routing import route_reads
 from app.models.grocery_list import GroceryList
-from app.models.price import Price
-from app.models.store import Store
 from app.schemas.price import (
+    BatchComparisonRequest,
+    BatchComparisonResponse,
+    BatchComparisonResult,
     ComparisonRequest,
     ComparisonResponse,
+    ComparisonTotalsEvent,
     ItemPriceComparison,
+    SplitBasketAssignment,
+    SplitBasketPlan,
     StorePrice,
     StoreTotalComparison,
 )
+from app.services.basket_optimizer import BasketOptimizer
+from app.services.comparison_cache import cache_comparison, get_cached_comparison
+from app.services.comparison_engine import (
+    ComparisonTotals,
+    MatchedItem,
+    PriceMatrix,
+    RunningTotals,
+    find_unit_value_candidates,
+    match_list_items,
+)
+from app.services.price_resolver import PriceResolver, PriceRow
+from app.services.product_catalog import ProductCatalog, get_product_catalog
 from app.services.product_matcher import ProductMatcher
+from app.services.store_directory import StoreEntry, get_store_directory
 
 router = APIRouter()
 
 
-@router.post(
-    "/compare",
-    response_model=ComparisonResponse,
-    summary="Compare prices across stores",
-    description="Compare prices for a grocery list across stores in a specific ZIP code.",
-)
-def compare_prices(
-    request: ComparisonRequest,
-    db: DbSession,
-) -> ComparisonResponse:
-    """Compare prices for a grocery list across stores."""
-    # Get the grocery list
-    grocery_list = db.query(GroceryList).filter(GroceryList.id == request.list_id).first()
+def _find_nearby_stores(
+    db: Session, request: ComparisonRequest
+) -> tuple[list[StoreEntry], dict[int, float]]:
+    """Find the nearest stores, within the requested radius if one is given.
+
+    Searches around the request coordinates, or around the stores in the
+    request ZIP code (or its 3-digit prefix) when no coordinates are given.
+
+    Returns:
+        Stores ordered by distance and a mapping of store ID to miles
+    """
+    directory = get_store_directory(db)
+    locator = directory.locator
+    if request.lat is not None and request.lng is not None:
+        origin: Optional[tuple[float, float]] = (request.lat, request.lng)
+    else:
+        origin = locator.zip_centroid(request.zip_code)
+    if origin is None:
+        return [], {}
+
+    nearby = locator.nearest(
+        origin[0],
+        origin[1],
+        get_settings().compare_max_stores,
+        request.radius_miles,
+    )
+    distances = {match.store_id: round(match.distance_miles, 2) for match in nearby}
+    return directory.get_many(distances), distances
+
+
+def _locate_stores(
+    db: Session, request: ComparisonRequest
+) -> tuple[list[StoreEntry], dict[int, float]]:
+    """Find the stores for a request's location.
+
+    Stores in the ZIP code, unless a radius or coordinates are given or the
+    ZIP code has no stores; then the nearest stores.
+
+    Returns:
+        Stores in comparison order and a mapping of store ID to miles
+    """
+    if request.radius_miles is None and (request.lat is None or request.lng is None):
+        stores = get_store_directory(db).for_zip(request.zip_code)
+        if stores:
+            return stores, {}
+    return _find_nearby_stores(db, request)
+
+
+def _no_stores_detail(request: ComparisonRequest) -> str:
+    """Describe the searched location when no stores are found."""
+    location = f"ZIP code {request.zip_code}"
+    if request.radius_miles is not None:
+        location = f"{request.radius_miles:g} miles of {location}"
+    return f"No stores found in {location}"
+
+
+def _get_list(db: Session, list_id: int) -> GroceryList:
+    """Load a grocery list; its items are loaded lazily.
+
+    Raises:
+        HTTPException: 404 if the list does not exist
+    """
+    grocery_list: Optional[GroceryList] = db.execute(grocery_list_by_id(list_id)).scalar_one_or_none()
 
     if not grocery_list:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Grocery list with ID {request.list_id} not found",
+            detail=f"Grocery list with ID {list_id} not found",
         )
+    return grocery_list
 
-    # Get stores in the ZIP code
-    stores = db.query(Store).filter(Store.zip_code == request.zip_code).all()
 
+def _get_stores(db: Session, request: ComparisonRequest) -> tuple[list[StoreEntry], dict[int, float]]:
+    """Get the stores to compare.
+
+    Raises:
+        HTTPException: 404 if no stores are found
+
+    Returns:
+        Stores in comparison order and a mapping of store ID to miles
+    """
+    stores, distances = _locate_stores(db, request)
     if not stores:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No stores found in ZIP code {request.zip_code}",
+            detail=_no_stores_detail(request),
         )
 
-    # Initialize product matcher
-    matcher = ProductMatcher(db)
+    return stores, distances
 
-    # Process each item in the list
-    item_breakdowns: list[ItemPriceComparison] = []
-    store_totals: dict[int, StoreTotalComparison] = {}
 
-    # Initialize store totals
-    for store in stores:
-        store_totals[store.id] = StoreTotalComparison(
+def _build_store_totals(
+    stores: list[StoreEntry], totals: ComparisonTotals, distances: dict[int, float]
+) -> list[StoreTotalComparison]:
+    """Build per-store totals in store order."""
+    total_prices = [round(total, 2) for total in totals.total_price.tolist()]
+    items_found = totals.items_found.tolist()
+    items_on_sale = totals.items_on_sale.tolist()
+    return [
+        StoreTotalComparison(
             store_id=store.id,
             store_name=store.name,
             store_chain=store.chain,
             store_address=store.address,
-            total_price=0.0,
-            items_found=0,
-            items_on_sale=0,
+            total_price=total_prices[column],
+            items_found=items_found[column],
+            items_on_sale=items_on_sale[column],
+            is_cheapest=column == totals.cheapest_overall,
+            distance_miles=distances.get(store.id),
         )
+        for column, store in enumerate(stores)
+    ]
+
 
-    for list_item in grocery_list.items:
-        # Match product
-        if list_item.product_id:
-            product_id = list_item.product_id
-            match_confidence = 100.0
+def _build_item_breakdown(
+    matrix: PriceMatrix,
+    stores: list[StoreEntry],
+    cheapest_store: np.ndarray,
+    rows: range,
+    cheapest_only: bool = False,
+) -> list[ItemPriceComparison]:
+    """Build per-item price comparisons for a page of list items.
+
+    Args:
+        matrix: Price matrix for the list items
+        stores: Stores in matrix column order
+        cheapest_store: Cheapest store column per matrix row
+        rows: Matrix rows to include
+        cheapest_only: Only include the cheapest store's price per item
+
+    Returns:
+        Item comparisons in list order
+    """
+    cheapest_columns = cheapest_store.tolist()
+    breakdown = []
+    for row in rows:
+        item = matrix.items[row]
+        cheapest_column = cheapest_columns[row]
+        if cheapest_only:
+            columns = [cheapest_column] if cheapest_column >= 0 else []
         else:
-            match = matcher.find_best_match(list_item.name)
-            if match:
-                product_id = match["product_id"]
-                match_confidence = match["score"]
-            else:
-                product_id = None
-                match_confidence = 0.0
-
-        # Get prices for this product at each store
-        prices_by_store: list[StorePrice] = []
-        cheapest_price = float("inf")
-        cheapest_store_id = None
-
-        for store in stores:
-            if product_id:
-                price_entry = (
-                    db.query(Price)
-                    .filter(Price.product_id == product_id, Price.store_id == store.id)
-                    .order_by(Price.effective_date.desc())
-                    .first()
+            columns = np.flatnonzero(matrix.found[row]).tolist()
+
+        prices_by_store = []
+        for column in columns:
+            store = stores[column]
+            product_id = matrix.product_id(row, column)
+            if product_id is None:
+                continue
+            price_row = matrix.price_rows[(product_id, store.id)]
+            prices_by_store.append(
+                StorePrice(
+                    store_id=store.id,
+                    store_name=store.name,
+                    store_chain=store.chain,
+                    regular_price=price_row.regular_price,
+                    current_price=price_row.current_price,
+                    is_on_sale=price_row.is_on_sale,
+                    sale_expires=price_row.expiration_date if price_row.is_on_sale else None,
+                    unit_price=price_row.unit_price,
+                    product_id=product_id,
+                    normalized_unit_price=price_row.normalized_price,
+                    normalized_unit=price_row.normalized_unit,
                 )
+            )
+        breakdown.append(
+            ItemPriceComparison(
+                item_name=item.item_name,
+                product_id=item.product_id,
+                quantity=item.quantity,
+                unit=item.unit,
+                match_confidence=item.match_confidence,
+                prices_by_store=prices_by_store,
+                cheapest_store_id=stores[cheapest_column].id if cheapest_column >= 0 else None,
+            )
+        )
+    return breakdown
+
+
+def _plan_split_basket(
+    matrix: PriceMatrix, stores: list[StoreEntry], max_stores: int
+) -> Optional[SplitBasketPlan]:
+    """Find the cheapest way to buy the list visiting at most max_stores stores.
 
-                if price_entry:
-                    current_price = price_entry.current_price
-                    is_on_sale = (
-                        price_entry.sale_price is not None
-                        and current_price == price_entry.sale_price
-                    )
-
-                    item_total = current_price * list_item.quantity
-
-                    store_price = StorePrice(
-                        store_id=store.id,
-                        store_name=store.name,
-                        store_chain=store.chain,
-                        regular_price=price_entry.price,
-                        current_price=current_price,
-                        is_on_sale=is_on_sale,
-                        sale_expires=price_entry.expiration_date if is_on_sale else None,
-                        unit_price=price_entry.unit_price,
-                    )
-                    prices_by_store.append(store_price)
-
-                    # Update store totals
-                    store_totals[store.id].total_price += item_total
-                    store_totals[store.id].items_found += 1
-                    if is_on_sale:
-                        store_totals[store.id].items_on_sale += 1
-
-                    # Track cheapest
-                    if current_price < cheapest_price:
-                        cheapest_price = current_price
-                        cheapest_store_id = store.id
-
-        item_comparison = ItemPriceComparison(
-            item_name=list_item.name,
-            product_id=product_id,
-            quantity=list_item.quantity,
-            unit=list_item.unit,
-            match_confidence=match_confidence,
-            prices_by_store=prices_by_store,
-            cheapest_store_id=cheapest_store_id,
+    Returns:
+        Split-basket plan, or None if no store prices any item
+    """
+    line_costs = matrix.line_totals
+    optimizer = BasketOptimizer(line_costs)
+    plan = optimizer.optimize(max_stores)
+    if plan is None:
+        return None
+
+    single = optimizer.optimize(1)
+    single_store_total = None
+    savings = None
+    if single is not None and single.items_found == plan.items_found:
+        single_store_total = round(single.total, 2)
+        savings = round(single.total - plan.total, 2)
+
+    assignments = []
+    for row, column in enumerate(plan.assignments.tolist()):
+        if column < 0:
+            continue
+        item = matrix.items[row]
+        assignments.append(
+            SplitBasketAssignment(
+                item_name=item.item_name,
+                product_id=item.product_id,
+                store_id=stores[column].id,
+                current_price=float(matrix.current_price[row, column]),
+                line_total=round(float(line_costs[row, column]), 2),
+            )
         )
-        item_breakdowns.append(item_comparison)
 
-    # Determine cheapest store overall
-    store_totals_list = list(store_totals.values())
-    stores_with_items = [st for st in store_totals_list if st.items_found > 0]
+    return SplitBasketPlan(
+        store_ids=[stores[column].id for column in plan.store_indices],
+        total_price=round(plan.total, 2),
+        items_found=plan.items_found,
+        single_store_total=single_store_total,
+        savings_vs_single_store=savings,
+        exact=plan.exact,
+        assignments=assignments,
+    )
+
+
+def _build_comparison(
+    request: ComparisonRequest,
+    grocery_list: GroceryList,
+    stores: list[StoreEntry],
+    distances: dict[int, float],
+    matched_items: list[MatchedItem],
+    latest_prices: Mapping[tuple[int, int], PriceRow],
+    candidates: Optional[list[list[int]]] = None,
+    catalog: Optional[ProductCatalog] = None,
+) -> ComparisonResponse:
+    """Aggregate resolved prices and build the comparison response.
 
-    cheapest_overall_id = None
-    potential_savings = 0.0
+    Args:
+        request: Comparison options
+        grocery_list: List being compared
+        stores: Stores in comparison order
+        distances: Store ID to miles for radius searches
+        matched_items: List items matched to products
+        latest_prices: Latest price per (product_id, store_id); may hold extra pairs
+        candidates: Candidate products per item, for unit_value mode
+        catalog: Product catalog with pack sizes, for unit_value mode
 
-    if stores_with_items:
-        stores_with_items.sort(key=lambda x: x.total_price)
-        cheapest_overall_id = stores_with_items[0].store_id
-        stores_with_items[0].is_cheapest = True
+    Returns:
+        Comparison response
+    """
+    # Aggregate over the item x store matrix, then build the response
+    store_ids = [store.id for store in stores]
+    if request.mode == "unit_value" and candidates is not None and catalog is not None:
+        matrix = PriceMatrix.build_unit_value(matched_items, candidates, catalog, store_ids, latest_prices)
+    else:
+        matrix = PriceMatrix.build(matched_items, store_ids, latest_prices)
+    totals = matrix.aggregate()
 
-        if len(stores_with_items) > 1:
-            potential_savings = stores_with_items[-1].total_price - stores_with_items[0].total_price
+    item_breakdown: list[ItemPriceComparison] = []
+    if request.detail != "summary":
+        page = range(len(matched_items))[request.item_skip:]
+        if request.item_limit is not None:
+            page = page[:request.item_limit]
+        item_breakdown = _build_item_breakdown(
+            matrix,
+            stores,
+            totals.cheapest_store,
+            page,
+            cheapest_only=request.detail == "cheapest_only",
+        )
 
-    # Round totals to 2 decimal places
-    for st in store_totals_list:
-        st.total_price = round(st.total_price, 2)
+    split_basket = None
+    if request.mode == "split_basket":
+        split_basket = _plan_split_basket(matrix, stores, request.max_stores)
 
     return ComparisonResponse(
         list_id=grocery_list.id,
         list_name=grocery_list.name,
         zip_code=request.zip_code,
-        store_totals=store_totals_list,
-        item_breakdown=item_breakdowns,
-        cheapest_store_id=cheapest_overall_id,
-        potential_savings=round(potential_savings, 2),
+        store_totals=_build_store_totals(stores, totals, distances),
+        item_breakdown=item_breakdown,
+        item_count=len(matched_items),
+        cheapest_store_id=(
+            stores[totals.cheapest_overall].id if totals.cheapest_overall is not None else None
+        ),
+        potential_savings=round(totals.potential_savings, 2),
+        split_basket=split_basket,
+    )
+
+
+@router.post(
+    "/compare",
+    response_model=ComparisonResponse,
+    summary="Compare prices across stores",
+    description=(
+        "Compare prices for a grocery list across stores in a specific ZIP code. "
+        "With mode 'split_basket', also find the cheapest way to buy the list "
+        "visiting at most max_stores stores. With mode 'unit_value', each item is "
+        "priced by the best unit price among similar products in the same unit "
+        "(e.g. a half gallon against a gallon). Use detail, item_skip and item_limit "
+        "to trim or paginate the item breakdown."
+    ),
+)
+def compare_prices(
+    request: ComparisonRequest,
+    db: ReadDbSession,
+    accept_encoding: Annotated[Optional[str], Header()] = None,
+) -> PydanticJSONResponse:
+    """Compare prices for a grocery list across stores.
+
+    Each phase is recorded in the ``compare_phase_seconds`` histogram, so the
+    response is serialized here rather than by FastAPI. The body is cached
+    in every content encoding, and served precompressed on later hits.
+    """
+    encoding = negotiate_encoding(accept_encoding)
+    cached = get_cached_comparison(request, encoding)
+    if cached is not None:
+        return _encoded_response(*cached)
+
+    started = time.perf_counter()
+    route_reads(db, list_ids=[request.list_id])
+    grocery_list = _get_list(db, request.list_id)
+    list_items = grocery_list.items
+    started = observe_since(COMPARE_LIST_LOAD, started)
+
+    stores, distances = _get_stores(db, request)
+    started = observe_since(COMPARE_STORE_LOOKUP, started)
+
+    # Match products
+    catalog = get_product_catalog(db)
+    matcher = ProductMatcher(db, catalog=catalog)
+    matched_items = match_list_items(matcher, list_items)
+    candidates = None
+    if request.mode == "unit_value":
+        candidates = find_unit_value_candidates(matcher, catalog, matched_items)
+    store_ids = [store.id for store in stores]
+    started = observe_since(COMPARE_MATCHING, started)
+
+    # Resolve the latest price for every (product, store) pair in one query
+    product_ids = {item.product_id for item in matched_items if item.product_id}
+    product_ids.update(product_id for item_candidates in candidates or () for product_id in item_candidates)
+    latest_prices = PriceResolver(db).get_latest_prices(product_ids, store_ids)
+    started = observe_since(COMPARE_PRICE_RESOLUTION, started)
+
+    comparison = _build_comparison(
+        request, grocery_list, stores, distances, matched_items, latest_prices, candidates, catalog
+    )
+    started = observe_since(COMPARE_AGGREGATION, started)
+
+    bodies = cache_comparison(request, comparison.model_dump_json().encode())
+    observe_since(COMPARE_SERIALIZATION, started)
+    if encoding in bodies:
+        return _encoded_response(bodies[encoding], encoding)
+    # Uncompressed or not cached: the compression middleware decides
+    return PydanticJSONResponse(content=bodies[IDENTITY])
+
+
+def _encoded_response(body: bytes, encoding: str) -> PydanticJSONResponse:
+    """Build a JSON response from a body that may already be compressed."""
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding != IDENTITY:
+        headers["Content-Encoding"] = encoding
+    return PydanticJSONResponse(content=body, headers=headers)
+
+
+def _encode_event(event: str, payload: str, sse: bool) -> str:
+    """Frame a JSON payload as an NDJSON line or a Server-Sent Event."""
+    if sse:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f'{{"event":"{event}","data":{payload}}}\n'
+
+
+def _stream_comparison(
+    db: Session,
+    request: ComparisonRequest,
+    grocery_list: GroceryList,
+    stores: list[StoreEntry],
+    distances: dict[int, float],
+    sse: bool,
+) -> Iterator[str]:
+    """Compare a list batch by batch, yielding items and running totals.
+
+    Only one batch of list items, matches and prices is held at a time.
+    """
+    batch_size = get_settings().compare_stream_batch_size
+    matcher = ProductMatcher(db, catalog=get_product_catalog(db))
+    resolver = PriceResolver(db)
+    store_ids = [store.id for store in stores]
+    running = RunningTotals(len(stores))
+
+    first_item = request.item_skip
+    last_item = first_item + request.item_limit if request.item_limit is not None else None
+    items_processed = 0
+    last_item_id = 0
+
+    def totals_event(complete: bool) -> str:
+        totals = running.result()
+        event = ComparisonTotalsEvent(
+            list_id=grocery_list.id,
+            list_name=grocery_list.name,
+            zip_code=request.zip_code,
+            store_totals=_build_store_totals(stores, totals, distances),
+            items_processed=items_processed,
+            complete=complete,
+            cheapest_store_id=(
+                stores[totals.cheapest_overall].id if totals.cheapest_overall is not None else None
+            ),
+            potential_savings=round(totals.potential_savings, 2),
+        )
+        return _encode_event("totals", event.model_dump_json(), sse)
+
+    while True:
+        batch = db.scalars(grocery_list_item_batch(grocery_list.id, last_item_id, batch_size)).all()
+        if not batch:
+            break
+        # Running totals for the previous batch; the final ones follow the loop
+        if items_processed:
+            yield totals_event(complete=False)
+        last_item_id = batch[-1].id
+
+        matched_items = match_list_items(matcher, batch)
+        latest_prices = resolver.get_latest_prices(
+            (item.product_id for item in matched_items if item.product_id),
+            store_ids,
+        )
+        matrix = PriceMatrix.build(matched_items, store_ids, latest_prices)
+        running.add(matrix)
+
+        if request.detail != "summary":
+            # Rows of this batch that fall inside the requested page
+            start = max(first_item - items_processed, 0)
+            stop = len(batch) if last_item is None else min(last_item - items_processed, len(batch))
+            for item in _build_item_breakdown(
+                matrix,
+                stores,
+                matrix.cheapest_stores(),
+                range(start, max(stop, start)),
+                cheapest_only=request.detail == "cheapest_only",
+            ):
+                yield _encode_event("item", item.model_dump_json(), sse)
+
+        items_processed += len(batch)
+
+    yield totals_event(complete=True)
+
+
+@router.post(
+    "/compare/stream",
+    summary="Stream a price comparison",
+    description=(
+        "Compare prices like POST /compare, streaming each item comparison as it "
+        "resolves followed by running store totals after every batch. The last "
+        "'totals' event has complete=true. Responds with Server-Sent Events when "
+        "the Accept header includes text/event-stream, NDJSON otherwise. "
+        "Only per_store mode is supported."
+    ),
+    response_class=StreamingResponse,
+)
+def stream_compare_prices(
+    request: ComparisonRequest,
+    db: ReadDbSession,
+    accept: Annotated[Optional[str], Header()] = None,
+) -> StreamingResponse:
+    """Stream a price comparison for a grocery list across stores."""
+    if request.mode != "per_store":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{request.mode} mode needs the whole list and cannot be streamed",
+        )
+
+    route_reads(db, list_ids=[request.list_id])
+    grocery_list = _get_list(db, request.list_id)
+    stores, distances = _get_stores(db, request)
+    sse = accept is not None and "text/event-stream" in accept
+    # The generator keeps using ``db``: since FastAPI 0.118, yield dependencies
+    # are closed after the response has been sent
+    return StreamingResponse(
+        _stream_comparison(db, request, grocery_list, stores, distances, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
     )
+
+
+@router.post(
+    "/compare:batch",
+    response_model=BatchComparisonResponse,
+    summary="Compare several lists and ZIP codes at once",
+    description=(
+        "Run up to 20 comparisons (same options as POST /compare) in one request. "
+        "Lists, stores and product matches are loaded once and the prices for every "
+        "comparison are fetched in a single query. A missing list or location yields "
+        "a per-comparison status_code instead of failing the batch."
+    ),
+)
+def batch_compare_prices(
+    request: BatchComparisonRequest,
+    db: ReadDbSession,
+) -> PydanticJSONResponse:
+    """Compare prices for several (list, location) pairs."""
+    comparisons = request.comparisons
+
+    # Load every distinct list with its items in two queries
+    list_ids = {comparison.list_id for comparison in comparisons}
+    route_reads(db, list_ids=sorted(list_ids))
+    lists_by_id = {
+        grocery_list.id: grocery_list
+        for grocery_list in db.scalars(grocery_lists_with_items(list_ids))
+    }
+
+    # Stores come from the store directory; store searches are shared
+    # between identical locations
+    nearby: dict[tuple, tuple[list[StoreEntry], dict[int, float]]] = {}
+    locations: list[tuple[list[StoreEntry], dict[int, float]]] = []
+    for comparison in comparisons:
+        key = (comparison.zip_code, comparison.radius_miles, comparison.lat, comparison.lng)
+        if key not in nearby:
+            nearby[key] = _locate_stores(db, comparison)
+        locations.append(nearby[key])
+
+    # Match each list once, sharing the product catalog and fuzzy matches
+    catalog = get_product_catalog(db)
+    matcher = ProductMatcher(db, catalog=catalog)
+    match_cache: dict[str, tuple[Optional[int], float]] = {}
+    matched_by_list = {
+        list_id: match_list_items(matcher, grocery_list.items, match_cache)
+        for list_id, grocery_list in lists_by_id.items()
+    }
+    unit_value_lists = {c.list_id for c in comparisons if c.mode == "unit_value" and c.list_id in lists_by_id}
+    candidates_by_list = {
+        list_id: find_unit_value_candidates(matcher, catalog, matched_by_list[list_id])
+        for list_id in unit_value_lists
+    }
+
+    # Resolve the union of (product, store) prices in one query
+    product_ids = {
+        item.product_id
+        for list_id, (stores, _) in zip((c.list_id for c in comparisons), locations)
+        if stores
+        for item in matched_by_list.get(list_id, ())
+        if item.product_id
+    }
+    product_ids.update(
+        product_id
+        for item_candidates in candidates_by_list.values()
+        for candidates in item_candidates
+        for product_id in candidates
+    )
+    store_ids = {
+        store.id
+        for comparison, (stores, _) in zip(comparisons, locations)
+        if comparison.list_id in lists_by_id
+        for store in stores
+    }
+    latest_prices = PriceResolver(db).get_latest_prices(product_ids, store_ids)
+
+    results = []
+    for comparison, (stores, distances) in zip(comparisons, locations):
+        result = BatchComparisonResult(list_id=comparison.list_id, zip_code=comparison.zip_code)
+        grocery_list = lists_by_id.get(comparison.list_id)
+        if grocery_list is None:
+            result.status_code = status.HTTP_404_NOT_FOUND
+            result.detail = f"Grocery list with ID {comparison.list_id} not found"
+        elif not stores:
+            result.status_code = status.HTTP_404_NOT_FOUND
+            result.detail = _no_stores_detail(comparison)
+        else:
+            result.result = _build_comparison(
+                comparison,
+                grocery_list,
+                stores,
+                distances,
+                matched_by_list[grocery_list.id],
+                latest_prices,
+                candidates_by_list.get(grocery_list.id),
+                catalog,
+            )
+        results.append(result)
+
+    return PydanticJSONResponse(content=BatchComparisonResponse(results=results).model_dump_json())
@@ -1,9 +1,14 @@
 """Grocery list CRUD API routes."""
 
 from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import TypeAdapter
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
-from app.api.deps import DbSession
+from app.api.deps import DbSession, ReadDbSession
+from app.core.responses import PydanticJSONResponse, dump_response
+from app.db.queries import grocery_list_by_id, grocery_list_summaries
+from app.db.routing import record_write, route_reads
 from app.models.grocery_list import GroceryList, GroceryListItem
 from app.schemas.grocery_list import (
     GroceryListCreate,
@@ -11,9 +16,14 @@ from app.schemas.grocery_list import (
     GroceryListSummary,
     GroceryListUpdate,
 )
+from app.services.comparison_cache import invalidate_comparisons
 
 router = APIRouter()
 
+# Responses are validated once from the ORM objects and dumped straight to JSON
+_GROCERY_LIST = TypeAdapter(GroceryListResponse)
+_SUMMARIES = TypeAdapter(list[GroceryListSummary])
+
 
 @router.post(
     "/lists",
@@ -25,7 +35,7 @@ router = APIRouter()
 def create_grocery_list(
     list_data: GroceryListCreate,
     db: DbSession,
-) -> GroceryList:
+) -> PydanticJSONResponse:
     """Create a new grocery list."""
     grocery_list = GroceryList(
         name=list_data.name,
@@ -50,7 +60,10 @@ def create_grocery_list(
 
     db.commit()
     db.refresh(grocery_list)
-    return grocery_list
+    record_write(user_id=grocery_list.user_id, list_ids=[grocery_list.id])
+    return dump_response(
+        _GROCERY_LIST, _GROCERY_LIST.validate_python(grocery_list), status.HTTP_201_CREATED
+    )
 
 
 @router.get(
@@ -60,31 +73,27 @@ def create_grocery_list(
     description="Get all grocery lists for a specific user.",
 )
 def get_grocery_lists(
-    db: DbSession,
+    db: ReadDbSession,
     user_id: str = Query(..., description="User ID to filter lists"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of records to return"),
-) -> list[GroceryListSummary]:
+) -> PydanticJSONResponse:
     """Get all grocery lists for a user."""
-    lists = (
-        db.query(GroceryList)
-        .filter(GroceryList.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    route_reads(db, user_id=user_id)
+    rows = db.execute(grocery_list_summaries(user_id, skip, limit))
 
-    return [
+    summaries = [
         GroceryListSummary(
             id=grocery_list.id,
             name=grocery_list.name,
             user_id=grocery_list.user_id,
-            item_count=len(grocery_list.items),
+            item_count=item_count,
             created_at=grocery_list.created_at,
             updated_at=grocery_list.updated_at,
         )
-        for grocery_list in lists
+        for grocery_list, item_count in rows
     ]
+    return dump_response(_SUMMARIES, summaries)
 
 
 @router.get(
@@ -95,10 +104,11 @@ def get_grocery_lists(
 )
 def get_grocery_list(
     list_id: int,
-    db: DbSession,
-) -> GroceryList:
+    db: ReadDbSession,
+) -> PydanticJSONResponse:
     """Get a specific grocery list by ID."""
-    grocery_list = db.query(GroceryList).filter(GroceryList.id == list_id).first()
+    route_reads(db, list_ids=[list_id])
+    grocery_list = db.execute(grocery_list_by_id(list_id)).scalar_one_or_none()
 
     if not grocery_list:
         raise HTTPException(
@@ -106,7 +116,7 @@ def get_grocery_list(
             detail=f"Grocery list with ID {list_id} not found",
         )
 
-    return grocery_list
+    return dump_response(_GROCERY_LIST, _GROCERY_LIST.validate_python(grocery_list))
 
 
 @router.put(
@@ -119,9 +129,9 @@ def update_grocery_list(
     list_id: int,
     list_data: GroceryListUpdate,
     db: DbSession,
-) -> GroceryList:
+) -> PydanticJSONResponse:
     """Update a grocery list."""
-    grocery_list = db.query(GroceryList).filter(GroceryList.id == list_id).first()
+    grocery_list = db.execute(grocery_list_by_id(list_id)).scalar_one_or_none()
 
     if not grocery_list:
         raise HTTPException(
@@ -136,9 +146,7 @@ def update_grocery_list(
     # Replace items if provided
     if list_data.items is not None:
         # Delete existing items
-        db.query(GroceryListItem).filter(
-            GroceryListItem.grocery_list_id == list_id
-        ).delete()
+        db.execute(delete(GroceryListItem).where(GroceryListItem.grocery_list_id == list_id))
 
         # Add new items
         for i, item_data in enumerate(list_data.items):
@@ -155,7 +163,9 @@ def update_grocery_list(
 
     db.commit()
     db.refresh(grocery_list)
-    return grocery_list
+    record_write(user_id=grocery_list.user_id, list_ids=[list_id])
+    invalidate_comparisons(list_id)
+    return dump_response(_GROCERY_LIST, _GROCERY_LIST.validate_python(grocery_list))
 
 
 @router.delete(
@@ -169,7 +179,7 @@ def delete_grocery_list(
     db: DbSession,
 ) -> None:
     """Delete a grocery list."""
-    grocery_list = db.query(GroceryList).filter(GroceryList.id == list_id).first()
+    grocery_list = db.execute(grocery_list_by_id(list_id)).scalar_one_or_none()
 
     if not grocery_list:
         raise HTTPException(
@@ -177,5 +187,8 @@ def delete_grocery_list(
             detail=f"Grocery list with ID {list_id} not found",
         )
 
+    user_id = grocery_list.user_id
     db.delete(grocery_list)
     db.commit()
+    record_write(user_id=user_id, list_ids=[list_id])
+    invalidate_comparisons(list_id)
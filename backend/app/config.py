@@ -23,6 +23,21 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "postgresql://localhost/grocery_compare"
 
+    # Read replicas for comparisons and list reads (JSON list of URLs), how
+    # long a user's reads stay on the primary after they write, and whether
+    # those pins are shared between processes through Redis
+    database_replica_urls: list[str] = []
+    read_your_writes_seconds: float = 5.0
+    write_pin_cache: bool = True
+
+    # Executions of a statement on a connection before psycopg 3 prepares it
+    # server-side (0 prepares immediately, None disables)
+    database_prepare_threshold: Optional[int] = 5
+
+    # Price partitioning (PostgreSQL): months kept in the live ``prices`` table
+    # before PriceCompactor archives them into ``price_history``
+    price_hot_months: int = 1
+
     # Redis
     redis_url: str = "redis://localhost:6379"
     cache_ttl_seconds: int = 3600  # 1 hour default cache TTL
@@ -35,6 +50,56 @@ class Settings(BaseSettings):
     # API Settings
     api_prefix: str = "/api"
 
+    # Requests slower than this are logged with their SQL statements
+    slow_request_threshold_ms: float = 1000.0
+
+    # Load caches such as the store directory when the app starts
+    startup_warmup: bool = True
+
+    # Maximum number of nearby stores included in a radius comparison
+    compare_max_stores: int = 25
+
+    # Store directory: seconds between syncs with Redis/the database, and
+    # whether rosters are shared between processes through Redis
+    store_directory_refresh_seconds: int = 300
+    store_directory_cache: bool = True
+
+    # Seconds between checks for product changes made outside this process
+    # (other workers, bulk loads); the catalog is reloaded when they changed
+    product_catalog_refresh_seconds: int = 300
+
+    # List items matched and priced per batch by the streaming comparison
+    compare_stream_batch_size: int = 50
+
+    # Smallest response body, in bytes, compressed with zstd, br or gzip
+    compression_minimum_size: int = 1024
+
+    # Cache POST /compare bodies in Redis, precompressed in every encoding;
+    # off by default since price and store changes wait for entries to expire
+    comparison_cache: bool = False
+
+    # Circular PDF pages: parsed items cached in Redis by page content digest
+    circular_page_cache: bool = True
+    circular_page_cache_ttl_seconds: int = 14 * 24 * 3600
+
+    # Raw circular snapshots: a local directory (absolute, since a relative
+    # one depends on the working directory) or s3://bucket/prefix, unset to
+    # disable; and the endpoint of an S3-compatible service other than AWS
+    snapshot_store_url: Optional[str] = None
+    snapshot_s3_endpoint_url: Optional[str] = None
+
+    # Ingest scheduler: concurrent workers per run, the off-peak window
+    # (hours in ingest_timezone) that scraping jobs are limited to, attempts
+    # per job, the first retry's delay (doubling per attempt), and how long
+    # a running job may go before it is treated as a crashed attempt
+    ingest_workers: int = 4
+    ingest_window_start_hour: int = 2
+    ingest_window_end_hour: int = 6
+    ingest_timezone: str = "America/New_York"
+    ingest_max_attempts: int = 5
+    ingest_retry_base_seconds: float = 60.0
+    ingest_job_timeout_seconds: int = 3600
+
 
 @lru_cache
 def get_settings() -> Settings:
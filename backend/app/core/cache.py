@@ -1,32 +1,64 @@
 """Redis caching service."""
 
 import json
+import logging
+import time
+from collections.abc import Mapping, Sequence
 from datetime import timedelta
 from typing import Any, Optional, Union
 
 import redis
+from redis.typing import EncodableT
 
 from app.config import get_settings
+from app.core.instrumentation import track_redis
+from app.core.metrics import CacheCounters, bind_cache_counters
+
+logger = logging.getLogger(__name__)
+
+# Seconds cache operations skip Redis after it was unreachable
+REDIS_RETRY_SECONDS = 5.0
 
 
 class CacheManager:
-    """Service for managing Redis cache operations."""
+    """Service for managing Redis cache operations.
+
+    Redis failures never propagate to callers (reads degrade to misses),
+    but each one is logged and counted in ``cache_requests_total``. After a
+    connection failure every operation skips Redis for
+    ``REDIS_RETRY_SECONDS`` rather than waiting out the connect timeout.
+    """
 
     # Cache key prefixes
     PREFIX_PRICE = "price"
     PREFIX_PRODUCT = "product"
     PREFIX_STORE = "store"
     PREFIX_COMPARISON = "comparison"
+    PREFIX_CIRCULAR_PAGE = "circular_page"
+    PREFIX_WRITE_PIN = "write_pin"
+
+    _COUNTERS = bind_cache_counters(
+        [
+            PREFIX_PRICE,
+            PREFIX_PRODUCT,
+            PREFIX_STORE,
+            PREFIX_COMPARISON,
+            PREFIX_CIRCULAR_PAGE,
+            PREFIX_WRITE_PIN,
+        ]
+    )
 
     def __init__(self) -> None:
         """Initialize the cache manager."""
         settings = get_settings()
         self.redis_url = settings.redis_url
         self.default_ttl = settings.cache_ttl_seconds
-        self._client: Optional[redis.Redis[str]] = None
+        self._client: Optional["redis.Redis[str]"] = None
+        self._binary_client: Optional[redis.Redis] = None
+        self._unreachable_until = 0.0
 
     @property
-    def client(self) -> redis.Redis[str]:
+    def client(self) -> "redis.Redis[str]":
         """Get or create Redis client.
 
         Returns:
@@ -39,6 +71,17 @@ class CacheManager:
             )
         return self._client
 
+    @property
+    def binary_client(self) -> redis.Redis:
+        """Get or create a Redis client for raw byte values.
+
+        Returns:
+            Redis client instance that does not decode responses
+        """
+        if self._binary_client is None:
+            self._binary_client = redis.from_url(self.redis_url)
+        return self._binary_client
+
     def _make_key(self, prefix: str, *args: Union[str, int]) -> str:
         """Create a cache key with prefix and components.
 
@@ -52,6 +95,27 @@ class CacheManager:
         parts = [prefix] + [str(arg) for arg in args]
         return ":".join(parts)
 
+    def _counters(self, key: str) -> CacheCounters:
+        """Get the metrics counters for a key's prefix."""
+        counters = self._COUNTERS.get(key.partition(":")[0])
+        return counters if counters is not None else self._COUNTERS["other"]
+
+    def _redis_error(self, operation: str, key: str, error: redis.RedisError) -> None:
+        """Log and count a failed Redis operation."""
+        self._counters(key).error.inc()
+        logger.warning("Redis %s failed for %s: %s", operation, key, error)
+        if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+            self._unreachable_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    @property
+    def reachable(self) -> bool:
+        """Whether Redis has not failed to connect in the last ``REDIS_RETRY_SECONDS``.
+
+        Every cache operation checks this to skip its round trip during an
+        outage; ``health_check`` always tries Redis.
+        """
+        return time.monotonic() >= self._unreachable_until
+
     def get(self, key: str) -> Optional[Any]:
         """Get a value from cache.
 
@@ -61,14 +125,22 @@ class CacheManager:
         Returns:
             Cached value or None if not found
         """
+        if not self.reachable:
+            return None
         try:
-            value = self.client.get(key)
+            with track_redis():
+                value = self.client.get(key)
             if value:
-                return json.loads(value)
+                result = json.loads(value)
+                self._counters(key).hit.inc()
+                return result
+            self._counters(key).miss.inc()
             return None
-        except redis.RedisError:
+        except redis.RedisError as e:
+            self._redis_error("GET", key, e)
             return None
         except json.JSONDecodeError:
+            self._counters(key).miss.inc()
             return None
 
     def set(
@@ -87,12 +159,18 @@ class CacheManager:
         Returns:
             True if successful, False otherwise
         """
+        if not self.reachable:
+            return False
         try:
             ttl = ttl or self.default_ttl
             serialized = json.dumps(value)
-            self.client.setex(key, ttl, serialized)
+            with track_redis():
+                self.client.set(key, serialized, ex=ttl)
             return True
-        except (redis.RedisError, TypeError):
+        except redis.RedisError as e:
+            self._redis_error("SET", key, e)
+            return False
+        except TypeError:
             return False
 
     def delete(self, key: str) -> bool:
@@ -104,9 +182,13 @@ class CacheManager:
         Returns:
             True if deleted, False otherwise
         """
+        if not self.reachable:
+            return False
         try:
-            return bool(self.client.delete(key))
-        except redis.RedisError:
+            with track_redis():
+                return bool(self.client.delete(key))
+        except redis.RedisError as e:
+            self._redis_error("DEL", key, e)
             return False
 
     def delete_pattern(self, pattern: str) -> int:
@@ -118,12 +200,16 @@ class CacheManager:
         Returns:
             Number of keys deleted
         """
-        try:
-            keys = list(self.client.scan_iter(match=pattern))
-            if keys:
-                return self.client.delete(*keys)
+        if not self.reachable:
             return 0
-        except redis.RedisError:
+        try:
+            with track_redis():
+                keys = list(self.client.scan_iter(match=pattern))
+                if keys:
+                    return self.client.delete(*keys)
+                return 0
+        except redis.RedisError as e:
+            self._redis_error("SCAN/DEL", pattern, e)
             return 0
 
     def exists(self, key: str) -> bool:
@@ -135,9 +221,13 @@ class CacheManager:
         Returns:
             True if key exists, False otherwise
         """
+        if not self.reachable:
+            return False
         try:
-            return bool(self.client.exists(key))
-        except redis.RedisError:
+            with track_redis():
+                return bool(self.client.exists(key))
+        except redis.RedisError as e:
+            self._redis_error("EXISTS", key, e)
             return False
 
     def get_ttl(self, key: str) -> int:
@@ -149,9 +239,13 @@ class CacheManager:
         Returns:
             TTL in seconds, -1 if no TTL, -2 if key doesn't exist
         """
+        if not self.reachable:
+            return -2
         try:
-            return self.client.ttl(key)
-        except redis.RedisError:
+            with track_redis():
+                return self.client.ttl(key)
+        except redis.RedisError as e:
+            self._redis_error("TTL", key, e)
             return -2
 
     # High-level caching methods
@@ -254,6 +348,74 @@ class CacheManager:
         ttl = ttl or (self.default_ttl // 2)
         return self.set(key, comparison_data, ttl)
 
+    def get_comparison_body(
+        self, list_id: int, zip_code: str, digest: str, encodings: Sequence[str]
+    ) -> Optional[tuple[bytes, str]]:
+        """Get a cached, serialized comparison in the first available encoding.
+
+        Args:
+            list_id: Grocery list ID
+            zip_code: ZIP code
+            digest: Digest of the comparison options
+            encodings: Content encodings in order of preference, ``identity``
+                meaning uncompressed JSON
+
+        Returns:
+            (body, encoding) or None if not cached
+        """
+        if not self.reachable:
+            return None
+        key = self._make_key(self.PREFIX_COMPARISON, list_id, zip_code, digest)
+        try:
+            with track_redis():
+                bodies = self.binary_client.hmget(key, list(encodings))
+        except redis.RedisError as e:
+            self._redis_error("HMGET", key, e)
+            return None
+        for encoding, body in zip(encodings, bodies):
+            if isinstance(body, bytes):
+                self._counters(key).hit.inc()
+                return body, encoding
+        self._counters(key).miss.inc()
+        return None
+
+    def set_comparison_bodies(
+        self,
+        list_id: int,
+        zip_code: str,
+        digest: str,
+        bodies: Mapping[str, bytes],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        """Cache a serialized comparison in each of its encodings.
+
+        Args:
+            list_id: Grocery list ID
+            zip_code: ZIP code
+            digest: Digest of the comparison options
+            bodies: Body by content encoding, including ``identity``
+            ttl: Optional TTL override
+
+        Returns:
+            True if successful
+        """
+        if not self.reachable:
+            return False
+        key = self._make_key(self.PREFIX_COMPARISON, list_id, zip_code, digest)
+        ttl = ttl or (self.default_ttl // 2)
+        try:
+            with track_redis():
+                pipeline = self.binary_client.pipeline()
+                pipeline.delete(key)
+                mapping: dict[EncodableT, EncodableT] = {encoding: body for encoding, body in bodies.items()}
+                pipeline.hset(key, mapping=mapping)
+                pipeline.expire(key, ttl)
+                pipeline.execute()
+            return True
+        except redis.RedisError as e:
+            self._redis_error("HSET", key, e)
+            return False
+
     def invalidate_list_comparisons(self, list_id: int) -> int:
         """Invalidate all cached comparisons for a grocery list.
 
@@ -266,6 +428,226 @@ class CacheManager:
         pattern = f"{self.PREFIX_COMPARISON}:{list_id}:*"
         return self.delete_pattern(pattern)
 
+    def get_circular_pages(self, digests: Sequence[str]) -> dict[str, list[dict[str, Any]]]:
+        """Get the cached parsed items of circular pages.
+
+        Args:
+            digests: Content digests of the pages
+
+        Returns:
+            Parsed item records by digest, for the pages that are cached
+        """
+        if not digests:
+            return {}
+        if not self.reachable:
+            return {}
+        counters = self._COUNTERS[self.PREFIX_CIRCULAR_PAGE]
+        try:
+            with track_redis():
+                values = self.client.mget([self._make_key(self.PREFIX_CIRCULAR_PAGE, d) for d in digests])
+        except redis.RedisError as e:
+            self._redis_error("MGET", self._make_key(self.PREFIX_CIRCULAR_PAGE, "*"), e)
+            return {}
+
+        pages = {}
+        for digest, value in zip(digests, values):
+            try:
+                if value is not None:
+                    pages[digest] = json.loads(value)
+                    counters.hit.inc()
+                    continue
+            except json.JSONDecodeError:
+                pass
+            counters.miss.inc()
+        return pages
+
+    def set_circular_pages(
+        self, pages: Mapping[str, list[dict[str, Any]]], ttl: Optional[int] = None
+    ) -> bool:
+        """Cache the parsed items of circular pages.
+
+        Args:
+            pages: Parsed item records by page content digest
+            ttl: Optional TTL override (default ``CIRCULAR_PAGE_CACHE_TTL_SECONDS``)
+
+        Returns:
+            True if successful
+        """
+        if not pages:
+            return True
+        if not self.reachable:
+            return False
+        ttl = ttl or get_settings().circular_page_cache_ttl_seconds
+        try:
+            with track_redis():
+                pipeline = self.client.pipeline(transaction=False)
+                for digest, items in pages.items():
+                    pipeline.set(self._make_key(self.PREFIX_CIRCULAR_PAGE, digest), json.dumps(items), ex=ttl)
+                pipeline.execute()
+            return True
+        except redis.RedisError as e:
+            self._redis_error("SET", self._make_key(self.PREFIX_CIRCULAR_PAGE, "*"), e)
+            return False
+
+    def set_write_pins(self, keys: Sequence[str], seconds: float) -> bool:
+        """Pin keys' reads to the primary database for every process.
+
+        Args:
+            keys: Pinned keys, e.g. ``list:42``
+            seconds: How long the pins last
+
+        Returns:
+            True if successful
+        """
+        if not keys:
+            return True
+        if not self.reachable:
+            return False
+        milliseconds = max(int(seconds * 1000), 1)
+        try:
+            with track_redis():
+                pipeline = self.client.pipeline(transaction=False)
+                for key in keys:
+                    pipeline.set(self._make_key(self.PREFIX_WRITE_PIN, key), 1, px=milliseconds)
+                pipeline.execute()
+            return True
+        except redis.RedisError as e:
+            self._redis_error("SET", self._make_key(self.PREFIX_WRITE_PIN, "*"), e)
+            return False
+
+    def any_write_pinned(self, keys: Sequence[str]) -> bool:
+        """Check whether any process pinned one of the keys.
+
+        Args:
+            keys: Keys being read
+
+        Returns:
+            True if a pin is live; False if not, or if Redis failed
+        """
+        if not keys:
+            return False
+        if not self.reachable:
+            return False
+        counters = self._COUNTERS[self.PREFIX_WRITE_PIN]
+        pin_keys = [self._make_key(self.PREFIX_WRITE_PIN, key) for key in keys]
+        try:
+            with track_redis():
+                pinned = self.client.exists(*pin_keys) > 0
+        except redis.RedisError as e:
+            self._redis_error("EXISTS", self._make_key(self.PREFIX_WRITE_PIN, "*"), e)
+            return False
+        (counters.hit if pinned else counters.miss).inc()
+        return pinned
+
+    def clear_write_pins(self) -> int:
+        """Drop every process's write pins.
+
+        Returns:
+            Number of keys deleted
+        """
+        return self.delete_pattern(f"{self.PREFIX_WRITE_PIN}:*")
+
+    def get_store_directory_version(self) -> Optional[str]:
+        """Get the version of the store rosters published to the cache.
+
+        Returns:
+            Version token or None if no rosters are cached
+        """
+        return self.get(self._make_key(self.PREFIX_STORE, "version"))
+
+    def get_store_roster(self, zip_code: str) -> Optional[list[dict[str, Any]]]:
+        """Get the cached stores in a ZIP code.
+
+        Args:
+            zip_code: ZIP code
+
+        Returns:
+            Cached store records or None
+        """
+        return self.get(self._make_key(self.PREFIX_STORE, "zip", zip_code))
+
+    def get_store_rosters(self) -> Optional[tuple[str, dict[str, list[dict[str, Any]]]]]:
+        """Get every cached per-ZIP store roster.
+
+        Returns:
+            (version, rosters by ZIP code), or None if the cached rosters are
+            missing or incomplete
+        """
+        if not self.reachable:
+            return None
+        counters = self._COUNTERS[self.PREFIX_STORE]
+        try:
+            with track_redis():
+                version, zip_codes = self.client.mget(
+                    self._make_key(self.PREFIX_STORE, "version"),
+                    self._make_key(self.PREFIX_STORE, "zips"),
+                )
+            if not version or not zip_codes:
+                counters.miss.inc()
+                return None
+            zip_codes = json.loads(zip_codes)
+            values = []
+            if zip_codes:
+                with track_redis():
+                    values = self.client.mget(
+                        [self._make_key(self.PREFIX_STORE, "zip", z) for z in zip_codes]
+                    )
+            if any(value is None for value in values):
+                counters.miss.inc()
+                return None
+            rosters = json.loads(version), {
+                zip_code: json.loads(value)
+                for zip_code, value in zip(zip_codes, values)
+                if value is not None
+            }
+            counters.hit.inc()
+            return rosters
+        except redis.RedisError as e:
+            self._redis_error("MGET", self._make_key(self.PREFIX_STORE, "zip", "*"), e)
+            return None
+        except json.JSONDecodeError:
+            counters.miss.inc()
+            return None
+
+    def set_store_rosters(
+        self,
+        version: str,
+        rosters: dict[str, list[dict[str, Any]]],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        """Publish per-ZIP store rosters, replacing any previous ones.
+
+        Args:
+            version: Version token other processes compare against
+            rosters: Store records by ZIP code
+            ttl: Optional TTL override
+
+        Returns:
+            True if successful
+        """
+        if not self.reachable:
+            return False
+        # Rosters change rarely; keep them for a day unless overridden
+        ttl = ttl or max(self.default_ttl, 86400)
+        try:
+            previous = self.get(self._make_key(self.PREFIX_STORE, "zips")) or []
+            pipeline = self.client.pipeline(transaction=True)
+            stale = set(previous) - set(rosters)
+            if stale:
+                pipeline.delete(*[self._make_key(self.PREFIX_STORE, "zip", z) for z in stale])
+            for zip_code, roster in rosters.items():
+                pipeline.set(self._make_key(self.PREFIX_STORE, "zip", zip_code), json.dumps(roster), ex=ttl)
+            pipeline.set(self._make_key(self.PREFIX_STORE, "zips"), json.dumps(sorted(rosters)), ex=ttl)
+            pipeline.set(self._make_key(self.PREFIX_STORE, "version"), json.dumps(version), ex=ttl)
+            with track_redis():
+                pipeline.execute()
+            return True
+        except redis.RedisError as e:
+            self._redis_error("MULTI/EXEC", self._make_key(self.PREFIX_STORE, "zip", "*"), e)
+            return False
+        except TypeError:
+            return False
+
     def health_check(self) -> bool:
         """Check if Redis connection is healthy.
 
@@ -273,6 +655,29 @@ class CacheManager:
             True if Redis is reachable, False otherwise
         """
         try:
-            return self.client.ping()
+            with track_redis():
+                healthy = self.client.ping()
         except redis.RedisError:
             return False
+        if healthy:
+            self._unreachable_until = 0.0
+        return healthy
+
+
+_shared: Optional[CacheManager] = None
+
+
+def get_cache_manager() -> CacheManager:
+    """Get the process-wide cache manager.
+
+    Caches that live for the whole process (store directory, comparisons,
+    circular pages) share it, so the process holds one pair of Redis
+    connection pools and the startup warmup fills the pools they use.
+
+    Returns:
+        Shared cache manager
+    """
+    global _shared
+    if _shared is None:
+        _shared = CacheManager()
+    return _shared
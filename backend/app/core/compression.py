@@ -0,0 +1,168 @@
+"""Response compression (zstd, brotli or gzip) negotiated per request.
+
+``CompressionMiddleware`` compresses buffered responses of a compressible
+type once they reach a minimum size. Streaming responses pass through
+unchanged so their events are not held back, and responses that already
+carry a ``Content-Encoding`` (such as precompressed cached comparisons) are
+left alone.
+"""
+
+import gzip
+from collections.abc import Iterable
+from typing import Optional
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+IDENTITY = "identity"
+
+# Supported encodings, most preferred first
+ENCODINGS = ("zstd", "br", "gzip")
+
+# Levels for compressing on every response: fast, most of the size win
+DYNAMIC_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+# Levels for payloads compressed once and served many times from a cache
+CACHED_LEVELS = {"zstd": 10, "br": 9, "gzip": 9}
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding a client accepts.
+
+    Args:
+        accept_encoding: ``Accept-Encoding`` request header
+
+    Returns:
+        Encoding name, or None to send the body uncompressed
+    """
+    if not accept_encoding:
+        return None
+
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress a body.
+
+    Args:
+        body: Uncompressed bytes
+        encoding: One of ``ENCODINGS``
+        level: Compression level; defaults to the encoding's dynamic level
+
+    Returns:
+        Compressed bytes
+    """
+    if encoding not in DYNAMIC_LEVELS:
+        raise ValueError(f"Unsupported encoding: {encoding}")
+    level = DYNAMIC_LEVELS[encoding] if level is None else level
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    if encoding == "br":
+        compressed: bytes = brotli.compress(body, quality=level)
+        return compressed
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def precompress(body: bytes, minimum_size: int, encodings: Iterable[str] = ENCODINGS) -> dict[str, bytes]:
+    """Compress a body once into every encoding, for caching.
+
+    Args:
+        body: Uncompressed bytes
+        minimum_size: Bodies smaller than this are only kept uncompressed
+        encodings: Encodings to produce
+
+    Returns:
+        Body by encoding, always including ``identity``
+    """
+    bodies = {IDENTITY: body}
+    if len(body) >= minimum_size:
+        for encoding in encodings:
+            bodies[encoding] = compress(body, encoding, CACHED_LEVELS[encoding])
+    return bodies
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """Check whether a content type is worth compressing."""
+    return content_type is not None and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses for clients that accept it."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        """Wrap an ASGI app.
+
+        Args:
+            app: Application whose responses are compressed
+            minimum_size: Smallest body, in bytes, that is compressed
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve a request, compressing its response if worthwhile."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk shows the size
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            body = message.get("body", b"")
+            if (
+                not message.get("more_body", False)
+                and "content-encoding" not in headers
+                and is_compressible(headers.get("content-type"))
+                and len(body) >= self.minimum_size
+            ):
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                message = {**message, "body": body}
+            await send({**start, "headers": headers.raw})
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,198 @@
+"""Per-request instrumentation of database, Redis and matcher work."""
+
+import contextlib
+import json
+import logging
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+logger = logging.getLogger("app.requests")
+
+# Statements kept per request for slow-request logs; counts are never capped
+MAX_RECORDED_STATEMENTS = 100
+
+
+@dataclass
+class RequestMetrics:
+    """Work done while serving one request."""
+
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    redis_calls: int = 0
+    redis_seconds: float = 0.0
+    matcher_calls: int = 0
+    matcher_seconds: float = 0.0
+    statements: list[tuple[str, float]] = field(default_factory=list)
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """Get the metrics of the request being served, if any."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def collect_metrics() -> Iterator[RequestMetrics]:
+    """Collect metrics for the enclosed work, e.g. outside a request."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def track_redis() -> Iterator[None]:
+    """Count and time one Redis round trip for the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.redis_calls += 1
+        metrics.redis_seconds += time.perf_counter() - started
+
+
+@contextlib.contextmanager
+def track_matcher() -> Iterator[None]:
+    """Count and time one product match for the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.matcher_calls += 1
+        metrics.matcher_seconds += time.perf_counter() - started
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    metrics = _current.get()
+    started = conn.info.get("query_started")
+    if metrics is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    metrics.db_queries += 1
+    metrics.db_seconds += elapsed
+    if len(metrics.statements) < MAX_RECORDED_STATEMENTS:
+        metrics.statements.append((statement, elapsed))
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record every statement an engine executes against the current request.
+
+    Args:
+        engine: Engine to instrument (idempotent)
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def server_timing(metrics: RequestMetrics, total_seconds: float) -> str:
+    """Format metrics as a Server-Timing header value."""
+    return ", ".join([
+        f'db;dur={metrics.db_seconds * 1000:.2f};desc="{metrics.db_queries} queries"',
+        f'redis;dur={metrics.redis_seconds * 1000:.2f};desc="{metrics.redis_calls} calls"',
+        f'matcher;dur={metrics.matcher_seconds * 1000:.2f};desc="{metrics.matcher_calls} matches"',
+        f"total;dur={total_seconds * 1000:.2f}",
+    ])
+
+
+class InstrumentationMiddleware:
+    """ASGI middleware reporting per-request DB, Redis and matcher work.
+
+    Adds a ``Server-Timing`` header and logs one JSON line per request.
+    Requests slower than ``SLOW_REQUEST_THRESHOLD_MS`` are logged as
+    warnings together with their SQL statements. Streaming responses send
+    their headers before the body is generated, so the header only covers
+    work done up to that point while the log line covers the whole request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Wrap an ASGI app.
+
+        Args:
+            app: Application to instrument
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve a request while collecting its metrics."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    server_timing(metrics, time.perf_counter() - started).encode("latin-1"),
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._log(scope, status_code, metrics, time.perf_counter() - started)
+
+    @staticmethod
+    def _log(scope: Scope, status_code: int, metrics: RequestMetrics, total_seconds: float) -> None:
+        """Write the structured log line for a finished request."""
+        duration_ms = total_seconds * 1000
+        record: dict[str, Any] = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "db_queries": metrics.db_queries,
+            "db_ms": round(metrics.db_seconds * 1000, 2),
+            "redis_calls": metrics.redis_calls,
+            "redis_ms": round(metrics.redis_seconds * 1000, 2),
+            "matcher_calls": metrics.matcher_calls,
+            "matcher_ms": round(metrics.matcher_seconds * 1000, 2),
+        }
+        if duration_ms >= get_settings().slow_request_threshold_ms:
+            record["slow"] = True
+            record["statements"] = [
+                {"sql": statement, "ms": round(elapsed * 1000, 2)}
+                for statement, elapsed in metrics.statements
+            ]
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
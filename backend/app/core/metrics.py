@@ -0,0 +1,88 @@
+"""Prometheus metrics for the comparison hot paths.
+
+Label values are bound once at import time; hot paths only call
+``observe``/``inc`` on the pre-bound children.
+"""
+
+import time
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from prometheus_client import Counter, Histogram
+
+# Comparison latency by phase
+COMPARE_PHASE_SECONDS = Histogram(
+    "compare_phase_seconds",
+    "Time spent in each phase of POST /api/compare",
+    ["phase"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+COMPARE_LIST_LOAD = COMPARE_PHASE_SECONDS.labels("list_load")
+COMPARE_STORE_LOOKUP = COMPARE_PHASE_SECONDS.labels("store_lookup")
+COMPARE_MATCHING = COMPARE_PHASE_SECONDS.labels("matching")
+COMPARE_PRICE_RESOLUTION = COMPARE_PHASE_SECONDS.labels("price_resolution")
+COMPARE_AGGREGATION = COMPARE_PHASE_SECONDS.labels("aggregation")
+COMPARE_SERIALIZATION = COMPARE_PHASE_SECONDS.labels("serialization")
+
+# Fuzzy matcher quality
+MATCHER_BEST_SCORE = Histogram(
+    "matcher_best_score",
+    "Best fuzzy score per product match query, whether or not it passes min_score",
+    buckets=(30, 40, 50, 60, 70, 80, 90, 95, 100),
+)
+MATCHER_CANDIDATES = Histogram(
+    "matcher_candidates",
+    "Candidates at or above min_score per product match query",
+    buckets=(0, 1, 2, 3, 5, 10, 25),
+)
+
+# Redis cache outcomes by key prefix
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "CacheManager operations by key prefix and result",
+    ["prefix", "result"],
+)
+
+# Database pool
+DB_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to obtain a connection from the database pool",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+class CacheCounters(NamedTuple):
+    """Pre-bound cache counters for one key prefix."""
+
+    hit: Counter
+    miss: Counter
+    error: Counter
+
+
+def bind_cache_counters(prefixes: Iterable[str]) -> dict[str, CacheCounters]:
+    """Bind hit/miss/error counters for each key prefix plus ``other``.
+
+    Args:
+        prefixes: Known cache key prefixes
+
+    Returns:
+        Counters by prefix
+    """
+    return {
+        prefix: CacheCounters(
+            CACHE_REQUESTS.labels(prefix, "hit"),
+            CACHE_REQUESTS.labels(prefix, "miss"),
+            CACHE_REQUESTS.labels(prefix, "error"),
+        )
+        for prefix in (*prefixes, "other")
+    }
+
+
+def observe_since(histogram: Histogram, started: float) -> float:
+    """Observe the time since ``started`` and return the current time.
+
+    Lets consecutive phases be timed with one clock read each.
+    """
+    now = time.perf_counter()
+    histogram.observe(now - started)
+    return now
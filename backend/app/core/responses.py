@@ -0,0 +1,55 @@
+"""JSON response classes for the API.
+
+Routes with a response model validate their result once, through a pre-built
+``TypeAdapter`` or ``model_validate``, and return the bytes from Pydantic's
+``dump_json`` in a ``PydanticJSONResponse``. FastAPI passes a returned
+``Response`` through untouched, so ``response_model`` is then only used for
+the OpenAPI schema and the result is not validated a second time.
+"""
+
+from typing import Any, TypeVar
+
+import orjson
+from fastapi import status
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Like Starlette's ``JSONResponse`` it uses compact separators and UTF-8
+    rather than ``\\u`` escapes, so strings, integers, booleans, nulls and
+    floats written without an exponent come out byte for byte the same.
+    Two cases differ: exponents have no ``+`` or leading zero (``1e16``
+    rather than ``1e+16``, which parse to the same number), and NaN and
+    infinity are written as ``null`` where ``JSONResponse`` raises.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Serialize content to JSON bytes."""
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class PydanticJSONResponse(Response):
+    """Response whose content is JSON already serialized by Pydantic."""
+
+    media_type = "application/json"
+
+
+def dump_response(
+    adapter: TypeAdapter[T], value: T, status_code: int = status.HTTP_200_OK
+) -> PydanticJSONResponse:
+    """Serialize a validated value straight to a JSON response.
+
+    Args:
+        adapter: Pre-built adapter for the route's response model
+        value: Value already of the response model's type
+        status_code: HTTP status code
+
+    Returns:
+        Response with the serialized value
+    """
+    return PydanticJSONResponse(content=adapter.dump_json(value), status_code=status_code)
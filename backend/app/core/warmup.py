@@ -0,0 +1,135 @@
+"""Startup warmup of caches and connection pools."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Sequence
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheManager
+from app.core.instrumentation import track_redis
+from app.services.product_catalog import load_product_catalog
+from app.services.store_directory import load_store_directory
+
+logger = logging.getLogger(__name__)
+
+# Component states reported by the readiness check
+PENDING = "pending"
+OK = "ok"
+FAILED = "failed"
+
+
+class WarmupState:
+    """Progress of the startup warmup, read by the readiness check."""
+
+    # Components that must be warm before the app takes traffic; Redis is
+    # optional because every cache operation degrades to a miss
+    REQUIRED = ("database", "product_catalog", "store_directory")
+    COMPONENTS = REQUIRED + ("redis",)
+
+    def __init__(self, enabled: bool = True):
+        """Initialize the state.
+
+        Args:
+            enabled: False when warmup is skipped and the app is ready at once
+        """
+        self.checks: dict[str, str] = {
+            name: PENDING if enabled else OK for name in self.COMPONENTS
+        }
+        self.errors: dict[str, str] = {}
+        self.duration_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether every required component is warm."""
+        return all(self.checks[name] == OK for name in self.REQUIRED)
+
+
+def _warm_database(engine: Engine) -> None:
+    """Open the pool's steady-state connections and return them to the pool."""
+    size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(size):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def _with_session(
+    session_factory: Callable[[], Session], load: Callable[[Session], object]
+) -> Callable[[], None]:
+    """Run a loader with its own short-lived session."""
+
+    def run() -> None:
+        with session_factory() as db:
+            load(db)
+
+    return run
+
+
+def _warm_redis(cache: CacheManager) -> None:
+    """Establish the Redis connection pools for text and byte values."""
+    if not cache.health_check():
+        raise ConnectionError(f"Redis at {cache.redis_url} is unreachable")
+    with track_redis():
+        cache.binary_client.ping()
+
+
+async def warm_up(
+    state: WarmupState,
+    engine: Engine,
+    session_factory: Callable[[], Session],
+    cache: CacheManager,
+    retry_seconds: float = 5.0,
+    replicas: Sequence[Engine] = (),
+) -> None:
+    """Warm every component in parallel, retrying required ones until they succeed.
+
+    Args:
+        state: State updated as components become warm
+        engine: Engine whose connection pool is filled
+        session_factory: Factory for the sessions used to load caches
+        cache: Redis cache manager to connect, shared with the app's caches
+        retry_seconds: Delay before retrying failed required components
+        replicas: Read replica engines whose pools are filled too
+    """
+
+    def warm_databases() -> None:
+        for database in (engine, *replicas):
+            _warm_database(database)
+
+    tasks: dict[str, Callable[[], None]] = {
+        "database": warm_databases,
+        "product_catalog": _with_session(session_factory, load_product_catalog),
+        "store_directory": _with_session(session_factory, load_store_directory),
+        "redis": lambda: _warm_redis(cache),
+    }
+    started = time.perf_counter()
+
+    async def run(name: str) -> None:
+        while True:
+            try:
+                await run_in_threadpool(tasks[name])
+            except Exception as exc:
+                state.checks[name] = FAILED
+                state.errors[name] = str(exc)
+                logger.warning("Warmup of %s failed: %s", name, exc)
+                if name not in WarmupState.REQUIRED:
+                    return
+                await asyncio.sleep(retry_seconds)
+            else:
+                state.checks[name] = OK
+                state.errors.pop(name, None)
+                return
+
+    await asyncio.gather(*(run(name) for name in tasks))
+    state.duration_seconds = round(time.perf_counter() - started, 3)
+    logger.info("Warmup finished in %.3fs: %s", state.duration_seconds, state.checks)
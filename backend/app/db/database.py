@@ -1,12 +1,16 @@
 """Database connection and session management."""
 
+import time
 from collections.abc import Generator
 from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, make_url
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import PoolProxiedConnection, QueuePool
 
 from app.config import get_settings
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT_SECONDS
+from app.db.routing import RoutingSession
 
 settings = get_settings()
 
@@ -17,16 +21,55 @@ class Base(DeclarativeBase):
     pass
 
 
-# Create engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-)
+class TimedQueuePool(QueuePool):
+    """Queue pool that records how long each checkout waits for a connection.
+
+    Times the public ``Pool.connect`` that engines check out through, so
+    the wait includes queueing for a free connection, opening a new one and
+    the pre-ping.
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        """Check out a connection, recording the wait."""
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+
+def connect_args(url: str) -> dict[str, Any]:
+    """Get driver connect arguments for a database URL.
+
+    psycopg 3 (``postgresql+psycopg://``) prepares statements server-side
+    once they have run ``DATABASE_PREPARE_THRESHOLD`` times on a connection;
+    other drivers, including psycopg2, have no server-side preparation.
+    """
+    if make_url(url).drivername == "postgresql+psycopg":
+        return {"prepare_threshold": settings.database_prepare_threshold}
+    return {}
+
+
+def _create_engine(url: str) -> Engine:
+    return create_engine(
+        url,
+        connect_args=connect_args(url),
+        poolclass=TimedQueuePool,
+        pool_pre_ping=True,
+        pool_size=5,
+        max_overflow=10,
+    )
+
 
-# Session factory
+# Create engines
+engine = _create_engine(settings.database_url)
+replica_engines = [_create_engine(url) for url in settings.database_replica_urls]
+
+# Session factories: primary only, and replica reads for read-mostly routes
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replicas=replica_engines
+)
 
 
 def get_db() -> Generator[Session, Any, None]:
@@ -38,6 +81,15 @@ def get_db() -> Generator[Session, Any, None]:
         db.close()
 
 
+def get_read_db() -> Generator[Session, Any, None]:
+    """Get a session that reads from a replica until it writes."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def create_tables() -> None:
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
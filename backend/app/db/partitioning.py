@@ -0,0 +1,194 @@
+"""Monthly range partitioning helpers for the prices table (PostgreSQL)."""
+
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import Connection, text
+
+PRICES_TABLE = "prices"
+DEFAULT_PARTITION = "prices_default"
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    """Get the first day of the month containing a date.
+
+    Args:
+        day: Any date
+        offset: Number of months to shift by (may be negative)
+
+    Returns:
+        First day of the (shifted) month
+    """
+    month_index = day.year * 12 + (day.month - 1) + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Get the partition table name for a month.
+
+    Args:
+        month: Any date within the month
+
+    Returns:
+        Partition name such as ``prices_y2024m03``
+    """
+    return f"{PRICES_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Check whether the prices table is a partitioned table.
+
+    Args:
+        connection: Database connection
+
+    Returns:
+        True on PostgreSQL when ``prices`` is range-partitioned
+    """
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(
+        connection.scalar(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :name)"
+            ),
+            {"name": PRICES_TABLE},
+        )
+    )
+
+
+def default_partition(connection: Connection, parent: str = PRICES_TABLE) -> Optional[str]:
+    """Get the DEFAULT partition of a partitioned table.
+
+    Args:
+        connection: PostgreSQL connection
+        parent: Partitioned table
+
+    Returns:
+        Name of the DEFAULT partition, or None if it has none
+    """
+    name: Optional[str] = connection.scalar(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT'"
+        ),
+        {"parent": parent},
+    )
+    return name
+
+
+def create_month_partition(
+    connection: Connection, month: date, parent: str = PRICES_TABLE
+) -> str:
+    """Create the partition for a month if it does not exist yet.
+
+    Rows of the month that already landed in the DEFAULT partition would
+    make ``CREATE TABLE ... PARTITION OF`` fail, so they are moved into the
+    new table before it is attached.
+
+    Args:
+        connection: PostgreSQL connection
+        month: Any date within the month
+        parent: Partitioned table to attach to
+
+    Returns:
+        Name of the partition
+    """
+    name = partition_name(month)
+    if connection.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is not None:
+        return name
+
+    lower = month_start(month).isoformat()
+    upper = month_start(month, 1).isoformat()
+    bounds = f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    default = default_partition(connection, parent)
+    in_month = f"effective_date >= '{lower}' AND effective_date < '{upper}'"
+    if default is None or not connection.scalar(
+        text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_month})")
+    ):
+        connection.execute(text(f"CREATE TABLE {name} PARTITION OF {parent} {bounds}"))
+        return name
+
+    connection.execute(text(f"CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS)"))
+    connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )
+    )
+    connection.execute(text(f"ALTER TABLE {parent} ATTACH PARTITION {name} {bounds}"))
+    return name
+
+
+def ensure_price_partitions(
+    connection: Connection,
+    start: date,
+    months_ahead: int = 2,
+    parent: str = PRICES_TABLE,
+) -> list[str]:
+    """Create monthly partitions from ``start`` through ``months_ahead``.
+
+    Args:
+        connection: PostgreSQL connection
+        start: First month to cover
+        months_ahead: Months to pre-create beyond the current one
+        parent: Partitioned table to attach to
+
+    Returns:
+        Names of the partitions covering the range
+    """
+    last = month_start(date.today(), months_ahead)
+    month = month_start(start)
+    names = []
+    while month <= last:
+        names.append(create_month_partition(connection, month, parent))
+        month = month_start(month, 1)
+    return names
+
+
+def list_month_partitions(connection: Connection) -> list[tuple[str, date]]:
+    """List the monthly partitions attached to the prices table.
+
+    Args:
+        connection: PostgreSQL connection
+
+    Returns:
+        (partition name, first day of month) pairs in month order
+    """
+    rows = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :name"
+        ),
+        {"name": PRICES_TABLE},
+    )
+    partitions = []
+    prefix = f"{PRICES_TABLE}_y"
+    for (name,) in rows:
+        if name.startswith(prefix):
+            year, month = name[len(prefix):].split("m")
+            partitions.append((name, date(int(year), int(month), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def drop_partitions_before(connection: Connection, cutoff: date) -> list[str]:
+    """Detach and drop every monthly partition entirely before a cutoff.
+
+    Args:
+        connection: PostgreSQL connection
+        cutoff: First day of the oldest month to keep
+
+    Returns:
+        Names of the dropped partitions
+    """
+    dropped = []
+    for name, month in list_month_partitions(connection):
+        if month_start(month, 1) <= cutoff:
+            connection.execute(text(f"ALTER TABLE {PRICES_TABLE} DETACH PARTITION {name}"))
+            connection.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    return dropped
@@ -0,0 +1,62 @@
+"""Cached statements for the hot list and product queries.
+
+Each function returns a ``lambda_stmt``: the statement is built and its
+cache key computed once per call site, and later calls only extract the new
+parameter values, skipping construction and SQL compilation.
+"""
+
+from collections.abc import Collection
+
+from sqlalchemy import StatementLambdaElement, func, lambda_stmt, select
+from sqlalchemy.orm import selectinload
+
+from app.models import GroceryList, GroceryListItem, Product
+
+# Item count per list, correlated to the enclosing grocery_lists row
+_ITEM_COUNT = (
+    select(func.count(GroceryListItem.id))
+    .where(GroceryListItem.grocery_list_id == GroceryList.id)
+    .correlate(GroceryList)
+    .scalar_subquery()
+    .label("item_count")
+)
+
+
+def grocery_list_by_id(list_id: int) -> StatementLambdaElement:
+    """Select a grocery list by ID."""
+    return lambda_stmt(lambda: select(GroceryList).where(GroceryList.id == list_id))
+
+
+def grocery_lists_with_items(list_ids: Collection[int]) -> StatementLambdaElement:
+    """Select grocery lists by ID with their items eagerly loaded."""
+    list_ids = list(list_ids)
+    return lambda_stmt(
+        lambda: select(GroceryList)
+        .options(selectinload(GroceryList.items))
+        .where(GroceryList.id.in_(list_ids))
+    )
+
+
+def grocery_list_summaries(user_id: str, skip: int, limit: int) -> StatementLambdaElement:
+    """Select a page of a user's grocery lists with their item counts."""
+    return lambda_stmt(
+        lambda: select(GroceryList, _ITEM_COUNT)
+        .where(GroceryList.user_id == user_id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def grocery_list_item_batch(list_id: int, after_id: int, limit: int) -> StatementLambdaElement:
+    """Select the next batch of a list's items by ID (keyset pagination)."""
+    return lambda_stmt(
+        lambda: select(GroceryListItem)
+        .where(GroceryListItem.grocery_list_id == list_id, GroceryListItem.id > after_id)
+        .order_by(GroceryListItem.id)
+        .limit(limit)
+    )
+
+
+def product_by_upc(upc: str) -> StatementLambdaElement:
+    """Select a product by UPC."""
+    return lambda_stmt(lambda: select(Product).where(Product.upc == upc))
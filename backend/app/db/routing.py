@@ -0,0 +1,169 @@
+"""Read-replica routing with read-your-writes pinning."""
+
+import random
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any, Optional, Union
+
+from sqlalchemy import ClauseElement, Connection, Engine, Select, StatementLambdaElement
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import CacheManager, get_cache_manager
+
+
+class RoutingSession(Session):
+    """Session that sends plain SELECTs to a replica and everything else to the primary.
+
+    Each session picks one replica at random, so a request never mixes
+    replicas that have replayed different amounts of the primary's log.
+    Once the session writes, or ``use_primary()`` is called, all further
+    statements go to the primary so the session reads its own changes.
+    ``SELECT ... FOR UPDATE`` and textual SQL always go to the primary.
+    """
+
+    def __init__(self, *args: Any, replicas: Sequence[Engine] = (), **kwargs: Any):
+        """Create a session.
+
+        Args:
+            *args: Positional Session arguments; ``bind`` is the primary
+            replicas: Replica engines to read from; none means primary only
+            **kwargs: Other Session arguments
+        """
+        super().__init__(*args, **kwargs)
+        self.replica: Optional[Engine] = random.choice(replicas) if replicas else None
+        self._primary_only = self.replica is None
+
+    def use_primary(self) -> None:
+        """Send every further statement of this session to the primary."""
+        self._primary_only = True
+
+    @property
+    def reads_from_replica(self) -> bool:
+        """Whether SELECTs currently go to a replica."""
+        return not self._primary_only
+
+    def get_bind(
+        self,
+        mapper: Optional[Any] = None,
+        *,
+        clause: Optional[ClauseElement] = None,
+        bind: Optional[Union[Engine, Connection]] = None,
+        **kwargs: Any,
+    ) -> Union[Engine, Connection]:
+        """Choose the engine for a statement."""
+        if self.replica is not None and not self._primary_only:
+            if isinstance(clause, StatementLambdaElement):
+                clause = clause._resolved
+            if (
+                isinstance(clause, Select)
+                and clause._for_update_arg is None
+                and not self._flushing
+            ):
+                return self.replica
+            if clause is not None or self._flushing:
+                # Writes and statements we cannot classify pin the session
+                self._primary_only = True
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+class WritePins:
+    """Keys written recently enough that their readers must use the primary.
+
+    Pins are kept in this process and, given a cache, in Redis with the same
+    lifetime, so read-your-writes holds whichever process serves the next
+    request. Without Redis they hold for the process that handled the write.
+    """
+
+    def __init__(self, cache: Optional[CacheManager] = None) -> None:
+        """Create an empty pin registry.
+
+        Args:
+            cache: Redis cache shared with other processes
+        """
+        self.cache = cache
+        self._expiry: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def pin(self, keys: Sequence[str], seconds: float) -> None:
+        """Pin keys to the primary for a number of seconds."""
+        now = time.monotonic()
+        with self._lock:
+            if len(self._expiry) > 10_000:
+                self._expiry = {key: expiry for key, expiry in self._expiry.items() if expiry > now}
+            for key in keys:
+                self._expiry[key] = now + seconds
+        if self.cache is not None:
+            self.cache.set_write_pins(keys, seconds)
+
+    def is_pinned(self, keys: Sequence[str]) -> bool:
+        """Check whether any of the keys is still pinned, here or by another process."""
+        now = time.monotonic()
+        if any(self._expiry.get(key, 0.0) > now for key in keys):
+            return True
+        return self.cache is not None and self.cache.any_write_pinned(keys)
+
+    def clear(self) -> None:
+        """Drop every pin."""
+        with self._lock:
+            self._expiry.clear()
+        if self.cache is not None:
+            self.cache.clear_write_pins()
+
+
+_local_pins = WritePins()
+_shared_pins: Optional[WritePins] = None
+
+
+def _get_pins() -> WritePins:
+    """Get the pin registry: shared through Redis if enabled, else this process's."""
+    global _shared_pins
+    if not get_settings().write_pin_cache:
+        return _local_pins
+    if _shared_pins is None:
+        _shared_pins = WritePins(get_cache_manager())
+    return _shared_pins
+
+
+def _keys(user_id: Optional[str], list_ids: Sequence[int]) -> list[str]:
+    keys = [f"list:{list_id}" for list_id in list_ids]
+    if user_id is not None:
+        keys.append(f"user:{user_id}")
+    return keys
+
+
+def record_write(user_id: Optional[str] = None, list_ids: Sequence[int] = ()) -> None:
+    """Pin a user's and lists' reads to the primary after a write.
+
+    Reads stay pinned for ``READ_YOUR_WRITES_SECONDS``, which should exceed
+    the usual replica lag.
+
+    Args:
+        user_id: User who wrote
+        list_ids: Lists that were written
+    """
+    seconds = get_settings().read_your_writes_seconds
+    if seconds > 0:
+        _get_pins().pin(_keys(user_id, list_ids), seconds)
+
+
+def route_reads(db: Session, user_id: Optional[str] = None, list_ids: Sequence[int] = ()) -> None:
+    """Read from the primary if the user or lists were written recently.
+
+    Args:
+        db: Session serving the read; only routing sessions are affected
+        user_id: User being read for
+        list_ids: Lists being read
+    """
+    if not isinstance(db, RoutingSession) or not db.reads_from_replica:
+        return
+    if _get_pins().is_pinned(_keys(user_id, list_ids)):
+        db.use_primary()
+
+
+def clear_write_pins() -> None:
+    """Forget every recent write."""
+    _local_pins.clear()
+    if _shared_pins is not None:
+        _shared_pins.clear()
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.db.database import SessionLocal, create_tables
 from app.models import GroceryList, GroceryListItem, Price, Product, Store
+from app.services import unit_pricing  # noqa: F401  (fills in normalized unit prices on flush)
 
 
 def create_sample_products(db: Session) -> list[Product]:
@@ -0,0 +1,369 @@
+"""Synthetic data generator for benchmarks and load tests.
+
+Unlike ``seed.py``, which inserts a small hand-written catalog one ORM object
+at a time, this module generates a catalog whose size is controlled by a
+scale factor and loads it with bulk inserts (``COPY`` on PostgreSQL).
+
+Usage (from ``backend/``, against a scratch database)::
+
+    python -m app.db.synthetic --scale 10
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import Connection, Engine, Table, func, insert, select, text
+
+from app.db.database import Base, engine as default_engine
+from app.models import GroceryList, GroceryListItem, Price, Product, Store
+from app.services.product_catalog import invalidate_product_catalog
+from app.services.unit_pricing import normalize_price_rows
+
+# Rows sent per INSERT/COPY round trip
+BATCH_ROWS = 10_000
+
+CATEGORIES = {
+    "Dairy": ["Milk", "Yogurt", "Cheddar Cheese", "Butter", "Sour Cream", "Cottage Cheese", "Eggs"],
+    "Bread": ["White Bread", "Whole Wheat Bread", "Bagels", "English Muffins", "Tortillas"],
+    "Produce": ["Bananas", "Apples", "Baby Spinach", "Potatoes", "Onions", "Carrots", "Tomatoes"],
+    "Meat": ["Chicken Breast", "Ground Beef", "Bacon", "Pork Chops", "Turkey Slices"],
+    "Beverages": ["Orange Juice", "Coffee", "Cola", "Sparkling Water", "Green Tea"],
+    "Cereal": ["Corn Flakes", "Oat Cereal", "Granola", "Oatmeal"],
+    "Canned": ["Chicken Noodle Soup", "Diced Tomatoes", "Black Beans", "Tuna", "Corn"],
+    "Snacks": ["Potato Chips", "Sandwich Cookies", "Pretzels", "Crackers", "Popcorn"],
+}
+VARIANTS = ["", "Organic", "Low Fat", "Family Size", "Classic", "Reduced Sodium", "Original", "Lite"]
+BRANDS = [None, "Valley Farms", "Sunrise", "Golden Harvest", "Blue Ridge", "Coastal", "Heartland"]
+UNITS = ["oz", "lb", "count", "gallon", "fl oz"]
+CHAINS = ["Ralphs", "Vons", "Albertsons", "Food 4 Less", "Trader Joe's", "Sprouts", "Smart & Final"]
+
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    """Sizes of a synthetic dataset."""
+
+    products: int
+    stores: int
+    zip_codes: int
+    price_history: int
+    users: int
+    lists_per_user: int
+    items_per_list: int
+    # Share of (product, store) pairs that have prices at all
+    coverage: float = 0.8
+
+    @classmethod
+    def for_factor(
+        cls,
+        factor: float,
+        price_history: int = 4,
+        lists_per_user: int = 3,
+        items_per_list: int = 25,
+    ) -> "SyntheticScale":
+        """Get the dataset sizes for a scale factor.
+
+        Scale factor 1 is 1,000 products in 20 stores across 5 ZIP codes with
+        4 weeks of prices (~64k rows), and 10 users with 3 lists of 25 items.
+        Catalog, store and user counts grow linearly with the factor.
+
+        Args:
+            factor: Scale factor (> 0)
+            price_history: Weeks of prices per product and store
+            lists_per_user: Grocery lists per user
+            items_per_list: Items per grocery list
+
+        Returns:
+            Dataset sizes
+        """
+        if factor <= 0:
+            raise ValueError("Scale factor must be positive")
+        if min(price_history, lists_per_user, items_per_list) < 1:
+            raise ValueError("Price history, lists per user and items per list must be at least 1")
+        return cls(
+            products=max(int(1000 * factor), 10),
+            stores=max(int(20 * factor), 2),
+            zip_codes=max(int(5 * factor), 1),
+            price_history=price_history,
+            users=max(int(10 * factor), 1),
+            lists_per_user=lists_per_user,
+            items_per_list=items_per_list,
+        )
+
+
+@dataclass
+class SyntheticData:
+    """IDs and row counts of a loaded synthetic dataset."""
+
+    scale: SyntheticScale
+    product_ids: list[int]
+    store_ids: list[int]
+    zip_codes: list[str]
+    list_ids: list[int]
+    user_ids: list[str]
+    rows: dict[str, int]
+
+    def summary(self) -> dict[str, Any]:
+        """Describe the dataset for benchmark reports."""
+        return {"scale": asdict(self.scale), "rows": self.rows}
+
+
+def _next_id(connection: Connection, table: Table) -> int:
+    """Get the first unused primary key of a table."""
+    return (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _batches(rows: Iterable[dict[str, Any]], size: int = BATCH_ROWS) -> Iterator[list[dict[str, Any]]]:
+    """Split rows into lists of at most ``size``."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy(connection: Connection, table: Table, columns: Sequence[str], batch: list[dict[str, Any]]) -> None:
+    """Load rows with PostgreSQL ``COPY ... FROM STDIN`` (psycopg 3 or psycopg2)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([row[column] for column in columns])
+    statement = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = connection.connection.cursor()
+    try:
+        if connection.dialect.driver == "psycopg":
+            with cursor.copy(statement) as copy:
+                copy.write(buffer.getvalue())
+        else:
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
+
+
+def bulk_load(connection: Connection, table: Table, rows: Iterable[dict[str, Any]]) -> int:
+    """Load rows in batches, with COPY on PostgreSQL and executemany elsewhere.
+
+    Args:
+        connection: Connection inside a transaction
+        table: Destination table
+        rows: Row dicts, all with the same keys
+
+    Returns:
+        Number of rows loaded
+    """
+    count = 0
+    copy = connection.dialect.name == "postgresql"
+    for batch in _batches(rows):
+        if copy:
+            _copy(connection, table, list(batch[0]), batch)
+        else:
+            connection.execute(insert(table), batch)
+        count += len(batch)
+    return count
+
+
+def _reset_sequences(connection: Connection, tables: Iterable[Table]) -> None:
+    """Move PostgreSQL ID sequences past explicitly inserted IDs."""
+    if connection.dialect.name != "postgresql":
+        return
+    for table in tables:
+        connection.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+            )
+        )
+
+
+def _product_rows(scale: SyntheticScale, first_id: int, rng: random.Random) -> Iterator[dict[str, Any]]:
+    categories = list(CATEGORIES.items())
+    for offset in range(scale.products):
+        category, bases = categories[offset % len(categories)]
+        base = bases[(offset // len(categories)) % len(bases)]
+        variant = VARIANTS[(offset // (len(categories) * len(bases))) % len(VARIANTS)]
+        # Larger catalogs repeat names with a running number, like pack sizes
+        name = " ".join(part for part in (variant, base, str(offset // 256 or "")) if part)
+        yield {
+            "id": first_id + offset,
+            "name": name,
+            "brand": rng.choice(BRANDS),
+            "category": category,
+            "upc": f"9{first_id + offset:011d}",
+            "unit_size": round(rng.uniform(0.5, 32), 1),
+            "unit_type": rng.choice(UNITS),
+        }
+
+
+def _store_rows(
+    scale: SyntheticScale, first_id: int, zip_codes: list[str], rng: random.Random
+) -> Iterator[dict[str, Any]]:
+    for offset in range(scale.stores):
+        zip_index = offset % len(zip_codes)
+        chain = CHAINS[offset % len(CHAINS)]
+        yield {
+            "id": first_id + offset,
+            "name": f"{chain} #{first_id + offset}",
+            "chain": chain,
+            "address": f"{100 + offset} Market St",
+            "zip_code": zip_codes[zip_index],
+            # ZIP centroids ~7 miles apart on a grid around San Diego
+            "lat": round(32.7 + (zip_index // 10) * 0.1 + rng.uniform(-0.02, 0.02), 6),
+            "lng": round(-117.2 + (zip_index % 10) * 0.1 + rng.uniform(-0.02, 0.02), 6),
+        }
+
+
+def _price_rows(
+    scale: SyntheticScale, product_ids: list[int], store_ids: list[int], today: date, rng: random.Random
+) -> Iterator[dict[str, Any]]:
+    for product_id in product_ids:
+        base_price = round(rng.uniform(0.99, 14.99), 2)
+        for store_id in store_ids:
+            if rng.random() >= scale.coverage:
+                continue
+            store_price = base_price * rng.uniform(0.85, 1.2)
+            for week in range(scale.price_history):
+                effective = today - timedelta(weeks=scale.price_history - 1 - week)
+                price = round(store_price * rng.uniform(0.95, 1.05), 2)
+                on_sale = rng.random() < 0.1
+                yield {
+                    "product_id": product_id,
+                    "store_id": store_id,
+                    "price": price,
+                    "sale_price": round(price * 0.8, 2) if on_sale else None,
+                    "effective_date": effective,
+                    "expiration_date": effective + timedelta(days=6) if on_sale else None,
+                }
+
+
+def load_synthetic_data(
+    engine: Optional[Engine] = None,
+    scale: Optional[SyntheticScale] = None,
+    seed: int = 0,
+    today: Optional[date] = None,
+) -> SyntheticData:
+    """Generate a synthetic dataset and bulk-load it.
+
+    Rows are added next to any existing data. The same scale and seed always
+    produce the same rows.
+
+    Args:
+        engine: Engine to load into (defaults to the application engine)
+        scale: Dataset sizes (defaults to scale factor 1)
+        seed: Random seed
+        today: Date of the newest prices (defaults to today)
+
+    Returns:
+        IDs and row counts of the loaded data
+    """
+    engine = engine or default_engine
+    scale = scale or SyntheticScale.for_factor(1)
+    today = today or date.today()
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+
+    products, stores, lists, items, prices = (
+        Base.metadata.tables[model.__tablename__]
+        for model in (Product, Store, GroceryList, GroceryListItem, Price)
+    )
+    rows: dict[str, int] = {}
+
+    with engine.begin() as connection:
+        first_product = _next_id(connection, products)
+        first_store = _next_id(connection, stores)
+        first_list = _next_id(connection, lists)
+
+        product_ids = list(range(first_product, first_product + scale.products))
+        store_ids = list(range(first_store, first_store + scale.stores))
+        zip_codes = [f"{91000 + index * 7:05d}" for index in range(scale.zip_codes)]
+
+        product_names = []
+        product_rows = []
+        for row in _product_rows(scale, first_product, rng):
+            product_names.append(row["name"])
+            product_rows.append(row)
+        rows["products"] = bulk_load(connection, products, product_rows)
+        rows["stores"] = bulk_load(connection, stores, _store_rows(scale, first_store, zip_codes, rng))
+        pack_sizes = {row["id"]: (row["unit_size"], row["unit_type"]) for row in product_rows}
+        rows["prices"] = bulk_load(
+            connection,
+            prices,
+            normalize_price_rows(_price_rows(scale, product_ids, store_ids, today, rng), pack_sizes),
+        )
+
+        user_ids = [f"bench_user_{index}" for index in range(scale.users)]
+        list_rows: list[dict[str, Any]] = []
+        item_rows: list[dict[str, Any]] = []
+        for index in range(scale.users * scale.lists_per_user):
+            list_id = first_list + index
+            list_rows.append({
+                "id": list_id,
+                "name": f"List {index}",
+                "user_id": user_ids[index % scale.users],
+            })
+            for position in range(scale.items_per_list):
+                product_index = rng.randrange(scale.products)
+                # Half the items are linked; the rest go through fuzzy matching
+                linked = rng.random() < 0.5
+                item_rows.append({
+                    "grocery_list_id": list_id,
+                    "product_id": product_ids[product_index] if linked else None,
+                    "name": product_names[product_index] if linked else product_names[product_index].lower(),
+                    "quantity": float(rng.randint(1, 3)),
+                    "unit": None,
+                    "notes": None,
+                    "position": position,
+                })
+        rows["grocery_lists"] = bulk_load(connection, lists, list_rows)
+        rows["grocery_list_items"] = bulk_load(connection, items, item_rows)
+
+        _reset_sequences(connection, [products, stores, lists])
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("ANALYZE"))
+
+    # Bulk inserts bypass the ORM write hooks that refresh the shared catalog;
+    # other processes pick the products up on their next catalog sync
+    invalidate_product_catalog()
+
+    return SyntheticData(
+        scale=scale,
+        product_ids=product_ids,
+        store_ids=store_ids,
+        zip_codes=zip_codes,
+        list_ids=[row["id"] for row in list_rows],
+        user_ids=user_ids,
+        rows=rows,
+    )
+
+
+def main() -> None:
+    """Load a synthetic dataset into the configured database."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale factor")
+    parser.add_argument("--price-history", type=int, default=4, help="Weeks of prices per product and store")
+    parser.add_argument("--lists-per-user", type=int, default=3, help="Grocery lists per user")
+    parser.add_argument("--items-per-list", type=int, default=25, help="Items per grocery list")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    scale = SyntheticScale.for_factor(
+        args.scale,
+        price_history=args.price_history,
+        lists_per_user=args.lists_per_user,
+        items_per_list=args.items_per_list,
+    )
+    data = load_synthetic_data(scale=scale, seed=args.seed)
+    print(json.dumps(data.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
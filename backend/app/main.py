@@ -1,13 +1,89 @@
 """FastAPI main application entry point."""
 
-from fastapi import FastAPI
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Optional
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.api.routes import compare, lists
 from app.config import get_settings
+from app.core.cache import get_cache_manager
+from app.core.compression import CompressionMiddleware
+from app.core.instrumentation import InstrumentationMiddleware, instrument_engine
+from app.core.responses import ORJSONResponse
+from app.core.warmup import WarmupState, warm_up
+from app.db.database import SessionLocal, engine, replica_engines
+from app.services import unit_pricing  # noqa: F401  (fills in normalized unit prices on flush)
+from app.services.product_catalog import sync_product_catalog
+from app.services.store_directory import sync_store_directory
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+
+def _sync_store_directory() -> None:
+    """Sync the store directory with a short-lived session."""
+    with SessionLocal() as db:
+        sync_store_directory(db)
+
+
+def _sync_product_catalog() -> None:
+    """Sync the product catalog with a short-lived session."""
+    with SessionLocal() as db:
+        sync_product_catalog(db)
+
+
+async def _sync_periodically(name: str, sync: Callable[[], None], seconds: float) -> None:
+    """Run a sync on a fixed schedule."""
+    while True:
+        await asyncio.sleep(seconds)
+        try:
+            await run_in_threadpool(sync)
+        except Exception:
+            logger.exception("Scheduled %s sync failed", name)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Keep shared caches in sync and warm caches and pools in the background.
+
+    The app serves liveness checks immediately; /health/ready reports ready
+    once the warmup has finished (at once when it is disabled).
+    """
+    app.state.warmup = WarmupState(enabled=settings.startup_warmup)
+    background = [
+        asyncio.create_task(
+            _sync_periodically("store directory", _sync_store_directory, settings.store_directory_refresh_seconds)
+        ),
+        asyncio.create_task(
+            _sync_periodically("product catalog", _sync_product_catalog, settings.product_catalog_refresh_seconds)
+        ),
+    ]
+    if settings.startup_warmup:
+        background.append(
+            asyncio.create_task(
+                warm_up(
+                    app.state.warmup, engine, SessionLocal, get_cache_manager(), replicas=replica_engines
+                )
+            )
+        )
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        for task in background:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
@@ -15,8 +91,19 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+# zstd/br/gzip compression of responses above the size threshold
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
+# Per-request DB/Redis/matcher timing (Server-Timing header and request logs)
+instrument_engine(engine)
+for replica_engine in replica_engines:
+    instrument_engine(replica_engine)
+app.add_middleware(InstrumentationMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -39,10 +126,32 @@ async def root() -> dict[str, str]:
 
 @app.get("/health")
 async def health_check() -> dict[str, str]:
-    """Health check endpoint."""
+    """Liveness check endpoint."""
     return {"status": "healthy"}
 
 
+@app.get("/health/ready")
+async def readiness_check(request: Request, response: Response) -> dict[str, Any]:
+    """Readiness check endpoint; 503 until the startup warmup has finished."""
+    state: Optional[WarmupState] = getattr(request.app.state, "warmup", None)
+    if state is None:
+        state = WarmupState(enabled=False)
+    if not state.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if state.ready else "warming",
+        "checks": state.checks,
+        "errors": state.errors,
+        "warmup_seconds": state.duration_seconds,
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics in the text exposition format."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # Include routers
 app.include_router(lists.router, prefix=settings.api_prefix, tags=["Grocery Lists"])
 app.include_router(compare.router, prefix=settings.api_prefix, tags=["Price Comparison"])
@@ -1,14 +1,17 @@
 """Database models package."""
 
 from app.models.grocery_list import GroceryList, GroceryListItem
-from app.models.price import Price
+from app.models.ingest_job import IngestJob
+from app.models.price import Price, PriceHistory
 from app.models.product import Product
 from app.models.store import Store
 
 __all__ = [
     "Product",
     "Price",
+    "PriceHistory",
     "Store",
     "GroceryList",
     "GroceryListItem",
+    "IngestJob",
 ]
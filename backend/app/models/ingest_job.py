@@ -0,0 +1,66 @@
+"""Ingest job database model."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+class IngestJob(Base):
+    """A queued fetch of one source (circulars, base prices or promos) for a
+    chain and ZIP code, claimed by scheduler workers with ``SKIP LOCKED``.
+
+    Finished jobs stay in the table as the run history; the scheduler's next
+    ``schedule`` pass enqueues the target's next run per its source's cadence.
+    """
+
+    __tablename__ = "ingest_jobs"
+    __table_args__ = (
+        # Workers claim the highest-priority due pending job
+        Index("ix_ingest_jobs_due", "status", "priority", "run_at"),
+        # At most one pending or running job per source and target
+        Index(
+            "uq_ingest_jobs_active",
+            "source",
+            "store_chain",
+            "zip_code",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+            sqlite_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    source: Mapped[str] = mapped_column(String(32), nullable=False)
+    store_chain: Mapped[str] = mapped_column(String(100), nullable=False)
+    zip_code: Mapped[str] = mapped_column(String(10), nullable=False)
+    # Higher runs first among due jobs
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Only claimed inside the off-peak window
+    off_peak: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=PENDING)
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    items: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    locked_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the job."""
+        return (
+            f"<IngestJob(id={self.id}, source='{self.source}', chain='{self.store_chain}', "
+            f"zip='{self.zip_code}', status='{self.status}')>"
+        )
@@ -3,7 +3,22 @@
 from datetime import date, datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, func
+from sqlalchemy import (
+    Boolean,
+    ColumnElement,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    String,
+    and_,
+    bindparam,
+    case,
+    func,
+    type_coerce,
+)
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -14,9 +29,23 @@ if TYPE_CHECKING:
 
 
 class Price(Base):
-    """Price model representing a product price at a specific store."""
+    """Price model representing a product price at a specific store.
+
+    On PostgreSQL the ``prices`` table is range-partitioned by month on
+    ``effective_date`` (see ``migrations/versions``); older months are
+    collapsed into ``PriceHistory`` by ``PriceCompactor``.
+
+    The mapper's primary key is ``(id, effective_date)``, the partitioned
+    table's, so ORM updates and deletes name the partition key. The table
+    itself is still created with ``id`` as its primary key: migration 0001
+    rebuilds it as partitioned from that shape, and ``id`` stays the
+    autoincrementing key on databases without partitioning.
+    """
 
     __tablename__ = "prices"
+    __table_args__ = (
+        Index("ix_prices_product_store_effective", "product_id", "store_id", "effective_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False, index=True)
@@ -24,6 +53,11 @@ class Price(Base):
     price: Mapped[float] = mapped_column(Float, nullable=False)
     sale_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     unit_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # Regular and sale price per base unit (oz, fl oz or ct) of the product's
+    # pack size, set on write by app.services.unit_pricing
+    normalized_unit_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    normalized_sale_unit_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    normalized_unit: Mapped[Optional[str]] = mapped_column(String(8), nullable=True)
     effective_date: Mapped[date] = mapped_column(Date, nullable=False)
     expiration_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
@@ -33,11 +67,13 @@ class Price(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
+    __mapper_args__ = {"primary_key": [id, effective_date]}
+
     # Relationships
     product: Mapped["Product"] = relationship("Product", back_populates="prices")
     store: Mapped["Store"] = relationship("Store", back_populates="prices")
 
-    @property
+    @hybrid_property
     def current_price(self) -> float:
         """Get the current effective price (sale price if available)."""
         if self.sale_price is not None and self.expiration_date:
@@ -45,6 +81,90 @@ class Price(Base):
                 return self.sale_price
         return self.price
 
+    @current_price.inplace.expression
+    @classmethod
+    def _current_price_expression(cls) -> ColumnElement[float]:
+        """SQL equivalent of ``current_price``.
+
+        ``today`` is bound at execution time so the expression matches the
+        Python property (which uses the app server's date, not the database's)
+        and stays safe to reuse from cached statements.
+        """
+        return case((cls._sale_applies(), cls.sale_price), else_=cls.price)
+
+    @hybrid_property
+    def current_normalized_unit_price(self) -> Optional[float]:
+        """Get the current effective price per base unit."""
+        if self.sale_price is not None and self.current_price == self.sale_price:
+            return self.normalized_sale_unit_price
+        return self.normalized_unit_price
+
+    @current_normalized_unit_price.inplace.expression
+    @classmethod
+    def _current_normalized_unit_price_expression(cls) -> ColumnElement[Optional[float]]:
+        """SQL equivalent of ``current_normalized_unit_price``."""
+        return case((cls._sale_applies(), cls.normalized_sale_unit_price), else_=cls.normalized_unit_price)
+
+    @classmethod
+    def _sale_applies(cls) -> ColumnElement[bool]:
+        """Whether the sale price is in effect today, evaluated in SQL."""
+        today = bindparam("today", callable_=date.today, type_=Date, unique=True)
+        return and_(
+            cls.sale_price.is_not(None),
+            cls.expiration_date.is_not(None),
+            cls.expiration_date >= today,
+        )
+
+    @hybrid_property
+    def is_on_sale(self) -> bool:
+        """Whether the current effective price is the sale price."""
+        return self.sale_price is not None and self.current_price == self.sale_price
+
+    @is_on_sale.inplace.expression
+    @classmethod
+    def _is_on_sale_expression(cls) -> ColumnElement[bool]:
+        """SQL equivalent of ``is_on_sale``."""
+        return type_coerce(
+            and_(cls.sale_price.is_not(None), cls.current_price == cls.sale_price),
+            Boolean,
+        )
+
     def __repr__(self) -> str:
         """String representation of the price."""
         return f"<Price(id={self.id}, product_id={self.product_id}, store_id={self.store_id}, price={self.price})>"
+
+
+class PriceHistory(Base):
+    """Archived price interval for a product at a store.
+
+    Each row covers a run of unchanged prices from ``valid_from`` up to (but
+    not including) ``valid_to``.
+    """
+
+    __tablename__ = "price_history"
+    __table_args__ = (
+        Index("ix_price_history_product_store_valid_to", "product_id", "store_id", "valid_to"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False)
+    store_id: Mapped[int] = mapped_column(ForeignKey("stores.id"), nullable=False, index=True)
+    price: Mapped[float] = mapped_column(Float, nullable=False)
+    sale_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    unit_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    normalized_unit_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    normalized_sale_unit_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    normalized_unit: Mapped[Optional[str]] = mapped_column(String(8), nullable=True)
+    expiration_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    valid_from: Mapped[date] = mapped_column(Date, nullable=False)
+    valid_to: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the price interval."""
+        return (
+            f"<PriceHistory(product_id={self.product_id}, store_id={self.store_id}, "
+            f"price={self.price}, valid_from={self.valid_from}, valid_to={self.valid_to})>"
+        )
@@ -1,7 +1,7 @@
 """Price Pydantic schemas."""
 
 from datetime import date, datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -45,6 +45,9 @@ class StorePrice(BaseModel):
     is_on_sale: bool = False
     sale_expires: Optional[date] = None
     unit_price: Optional[float] = None
+    product_id: Optional[int] = None
+    normalized_unit_price: Optional[float] = None
+    normalized_unit: Optional[str] = None
 
 
 class ItemPriceComparison(BaseModel):
@@ -70,6 +73,7 @@ class StoreTotalComparison(BaseModel):
     items_found: int
     items_on_sale: int
     is_cheapest: bool = False
+    distance_miles: Optional[float] = None
 
 
 class ComparisonRequest(BaseModel):
@@ -77,6 +81,74 @@ class ComparisonRequest(BaseModel):
 
     list_id: int = Field(..., description="Grocery list ID to compare")
     zip_code: str = Field(..., min_length=5, max_length=10, description="ZIP code for store lookup")
+    radius_miles: Optional[float] = Field(
+        None,
+        gt=0,
+        le=100,
+        description="Include the nearest stores within this radius instead of only stores in the ZIP code",
+    )
+    lat: Optional[float] = Field(
+        None, ge=-90, le=90, description="Search latitude; compares the nearest stores to lat/lng"
+    )
+    lng: Optional[float] = Field(
+        None, ge=-180, le=180, description="Search longitude; compares the nearest stores to lat/lng"
+    )
+    mode: Literal["per_store", "split_basket", "unit_value"] = Field(
+        "per_store",
+        description=(
+            "'split_basket' also finds the cheapest way to buy the list across up to max_stores stores; "
+            "'unit_value' prices each item by the best unit price among similar pack sizes"
+        ),
+    )
+    max_stores: int = Field(2, ge=1, le=4, description="Maximum stores to visit in split_basket mode")
+    detail: Literal["summary", "cheapest_only", "full"] = Field(
+        "full",
+        description=(
+            "'summary' omits the item breakdown, 'cheapest_only' lists only the "
+            "cheapest store per item, 'full' lists every store per item"
+        ),
+    )
+    item_skip: int = Field(0, ge=0, description="Number of breakdown items to skip")
+    item_limit: Optional[int] = Field(
+        None, ge=1, le=500, description="Maximum number of breakdown items to return (default all)"
+    )
+
+
+class SplitBasketAssignment(BaseModel):
+    """Schema for where to buy one item in a split-basket plan."""
+
+    item_name: str
+    product_id: Optional[int]
+    store_id: int
+    current_price: float
+    line_total: float
+
+
+class SplitBasketPlan(BaseModel):
+    """Schema for the cheapest multi-store plan for a list."""
+
+    store_ids: list[int]
+    total_price: float
+    items_found: int
+    single_store_total: Optional[float] = Field(
+        None, description="Total at the best single store covering as many items, if any"
+    )
+    savings_vs_single_store: Optional[float] = None
+    exact: bool = Field(True, description="False when the plan comes from the greedy fallback")
+    assignments: list[SplitBasketAssignment]
+
+
+class ComparisonTotalsEvent(BaseModel):
+    """Schema for running store totals in a streamed comparison."""
+
+    list_id: int
+    list_name: str
+    zip_code: str
+    store_totals: list[StoreTotalComparison]
+    items_processed: int = Field(..., description="List items included in the totals so far")
+    complete: bool = Field(False, description="True for the final totals after every item")
+    cheapest_store_id: Optional[int] = None
+    potential_savings: float = Field(..., description="Savings compared to most expensive option")
 
 
 class ComparisonResponse(BaseModel):
@@ -87,5 +159,31 @@ class ComparisonResponse(BaseModel):
     zip_code: str
     store_totals: list[StoreTotalComparison]
     item_breakdown: list[ItemPriceComparison]
+    item_count: int = Field(..., description="Number of items in the list, across all breakdown pages")
     cheapest_store_id: Optional[int] = None
     potential_savings: float = Field(..., description="Savings compared to most expensive option")
+    split_basket: Optional[SplitBasketPlan] = None
+
+
+class BatchComparisonRequest(BaseModel):
+    """Schema for comparing several lists and/or ZIP codes at once."""
+
+    comparisons: list[ComparisonRequest] = Field(
+        ..., min_length=1, max_length=20, description="(list_id, zip_code) comparisons to run"
+    )
+
+
+class BatchComparisonResult(BaseModel):
+    """Schema for one comparison in a batch."""
+
+    list_id: int
+    zip_code: str
+    status_code: int = Field(default=200, description="HTTP status the single comparison would return")
+    detail: Optional[str] = Field(default=None, description="Error detail when status_code is not 200")
+    result: Optional[ComparisonResponse] = None
+
+
+class BatchComparisonResponse(BaseModel):
+    """Schema for batch comparison response, in request order."""
+
+    results: list[BatchComparisonResult]
@@ -1,7 +1,30 @@
-"""Services package."""
+"""Services package.
 
-from app.services.circular_parser import CircularParser
-from app.services.kroger_client import KrogerClient
-from app.services.product_matcher import ProductMatcher
+The re-exported services are imported on first use, so importing one
+service module does not load every other service's dependencies.
+"""
 
-__all__ = ["ProductMatcher", "KrogerClient", "CircularParser"]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.services.circular_parser import CircularParser
+    from app.services.kroger_client import KrogerClient
+    from app.services.product_matcher import ProductMatcher
+    from app.services.unit_pricing import backfill_normalized_unit_prices
+
+_EXPORTS = {
+    "ProductMatcher": "app.services.product_matcher",
+    "KrogerClient": "app.services.kroger_client",
+    "CircularParser": "app.services.circular_parser",
+    "backfill_normalized_unit_prices": "app.services.unit_pricing",
+}
+
+__all__ = ["ProductMatcher", "KrogerClient", "CircularParser", "backfill_normalized_unit_prices"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a re-exported service on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name]), name)
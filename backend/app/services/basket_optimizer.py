@@ -0,0 +1,150 @@
+"""Split-basket optimizer for buying a list across several stores."""
+
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+# Store subsets evaluated per vectorized batch
+_BATCH_SIZE = 4096
+
+# Above this many subsets the exact search falls back to greedy + swaps
+_MAX_EXACT_SUBSETS = 200_000
+
+
+@dataclass
+class BasketPlan:
+    """Cheapest way found to buy a basket from a set of stores."""
+
+    store_indices: list[int]
+    total: float
+    items_found: int
+    # Store column chosen for each item row, or -1 if no chosen store has it
+    assignments: np.ndarray
+    exact: bool = True
+
+
+class BasketOptimizer:
+    """Service for choosing the best store subset for a basket.
+
+    Works on an item x store matrix of line costs (price x quantity, NaN
+    where a store has no price). A plan is ranked first by how many items it
+    covers, then by total cost. Stores dominated by another store (no
+    cheaper item anywhere and no item the other lacks) are pruned before
+    every subset of the remaining stores is evaluated in vectorized batches.
+    """
+
+    def __init__(self, line_costs: np.ndarray, max_exact_subsets: int = _MAX_EXACT_SUBSETS):
+        """Initialize the optimizer.
+
+        Args:
+            line_costs: Item x store matrix of line costs, NaN when unavailable
+            max_exact_subsets: Subset count above which the search is greedy
+        """
+        self.costs = np.where(np.isnan(line_costs), np.inf, line_costs)
+        self.max_exact_subsets = max_exact_subsets
+
+    def _candidate_stores(self) -> np.ndarray:
+        """Get the store columns not dominated by another store."""
+        costs = self.costs
+        n_stores = costs.shape[1]
+        # at_most[i, j]: store i is no more expensive than j for every item
+        at_most = (costs[:, :, None] <= costs[:, None, :]).all(axis=0)
+        equal = at_most & at_most.T
+        # i strictly dominates j, or ties with it and has the lower index
+        dominates = (at_most & ~equal) | (equal & np.triu(np.ones_like(equal), k=1))
+        np.fill_diagonal(dominates, False)
+        dominated = dominates.any(axis=0)
+        # Stores that price nothing never help
+        useful = np.isfinite(costs).any(axis=0)
+        return np.flatnonzero(~dominated & useful) if n_stores else np.array([], dtype=int)
+
+    def _plan(self, stores: list[int]) -> BasketPlan:
+        """Build the plan for an explicit store subset."""
+        sub = self.costs[:, stores]
+        best = sub.min(axis=1)
+        found = np.isfinite(best)
+        columns = np.asarray(stores)[sub.argmin(axis=1)]
+        assignments = np.where(found, columns, -1)
+        used = sorted(set(assignments[found].tolist()))
+        return BasketPlan(
+            store_indices=used,
+            total=float(best[found].sum()),
+            items_found=int(found.sum()),
+            assignments=assignments,
+        )
+
+    def optimize(self, max_stores: int) -> Optional[BasketPlan]:
+        """Find the cheapest plan visiting at most ``max_stores`` stores.
+
+        Args:
+            max_stores: Maximum number of stores to visit
+
+        Returns:
+            Best plan, or None if no store prices any item
+        """
+        candidates = self._candidate_stores()
+        if candidates.size == 0:
+            return None
+
+        # Adding a store never lowers coverage or raises cost, so only the
+        # largest subsets need evaluating; unused stores are dropped after.
+        k = min(max_stores, candidates.size)
+        if math.comb(candidates.size, k) > self.max_exact_subsets:
+            return self._optimize_greedy(candidates, k)
+
+        best_found, best_total, best_subset = -1, math.inf, None
+        subsets = itertools.combinations(candidates.tolist(), k)
+        while True:
+            batch = np.array(list(itertools.islice(subsets, _BATCH_SIZE)), dtype=np.intp)
+            if batch.size == 0:
+                break
+            # (items, subsets, k) -> cheapest line cost per item and subset
+            per_item = self.costs[:, batch].min(axis=2)
+            finite = np.isfinite(per_item)
+            found = finite.sum(axis=0)
+            totals = np.where(finite, per_item, 0.0).sum(axis=0)
+
+            top = found.max()
+            if top < best_found:
+                continue
+            eligible = np.flatnonzero(found == top)
+            winner = eligible[totals[eligible].argmin()]
+            if top > best_found or totals[winner] < best_total:
+                best_found, best_total = int(top), float(totals[winner])
+                best_subset = batch[winner].tolist()
+
+        return self._plan(best_subset) if best_subset is not None else None
+
+    def _optimize_greedy(self, candidates: np.ndarray, k: int) -> BasketPlan:
+        """Approximate the best plan by greedy selection and 1-swap moves."""
+
+        def score(stores: list[int]) -> tuple[int, float]:
+            plan = self._plan(stores)
+            return -plan.items_found, plan.total
+
+        chosen: list[int] = []
+        remaining = candidates.tolist()
+        for _ in range(k):
+            best = min(remaining, key=lambda store: score(chosen + [store]))
+            chosen.append(best)
+            remaining.remove(best)
+
+        improved = True
+        while improved:
+            improved = False
+            current = score(chosen)
+            for position, store in itertools.product(range(k), list(remaining)):
+                trial = chosen[:position] + [store] + chosen[position + 1:]
+                if score(trial) < current:
+                    remaining.append(chosen[position])
+                    remaining.remove(store)
+                    chosen = trial
+                    improved = True
+                    break
+
+        plan = self._plan(chosen)
+        plan.exact = False
+        return plan
@@ -1,9 +1,91 @@
 """Circular (weekly ad) parser service."""
 
+import asyncio
+import hashlib
+import json
+import os
 import re
-from dataclasses import dataclass
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import date, timedelta
-from typing import Any, Optional
+from functools import lru_cache
+from itertools import repeat
+from typing import Any, BinaryIO, Optional, Union
+
+import ijson
+from lxml import etree
+from pypdf import PageObject, PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, PdfObject, StreamObject
+
+from app.config import get_settings
+from app.core.cache import CacheManager, get_cache_manager
+from app.services.html_templates import get_html_template
+from app.services.snapshot_store import Snapshot, SnapshotStore, get_snapshot_store
+from app.services.units import CIRCULAR_UNITS
+
+# Batches smaller than this are extracted in-process; a pool costs more to start
+PARALLEL_MIN_TEXTS = 20_000
+
+# Snippets sent to a worker process per task
+PARALLEL_CHUNK_TEXTS = 5_000
+
+# Flyer-level fields of a Flipp feed applied to the items that follow them
+FLIPP_FLYER_FIELDS = frozenset({"merchant", "merchant.name", "merchant_name", "valid_from", "valid_to"})
+
+# Path of each item in a Flipp feed
+FLIPP_ITEMS_PREFIX = "flyer_items.item"
+
+# Content types of fetched circulars, as recorded in the snapshot store
+FLIPP_CONTENT_TYPE = "application/json"
+HTML_CONTENT_TYPE = "text/html"
+PDF_CONTENT_TYPE = "application/pdf"
+
+FlippSource = Union[str, "os.PathLike[str]", bytes, BinaryIO]
+
+# Part of every PDF page digest; bump it when page text parsing changes so
+# pages cached by an older parser are parsed again
+PDF_PAGE_PARSER_VERSION = 1
+
+# Price formats in the order extract_price_info applies them; a later
+# format's price replaces an earlier one's
+PRICE_PATTERNS = [
+    # "$X.XX" format
+    r"\$(?P<price>\d+\.?\d*)",
+    # "X for $Y" format
+    r"(?P<multi_quantity>\d+)\s+for\s+\$(?P<multi_price>\d+\.?\d*)",
+    # "$X.XX/lb" format
+    r"\$(?P<unit_price>\d+\.?\d*)\s*/\s*(?P<unit>\w+)",
+    # "Buy X Get Y" quantities of a BOGO ("free" may be anywhere in the text)
+    r"buy\s+(?P<buy>\d+)\s+get\s+(?P<get>\d+)",
+]
+
+# Every price pattern as an optional lookahead from the start of the text,
+# so one match call finds each pattern's leftmost occurrence, the same one
+# re.search would find, even where occurrences overlap
+PRICE_SCAN = re.compile("".join(f"(?:(?=.*?{pattern}))?" for pattern in PRICE_PATTERNS), re.DOTALL)
+
+# "Reg. $4.49" / "Regular $4.49" / "Was $4.49" lines follow the sale price
+_REGULAR_PRICE = re.compile(r"^(?:reg(?:ular)?\.?|was)\s*\$(\d+\.?\d*)", re.IGNORECASE)
+
+# Start of the price on a line, e.g. "$2.99" or "2 for $5"
+_PRICE_START = re.compile(r"(?:\d+\s+for\s+)?\$", re.IGNORECASE)
+
+# Price details of a field an HTML template does not have
+_NO_PRICE: Mapping[str, Any] = {"price": None, "unit": None, "quantity": None, "is_bogo": False}
+
+_page_cache: Optional[CacheManager] = None
+
+
+def _get_page_cache() -> Optional[CacheManager]:
+    """Get the Redis cache for parsed PDF pages, if enabled."""
+    global _page_cache
+    if not get_settings().circular_page_cache:
+        return None
+    if _page_cache is None:
+        _page_cache = get_cache_manager()
+    return _page_cache
 
 
 @dataclass
@@ -31,31 +113,10 @@ class CircularParser:
     """
 
     # Patterns for extracting price information
-    PRICE_PATTERNS = [
-        # "$X.XX" format
-        r"\$(\d+\.?\d*)",
-        # "X for $Y" format
-        r"(\d+)\s+for\s+\$(\d+\.?\d*)",
-        # "$X.XX/lb" format
-        r"\$(\d+\.?\d*)\s*/\s*(lb|oz|ea|each)",
-        # "Buy X Get Y Free" format
-        r"buy\s+(\d+)\s+get\s+(\d+)\s+free",
-    ]
+    PRICE_PATTERNS = PRICE_PATTERNS
 
     # Unit abbreviation mappings
-    UNIT_MAP = {
-        "lb": "lb",
-        "lbs": "lb",
-        "pound": "lb",
-        "pounds": "lb",
-        "oz": "oz",
-        "ounce": "oz",
-        "ounces": "oz",
-        "ea": "each",
-        "each": "each",
-        "ct": "count",
-        "count": "count",
-    }
+    UNIT_MAP = CIRCULAR_UNITS
 
     def __init__(self, store_chain: Optional[str] = None):
         """Initialize the circular parser.
@@ -69,59 +130,258 @@ class CircularParser:
         """Parse circular data from Flipp API format.
 
         Args:
-            data: Raw data from Flipp API
+            data: Raw data from Flipp API, already decoded
 
         Returns:
             List of parsed circular items
+        """
+        flyer: dict[str, Any] = {field: data[field] for field in ("merchant", "merchant_name", "valid_from", "valid_to") if field in data}
+        if isinstance(data.get("merchant"), dict):
+            flyer["merchant.name"] = data["merchant"].get("name")
+        items = (self._parse_flipp_item(raw_item, flyer) for raw_item in data.get("flyer_items", ()))
+        return [item for item in items if item is not None]
 
-        Note:
-            This is a stub. Implement when Flipp integration is available.
+    def parse_flipp_stream(self, source: FlippSource) -> Iterator[ParsedCircularItem]:
+        """Parse a Flipp feed incrementally, yielding items as they are read.
+
+        The feed is read in small buffers and only one flyer item is decoded
+        at a time, so memory stays flat however large the feed is. Flyer-level
+        ``merchant``, ``valid_from`` and ``valid_to`` apply to the items that
+        follow them in the feed; item fields take precedence.
+
+        Args:
+            source: Path of a feed file, the feed bytes, or a binary file
+                object (e.g. an HTTP response body)
+
+        Yields:
+            Parsed circular items in feed order
         """
-        # TODO: Implement Flipp API parsing
-        # Flipp provides weekly ad data in JSON format
-        # Structure typically includes:
-        # - flyer_items: list of sale items
-        # - merchant: store information
-        # - valid_from, valid_to: date range
-        return []
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as feed:
+                yield from self.parse_flipp_stream(feed)
+            return
+
+        flyer: dict[str, Any] = {}
+        events = _record_flyer_fields(ijson.parse(source, use_float=True), flyer)
+        for raw_item in ijson.items(events, FLIPP_ITEMS_PREFIX):
+            item = self._parse_flipp_item(raw_item, flyer)
+            if item is not None:
+                yield item
+
+    def _parse_flipp_item(
+        self, raw_item: Mapping[str, Any], flyer: Mapping[str, Any]
+    ) -> Optional[ParsedCircularItem]:
+        """Convert one Flipp flyer item.
 
-    def parse_html_circular(self, html_content: str) -> list[ParsedCircularItem]:
-        """Parse circular data from HTML content.
+        Args:
+            raw_item: Decoded ``flyer_items`` entry
+            flyer: Flyer-level fields seen so far
+
+        Returns:
+            Parsed item, or None if it has no name or price
+        """
+        name = raw_item.get("name")
+        if not name:
+            return None
+
+        # Price text like "2 for $5" or "$2.99/lb", parsed like any snippet
+        current_price = raw_item.get("current_price")
+        if current_price is not None:
+            price_text = f"{raw_item.get('pre_price_text') or ''} ${current_price}{raw_item.get('post_price_text') or ''}"
+        else:
+            price_text = raw_item.get("price_text") or ""
+        info = self.extract_price_info(f"{price_text} {raw_item.get('sale_story') or ''}")
+        if info["price"] is None:
+            return None
+
+        categories = raw_item.get("category_names")
+        merchant = (
+            raw_item.get("merchant_name")
+            or flyer.get("merchant.name")
+            or flyer.get("merchant_name")
+            or flyer.get("merchant")
+        )
+        return ParsedCircularItem(
+            product_name=self.normalize_product_name(name),
+            sale_price=info["price"],
+            regular_price=raw_item.get("original_price"),
+            unit=info["unit"],
+            quantity_required=info["quantity"],
+            valid_from=_flipp_date(raw_item.get("valid_from") or flyer.get("valid_from")),
+            valid_until=_flipp_date(raw_item.get("valid_to") or flyer.get("valid_to")),
+            store_chain=self.store_chain or (merchant if isinstance(merchant, str) else None),
+            category=categories[0] if categories else raw_item.get("category"),
+            image_url=raw_item.get("cutout_image_url") or raw_item.get("image_url"),
+        )
+
+    def parse_html_circular(self, html_content: Union[str, bytes]) -> list[ParsedCircularItem]:
+        """Parse circular data from a weekly ad page.
+
+        Items are located with the chain's compiled extraction template (see
+        ``app.services.html_templates``), falling back to schema.org Product
+        microdata. Pass the page as fetched, in bytes: lxml decodes it while
+        parsing, using the page's declared charset, without a decoded copy.
 
         Args:
             html_content: Raw HTML content from a store's weekly ad page
 
         Returns:
-            List of parsed circular items
-
-        Note:
-            This is a stub. Implement with BeautifulSoup for specific store formats.
+            List of parsed circular items in page order
         """
-        # TODO: Implement HTML parsing for store-specific formats
-        # Each store has different HTML structure
-        # Will need per-store parsing logic
-        return []
-
-    def parse_pdf_circular(self, pdf_path: str) -> list[ParsedCircularItem]:
+        root = etree.HTML(html_content) if html_content else None
+        if root is None:
+            return []
+
+        items = []
+        for fields in get_html_template(self.store_chain).extract(root):
+            name = fields["name"]
+            info = self.extract_price_info(_price_text(fields["price"]))
+            if not name or info["price"] is None:
+                continue
+            regular_text = fields.get("regular_price")
+            regular_price = self.extract_price_info(_price_text(regular_text))["price"] if regular_text else None
+            unit_text = fields.get("unit")
+            unit_info = self.extract_price_info(unit_text) if unit_text else _NO_PRICE
+            items.append(
+                ParsedCircularItem(
+                    product_name=self.normalize_product_name(name),
+                    sale_price=info["price"],
+                    regular_price=regular_price,
+                    unit_price=unit_info["price"] if unit_info["unit"] else None,
+                    unit=info["unit"] or unit_info["unit"],
+                    quantity_required=info["quantity"],
+                    store_chain=self.store_chain,
+                    category=fields.get("category") or None,
+                    image_url=fields.get("image_url") or None,
+                )
+            )
+        return items
+
+    def parse_pdf_circular(
+        self, pdf_path: str, workers: Optional[int] = None, cache: Optional[CacheManager] = None
+    ) -> list[ParsedCircularItem]:
         """Parse circular data from a PDF file.
 
         Args:
             pdf_path: Path to the PDF file
+            workers: Worker processes (default one per CPU); 1 parses in-process
+            cache: Page cache (default the shared Redis cache when
+                ``CIRCULAR_PAGE_CACHE`` is on)
 
         Returns:
-            List of parsed circular items
+            List of parsed circular items in page order
+        """
+        return list(self.iter_pdf_circular(pdf_path, workers, cache))
 
-        Note:
-            This is a stub. Implement with pdfplumber or PyPDF2.
+    def iter_pdf_circular(
+        self, pdf_path: str, workers: Optional[int] = None, cache: Optional[CacheManager] = None
+    ) -> Iterator[ParsedCircularItem]:
+        """Parse a PDF circular page by page, yielding each page's items in order.
+
+        Pages are parsed in parallel across a process pool. Each page's items
+        are cached under a digest of its content stream and resources (fonts,
+        XObjects), so pages unchanged since an earlier run (of this or another
+        PDF) are not parsed again.
+
+        Args:
+            pdf_path: Path to the PDF file
+            workers: Worker processes (default one per CPU); 1 parses in-process
+            cache: Page cache (default the shared Redis cache when
+                ``CIRCULAR_PAGE_CACHE`` is on)
+
+        Yields:
+            Parsed circular items, page by page
+        """
+        cache = cache if cache is not None else _get_page_cache()
+        stat = os.stat(pdf_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        resolved: dict[tuple[int, int], bytes] = {}
+        digests = [_page_digest(page, resolved) for page in _open_pdf(pdf_path, version).pages]
+        cached = cache.get_circular_pages(digests) if cache is not None else {}
+        missing = [number for number, digest in enumerate(digests) if digest not in cached]
+
+        workers = min(workers or os.cpu_count() or 1, len(missing))
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            if pool is not None:
+                parsed = pool.map(_parse_pdf_page, repeat((pdf_path, version)), missing, repeat(self.store_chain))
+            else:
+                parsed = map(_parse_pdf_page, repeat((pdf_path, version)), missing, repeat(self.store_chain))
+
+            for digest in digests:
+                if digest in cached:
+                    yield from (self._cached_item(record) for record in cached[digest])
+                    continue
+                items = next(parsed)
+                if cache is not None:
+                    cache.set_circular_pages({digest: [_item_record(item) for item in items]})
+                yield from items
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def parse_circular_text(self, text: str) -> list[ParsedCircularItem]:
+        """Parse sale items from the plain text of a circular page.
+
+        A line with a price closes an item: its name is the text before the
+        price, or else the last line without a price. A following "Reg. $X"
+        line sets the item's regular price.
+
+        Args:
+            text: Page text, one ad element per line
+
+        Returns:
+            Parsed circular items in text order
         """
-        # TODO: Implement PDF parsing
-        # PDFs are challenging due to layout extraction
-        # Consider using OCR for image-based PDFs
-        return []
+        items: list[ParsedCircularItem] = []
+        name: Optional[str] = None
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            regular = _REGULAR_PRICE.match(line)
+            if regular:
+                if items:
+                    items[-1].regular_price = float(regular.group(1))
+                continue
+
+            info = self.extract_price_info(line)
+            if info["price"] is None:
+                name = line
+                continue
+            price_start = _PRICE_START.search(line)
+            inline_name = line[:price_start.start()].strip() if price_start else ""
+            product_name = inline_name or name
+            name = None
+            if not product_name:
+                continue
+            items.append(
+                ParsedCircularItem(
+                    product_name=self.normalize_product_name(product_name),
+                    sale_price=info["price"],
+                    unit=info["unit"],
+                    quantity_required=info["quantity"],
+                    store_chain=self.store_chain,
+                )
+            )
+        return items
+
+    def _cached_item(self, record: Mapping[str, Any]) -> ParsedCircularItem:
+        """Rebuild a cached page item for this parser's store chain."""
+        return ParsedCircularItem(
+            **{
+                **record,
+                "valid_from": _flipp_date(record.get("valid_from")),
+                "valid_until": _flipp_date(record.get("valid_until")),
+                "store_chain": self.store_chain,
+            }
+        )
 
     def extract_price_info(self, text: str) -> dict[str, Any]:
         """Extract price information from a text string.
 
+        Every format is found in one pass over the text with ``PRICE_SCAN``.
+
         Args:
             text: Text containing price information
 
@@ -136,38 +396,58 @@ class CircularParser:
         }
 
         text_lower = text.lower()
+        # Every group is optional, so the scan always matches
+        scan = PRICE_SCAN.match(text_lower)
+        found: dict[str, Any] = scan.groupdict() if scan else {}
 
         # Check for simple price
-        simple_price_match = re.search(r"\$(\d+\.?\d*)", text)
-        if simple_price_match:
-            result["price"] = float(simple_price_match.group(1))
+        if found.get("price") is not None:
+            result["price"] = float(found["price"])
 
         # Check for "X for $Y" format
-        multi_price_match = re.search(r"(\d+)\s+for\s+\$(\d+\.?\d*)", text_lower)
-        if multi_price_match:
-            quantity = int(multi_price_match.group(1))
-            total_price = float(multi_price_match.group(2))
-            result["price"] = total_price / quantity
+        if found.get("multi_price") is not None:
+            quantity = int(found["multi_quantity"])
+            result["price"] = float(found["multi_price"]) / quantity
             result["quantity"] = quantity
 
         # Check for unit price
-        unit_price_match = re.search(r"\$(\d+\.?\d*)\s*/\s*(\w+)", text_lower)
-        if unit_price_match:
-            result["price"] = float(unit_price_match.group(1))
-            unit = unit_price_match.group(2)
+        if found.get("unit_price") is not None:
+            result["price"] = float(found["unit_price"])
+            unit = found["unit"]
             result["unit"] = self.UNIT_MAP.get(unit, unit)
 
         # Check for BOGO
         if "buy" in text_lower and "get" in text_lower and "free" in text_lower:
             result["is_bogo"] = True
-            bogo_match = re.search(r"buy\s+(\d+)\s+get\s+(\d+)", text_lower)
-            if bogo_match:
-                buy = int(bogo_match.group(1))
-                get = int(bogo_match.group(2))
-                result["quantity"] = buy + get
+            if found.get("buy") is not None:
+                result["quantity"] = int(found["buy"]) + int(found["get"])
 
         return result
 
+    def extract_price_info_many(
+        self, texts: Sequence[str], workers: Optional[int] = None
+    ) -> list[dict[str, Any]]:
+        """Extract price information from many text strings.
+
+        Batches of at least ``PARALLEL_MIN_TEXTS`` snippets are split into
+        chunks and extracted across a process pool.
+
+        Args:
+            texts: Texts containing price information
+            workers: Worker processes for large batches (default one per
+                CPU); 1 always extracts in-process
+
+        Returns:
+            Extracted price details per text, in input order
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(texts) < PARALLEL_MIN_TEXTS:
+            return [self.extract_price_info(text) for text in texts]
+
+        chunks = [texts[start:start + PARALLEL_CHUNK_TEXTS] for start in range(0, len(texts), PARALLEL_CHUNK_TEXTS)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return [result for chunk in pool.map(_extract_price_chunk, chunks) for result in chunk]
+
     def normalize_product_name(self, name: str) -> str:
         """Normalize a product name from circular data.
 
@@ -215,83 +495,250 @@ class CircularParser:
 
         return start_date, end_date
 
-    async def fetch_and_parse(self, store_chain: str, zip_code: str) -> list[ParsedCircularItem]:
+    async def fetch_and_parse(
+        self, store_chain: str, zip_code: str, snapshots: Optional[SnapshotStore] = None
+    ) -> list[ParsedCircularItem]:
         """Fetch and parse circular data for a store chain and location.
 
+        The fetched bytes are written to the snapshot store before they are
+        parsed, so the fetch can be parsed again later with ``replay``.
+
         Args:
             store_chain: Name of the store chain
             zip_code: ZIP code for local pricing
+            snapshots: Snapshot store (default the one at ``SNAPSHOT_STORE_URL``,
+                if set)
 
         Returns:
             List of parsed circular items
 
         Note:
             This is the main entry point for getting circular data.
-            Implement specific fetching logic based on store chain.
+        """
+        snapshots = snapshots if snapshots is not None else get_snapshot_store()
+        content, content_type = await self._fetch_circular(store_chain, zip_code)
+        if snapshots is not None:
+            await asyncio.to_thread(snapshots.put, store_chain, zip_code, content, content_type)
+        # Parsing is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(CircularParser(store_chain).parse_content, content, content_type)
+
+    def replay(self, snapshot: Snapshot, snapshots: Optional[SnapshotStore] = None) -> list[ParsedCircularItem]:
+        """Parse a stored fetch again, without fetching it.
+
+        Args:
+            snapshot: Index entry of the fetch, e.g. from ``SnapshotStore.latest``
+            snapshots: Snapshot store holding it (default the configured one)
+
+        Returns:
+            List of parsed circular items
+
+        Raises:
+            ValueError: If no snapshot store is configured
+        """
+        snapshots = snapshots if snapshots is not None else get_snapshot_store()
+        if snapshots is None:
+            raise ValueError("No snapshot store is configured")
+        content = snapshots.read(snapshot)
+        return CircularParser(snapshot.store_chain).parse_content(content, snapshot.content_type)
+
+    def parse_content(self, content: bytes, content_type: str) -> list[ParsedCircularItem]:
+        """Parse a fetched circular with the parser for its content type.
+
+        Args:
+            content: Raw fetched bytes
+            content_type: Flipp JSON, HTML or PDF content type; parameters
+                such as ``charset`` are ignored
+
+        Returns:
+            List of parsed circular items
+
+        Raises:
+            ValueError: If the content type has no parser
+        """
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        if media_type == FLIPP_CONTENT_TYPE:
+            return list(self.parse_flipp_stream(content))
+        if media_type == HTML_CONTENT_TYPE:
+            return self.parse_html_circular(content)
+        if media_type == PDF_CONTENT_TYPE:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "circular.pdf")
+                with open(path, "wb") as pdf:
+                    pdf.write(content)
+                return self.parse_pdf_circular(path)
+        raise ValueError(f"No circular parser for content type {content_type!r}")
+
+    async def _fetch_circular(self, store_chain: str, zip_code: str) -> tuple[bytes, str]:
+        """Fetch a chain's current circular for a location.
+
+        Args:
+            store_chain: Name of the store chain
+            zip_code: ZIP code for local pricing
+
+        Returns:
+            Tuple of (raw bytes, content type)
         """
         # TODO: Implement per-chain fetching
         # This would:
         # 1. Determine the data source for the chain
-        # 2. Fetch the data (HTML, PDF, or API)
-        # 3. Call the appropriate parser
-        # 4. Return normalized items
+        # 2. Fetch the data (HTML, PDF, or API) as raw bytes
 
-        # For now, return mock data
-        return self._get_mock_circular_data(store_chain, zip_code)
+        # For now, return a mock Flipp feed
+        return self._get_mock_circular_feed(store_chain, zip_code), FLIPP_CONTENT_TYPE
 
-    def _get_mock_circular_data(
-        self, store_chain: str, zip_code: str
-    ) -> list[ParsedCircularItem]:
-        """Return mock circular data for development.
+    def _get_mock_circular_feed(self, store_chain: str, zip_code: str) -> bytes:
+        """Return a mock Flipp feed for development.
 
         Args:
             store_chain: Store chain name
             zip_code: ZIP code
 
         Returns:
-            Mock circular items
+            Mock feed as JSON bytes
         """
         start_date, end_date = self.get_current_week_dates()
 
         mock_items = [
-            ParsedCircularItem(
-                product_name="Whole Milk Gallon",
-                sale_price=2.99,
-                regular_price=4.49,
-                valid_from=start_date,
-                valid_until=end_date,
-                store_chain=store_chain,
-                category="Dairy",
-            ),
-            ParsedCircularItem(
-                product_name="Large Eggs 12ct",
-                sale_price=3.49,
-                regular_price=4.99,
-                valid_from=start_date,
-                valid_until=end_date,
-                store_chain=store_chain,
-                category="Dairy",
-            ),
-            ParsedCircularItem(
-                product_name="Chicken Breast",
-                sale_price=2.99,
-                regular_price=4.99,
-                unit="lb",
-                valid_from=start_date,
-                valid_until=end_date,
-                store_chain=store_chain,
-                category="Meat",
-            ),
-            ParsedCircularItem(
-                product_name="Bananas",
-                sale_price=0.49,
-                regular_price=0.59,
-                unit="lb",
-                valid_from=start_date,
-                valid_until=end_date,
-                store_chain=store_chain,
-                category="Produce",
-            ),
+            {
+                "name": "Whole Milk Gallon",
+                "current_price": 2.99,
+                "original_price": 4.49,
+                "category_names": ["Dairy"],
+            },
+            {
+                "name": "Large Eggs 12ct",
+                "current_price": 3.49,
+                "original_price": 4.99,
+                "category_names": ["Dairy"],
+            },
+            {
+                "name": "Chicken Breast",
+                "current_price": 2.99,
+                "original_price": 4.99,
+                "post_price_text": "/lb",
+                "category_names": ["Meat"],
+            },
+            {
+                "name": "Bananas",
+                "current_price": 0.49,
+                "original_price": 0.59,
+                "post_price_text": "/lb",
+                "category_names": ["Produce"],
+            },
         ]
 
-        return mock_items
+        feed = {
+            "merchant": {"name": store_chain},
+            "postal_code": zip_code,
+            "valid_from": start_date.isoformat(),
+            "valid_to": end_date.isoformat(),
+            "flyer_items": mock_items,
+        }
+        return json.dumps(feed).encode()
+
+
+def _extract_price_chunk(texts: Sequence[str]) -> list[dict[str, Any]]:
+    """Extract price information from a chunk of texts in a worker process."""
+    parser = CircularParser()
+    return [parser.extract_price_info(text) for text in texts]
+
+
+def _price_text(value: str) -> str:
+    """Prefix a bare number, e.g. a microdata ``content="2.99"``, with "$"."""
+    return f"${value}" if value[:1].isdigit() else value
+
+
+def _record_flyer_fields(
+    events: Iterable[tuple[str, str, Any]], flyer: dict[str, Any]
+) -> Iterator[tuple[str, str, Any]]:
+    """Pass parse events through, keeping flyer-level fields as they go by."""
+    for prefix, event, value in events:
+        if prefix in FLIPP_FLYER_FIELDS and event in ("string", "number"):
+            flyer[prefix] = value
+        yield prefix, event, value
+
+
+def _flipp_date(value: Optional[str]) -> Optional[date]:
+    """Parse a Flipp date or timestamp, e.g. "2024-06-05T04:00:00+00:00"."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4)
+def _open_pdf(pdf_path: str, version: tuple[int, int]) -> PdfReader:
+    """Open a PDF once per process and file version; pages are read lazily.
+
+    Args:
+        pdf_path: Path to the PDF file
+        version: (mtime_ns, size) of the file, so a rewritten file is reopened
+    """
+    return PdfReader(pdf_path)
+
+
+def _page_digest(page: PageObject, resolved: dict[tuple[int, int], bytes]) -> str:
+    """Digest a PDF page's content stream and resources with the parser version.
+
+    The resources (fonts and their encodings, XObjects) change the extracted
+    text as much as the content stream does, so they are part of the digest.
+
+    Args:
+        page: PDF page
+        resolved: Digests of indirect objects already visited, shared
+            between the pages of one PDF so common fonts are hashed once
+    """
+    contents = page.get_contents()
+    digest = hashlib.blake2b(contents.get_data() if contents is not None else b"", digest_size=16)
+    digest.update(_pdf_object_digest(page.get("/Resources"), resolved))
+    digest.update(b"v%d" % PDF_PAGE_PARSER_VERSION)
+    return digest.hexdigest()
+
+
+def _pdf_object_digest(value: Optional[PdfObject], resolved: dict[tuple[int, int], bytes]) -> bytes:
+    """Digest a PDF object by value, following indirect references.
+
+    Object numbers are not part of the digest, so the same resources written
+    by different PDFs digest the same.
+    """
+    if isinstance(value, IndirectObject):
+        reference = (value.idnum, value.generation)
+        if reference not in resolved:
+            # Placeholder while visiting, for reference cycles
+            resolved[reference] = b""
+            resolved[reference] = _pdf_object_digest(value.get_object(), resolved)
+        return resolved[reference]
+
+    digest = hashlib.blake2b(type(value).__name__.encode(), digest_size=16)
+    if isinstance(value, DictionaryObject):
+        for key in sorted(value):
+            if key not in ("/Parent", "/Length"):
+                digest.update(key.encode())
+                digest.update(_pdf_object_digest(value.raw_get(key), resolved))
+        if isinstance(value, StreamObject):
+            digest.update(value.get_data())
+    elif isinstance(value, ArrayObject):
+        for item in value:
+            digest.update(_pdf_object_digest(item, resolved))
+    else:
+        digest.update(repr(value).encode())
+    return digest.digest()
+
+
+def _parse_pdf_page(
+    pdf: tuple[str, tuple[int, int]], page_number: int, store_chain: Optional[str]
+) -> list[ParsedCircularItem]:
+    """Extract and parse the text of one PDF page (in a worker process)."""
+    text = _open_pdf(*pdf).pages[page_number].extract_text()
+    return CircularParser(store_chain).parse_circular_text(text)
+
+
+def _item_record(item: ParsedCircularItem) -> dict[str, Any]:
+    """Convert a parsed item to a JSON-serializable record for the page cache."""
+    record = asdict(item)
+    for field in ("valid_from", "valid_until"):
+        if record[field] is not None:
+            record[field] = record[field].isoformat()
+    return record
@@ -0,0 +1,83 @@
+"""Serialized comparison results cached in Redis, stored precompressed.
+
+A comparison is cached under its list, ZIP code and a digest of the request
+options, as one Redis hash holding the JSON body in every content encoding.
+A hit returns the client's encoding with a single ``HGET``, so neither the
+comparison nor its compression is repeated. List writes invalidate a list's
+comparisons; price and store changes only show up once the entry expires,
+which is why the cache is off unless ``COMPARISON_CACHE`` is set.
+"""
+
+import hashlib
+from typing import Optional
+
+from app.config import get_settings
+from app.core.cache import CacheManager, get_cache_manager
+from app.core.compression import IDENTITY, precompress
+from app.schemas.price import ComparisonRequest
+
+_cache: Optional[CacheManager] = None
+
+
+def _get_cache() -> Optional[CacheManager]:
+    """Get the Redis cache for comparisons, if enabled and Redis is reachable."""
+    global _cache
+    if not get_settings().comparison_cache:
+        return None
+    if _cache is None:
+        _cache = get_cache_manager()
+    return _cache if _cache.reachable else None
+
+
+def request_digest(request: ComparisonRequest) -> str:
+    """Digest the options that shape a comparison's result."""
+    return hashlib.blake2b(request.model_dump_json().encode(), digest_size=12).hexdigest()
+
+
+def get_cached_comparison(request: ComparisonRequest, encoding: Optional[str]) -> Optional[tuple[bytes, str]]:
+    """Get a cached comparison body in the client's encoding.
+
+    Args:
+        request: Comparison request
+        encoding: Encoding the client accepts, or None for uncompressed
+
+    Returns:
+        (body, encoding) or None on a miss; the encoding is ``identity``
+        when the body was too small to be stored compressed
+    """
+    cache = _get_cache()
+    if cache is None:
+        return None
+    encodings = (encoding, IDENTITY) if encoding is not None else (IDENTITY,)
+    return cache.get_comparison_body(request.list_id, request.zip_code, request_digest(request), encodings)
+
+
+def cache_comparison(request: ComparisonRequest, body: bytes) -> dict[str, bytes]:
+    """Compress a comparison body into every encoding and cache it.
+
+    Bodies below ``COMPRESSION_MINIMUM_SIZE`` are stored uncompressed only.
+
+    Args:
+        request: Comparison request
+        body: Serialized comparison
+
+    Returns:
+        Body by content encoding, including ``identity``
+    """
+    cache = _get_cache()
+    if cache is None:
+        return {IDENTITY: body}
+    bodies = precompress(body, get_settings().compression_minimum_size)
+    cache.set_comparison_bodies(request.list_id, request.zip_code, request_digest(request), bodies)
+    return bodies
+
+
+def invalidate_comparisons(list_id: int) -> None:
+    """Drop every cached comparison of a list after it changes.
+
+    Args:
+        list_id: Grocery list ID
+    """
+    cache = _get_cache()
+    if cache is not None:
+        cache.invalidate_list_comparisons(list_id)
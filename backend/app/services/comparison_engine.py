@@ -0,0 +1,371 @@
+"""Vectorized price comparison engine."""
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from app.models.grocery_list import GroceryListItem
+from app.services.price_resolver import PriceRow
+from app.services.product_catalog import ProductCatalog
+from app.services.product_matcher import ProductMatcher
+from app.services.unit_conversion import to_base, unit_dimension
+from app.services.units import COUNT
+
+
+class MatchedItem(NamedTuple):
+    """A grocery list item resolved to a product."""
+
+    item_name: str
+    product_id: Optional[int]
+    quantity: float
+    unit: Optional[str]
+    match_confidence: float
+
+
+def match_list_items(
+    matcher: ProductMatcher,
+    list_items: Iterable[GroceryListItem],
+    match_cache: Optional[dict[str, tuple[Optional[int], float]]] = None,
+) -> list[MatchedItem]:
+    """Resolve list items to products, fuzzy matching unlinked items.
+
+    Args:
+        matcher: Product matcher for items without a linked product
+        list_items: Grocery list items in list order
+        match_cache: Optional item name -> (product_id, score) memo shared
+            across calls, so repeated names are only fuzzy matched once
+
+    Returns:
+        Matched items in list order
+    """
+    matched = []
+    for list_item in list_items:
+        if list_item.product_id:
+            product_id: Optional[int] = list_item.product_id
+            match_confidence = 100.0
+        elif match_cache is not None and list_item.name in match_cache:
+            product_id, match_confidence = match_cache[list_item.name]
+        else:
+            match = matcher.find_best_match(list_item.name)
+            if match:
+                product_id = match["product_id"]
+                match_confidence = match["score"]
+            else:
+                product_id = None
+                match_confidence = 0.0
+            if match_cache is not None:
+                match_cache[list_item.name] = (product_id, match_confidence)
+        matched.append(
+            MatchedItem(
+                item_name=list_item.name,
+                product_id=product_id,
+                quantity=list_item.quantity,
+                unit=list_item.unit,
+                match_confidence=match_confidence,
+            )
+        )
+    return matched
+
+
+def find_unit_value_candidates(
+    matcher: ProductMatcher,
+    catalog: ProductCatalog,
+    items: Sequence[MatchedItem],
+    limit: int = 5,
+) -> list[list[int]]:
+    """Find the products that could fill each list item in unit value mode.
+
+    An item's candidates are its matched product followed by the products
+    matching its name that are sold in the same base unit, so a half gallon
+    competes with a gallon of the same milk.
+
+    Args:
+        matcher: Product matcher used to find similar products
+        catalog: Product catalog with pack sizes
+        items: Matched list items
+        limit: Maximum fuzzy matches considered per item
+
+    Returns:
+        Candidate product IDs per item, the matched product first
+    """
+    candidates: list[list[int]] = []
+    for item in items:
+        product_id = item.product_id
+        pack = catalog.base_size(product_id) if product_id else None
+        if not product_id or pack is None:
+            candidates.append([product_id] if product_id else [])
+            continue
+        product_ids = [product_id]
+        for match in matcher.find_matches(item.item_name, limit=limit):
+            other = catalog.base_size(match["product_id"])
+            if match["product_id"] not in product_ids and other is not None and other[1] == pack[1]:
+                product_ids.append(match["product_id"])
+        candidates.append(product_ids)
+    return candidates
+
+
+def _base_quantity(item: MatchedItem, pack: tuple[float, str]) -> float:
+    """Get the amount of an item wanted, in its product's base unit.
+
+    A weight or volume on the list item is taken literally; otherwise the
+    quantity counts packs of the matched product.
+    """
+    if unit_dimension(item.unit) not in (None, COUNT):
+        requested = to_base(item.quantity, item.unit)
+        if requested is not None and requested[1] == pack[1]:
+            return requested[0]
+    return item.quantity * pack[0]
+
+
+@dataclass
+class ComparisonTotals:
+    """Aggregates computed from a price matrix (unrounded)."""
+
+    # Per store
+    total_price: np.ndarray
+    items_found: np.ndarray
+    items_on_sale: np.ndarray
+    # Per item: column of the cheapest store, -1 when no store has a price
+    cheapest_store: np.ndarray
+    # Column of the cheapest store with any items, or None
+    cheapest_overall: Optional[int]
+    potential_savings: float
+
+
+@dataclass
+class PriceMatrix:
+    """Dense item x store matrices of resolved prices.
+
+    Missing prices are NaN in ``current_price``; ``found`` is the mask of
+    cells with a price. ``price_rows`` keeps the resolved rows needed only
+    for presentation (sale expiration, unit price). ``products`` holds the
+    product priced in each cell when it can differ from the item's matched
+    product (-1 where missing).
+    """
+
+    items: Sequence[MatchedItem]
+    store_ids: Sequence[int]
+    quantities: np.ndarray
+    current_price: np.ndarray
+    regular_price: np.ndarray
+    on_sale: np.ndarray
+    found: np.ndarray
+    price_rows: Mapping[tuple[int, int], PriceRow]
+    products: Optional[np.ndarray] = None
+
+    @classmethod
+    def build(
+        cls,
+        items: Sequence[MatchedItem],
+        store_ids: Sequence[int],
+        price_rows: Mapping[tuple[int, int], PriceRow],
+    ) -> "PriceMatrix":
+        """Lay resolved prices out as item x store matrices.
+
+        Args:
+            items: Matched list items (rows)
+            store_ids: Store IDs (columns)
+            price_rows: Latest price per (product_id, store_id)
+
+        Returns:
+            Price matrix
+        """
+        shape = (len(items), len(store_ids))
+        current_price = np.full(shape, np.nan)
+        regular_price = np.full(shape, np.nan)
+        on_sale = np.zeros(shape, dtype=bool)
+
+        columns = {store_id: column for column, store_id in enumerate(store_ids)}
+        rows_by_product: dict[int, list[int]] = {}
+        for row, item in enumerate(items):
+            if item.product_id:
+                rows_by_product.setdefault(item.product_id, []).append(row)
+
+        for (product_id, store_id), price_row in price_rows.items():
+            column = columns.get(store_id)
+            if column is None:
+                continue
+            for row in rows_by_product.get(product_id, ()):
+                current_price[row, column] = price_row.current_price
+                regular_price[row, column] = price_row.regular_price
+                on_sale[row, column] = price_row.is_on_sale
+
+        return cls(
+            items=items,
+            store_ids=store_ids,
+            quantities=np.array([item.quantity for item in items], dtype=float),
+            current_price=current_price,
+            regular_price=regular_price,
+            on_sale=on_sale,
+            found=~np.isnan(current_price),
+            price_rows=price_rows,
+        )
+
+    @classmethod
+    def build_unit_value(
+        cls,
+        items: Sequence[MatchedItem],
+        candidates: Sequence[Sequence[int]],
+        catalog: ProductCatalog,
+        store_ids: Sequence[int],
+        price_rows: Mapping[tuple[int, int], PriceRow],
+    ) -> "PriceMatrix":
+        """Lay out the best unit value per item and store.
+
+        Each cell holds the lowest stored normalized unit price among the
+        item's candidates at that store, and quantities are in base units,
+        so line totals are what the wanted amount costs at that rate. Items
+        whose product has no known pack size fall back to shelf prices.
+
+        Args:
+            items: Matched list items (rows)
+            candidates: Candidate product IDs per item
+            catalog: Product catalog with pack sizes
+            store_ids: Store IDs (columns)
+            price_rows: Latest price per (product_id, store_id)
+
+        Returns:
+            Price matrix with the chosen product per cell
+        """
+        shape = (len(items), len(store_ids))
+        current_price = np.full(shape, np.nan)
+        regular_price = np.full(shape, np.nan)
+        on_sale = np.zeros(shape, dtype=bool)
+        products = np.full(shape, -1)
+        quantities = np.array([item.quantity for item in items], dtype=float)
+
+        for row, (item, product_ids) in enumerate(zip(items, candidates)):
+            pack = catalog.base_size(item.product_id) if item.product_id else None
+            if pack is None:
+                product_ids = product_ids[:1]
+            else:
+                quantities[row] = _base_quantity(item, pack)
+
+            # Candidate x store unit prices; the first candidate wins ties
+            unit_prices = np.full((len(product_ids), len(store_ids)), np.nan)
+            for index, product_id in enumerate(product_ids):
+                for column, store_id in enumerate(store_ids):
+                    price_row = price_rows.get((product_id, store_id))
+                    if price_row is None:
+                        continue
+                    if pack is None:
+                        unit_prices[index, column] = price_row.current_price
+                    elif price_row.normalized_unit == pack[1] and price_row.normalized_price is not None:
+                        unit_prices[index, column] = price_row.normalized_price
+
+            for column in np.flatnonzero(~np.isnan(unit_prices).all(axis=0)).tolist():
+                index = int(np.nanargmin(unit_prices[:, column]))
+                product_id = product_ids[index]
+                price_row = price_rows[(product_id, store_ids[column])]
+                current_price[row, column] = unit_prices[index, column]
+                product_pack = None if pack is None else catalog.base_size(product_id)
+                regular_price[row, column] = (
+                    price_row.regular_price if product_pack is None
+                    else price_row.regular_price / product_pack[0]
+                )
+                on_sale[row, column] = price_row.is_on_sale
+                products[row, column] = product_id
+
+        return cls(
+            items=items,
+            store_ids=store_ids,
+            quantities=quantities,
+            current_price=current_price,
+            regular_price=regular_price,
+            on_sale=on_sale,
+            found=~np.isnan(current_price),
+            price_rows=price_rows,
+            products=products,
+        )
+
+    def product_id(self, row: int, column: int) -> Optional[int]:
+        """Get the product priced in a cell."""
+        if self.products is None:
+            return self.items[row].product_id
+        return int(self.products[row, column])
+
+    @property
+    def line_totals(self) -> np.ndarray:
+        """Price x quantity per item and store (NaN where missing)."""
+        totals: np.ndarray = self.current_price * self.quantities[:, None]
+        return totals
+
+    def cheapest_stores(self) -> np.ndarray:
+        """Get the first store column with the lowest current price per item.
+
+        Returns:
+            Column per item, -1 when no store has a price
+        """
+        if self.found.size == 0:
+            return np.full(len(self.items), -1)
+        priced = np.where(self.found, self.current_price, np.inf)
+        return np.where(self.found.any(axis=1), priced.argmin(axis=1), -1)
+
+    def aggregate(self) -> ComparisonTotals:
+        """Compute store totals, counts and cheapest stores.
+
+        Returns:
+            Aggregated comparison results
+        """
+        running = RunningTotals(len(self.store_ids))
+        running.add(self)
+        return running.result(self.cheapest_stores())
+
+
+class RunningTotals:
+    """Store totals accumulated over successive batches of list items.
+
+    Rows are added in list order, so the float totals are identical to
+    aggregating the whole list as one matrix.
+    """
+
+    def __init__(self, store_count: int):
+        """Initialize empty totals.
+
+        Args:
+            store_count: Number of store columns
+        """
+        self.total_price = np.zeros(store_count)
+        self.items_found = np.zeros(store_count, dtype=int)
+        self.items_on_sale = np.zeros(store_count, dtype=int)
+
+    def add(self, matrix: PriceMatrix) -> None:
+        """Add a batch of list items.
+
+        Args:
+            matrix: Price matrix for the batch, with the same store columns
+        """
+        found = matrix.found
+        line_totals = np.where(found, matrix.line_totals, 0.0)
+        self.total_price = np.vstack([self.total_price, line_totals]).sum(axis=0)
+        self.items_found += found.sum(axis=0)
+        self.items_on_sale += (matrix.on_sale & found).sum(axis=0)
+
+    def result(self, cheapest_store: Optional[np.ndarray] = None) -> ComparisonTotals:
+        """Rank stores by the totals so far.
+
+        Args:
+            cheapest_store: Cheapest store column per item, if known
+
+        Returns:
+            Aggregated comparison results
+        """
+        cheapest_overall = None
+        potential_savings = 0.0
+        with_items = np.flatnonzero(self.items_found > 0)
+        if with_items.size:
+            candidate_totals = self.total_price[with_items]
+            cheapest_overall = int(with_items[candidate_totals.argmin()])
+            if with_items.size > 1:
+                potential_savings = float(candidate_totals.max() - candidate_totals.min())
+
+        return ComparisonTotals(
+            total_price=self.total_price,
+            items_found=self.items_found,
+            items_on_sale=self.items_on_sale,
+            cheapest_store=cheapest_store if cheapest_store is not None else np.array([], dtype=int),
+            cheapest_overall=cheapest_overall,
+            potential_savings=potential_savings,
+        )
@@ -0,0 +1,114 @@
+"""Per-chain extraction templates for HTML weekly-ad pages.
+
+Each template is a set of XPath expressions: ``item`` selects every sale
+item on the page and the field expressions are evaluated relative to an
+item element, returning strings. Templates are compiled once per process
+and reused for every page of that chain.
+"""
+
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Optional
+
+from lxml import etree
+
+
+@dataclass(frozen=True)
+class HtmlTemplate:
+    """XPath expressions locating sale items on a chain's weekly-ad page."""
+
+    item: str
+    name: str
+    price: str
+    regular_price: Optional[str] = None
+    unit: Optional[str] = None
+    category: Optional[str] = None
+    image_url: Optional[str] = None
+
+
+# Pages of chains without a template are read as schema.org Product microdata
+DEFAULT_TEMPLATE = HtmlTemplate(
+    item="//*[@itemtype='https://schema.org/Product' or @itemtype='http://schema.org/Product']",
+    name="normalize-space(.//*[@itemprop='name'])",
+    # The machine-readable content attribute, else the element's text
+    price="normalize-space(.//*[@itemprop='price']/@content | .//*[@itemprop='price'][not(@content)])",
+    category="normalize-space(.//*[@itemprop='category'])",
+    image_url="string(.//*[@itemprop='image']/@src)",
+)
+
+# Templates by lower-case chain name
+HTML_TEMPLATES: dict[str, HtmlTemplate] = {
+    "kroger": HtmlTemplate(
+        item="//div[@data-qa='weekly-ad-item']",
+        name="normalize-space(.//*[@data-qa='item-title'])",
+        price="normalize-space(.//*[@data-qa='item-price'])",
+        regular_price="normalize-space(.//*[@data-qa='item-regular-price'])",
+        category="string(ancestor::section[@data-category][1]/@data-category)",
+        image_url="string(.//img/@src)",
+    ),
+    "walmart": HtmlTemplate(
+        item="//li[@data-item-id]",
+        name="normalize-space(.//span[@data-automation-id='product-title'])",
+        price="normalize-space(.//div[@data-automation-id='product-price'])",
+        regular_price="normalize-space(.//span[@data-automation-id='was-price'])",
+        unit="normalize-space(.//span[@data-automation-id='price-per-unit'])",
+        image_url="string(.//img[@data-testid='productTileImage']/@src)",
+    ),
+    "target": HtmlTemplate(
+        item="//div[@data-test='weekly-ad-offer']",
+        name="normalize-space(.//h3)",
+        price="normalize-space(.//*[@data-test='offer-price'])",
+        regular_price="normalize-space(.//*[@data-test='offer-reg-price'])",
+        category="normalize-space(.//*[@data-test='offer-category'])",
+        image_url="string(.//picture/img/@src)",
+    ),
+}
+
+# Template fields evaluated per item
+FIELDS = tuple(field.name for field in fields(HtmlTemplate) if field.name != "item")
+
+
+class CompiledHtmlTemplate:
+    """An HTML template with its XPath expressions compiled."""
+
+    def __init__(self, template: HtmlTemplate):
+        """Compile a template.
+
+        Args:
+            template: Template to compile
+        """
+        self.item = etree.XPath(template.item)
+        self.fields = {
+            field: etree.XPath(getattr(template, field))
+            for field in FIELDS
+            if getattr(template, field) is not None
+        }
+
+    def extract(self, root: etree._Element) -> list[dict[str, str]]:
+        """Extract the raw field strings of every item on a page.
+
+        Args:
+            root: Parsed page
+
+        Returns:
+            Field strings per item, in document order; fields without an
+            expression are omitted
+        """
+        return [
+            {field: str(expression(element)) for field, expression in self.fields.items()}
+            for element in self.item(root)
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_html_template(store_chain: Optional[str]) -> CompiledHtmlTemplate:
+    """Get the compiled template for a chain, compiling it on first use.
+
+    Args:
+        store_chain: Chain name, matched case-insensitively
+
+    Returns:
+        The chain's template, or the schema.org microdata template
+    """
+    template = HTML_TEMPLATES.get((store_chain or "").strip().lower(), DEFAULT_TEMPLATE)
+    return CompiledHtmlTemplate(template)
@@ -0,0 +1,546 @@
+"""Ingest job scheduler for circulars, base prices and promos.
+
+Fetch jobs live in the ``ingest_jobs`` table, one per source, chain and ZIP
+code. Each source has a cadence (weekly circulars, base prices every two
+days, daily promos); ``IngestScheduler.schedule`` enqueues a target's next
+job at the start of the off-peak window on the day it is due.
+
+A run drains the due jobs with ``INGEST_WORKERS`` concurrent workers. Workers
+claim the highest-priority due job with ``SELECT ... FOR UPDATE SKIP
+LOCKED``, so runs on several hosts share the queue without claiming a job
+twice. Off-peak jobs are only claimed inside the 2-6 AM window; failures are
+retried with exponential backoff, and a job still running after
+``INGEST_JOB_TIMEOUT_SECONDS`` counts as a crashed attempt. Each run also
+creates the monthly ``prices`` partitions ahead of the ingested rows.
+
+Run it from cron every few minutes (from ``backend/``)::
+
+    python -m app.services.ingest_scheduler
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from collections.abc import Awaitable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.partitioning import ensure_price_partitions, is_partitioned
+from app.models.ingest_job import IngestJob
+from app.models.product import Product
+from app.models.store import Store
+from app.services.circular_parser import CircularParser
+from app.services.kroger_client import KrogerClient
+
+logger = logging.getLogger(__name__)
+
+# Chains whose prices come from the Kroger API (Kroger and its banners)
+KROGER_CHAINS = frozenset({
+    "kroger", "ralphs", "fred meyer", "king soopers", "smith's", "fry's", "qfc", "dillons",
+    "harris teeter", "mariano's", "pick 'n save", "food 4 less", "city market",
+})
+
+# Longest delay before a retry
+RETRY_MAX_DELAY = timedelta(hours=6)
+
+# How long fetched Kroger prices are reused by a target's other source; shorter
+# than the daily promos cadence, so each night fetches afresh
+KROGER_PRICES_REUSE = timedelta(hours=12)
+
+# Fetches a source for a chain and ZIP code, returning the number of items
+IngestHandler = Callable[[str, str], Awaitable[int]]
+
+
+@dataclass(frozen=True)
+class IngestSource:
+    """A kind of fetch and how often it runs."""
+
+    name: str
+    cadence: timedelta
+    # Higher runs first among due jobs
+    priority: int
+    # Only run inside the off-peak window
+    off_peak: bool = True
+    # Lower-case chains it applies to; None for every chain
+    chains: Optional[frozenset[str]] = None
+
+    def applies_to(self, store_chain: str) -> bool:
+        """Check whether the source has data for a chain."""
+        return self.chains is None or store_chain.strip().lower() in self.chains
+
+
+INGEST_SOURCES: dict[str, IngestSource] = {
+    source.name: source
+    for source in (
+        # Promos change daily and go stale first
+        IngestSource("promos", timedelta(days=1), priority=30, chains=KROGER_CHAINS),
+        IngestSource("circulars", timedelta(weeks=1), priority=20),
+        IngestSource("base_prices", timedelta(days=2), priority=10, chains=KROGER_CHAINS),
+    )
+}
+
+
+class ClaimedJob(NamedTuple):
+    """A job claimed by a worker."""
+
+    id: int
+    source: str
+    store_chain: str
+    zip_code: str
+    attempts: int
+
+
+@dataclass
+class SourceStats:
+    """Outcomes of one source's jobs in a run."""
+
+    succeeded: int = 0
+    retried: int = 0
+    failed: int = 0
+    items: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def jobs(self) -> int:
+        """Jobs run, whatever their outcome."""
+        return self.succeeded + self.retried + self.failed
+
+
+@dataclass
+class IngestRunReport:
+    """Summary of one scheduler run."""
+
+    started_at: datetime
+    workers: int
+    scheduled: int = 0
+    requeued: int = 0
+    wall_seconds: float = 0.0
+    sources: dict[str, SourceStats] = field(default_factory=dict)
+
+    def record(self, source: str, status: str, items: int, seconds: float) -> None:
+        """Record the outcome of a job."""
+        stats = self.sources.setdefault(source, SourceStats())
+        if status == IngestJob.SUCCEEDED:
+            stats.succeeded += 1
+            stats.items += items
+        elif status == IngestJob.PENDING:
+            stats.retried += 1
+        else:
+            stats.failed += 1
+        stats.busy_seconds += seconds
+
+    def throughput(self) -> dict[str, dict[str, float]]:
+        """Get each source's jobs and items per second of wall-clock time.
+
+        Returns:
+            Rates by source
+        """
+        wall = self.wall_seconds or float("inf")
+        return {
+            source: {
+                "jobs_per_second": round(stats.jobs / wall, 3),
+                "items_per_second": round(stats.items / wall, 1),
+                "mean_job_seconds": round(stats.busy_seconds / stats.jobs, 3) if stats.jobs else 0.0,
+            }
+            for source, stats in self.sources.items()
+        }
+
+
+def _utc(value: datetime) -> datetime:
+    """Make a datetime read back from the database timezone-aware UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def in_off_peak_window(now: datetime) -> bool:
+    """Check whether a time falls in the off-peak scraping window.
+
+    Args:
+        now: Timezone-aware time
+
+    Returns:
+        True between ``INGEST_WINDOW_START_HOUR`` and ``INGEST_WINDOW_END_HOUR``
+        in ``INGEST_TIMEZONE``
+    """
+    settings = get_settings()
+    hour = now.astimezone(ZoneInfo(settings.ingest_timezone)).hour
+    start, end = settings.ingest_window_start_hour, settings.ingest_window_end_hour
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def next_run_at(source: IngestSource, last_run: datetime) -> datetime:
+    """Get when a target's next job for a source is due.
+
+    Off-peak sources are due at the start of the window on the day one
+    cadence after the last run, so runs stay at the start of the window
+    rather than drifting later each time.
+
+    Args:
+        source: Ingest source
+        last_run: When the last job for the target finished
+
+    Returns:
+        Due time, in UTC
+    """
+    due = _utc(last_run) + source.cadence
+    if not source.off_peak:
+        return due
+    settings = get_settings()
+    local = due.astimezone(ZoneInfo(settings.ingest_timezone))
+    window_start = local.replace(hour=settings.ingest_window_start_hour, minute=0, second=0, microsecond=0)
+    return window_start.astimezone(timezone.utc)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Get the delay before retrying a job, doubling with each attempt.
+
+    Args:
+        attempts: Attempts made so far
+
+    Returns:
+        Delay, at most ``RETRY_MAX_DELAY``
+    """
+    delay = timedelta(seconds=get_settings().ingest_retry_base_seconds * 2 ** max(attempts - 1, 0))
+    return min(delay, RETRY_MAX_DELAY)
+
+
+def default_handlers(
+    session_factory: Callable[[], Session],
+    kroger: Optional[KrogerClient] = None,
+    clock: Optional[Callable[[], datetime]] = None,
+) -> dict[str, IngestHandler]:
+    """Create the fetch handlers of the built-in sources.
+
+    The promos and base_prices jobs of a target share one Kroger fetch: the
+    prices are kept for ``KROGER_PRICES_REUSE``, and a job started while the
+    other's fetch is in flight waits for it. The product UPCs are loaded
+    when a fetch starts, so products added since the handlers were built
+    are priced. Handlers count what they fetch; they do not store it.
+
+    Args:
+        session_factory: Creates sessions for loading the product UPCs to price
+        kroger: Kroger API client (default ``KrogerClient()``)
+        clock: Returns the current UTC time
+
+    Returns:
+        Handlers by source name
+    """
+    parser = CircularParser()
+    kroger = kroger or KrogerClient()
+    clock = clock or (lambda: datetime.now(timezone.utc))
+    # Prices by (chain, ZIP code) with when they were fetched, and fetches in flight
+    fetched: dict[tuple[str, str], tuple[datetime, list[dict[str, Any]]]] = {}
+    in_flight: dict[tuple[str, str], asyncio.Task[list[dict[str, Any]]]] = {}
+
+    def load_upcs() -> list[str]:
+        """Load the UPCs of the products to price."""
+        with session_factory() as db:
+            return [upc for upc in db.scalars(select(Product.upc)) if upc is not None]
+
+    async def fetch_kroger_prices(store_chain: str, zip_code: str) -> list[dict[str, Any]]:
+        """Fetch catalog prices at a chain's Kroger API locations in a ZIP code."""
+        upcs = await asyncio.to_thread(load_upcs)
+        prices: list[dict[str, Any]] = []
+        for location in await kroger.get_locations(zip_code):
+            if str(location.get("chain", "")).lower() == store_chain:
+                prices.extend(await kroger.get_product_prices(location["locationId"], upcs))
+        return prices
+
+    async def kroger_prices(store_chain: str, zip_code: str) -> list[dict[str, Any]]:
+        """Get a target's Kroger prices, fetching them unless recently fetched."""
+        key = (store_chain.strip().lower(), zip_code)
+        if key in fetched and clock() - fetched[key][0] < KROGER_PRICES_REUSE:
+            return fetched[key][1]
+        task = in_flight.get(key)
+        if task is None:
+            task = in_flight[key] = asyncio.create_task(fetch_kroger_prices(*key))
+            task.add_done_callback(lambda _: in_flight.pop(key, None))
+        prices = await asyncio.shield(task)
+        fetched[key] = (clock(), prices)
+        return prices
+
+    async def circulars(store_chain: str, zip_code: str) -> int:
+        """Fetch, snapshot and parse the chain's weekly circular."""
+        return len(await parser.fetch_and_parse(store_chain, zip_code))
+
+    async def base_prices(store_chain: str, zip_code: str) -> int:
+        """Fetch regular shelf prices."""
+        return len(await kroger_prices(store_chain, zip_code))
+
+    async def promos(store_chain: str, zip_code: str) -> int:
+        """Fetch prices and count the items on promotion."""
+        prices = await kroger_prices(store_chain, zip_code)
+        return sum(1 for price in prices if (price.get("price") or {}).get("promo"))
+
+    return {"circulars": circulars, "base_prices": base_prices, "promos": promos}
+
+
+class IngestScheduler:
+    """Schedules ingest jobs and runs them with concurrent workers.
+
+    Queue operations use blocking database sessions, so the async workers
+    run them in threads (``asyncio.to_thread``); workers overlap while their
+    handlers wait on the network.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        handlers: Optional[dict[str, IngestHandler]] = None,
+        workers: Optional[int] = None,
+        sources: Optional[Iterable[IngestSource]] = None,
+        clock: Optional[Callable[[], datetime]] = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            session_factory: Creates database sessions
+            handlers: Fetch handlers by source name (default
+                ``default_handlers``)
+            workers: Concurrent workers (default ``INGEST_WORKERS``)
+            sources: Sources to schedule (default ``INGEST_SOURCES``)
+            clock: Returns the current UTC time
+        """
+        self.session_factory = session_factory
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.handlers = handlers if handlers is not None else default_handlers(session_factory, clock=self.clock)
+        self.workers = workers or get_settings().ingest_workers
+        self.sources = {source.name: source for source in (sources or INGEST_SOURCES.values())}
+
+    def schedule(self) -> int:
+        """Enqueue the next job of every target without a pending or running one.
+
+        Targets are the distinct chains and ZIP codes of known stores. A
+        target's first job is due now; later ones per ``next_run_at``. Each
+        job is inserted under its own savepoint, so a target another
+        scheduler enqueued first is skipped without losing the others.
+
+        Returns:
+            Number of jobs enqueued
+        """
+        now = self.clock()
+        with self.session_factory() as db:
+            targets = db.execute(select(Store.chain, Store.zip_code).distinct()).all()
+            key = (IngestJob.source, IngestJob.store_chain, IngestJob.zip_code)
+            active = set(
+                db.execute(select(*key).where(IngestJob.status.in_((IngestJob.PENDING, IngestJob.RUNNING)))).all()
+            )
+            last_finished = {
+                (source, chain, zip_code): finished_at
+                for source, chain, zip_code, finished_at in db.execute(
+                    select(*key, func.max(IngestJob.finished_at))
+                    .where(IngestJob.finished_at.is_not(None))
+                    .group_by(*key)
+                )
+            }
+
+            scheduled = 0
+            for source in self.sources.values():
+                for chain, zip_code in targets:
+                    target = (source.name, chain, zip_code)
+                    if not source.applies_to(chain) or target in active:
+                        continue
+                    finished_at = last_finished.get(target)
+                    job = IngestJob(
+                        source=source.name,
+                        store_chain=chain,
+                        zip_code=zip_code,
+                        priority=source.priority,
+                        off_peak=source.off_peak,
+                        status=IngestJob.PENDING,
+                        run_at=next_run_at(source, finished_at) if finished_at else now,
+                        attempts=0,
+                    )
+                    try:
+                        with db.begin_nested():
+                            db.add(job)
+                    except IntegrityError:
+                        # Another scheduler enqueued this target first
+                        continue
+                    scheduled += 1
+            db.commit()
+        return scheduled
+
+    def ensure_partitions(self) -> list[str]:
+        """Create the ``prices`` partitions for this month and the next two.
+
+        Runs before ingesting so new prices never land in the DEFAULT
+        partition; a no-op unless ``prices`` is partitioned.
+
+        Returns:
+            Names of the partitions covering the range
+        """
+        with self.session_factory() as db:
+            connection = db.connection()
+            if not is_partitioned(connection):
+                return []
+            names = ensure_price_partitions(connection, self.clock().date())
+            db.commit()
+        return names
+
+    def requeue_stale(self) -> int:
+        """Treat jobs running longer than ``INGEST_JOB_TIMEOUT_SECONDS`` as failed attempts.
+
+        Returns:
+            Number of jobs requeued or failed
+        """
+        now = self.clock()
+        cutoff = now - timedelta(seconds=get_settings().ingest_job_timeout_seconds)
+        with self.session_factory() as db:
+            stale = db.scalars(
+                select(IngestJob)
+                .where(IngestJob.status == IngestJob.RUNNING, IngestJob.started_at < cutoff)
+                .with_for_update(skip_locked=True)
+            ).all()
+            for job in stale:
+                self._fail(job, "Timed out", now)
+            db.commit()
+        return len(stale)
+
+    def claim(self, worker: str) -> Optional[ClaimedJob]:
+        """Claim the highest-priority due job.
+
+        Args:
+            worker: Worker identifier recorded on the job
+
+        Returns:
+            The claimed job, or None if no job is due
+        """
+        now = self.clock()
+        query = select(IngestJob).where(IngestJob.status == IngestJob.PENDING, IngestJob.run_at <= now)
+        if not in_off_peak_window(now):
+            query = query.where(IngestJob.off_peak.is_(False))
+        query = (
+            query.order_by(IngestJob.priority.desc(), IngestJob.run_at, IngestJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        with self.session_factory() as db:
+            job = db.scalars(query).first()
+            if job is None:
+                return None
+            job.status = IngestJob.RUNNING
+            job.locked_by = worker
+            job.started_at = now
+            job.attempts += 1
+            claimed = ClaimedJob(job.id, job.source, job.store_chain, job.zip_code, job.attempts)
+            db.commit()
+        return claimed
+
+    def finish(self, claimed: ClaimedJob, items: int = 0, error: Optional[str] = None) -> str:
+        """Record the outcome of a claimed job.
+
+        Args:
+            claimed: The job
+            items: Items fetched, if it succeeded
+            error: Error message, if it failed
+
+        Returns:
+            The job's new status: succeeded, pending (to be retried) or failed
+        """
+        now = self.clock()
+        with self.session_factory() as db:
+            job = db.get(IngestJob, claimed.id)
+            if job is None:
+                logger.warning("Ingest job %d was deleted while running", claimed.id)
+                return IngestJob.FAILED
+            if error is None:
+                job.status = IngestJob.SUCCEEDED
+                job.items = items
+                job.last_error = None
+                job.finished_at = now
+                job.locked_by = None
+            else:
+                self._fail(job, error, now)
+            status = job.status
+            db.commit()
+        return status
+
+    @staticmethod
+    def _fail(job: IngestJob, error: str, now: datetime) -> None:
+        """Schedule a retry of a failed attempt, or fail the job after its last."""
+        job.last_error = error
+        job.locked_by = None
+        if job.attempts < get_settings().ingest_max_attempts:
+            job.status = IngestJob.PENDING
+            job.run_at = now + retry_delay(job.attempts)
+        else:
+            job.status = IngestJob.FAILED
+            job.finished_at = now
+
+    async def run(self) -> IngestRunReport:
+        """Schedule jobs, then run every due job with concurrent workers.
+
+        Returns once no job is due, e.g. when the off-peak window closes.
+
+        Returns:
+            Run report with wall-clock time and per-source outcomes
+        """
+        report = IngestRunReport(started_at=self.clock(), workers=self.workers)
+        started = time.perf_counter()
+        await asyncio.to_thread(self.ensure_partitions)
+        report.requeued = await asyncio.to_thread(self.requeue_stale)
+        report.scheduled = await asyncio.to_thread(self.schedule)
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        await asyncio.gather(*(self._work(f"{prefix}:{number}", report) for number in range(self.workers)))
+        report.wall_seconds = time.perf_counter() - started
+        logger.info(
+            "Ingest run: %d jobs in %.1fs with %d workers; %s",
+            sum(stats.jobs for stats in report.sources.values()),
+            report.wall_seconds,
+            self.workers,
+            report.throughput(),
+        )
+        return report
+
+    async def _work(self, worker: str, report: IngestRunReport) -> None:
+        """Claim and run due jobs until none is left."""
+        while (job := await asyncio.to_thread(self.claim, worker)) is not None:
+            started = time.perf_counter()
+            handler = self.handlers.get(job.source)
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler for source {job.source!r}")
+                items = await handler(job.store_chain, job.zip_code)
+            except Exception as exc:
+                logger.warning(
+                    "Ingest job %d (%s, %s %s) failed: %r", job.id, job.source, job.store_chain, job.zip_code, exc
+                )
+                items = 0
+                status = await asyncio.to_thread(self.finish, job, error=f"{type(exc).__name__}: {exc}")
+            else:
+                status = await asyncio.to_thread(self.finish, job, items=items)
+            report.record(job.source, status, items, time.perf_counter() - started)
+
+
+def run_ingest() -> None:
+    """Run the scheduler once and print its report."""
+    from app.db.database import SessionLocal
+
+    report = asyncio.run(IngestScheduler(SessionLocal).run())
+    print(
+        f"Ingest run: {report.scheduled} jobs scheduled, {report.requeued} requeued, "
+        f"{sum(stats.jobs for stats in report.sources.values())} run in {report.wall_seconds:.1f}s "
+        f"with {report.workers} workers."
+    )
+    throughput = report.throughput()
+    for source, stats in report.sources.items():
+        rates = throughput[source]
+        print(
+            f"  {source}: {stats.succeeded} succeeded, {stats.retried} retried, {stats.failed} failed, "
+            f"{stats.items} items; {rates['jobs_per_second']} jobs/s, {rates['items_per_second']} items/s"
+        )
+
+
+if __name__ == "__main__":
+    run_ingest()
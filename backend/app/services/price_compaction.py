@@ -0,0 +1,287 @@
+"""Price history compaction service."""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Optional, cast
+
+from sqlalchemy import (
+    ColumnElement,
+    CursorResult,
+    Date,
+    Executable,
+    and_,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session, aliased
+
+from app.config import get_settings
+from app.db.partitioning import (
+    drop_partitions_before,
+    ensure_price_partitions,
+    is_partitioned,
+    month_start,
+)
+from app.models.price import Price, PriceHistory
+
+# Columns that define "the same price" when collapsing runs of rows
+_VALUE_COLUMNS = (
+    "price",
+    "sale_price",
+    "unit_price",
+    "normalized_unit_price",
+    "normalized_sale_unit_price",
+    "normalized_unit",
+    "expiration_date",
+)
+
+
+@dataclass
+class CompactionResult:
+    """Summary of a compaction run."""
+
+    cutoff: date
+    intervals_archived: int = 0
+    intervals_merged: int = 0
+    rows_carried_forward: int = 0
+    rows_deleted: int = 0
+    partitions_dropped: list[str] = field(default_factory=list)
+
+
+class PriceCompactor:
+    """Service for archiving old price rows into ``price_history``.
+
+    Everything older than the hot window is collapsed into intervals of
+    unchanged prices and removed from ``prices`` (whole partitions are
+    dropped on PostgreSQL). The latest row of every (product, store) pair is
+    carried forward to the cutoff date first, so the latest price is always
+    in the hot window and comparison queries never need older partitions.
+    """
+
+    def __init__(self, db: Session, hot_months: Optional[int] = None):
+        """Initialize the price compactor.
+
+        Args:
+            db: SQLAlchemy database session
+            hot_months: Months to keep in ``prices`` (defaults to settings)
+        """
+        self.db = db
+        self.hot_months = hot_months if hot_months is not None else get_settings().price_hot_months
+
+    def default_cutoff(self, today: Optional[date] = None) -> date:
+        """Get the first day of the oldest month kept in ``prices``.
+
+        Args:
+            today: Reference date (defaults to today)
+
+        Returns:
+            Compaction cutoff date
+        """
+        return month_start(today or date.today(), -(self.hot_months - 1))
+
+    def compact(self, cutoff: Optional[date] = None) -> CompactionResult:
+        """Archive every price row effective before the cutoff.
+
+        Args:
+            cutoff: First day of the oldest month to keep; must be the first
+                day of a month (defaults to ``default_cutoff()``)
+
+        Returns:
+            Compaction summary
+        """
+        cutoff = cutoff or self.default_cutoff()
+        if cutoff != month_start(cutoff):
+            raise ValueError(f"Compaction cutoff must be the first of a month, got {cutoff}")
+
+        result = CompactionResult(cutoff=cutoff)
+        connection = self.db.connection()
+        partitioned = is_partitioned(connection)
+        if partitioned:
+            ensure_price_partitions(connection, cutoff)
+
+        has_old_rows = self.db.scalar(select(exists().where(Price.effective_date < cutoff)))
+        if has_old_rows:
+            boundary = self.db.scalar(select(func.max(PriceHistory.valid_to)))
+            result.intervals_archived = self._archive_intervals(cutoff)
+            result.rows_carried_forward = self._carry_forward(cutoff)
+            if boundary is not None:
+                result.intervals_merged = self._merge_at_boundary(boundary)
+
+            if partitioned:
+                result.partitions_dropped = drop_partitions_before(connection, cutoff)
+            # Rows outside the dropped partitions (or on unpartitioned tables)
+            result.rows_deleted = self._rowcount(
+                delete(Price).where(Price.effective_date < cutoff)
+            )
+
+        self.db.commit()
+        return result
+
+    def _rowcount(self, statement: Executable) -> int:
+        """Execute a DML statement and get the number of rows it matched."""
+        return cast(CursorResult[Any], self.db.execute(statement)).rowcount
+
+    def _archive_intervals(self, cutoff: date) -> int:
+        """Collapse runs of unchanged prices before the cutoff into intervals."""
+        pair = (Price.product_id, Price.store_id)
+        order = (Price.effective_date, Price.id)
+        changed = or_(
+            *(
+                func.lag(getattr(Price, column))
+                .over(partition_by=pair, order_by=order)
+                .is_distinct_from(getattr(Price, column))
+                for column in _VALUE_COLUMNS
+            )
+        )
+        flagged = (
+            select(
+                *pair,
+                *(getattr(Price, column) for column in _VALUE_COLUMNS),
+                Price.effective_date,
+                Price.id,
+                case((changed, 1), else_=0).label("is_new_run"),
+            )
+            .where(Price.effective_date < cutoff)
+            .subquery("flagged")
+        )
+        runs = select(
+            flagged.c.product_id,
+            flagged.c.store_id,
+            *(flagged.c[column] for column in _VALUE_COLUMNS),
+            flagged.c.effective_date,
+            func.sum(flagged.c.is_new_run)
+            .over(
+                partition_by=(flagged.c.product_id, flagged.c.store_id),
+                order_by=(flagged.c.effective_date, flagged.c.id),
+            )
+            .label("run"),
+        ).subquery("runs")
+        islands = (
+            select(
+                runs.c.product_id,
+                runs.c.store_id,
+                *(runs.c[column] for column in _VALUE_COLUMNS),
+                func.min(runs.c.effective_date).label("valid_from"),
+            )
+            .group_by(
+                runs.c.product_id,
+                runs.c.store_id,
+                runs.c.run,
+                *(runs.c[column] for column in _VALUE_COLUMNS),
+            )
+            .subquery("islands")
+        )
+        intervals = select(
+            islands.c.product_id,
+            islands.c.store_id,
+            *(islands.c[column] for column in _VALUE_COLUMNS),
+            islands.c.valid_from,
+            func.lead(islands.c.valid_from, 1, literal(cutoff, Date))
+            .over(
+                partition_by=(islands.c.product_id, islands.c.store_id),
+                order_by=islands.c.valid_from,
+            )
+            .label("valid_to"),
+        )
+
+        columns = ["product_id", "store_id", *_VALUE_COLUMNS, "valid_from", "valid_to"]
+        return self._rowcount(
+            insert(PriceHistory).from_select(columns, intervals)
+        )
+
+    def _carry_forward(self, cutoff: date) -> int:
+        """Copy each pair's latest pre-cutoff row to the cutoff date."""
+        ranked = select(
+            Price.product_id,
+            Price.store_id,
+            *(getattr(Price, column) for column in _VALUE_COLUMNS),
+            Price.effective_date,
+            func.row_number()
+            .over(
+                partition_by=(Price.product_id, Price.store_id),
+                order_by=(Price.effective_date.desc(), Price.id.desc()),
+            )
+            .label("row_number"),
+        ).subquery("ranked")
+        latest_before_cutoff = select(
+            ranked.c.product_id,
+            ranked.c.store_id,
+            *(ranked.c[column] for column in _VALUE_COLUMNS),
+            literal(cutoff, Date),
+        ).where(ranked.c.row_number == 1, ranked.c.effective_date < cutoff)
+
+        columns = ["product_id", "store_id", *_VALUE_COLUMNS, "effective_date"]
+        return self._rowcount(
+            insert(Price).from_select(columns, latest_before_cutoff)
+        )
+
+    def _merge_at_boundary(self, boundary: date) -> int:
+        """Join archived intervals split by the previous run's carry-forward."""
+        following = aliased(PriceHistory)
+        preceding = aliased(PriceHistory)
+
+        def same_price(a: type[PriceHistory], b: type[PriceHistory]) -> ColumnElement[bool]:
+            return and_(
+                a.product_id == b.product_id,
+                a.store_id == b.store_id,
+                *(
+                    getattr(a, column).is_not_distinct_from(getattr(b, column))
+                    for column in _VALUE_COLUMNS
+                ),
+            )
+
+        continuation = (
+            select(following.valid_to)
+            .where(same_price(following, PriceHistory), following.valid_from == boundary)
+            .scalar_subquery()
+        )
+        merged = self._rowcount(
+            update(PriceHistory)
+            .where(PriceHistory.valid_to == boundary, continuation.is_not(None))
+            .values(valid_to=continuation)
+            .execution_options(synchronize_session=False)
+        )
+        if merged:
+            self.db.execute(
+                delete(PriceHistory)
+                .where(
+                    PriceHistory.valid_from == boundary,
+                    exists().where(
+                        same_price(preceding, PriceHistory),
+                        preceding.valid_from < boundary,
+                        preceding.valid_to == PriceHistory.valid_to,
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        return merged
+
+
+def run_compaction() -> None:
+    """Run a compaction with the default cutoff."""
+    from app.db.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = PriceCompactor(db).compact()
+        print(
+            f"Compacted prices before {result.cutoff}: "
+            f"{result.intervals_archived} intervals archived, "
+            f"{result.intervals_merged} merged, "
+            f"{result.rows_carried_forward} rows carried forward, "
+            f"{result.rows_deleted} rows deleted, "
+            f"{len(result.partitions_dropped)} partitions dropped."
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run_compaction()
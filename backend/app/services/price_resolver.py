@@ -0,0 +1,181 @@
+"""Price resolution service for comparison queries."""
+
+from collections.abc import Iterable, Mapping
+from datetime import date
+from typing import NamedTuple, Optional
+
+from sqlalchemy import Select, bindparam, case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.price import Price, PriceHistory
+
+# Effective-date floor used before any compaction has run
+_NO_FLOOR = date(1, 1, 1)
+
+
+def _latest_prices() -> Select:
+    """Build the latest-price statement with expanding ID parameters.
+
+    It is built once at import: executions only bind ``product_ids`` and
+    ``store_ids`` and reuse the compiled SQL from the engine's cache.
+    """
+    hot_floor = func.coalesce(
+        select(func.max(PriceHistory.valid_to)).scalar_subquery(), _NO_FLOOR
+    )
+    ranked = (
+        select(
+            Price.product_id,
+            Price.store_id,
+            Price.price.label("regular_price"),
+            Price.current_price.label("current_price"),
+            Price.is_on_sale.label("is_on_sale"),
+            Price.unit_price,
+            Price.expiration_date,
+            Price.current_normalized_unit_price.label("normalized_price"),
+            Price.normalized_unit,
+            func.row_number()
+            .over(
+                partition_by=(Price.product_id, Price.store_id),
+                order_by=(Price.effective_date.desc(), Price.id.desc()),
+            )
+            .label("row_number"),
+        )
+        .where(
+            Price.product_id.in_(bindparam("product_ids", expanding=True)),
+            Price.store_id.in_(bindparam("store_ids", expanding=True)),
+            Price.effective_date >= hot_floor,
+        )
+        .subquery()
+    )
+    return select(
+        ranked.c.product_id,
+        ranked.c.store_id,
+        ranked.c.regular_price,
+        ranked.c.current_price,
+        ranked.c.is_on_sale,
+        ranked.c.unit_price,
+        ranked.c.expiration_date,
+        ranked.c.normalized_price,
+        ranked.c.normalized_unit,
+    ).where(ranked.c.row_number == 1)
+
+
+_LATEST_PRICES = _latest_prices()
+
+
+class PriceRow(NamedTuple):
+    """Latest resolved price for a product at a store."""
+
+    product_id: int
+    store_id: int
+    regular_price: float
+    current_price: float
+    is_on_sale: bool
+    unit_price: Optional[float]
+    expiration_date: Optional[date]
+    normalized_price: Optional[float] = None
+    normalized_unit: Optional[str] = None
+
+
+class StoreTotalRow(NamedTuple):
+    """Basket totals for a store, aggregated in the database."""
+
+    store_id: int
+    total_price: float
+    items_found: int
+    items_on_sale: int
+
+
+class PriceResolver:
+    """Service for resolving current prices without hydrating ORM objects.
+
+    All queries select plain columns, using the SQL forms of
+    ``Price.current_price`` and ``Price.is_on_sale``, and pick the latest
+    price row per (product, store) with a window function instead of one
+    query per pair.
+
+    Rows before the last compaction cutoff are skipped: ``PriceCompactor``
+    carries every pair's latest price forward to that date, so on a
+    partitioned ``prices`` table only the hot partitions are scanned.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize the price resolver.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    @staticmethod
+    def latest_prices_statement(
+        product_ids: Iterable[int], store_ids: Iterable[int]
+    ) -> Select:
+        """Build a statement selecting the latest price per (product, store).
+
+        Args:
+            product_ids: Product IDs to resolve
+            store_ids: Store IDs to resolve
+
+        Returns:
+            Select yielding ``PriceRow``-shaped tuples
+        """
+        return _LATEST_PRICES.params(product_ids=list(product_ids), store_ids=list(store_ids))
+
+    def get_latest_prices(
+        self, product_ids: Iterable[int], store_ids: Iterable[int]
+    ) -> dict[tuple[int, int], PriceRow]:
+        """Resolve the latest price for every (product, store) pair.
+
+        Args:
+            product_ids: Product IDs to resolve
+            store_ids: Store IDs to resolve
+
+        Returns:
+            Mapping of (product_id, store_id) to the resolved price row
+        """
+        product_ids = set(product_ids)
+        store_ids = set(store_ids)
+        if not product_ids or not store_ids:
+            return {}
+
+        rows = self.db.execute(
+            _LATEST_PRICES, {"product_ids": list(product_ids), "store_ids": list(store_ids)}
+        )
+        return {(row.product_id, row.store_id): PriceRow(*row) for row in rows}
+
+    def get_store_totals(
+        self,
+        quantities: Mapping[int, float],
+        item_counts: Mapping[int, int],
+        store_ids: Iterable[int],
+    ) -> dict[int, StoreTotalRow]:
+        """Sum basket totals per store in the database.
+
+        Args:
+            quantities: Total quantity requested per product ID
+            item_counts: Number of list items resolved to each product ID
+            store_ids: Store IDs to total
+
+        Returns:
+            Mapping of store ID to its totals; stores without any priced
+            product are omitted
+        """
+        store_ids = set(store_ids)
+        if not quantities or not store_ids:
+            return {}
+
+        latest = self.latest_prices_statement(quantities.keys(), store_ids).subquery()
+        quantity = case(dict(quantities), value=latest.c.product_id, else_=0.0)
+        count = case(dict(item_counts), value=latest.c.product_id, else_=0)
+        stmt = select(
+            latest.c.store_id,
+            func.sum(latest.c.current_price * quantity),
+            func.sum(count),
+            func.sum(case((latest.c.is_on_sale, count), else_=0)),
+        ).group_by(latest.c.store_id)
+
+        return {
+            row[0]: StoreTotalRow(row[0], float(row[1]), int(row[2]), int(row[3]))
+            for row in self.db.execute(stmt)
+        }
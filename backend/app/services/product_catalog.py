@@ -0,0 +1,203 @@
+"""Shared product catalog used for fuzzy matching."""
+
+import logging
+import threading
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.services.product_matcher import ProductMatcher
+from app.services.unit_conversion import to_base_many
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogProduct(NamedTuple):
+    """Product fields returned by matches."""
+
+    id: int
+    name: str
+    brand: Optional[str]
+    category: Optional[str]
+    upc: Optional[str]
+    unit_size: Optional[float] = None
+    unit_type: Optional[str] = None
+
+
+class ProductCatalog:
+    """Immutable snapshot of every product and its normalized match name.
+
+    Building the normalized names is the expensive part of
+    ``ProductMatcher._load_products``; sharing one snapshot lets each
+    request's matcher skip it. Pack sizes are converted to base units once
+    here too, for unit value comparisons.
+    """
+
+    def __init__(self, products: list[CatalogProduct], version: Optional[str] = None):
+        """Build the catalog.
+
+        Args:
+            products: Every product, in ID order
+            version: ``catalog_version`` of the products table when loaded
+        """
+        self.products = products
+        self.version = version
+        self.names = [ProductMatcher._normalize_name(p.name, p.brand) for p in products]
+        self._positions = {product.id: position for position, product in enumerate(products)}
+        self._base_sizes, self._base_units = to_base_many(
+            [p.unit_size for p in products], [p.unit_type for p in products]
+        )
+
+    @classmethod
+    def from_session(cls, db: Session) -> "ProductCatalog":
+        """Load every product from the database.
+
+        Args:
+            db: SQLAlchemy database session
+
+        Returns:
+            Product catalog
+        """
+        # Read before the rows, so a concurrent write shows up as a new version
+        version = catalog_version(db)
+        rows = db.execute(
+            select(
+                Product.id,
+                Product.name,
+                Product.brand,
+                Product.category,
+                Product.upc,
+                Product.unit_size,
+                Product.unit_type,
+            )
+            .order_by(Product.id)
+        )
+        return cls([CatalogProduct(*row) for row in rows.tuples()], version)
+
+    @property
+    def size(self) -> int:
+        """Number of products in the catalog."""
+        return len(self.products)
+
+    def base_size(self, product_id: int) -> Optional[tuple[float, str]]:
+        """Get a product's pack size in base units.
+
+        Args:
+            product_id: Product ID
+
+        Returns:
+            (size in base units, base unit), or None if the pack size is unknown
+        """
+        position = self._positions.get(product_id)
+        if position is None:
+            return None
+        base_unit = self._base_units[position]
+        if base_unit is None:
+            return None
+        return float(self._base_sizes[position]), base_unit
+
+
+def catalog_version(db: Session) -> str:
+    """Get a fingerprint of the products table that changes with any write.
+
+    Inserts and deletes change the row count or highest ID, updates the
+    latest ``updated_at``; this also catches bulk loads and writes made by
+    other processes, which the ORM write hooks below cannot see.
+
+    Args:
+        db: SQLAlchemy database session
+
+    Returns:
+        Version string
+    """
+    count, max_id, updated_at = db.execute(
+        select(func.count(Product.id), func.max(Product.id), func.max(Product.updated_at))
+    ).one()
+    return f"{count}:{max_id}:{updated_at}"
+
+
+_catalog: Optional[ProductCatalog] = None
+_lock = threading.Lock()
+
+
+def load_product_catalog(db: Session) -> ProductCatalog:
+    """Load the catalog from the database and share it process-wide.
+
+    Args:
+        db: SQLAlchemy database session
+
+    Returns:
+        Process-wide product catalog
+    """
+    global _catalog
+    catalog = ProductCatalog.from_session(db)
+    with _lock:
+        _catalog = catalog
+    return catalog
+
+
+def get_product_catalog(db: Session) -> ProductCatalog:
+    """Get the process-wide product catalog, loading it if needed.
+
+    Args:
+        db: SQLAlchemy database session used if the catalog must be loaded
+
+    Returns:
+        Product catalog
+    """
+    catalog = _catalog
+    if catalog is None:
+        return load_product_catalog(db)
+    return catalog
+
+
+def sync_product_catalog(db: Session) -> ProductCatalog:
+    """Reload the catalog if the products table changed since it was loaded.
+
+    Args:
+        db: SQLAlchemy database session
+
+    Returns:
+        Process-wide product catalog
+    """
+    catalog = _catalog
+    if catalog is None or catalog.version != catalog_version(db):
+        return load_product_catalog(db)
+    return catalog
+
+
+def invalidate_product_catalog() -> None:
+    """Drop the process-wide catalog so it is reloaded on next use."""
+    global _catalog
+    _catalog = None
+
+
+@event.listens_for(Session, "after_flush")
+def _track_product_writes(session: Session, flush_context: Any) -> None:
+    """Remember that a transaction inserted, updated or deleted products."""
+    if any(
+        isinstance(instance, Product)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info["products_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_after_product_writes(session: Session) -> None:
+    """Rebuild the catalog once a transaction that wrote products commits."""
+    if not session.info.pop("products_changed", False) or _catalog is None:
+        return
+    try:
+        with Session(bind=session.get_bind()) as db:
+            load_product_catalog(db)
+    except Exception:
+        logger.exception("Failed to refresh the product catalog after a product write")
+        invalidate_product_catalog()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_product_writes(session: Session) -> None:
+    """Discard product write tracking when a transaction rolls back."""
+    session.info.pop("products_changed", None)
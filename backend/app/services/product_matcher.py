@@ -1,12 +1,20 @@
 """Product matching service using fuzzy string matching."""
 
 import re
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from rapidfuzz import fuzz, process
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.instrumentation import track_matcher
+from app.core.metrics import MATCHER_BEST_SCORE, MATCHER_CANDIDATES
+from app.db.queries import product_by_upc
 from app.models.product import Product
+from app.services.units import PRODUCT_UNITS
+
+if TYPE_CHECKING:
+    from app.services.product_catalog import ProductCatalog
 
 
 class ProductMatcher:
@@ -29,45 +37,39 @@ class ProductMatcher:
     }
 
     # Unit type normalization mapping
-    UNIT_NORMALIZATION: dict[str, str] = {
-        "ounce": "oz",
-        "ounces": "oz",
-        "pound": "lb",
-        "pounds": "lb",
-        "lbs": "lb",
-        "gallon": "gal",
-        "gallons": "gal",
-        "liter": "l",
-        "liters": "l",
-        "litre": "l",
-        "litres": "l",
-        "count": "ct",
-        "ct": "ct",
-        "pack": "ct",
-        "each": "ea",
-        "piece": "ea",
-        "pieces": "ea",
-    }
-
-    def __init__(self, db: Session, min_score: float = 60.0):
+    UNIT_NORMALIZATION = PRODUCT_UNITS
+
+    def __init__(
+        self,
+        db: Session,
+        min_score: float = 60.0,
+        catalog: Optional["ProductCatalog"] = None,
+    ):
         """Initialize the product matcher.
 
         Args:
             db: SQLAlchemy database session
             min_score: Minimum matching score (0-100) to consider a match
+            catalog: Optional shared product catalog to match against
+                instead of loading products from the database
         """
         self.db = db
         self.min_score = min_score
-        self._product_cache: Optional[list[Product]] = None
+        self._catalog = catalog
+        self._product_cache: Optional[list[Any]] = None
         self._name_cache: Optional[list[str]] = None
 
     def _load_products(self) -> None:
         """Load all products from the database into cache."""
-        if self._product_cache is None:
-            self._product_cache = self.db.query(Product).all()
+        if self._product_cache is None and self._catalog is not None:
+            self._product_cache = self._catalog.products
+            self._name_cache = self._catalog.names
+        elif self._product_cache is None:
+            self._product_cache = list(self.db.scalars(select(Product)))
             self._name_cache = [self._normalize_name(p.name, p.brand) for p in self._product_cache]
 
-    def _normalize_name(self, name: str, brand: Optional[str] = None) -> str:
+    @classmethod
+    def _normalize_name(cls, name: str, brand: Optional[str] = None) -> str:
         """Normalize a product name for matching.
 
         Args:
@@ -87,7 +89,7 @@ class ProductMatcher:
         normalized = full_name.lower()
 
         # Normalize brand aliases
-        for canonical, aliases in self.BRAND_ALIASES.items():
+        for canonical, aliases in cls.BRAND_ALIASES.items():
             for alias in aliases:
                 normalized = normalized.replace(alias, canonical)
 
@@ -116,7 +118,11 @@ class ProductMatcher:
     def calculate_unit_price(
         self, price: float, size: float, unit_type: str
     ) -> float:
-        """Calculate price per unit.
+        """Calculate price per unit of the given unit type.
+
+        The result is per ``unit_type`` as given; use
+        ``unit_conversion.normalized_unit_price`` to compare packs sold in
+        different units.
 
         Args:
             price: Total price
@@ -129,7 +135,6 @@ class ProductMatcher:
         if size <= 0:
             return price
 
-        normalized_unit = self.normalize_unit(unit_type)
         return round(price / size, 4)
 
     def find_best_match(
@@ -164,16 +169,20 @@ class ProductMatcher:
         if not self._product_cache or not self._name_cache:
             return []
 
-        # Normalize the query
-        normalized_query = self._normalize_name(query)
+        with track_matcher():
+            # Normalize the query
+            normalized_query = self._normalize_name(query)
 
-        # Use rapidfuzz to find matches
-        results = process.extract(
-            normalized_query,
-            self._name_cache,
-            scorer=fuzz.token_sort_ratio,
-            limit=limit,
-        )
+            # Use rapidfuzz to find matches
+            results = process.extract(
+                normalized_query,
+                self._name_cache,
+                scorer=fuzz.token_sort_ratio,
+                limit=limit,
+            )
+
+        if results:
+            MATCHER_BEST_SCORE.observe(results[0][1])
 
         matches = []
         for name, score, idx in results:
@@ -188,6 +197,7 @@ class ProductMatcher:
                     "upc": product.upc,
                 })
 
+        MATCHER_CANDIDATES.observe(len(matches))
         return matches
 
     def match_by_upc(self, upc: str) -> Optional[dict[str, Any]]:
@@ -199,7 +209,7 @@ class ProductMatcher:
         Returns:
             Matching product or None
         """
-        product = self.db.query(Product).filter(Product.upc == upc).first()
+        product = self.db.execute(product_by_upc(upc)).scalar_one_or_none()
 
         if product:
             return {
@@ -266,7 +276,8 @@ class ProductMatcher:
         return matches[:limit]
 
     def refresh_cache(self) -> None:
-        """Clear and reload the product cache."""
+        """Clear and reload the product cache from the database."""
+        self._catalog = None
         self._product_cache = None
         self._name_cache = None
         self._load_products()
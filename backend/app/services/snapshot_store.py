@@ -0,0 +1,319 @@
+"""Content-addressed store of raw circular snapshots.
+
+Every fetched circular (Flipp JSON, weekly-ad HTML or PDF) is kept as a
+zstd-compressed blob under the SHA-256 of its raw bytes, so identical
+fetches, e.g. the same weekly ad fetched daily or for neighbouring ZIP
+codes, are stored once. A small index records which blob each fetch
+returned, by chain, ZIP code and fetch time, so parsing can be replayed
+from the stored bytes without fetching again.
+
+Layout, on the local filesystem or under an S3 bucket prefix::
+
+    blobs/<hash[:2]>/<hash>.zst
+    index/<chain>/<zip_code>/<fetched_at>.json
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional, Protocol, Union
+
+import zstandard
+
+from app.config import get_settings
+
+# zstd level for blobs: written once a week per chain and ZIP, read rarely
+SNAPSHOT_ZSTD_LEVEL = 10
+
+# Index keys sort by fetch time
+FETCHED_AT_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Index entry of one fetch: where it came from and which blob it returned."""
+
+    store_chain: str
+    zip_code: str
+    fetched_at: datetime
+    content_hash: str
+    content_type: str
+    size: int
+
+
+class BlobStorage(Protocol):
+    """Key/value object storage holding blobs and index entries."""
+
+    def exists(self, key: str) -> bool:
+        """Check whether an object exists."""
+        ...
+
+    def read(self, key: str) -> bytes:
+        """Read an object, raising ``KeyError`` if it does not exist."""
+        ...
+
+    def write(self, key: str, data: bytes) -> None:
+        """Write an object, replacing any existing one."""
+        ...
+
+    def list(self, prefix: str) -> list[str]:
+        """List the keys under a prefix, sorted."""
+        ...
+
+
+class LocalBlobStorage:
+    """Blob storage in a local directory, one file per key."""
+
+    def __init__(self, root: Union[str, "os.PathLike[str]"]):
+        """Initialize the storage.
+
+        Args:
+            root: Directory holding the objects, created on first write
+        """
+        self.root = Path(root)
+
+    def exists(self, key: str) -> bool:
+        """Check whether an object exists."""
+        return (self.root / key).is_file()
+
+    def read(self, key: str) -> bytes:
+        """Read an object, raising ``KeyError`` if it does not exist."""
+        try:
+            return (self.root / key).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    def write(self, key: str, data: bytes) -> None:
+        """Write an object atomically, so readers never see a partial blob."""
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as output:
+                output.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def list(self, prefix: str) -> list[str]:
+        """List the keys under a prefix, sorted."""
+        directory = self.root / prefix
+        if not directory.is_dir():
+            return []
+        return sorted(
+            path.relative_to(self.root).as_posix()
+            for path in directory.rglob("*")
+            if path.is_file() and not path.name.startswith(".tmp-")
+        )
+
+
+class S3BlobStorage:
+    """Blob storage in an S3-compatible bucket (AWS S3, MinIO, R2, ...).
+
+    Requires boto3 (``pip install grocery-compare-backend[s3]``); credentials
+    come from the usual AWS environment variables or config files.
+    """
+
+    def __init__(
+        self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None, client: Any = None
+    ):
+        """Initialize the storage.
+
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix of every object
+            endpoint_url: Endpoint of an S3-compatible service other than AWS
+            client: S3 client to use instead of creating one with boto3
+        """
+        if client is None:
+            import boto3
+
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+
+    def exists(self, key: str) -> bool:
+        """Check whether an object exists."""
+        response = self.client.list_objects_v2(Bucket=self.bucket, Prefix=self.prefix + key, MaxKeys=1)
+        return any(entry["Key"] == self.prefix + key for entry in response.get("Contents", ()))
+
+    def read(self, key: str) -> bytes:
+        """Read an object, raising ``KeyError`` if it does not exist."""
+        if not self.exists(key):
+            raise KeyError(key)
+        data: bytes = self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"].read()
+        return data
+
+    def write(self, key: str, data: bytes) -> None:
+        """Write an object, replacing any existing one."""
+        self.client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=data)
+
+    def list(self, prefix: str) -> list[str]:
+        """List the keys under a prefix, sorted."""
+        keys: list[str] = []
+        options = {"Bucket": self.bucket, "Prefix": self.prefix + prefix}
+        while True:
+            response = self.client.list_objects_v2(**options)
+            keys.extend(entry["Key"][len(self.prefix):] for entry in response.get("Contents", ()))
+            if not response.get("IsTruncated"):
+                return sorted(keys)
+            options["ContinuationToken"] = response["NextContinuationToken"]
+
+
+def _slug(value: str) -> str:
+    """Lower-case a chain name or ZIP code for use in a key."""
+    return re.sub(r"[^a-z0-9]+", "-", value.strip().lower()).strip("-") or "unknown"
+
+
+class SnapshotStore:
+    """Content-addressed, compressed, deduplicated store of raw circulars."""
+
+    def __init__(self, storage: BlobStorage, level: int = SNAPSHOT_ZSTD_LEVEL):
+        """Initialize the store.
+
+        Args:
+            storage: Blob storage holding blobs and the index
+            level: zstd compression level of new blobs
+        """
+        self.storage = storage
+        self.level = level
+
+    @staticmethod
+    def blob_key(content_hash: str) -> str:
+        """Get the key of a blob."""
+        return f"blobs/{content_hash[:2]}/{content_hash}.zst"
+
+    def put(
+        self,
+        store_chain: str,
+        zip_code: str,
+        content: bytes,
+        content_type: str,
+        fetched_at: Optional[datetime] = None,
+    ) -> Snapshot:
+        """Store a fetched circular and record the fetch in the index.
+
+        The blob is only written if no earlier fetch returned the same bytes.
+
+        Args:
+            store_chain: Chain the circular was fetched for
+            zip_code: ZIP code the circular was fetched for
+            content: Raw fetched bytes
+            content_type: Content type, e.g. ``application/json``
+            fetched_at: Fetch time (default now)
+
+        Returns:
+            The index entry of the fetch
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        blob_key = self.blob_key(content_hash)
+        if not self.storage.exists(blob_key):
+            self.storage.write(blob_key, zstandard.ZstdCompressor(level=self.level).compress(content))
+
+        snapshot = Snapshot(
+            store_chain=store_chain,
+            zip_code=zip_code,
+            fetched_at=(fetched_at or datetime.now(timezone.utc)).astimezone(timezone.utc),
+            content_hash=content_hash,
+            content_type=content_type,
+            size=len(content),
+        )
+        entry = {**asdict(snapshot), "fetched_at": snapshot.fetched_at.isoformat()}
+        self.storage.write(self._index_key(snapshot), json.dumps(entry).encode())
+        return snapshot
+
+    def read(self, snapshot: Union[Snapshot, str]) -> bytes:
+        """Read the raw bytes of a snapshot.
+
+        Args:
+            snapshot: Index entry, or a content hash
+
+        Returns:
+            The bytes as fetched
+
+        Raises:
+            KeyError: If the blob does not exist
+            ValueError: If the stored blob does not match its hash
+        """
+        content_hash = snapshot.content_hash if isinstance(snapshot, Snapshot) else snapshot
+        content = zstandard.ZstdDecompressor().decompress(self.storage.read(self.blob_key(content_hash)))
+        if hashlib.sha256(content).hexdigest() != content_hash:
+            raise ValueError(f"Snapshot blob {content_hash} is corrupt")
+        return content
+
+    def history(self, store_chain: str, zip_code: str) -> list[Snapshot]:
+        """Get every recorded fetch of a chain's circular for a ZIP code.
+
+        Args:
+            store_chain: Chain name
+            zip_code: ZIP code
+
+        Returns:
+            Index entries, oldest first
+        """
+        return [self._read_entry(key) for key in self.storage.list(self._index_prefix(store_chain, zip_code))]
+
+    def latest(self, store_chain: str, zip_code: str) -> Optional[Snapshot]:
+        """Get the most recent fetch of a chain's circular for a ZIP code.
+
+        Args:
+            store_chain: Chain name
+            zip_code: ZIP code
+
+        Returns:
+            The newest index entry, or None if none was recorded
+        """
+        keys = self.storage.list(self._index_prefix(store_chain, zip_code))
+        return self._read_entry(keys[-1]) if keys else None
+
+    @staticmethod
+    def _index_prefix(store_chain: str, zip_code: str) -> str:
+        """Get the key prefix of a chain and ZIP code's index entries."""
+        return f"index/{_slug(store_chain)}/{_slug(zip_code)}/"
+
+    def _index_key(self, snapshot: Snapshot) -> str:
+        """Get the key of a snapshot's index entry."""
+        fetched_at = snapshot.fetched_at.strftime(FETCHED_AT_FORMAT)
+        return f"{self._index_prefix(snapshot.store_chain, snapshot.zip_code)}{fetched_at}.json"
+
+    def _read_entry(self, key: str) -> Snapshot:
+        """Read an index entry."""
+        entry = json.loads(self.storage.read(key))
+        return Snapshot(**{**entry, "fetched_at": datetime.fromisoformat(entry["fetched_at"])})
+
+
+def open_snapshot_store(url: str, endpoint_url: Optional[str] = None) -> SnapshotStore:
+    """Open a snapshot store from a location.
+
+    Args:
+        url: Local directory, or ``s3://bucket/prefix``
+        endpoint_url: Endpoint of an S3-compatible service other than AWS
+
+    Returns:
+        Snapshot store at that location
+    """
+    if url.startswith("s3://"):
+        bucket, _, prefix = url[len("s3://"):].partition("/")
+        return SnapshotStore(S3BlobStorage(bucket, prefix, endpoint_url))
+    return SnapshotStore(LocalBlobStorage(url))
+
+
+_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Get the configured snapshot store, if enabled."""
+    global _store
+    settings = get_settings()
+    if not settings.snapshot_store_url:
+        return None
+    if _store is None:
+        _store = open_snapshot_store(settings.snapshot_store_url, settings.snapshot_s3_endpoint_url)
+    return _store
@@ -0,0 +1,269 @@
+"""Warm per-ZIP store directory shared through Redis."""
+
+import logging
+import threading
+import uuid
+from collections.abc import Iterable
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import CacheManager, get_cache_manager
+from app.models.store import Store
+from app.services.store_locator import StoreLocator
+
+logger = logging.getLogger(__name__)
+
+
+class StoreEntry(NamedTuple):
+    """Store fields needed to run and present a comparison."""
+
+    id: int
+    name: str
+    chain: str
+    address: Optional[str]
+    zip_code: str
+    lat: Optional[float]
+    lng: Optional[float]
+
+
+class StoreDirectory:
+    """Immutable in-memory snapshot of every store.
+
+    Holds the per-ZIP rosters and the nearest-store index so a comparison
+    never queries the stores table. A new snapshot replaces the old one
+    whenever stores change.
+    """
+
+    def __init__(self, stores: Iterable[StoreEntry], version: Optional[str] = None):
+        """Build the directory.
+
+        Args:
+            stores: Every store
+            version: Token identifying this snapshot (generated if omitted)
+        """
+        self.version = version or uuid.uuid4().hex
+        self._by_id = {store.id: store for store in sorted(stores)}
+        by_zip: dict[str, list[StoreEntry]] = {}
+        for store in self._by_id.values():
+            by_zip.setdefault(store.zip_code, []).append(store)
+        self._by_zip = {zip_code: tuple(roster) for zip_code, roster in by_zip.items()}
+        self.locator = StoreLocator(
+            (store.id, store.zip_code, store.lat, store.lng) for store in self._by_id.values()
+        )
+
+    @classmethod
+    def from_session(cls, db: Session) -> "StoreDirectory":
+        """Load every store from the database.
+
+        Args:
+            db: SQLAlchemy database session
+
+        Returns:
+            Store directory
+        """
+        rows = db.execute(
+            select(
+                Store.id, Store.name, Store.chain, Store.address, Store.zip_code, Store.lat, Store.lng
+            )
+        )
+        return cls(StoreEntry(*row) for row in rows.tuples())
+
+    @classmethod
+    def from_rosters(
+        cls, version: str, rosters: dict[str, list[dict[str, Any]]]
+    ) -> "StoreDirectory":
+        """Rebuild a directory from cached per-ZIP rosters.
+
+        Args:
+            version: Version token of the cached rosters
+            rosters: Store records by ZIP code
+
+        Returns:
+            Store directory
+        """
+        return cls(
+            (StoreEntry(**record) for roster in rosters.values() for record in roster),
+            version,
+        )
+
+    def to_rosters(self) -> dict[str, list[dict[str, Any]]]:
+        """Get per-ZIP rosters for caching.
+
+        Returns:
+            Store records by ZIP code
+        """
+        return {
+            zip_code: [store._asdict() for store in roster]
+            for zip_code, roster in self._by_zip.items()
+        }
+
+    @property
+    def size(self) -> int:
+        """Number of stores in the directory."""
+        return len(self._by_id)
+
+    def for_zip(self, zip_code: str) -> list[StoreEntry]:
+        """Get the stores in a ZIP code, ordered by ID.
+
+        Args:
+            zip_code: ZIP code
+
+        Returns:
+            Stores in the ZIP code
+        """
+        return list(self._by_zip.get(zip_code, ()))
+
+    def get_many(self, store_ids: Iterable[int]) -> list[StoreEntry]:
+        """Get stores by ID, keeping the given order and skipping unknown IDs.
+
+        Args:
+            store_ids: Store IDs
+
+        Returns:
+            Known stores in the given order
+        """
+        return [self._by_id[store_id] for store_id in store_ids if store_id in self._by_id]
+
+
+_directory: Optional[StoreDirectory] = None
+_lock = threading.Lock()
+_cache: Optional[CacheManager] = None
+
+
+def _get_cache() -> Optional[CacheManager]:
+    """Get the Redis cache shared by store directories, if enabled."""
+    global _cache
+    if not get_settings().store_directory_cache:
+        return None
+    if _cache is None:
+        _cache = get_cache_manager()
+    return _cache
+
+
+def _install(directory: StoreDirectory) -> StoreDirectory:
+    """Make a directory the process-wide snapshot."""
+    global _directory
+    _directory = directory
+    return directory
+
+
+def load_store_directory(db: Session) -> StoreDirectory:
+    """Load the directory, preferring rosters already published to Redis.
+
+    Args:
+        db: SQLAlchemy database session used if Redis has no rosters
+
+    Returns:
+        Process-wide store directory
+    """
+    cache = _get_cache()
+    cached = cache.get_store_rosters() if cache else None
+    with _lock:
+        if cached is not None:
+            return _install(StoreDirectory.from_rosters(*cached))
+        directory = StoreDirectory.from_session(db)
+        if cache:
+            cache.set_store_rosters(directory.version, directory.to_rosters())
+        return _install(directory)
+
+
+def refresh_store_directory(db: Session) -> StoreDirectory:
+    """Rebuild the directory from the database and publish it to Redis.
+
+    Args:
+        db: SQLAlchemy database session
+
+    Returns:
+        Process-wide store directory
+    """
+    directory = StoreDirectory.from_session(db)
+    cache = _get_cache()
+    if cache:
+        cache.set_store_rosters(directory.version, directory.to_rosters())
+    with _lock:
+        return _install(directory)
+
+
+def sync_store_directory(db: Session) -> StoreDirectory:
+    """Pick up rosters published by other processes.
+
+    Reloads from Redis when its version differs from the local snapshot.
+    If the cached rosters are gone (expired or flushed), the directory is
+    rebuilt from the database and republished.
+
+    Args:
+        db: SQLAlchemy database session
+
+    Returns:
+        Process-wide store directory
+    """
+    cache = _get_cache()
+    if _directory is None or cache is None:
+        return refresh_store_directory(db)
+
+    version = cache.get_store_directory_version()
+    if version is None:
+        return refresh_store_directory(db)
+    if version != _directory.version:
+        cached = cache.get_store_rosters()
+        if cached is not None:
+            with _lock:
+                return _install(StoreDirectory.from_rosters(*cached))
+    return _directory
+
+
+def get_store_directory(db: Session) -> StoreDirectory:
+    """Get the process-wide store directory.
+
+    The directory is loaded at startup and refreshed by the scheduler and
+    after store writes; loading here is only a fallback.
+
+    Args:
+        db: SQLAlchemy database session used if the directory must be loaded
+
+    Returns:
+        Store directory
+    """
+    directory = _directory
+    if directory is None:
+        return load_store_directory(db)
+    return directory
+
+
+def invalidate_store_directory() -> None:
+    """Drop the process-wide directory so it is reloaded on next use."""
+    global _directory
+    _directory = None
+
+
+@event.listens_for(Session, "after_flush")
+def _track_store_writes(session: Session, flush_context: Any) -> None:
+    """Remember that a transaction inserted, updated or deleted stores."""
+    if any(
+        isinstance(instance, Store)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info["stores_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_after_store_writes(session: Session) -> None:
+    """Rebuild the directory once a transaction that wrote stores commits."""
+    if not session.info.pop("stores_changed", False) or _directory is None:
+        return
+    try:
+        with Session(bind=session.get_bind()) as db:
+            refresh_store_directory(db)
+    except Exception:
+        # The scheduled sync retries; never fail the committing request
+        logger.exception("Failed to refresh the store directory after a store write")
+        invalidate_store_directory()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_store_writes(session: Session) -> None:
+    """Discard store write tracking when a transaction rolls back."""
+    session.info.pop("stores_changed", None)
@@ -0,0 +1,193 @@
+"""Nearest-store search service using an in-memory spatial index."""
+
+import heapq
+import math
+from collections.abc import Iterable
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.store import Store
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Points per KD-tree leaf; small leaves keep per-query work in microseconds
+_LEAF_SIZE = 8
+
+
+class StoreDistance(NamedTuple):
+    """A store and its great-circle distance from the search point."""
+
+    store_id: int
+    distance_miles: float
+
+
+class _Node:
+    """KD-tree node; leaves hold points, inner nodes hold a split plane."""
+
+    __slots__ = ("axis", "split", "left", "right", "points")
+
+    def __init__(self) -> None:
+        self.axis = 0
+        self.split = 0.0
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        self.points: Optional[list[tuple[float, float, float, int]]] = None
+
+
+def _to_unit_vector(lat: float, lng: float) -> tuple[float, float, float]:
+    """Convert latitude/longitude in degrees to a point on the unit sphere."""
+    lat_rad = math.radians(lat)
+    lng_rad = math.radians(lng)
+    cos_lat = math.cos(lat_rad)
+    return cos_lat * math.cos(lng_rad), cos_lat * math.sin(lng_rad), math.sin(lat_rad)
+
+
+def _chord_to_miles(chord_squared: float) -> float:
+    """Convert a squared chord length on the unit sphere to miles."""
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(chord_squared) / 2))
+
+
+def _miles_to_chord_squared(miles: float) -> float:
+    """Convert a great-circle distance in miles to a squared chord length."""
+    angle = min(miles / EARTH_RADIUS_MILES, math.pi)
+    chord = 2 * math.sin(angle / 2)
+    return chord * chord
+
+
+class StoreLocator:
+    """Service for radius and k-nearest store searches.
+
+    Store coordinates are indexed as 3D points on the unit sphere in a
+    KD-tree. Straight-line (chord) distance grows monotonically with
+    great-circle distance, so tree pruning is exact and the haversine is only
+    evaluated for the stores actually returned.
+    """
+
+    def __init__(self, stores: Iterable[tuple[int, str, Optional[float], Optional[float]]]):
+        """Build the index.
+
+        Args:
+            stores: (store_id, zip_code, lat, lng) tuples; stores without
+                coordinates are skipped
+        """
+        points = []
+        zip_sums: dict[str, list[float]] = {}
+        for store_id, zip_code, lat, lng in stores:
+            if lat is None or lng is None:
+                continue
+            points.append((*_to_unit_vector(lat, lng), store_id))
+            # Sum per ZIP code and per 3-digit prefix (the USPS sectional center)
+            for key in (zip_code, zip_code[:3]):
+                sums = zip_sums.setdefault(key, [0.0, 0.0, 0.0])
+                sums[0] += lat
+                sums[1] += lng
+                sums[2] += 1
+
+        self.size = len(points)
+        self._root = self._build(points) if points else None
+        self._zip_centroids = {
+            zip_code: (lat_sum / count, lng_sum / count)
+            for zip_code, (lat_sum, lng_sum, count) in zip_sums.items()
+        }
+
+    @classmethod
+    def from_session(cls, db: Session) -> "StoreLocator":
+        """Build the index from the stores table.
+
+        Args:
+            db: SQLAlchemy database session
+
+        Returns:
+            Store locator covering every store with coordinates
+        """
+        rows = db.execute(select(Store.id, Store.zip_code, Store.lat, Store.lng))
+        return cls(rows.tuples())
+
+    def _build(self, points: list[tuple[float, float, float, int]]) -> _Node:
+        """Recursively build a KD-tree, splitting on the widest axis."""
+        node = _Node()
+        if len(points) <= _LEAF_SIZE:
+            node.points = points
+            return node
+
+        spreads = [
+            max(point[axis] for point in points) - min(point[axis] for point in points)
+            for axis in range(3)
+        ]
+        axis = spreads.index(max(spreads))
+        points.sort(key=lambda point: point[axis])
+        middle = len(points) // 2
+
+        node.axis = axis
+        node.split = points[middle][axis]
+        node.left = self._build(points[:middle])
+        node.right = self._build(points[middle:])
+        return node
+
+    def zip_centroid(self, zip_code: str) -> Optional[tuple[float, float]]:
+        """Get the mean coordinates of the indexed stores in a ZIP code.
+
+        A ZIP code without stores falls back to the stores sharing its
+        3-digit prefix, which are in the same region.
+
+        Args:
+            zip_code: ZIP code
+
+        Returns:
+            (lat, lng) or None if no store in the ZIP code or its prefix has
+            coordinates
+        """
+        return self._zip_centroids.get(zip_code) or self._zip_centroids.get(zip_code[:3])
+
+    def nearest(
+        self, lat: float, lng: float, k: int, radius_miles: Optional[float] = None
+    ) -> list[StoreDistance]:
+        """Find the k nearest stores, optionally within a radius.
+
+        Args:
+            lat: Search latitude
+            lng: Search longitude
+            k: Maximum number of stores to return
+            radius_miles: Optional maximum distance in miles
+
+        Returns:
+            Up to k stores ordered by distance
+        """
+        if self._root is None or k <= 0:
+            return []
+
+        qx, qy, qz = _to_unit_vector(lat, lng)
+        query = (qx, qy, qz)
+        bound = _miles_to_chord_squared(radius_miles) if radius_miles is not None else math.inf
+        # Max-heap (negated distances) of the best k candidates so far
+        best: list[tuple[float, int]] = []
+
+        def visit(node: _Node) -> None:
+            nonlocal bound
+            if node.points is not None:
+                for x, y, z, store_id in node.points:
+                    squared = (x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2
+                    if squared > bound:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-squared, store_id))
+                    else:
+                        heapq.heapreplace(best, (-squared, store_id))
+                    if len(best) == k:
+                        bound = -best[0][0]
+                return
+
+            diff = query[node.axis] - node.split
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            visit(near)  # type: ignore[arg-type]
+            if diff * diff <= bound:
+                visit(far)  # type: ignore[arg-type]
+
+        visit(self._root)
+        return [
+            StoreDistance(store_id, _chord_to_miles(-negated))
+            for negated, store_id in sorted(best, reverse=True)
+        ]
+
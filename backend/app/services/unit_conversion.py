@@ -0,0 +1,123 @@
+"""Unit conversion between pack sizes of the same dimension.
+
+Every unit belongs to a dimension (mass, volume or count) and converts to
+that dimension's base unit: ounces, fluid ounces or items. Unit spellings
+and factors are in ``app.services.units``: the circular parser's and product
+matcher's spellings plus metric and fluid units. A plain "oz" is
+always a weight; liquids must say "fl oz" to compare against gallons or
+liters.
+"""
+
+import re
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+
+from app.services.units import BASE_UNITS, UNIT_ALIASES, UNIT_FACTORS
+
+_SPELLING_NOISE = re.compile(r"[.\s]+")
+
+
+def canonical_unit(unit: Optional[str]) -> Optional[str]:
+    """Get the canonical name of a unit spelling.
+
+    Args:
+        unit: Unit as written, e.g. "Fl. Oz" or "pounds"
+
+    Returns:
+        Canonical unit, or None if the unit is unknown
+    """
+    if not unit:
+        return None
+    spelling = _SPELLING_NOISE.sub(" ", unit.lower()).strip()
+    return UNIT_ALIASES.get(spelling)
+
+
+def unit_dimension(unit: Optional[str]) -> Optional[str]:
+    """Get the dimension (mass, volume or count) of a unit, if known."""
+    canonical = canonical_unit(unit)
+    return UNIT_FACTORS[canonical][0] if canonical else None
+
+
+def to_base(size: Optional[float], unit: Optional[str]) -> Optional[tuple[float, str]]:
+    """Convert a pack size to its dimension's base unit.
+
+    Args:
+        size: Pack size in ``unit``
+        unit: Unit of the size
+
+    Returns:
+        (size in base units, base unit), or None if the size or unit is unusable
+    """
+    canonical = canonical_unit(unit)
+    if canonical is None or size is None or size <= 0:
+        return None
+    dimension, factor = UNIT_FACTORS[canonical]
+    return size * factor, BASE_UNITS[dimension]
+
+
+def normalized_unit_price(
+    price: float, size: Optional[float], unit: Optional[str]
+) -> Optional[tuple[float, str]]:
+    """Get the price per base unit (oz, fl oz or ct) of a pack.
+
+    Args:
+        price: Pack price
+        size: Pack size in ``unit``
+        unit: Unit of the size
+
+    Returns:
+        (price per base unit, base unit), or None if the pack size is unknown
+    """
+    base = to_base(size, unit)
+    if base is None:
+        return None
+    return price / base[0], base[1]
+
+
+def to_base_many(
+    sizes: Sequence[Optional[float]], units: Sequence[Optional[str]]
+) -> tuple[np.ndarray, list[Optional[str]]]:
+    """Convert many pack sizes to base units at once.
+
+    Unit spellings are resolved once per distinct spelling and the sizes
+    are scaled as one array.
+
+    Args:
+        sizes: Pack sizes
+        units: Unit of each size
+
+    Returns:
+        (sizes in base units with NaN where unknown, base unit or None per size)
+    """
+    resolved: dict[Optional[str], tuple[float, Optional[str]]] = {}
+    for unit in set(units):
+        canonical = canonical_unit(unit)
+        if canonical is None:
+            resolved[unit] = (np.nan, None)
+        else:
+            dimension, factor = UNIT_FACTORS[canonical]
+            resolved[unit] = (factor, BASE_UNITS[dimension])
+
+    factors = np.array([resolved[unit][0] for unit in units], dtype=float)
+    size_array = np.array([np.nan if size is None else size for size in sizes], dtype=float)
+    base = size_array * factors
+    base[~(base > 0)] = np.nan
+    base_units = [resolved[unit][1] if base_size == base_size else None for unit, base_size in zip(units, base)]
+    return base, base_units
+
+
+def normalized_unit_prices(prices: Sequence[Optional[float]], base_sizes: np.ndarray) -> np.ndarray:
+    """Divide many prices by their pack sizes in base units.
+
+    Args:
+        prices: Pack prices (None where there is no price)
+        base_sizes: Pack sizes in base units, NaN where unknown
+
+    Returns:
+        Prices per base unit, NaN where the price or size is unknown
+    """
+    price_array = np.array([np.nan if price is None else price for price in prices], dtype=float)
+    unit_prices: np.ndarray = price_array / base_sizes
+    return unit_prices
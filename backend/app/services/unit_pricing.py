@@ -0,0 +1,208 @@
+"""Normalized unit prices stored with every price row.
+
+Prices written through the ORM get their ``normalized_*`` columns filled in
+before each flush, with one product lookup and one vectorized conversion
+per flush. Bulk loaders call ``normalize_price_rows``. When a flush changes
+a product's pack size, ``backfill_normalized_unit_prices`` recomputes its
+rows with one set-based ``UPDATE``.
+"""
+
+from collections.abc import Collection, Iterable, Iterator, Mapping
+from itertools import islice
+from typing import Any, Optional, cast
+
+import numpy as np
+from sqlalchemy import ColumnElement, Connection, CursorResult, case, event, inspect, null, select, update
+from sqlalchemy.orm import Session
+
+from app.models.price import Price
+from app.models.product import Product
+from app.services.unit_conversion import canonical_unit, normalized_unit_prices, to_base_many
+from app.services.units import BASE_UNITS, UNIT_FACTORS
+
+# Price rows converted per vectorized batch
+BATCH_ROWS = 10_000
+
+# Columns that change a row's normalized unit price when written
+_SOURCE_COLUMNS = ("product_id", "price", "sale_price")
+
+# Product columns that change its prices' normalized unit prices
+_PACK_SIZE_COLUMNS = ("unit_size", "unit_type")
+
+_NORMALIZED_COLUMNS = ["normalized_unit_price", "normalized_sale_unit_price", "normalized_unit"]
+
+PackSize = tuple[Optional[float], Optional[str]]
+_UNKNOWN: PackSize = (None, None)
+
+
+def _nullable(values: np.ndarray) -> list[Optional[float]]:
+    """Convert NaN to None for storage."""
+    return [None if value != value else value for value in values.tolist()]
+
+
+def normalize_prices(
+    prices: list[float], sale_prices: list[Optional[float]], pack_sizes: list[PackSize]
+) -> tuple[list[Optional[float]], list[Optional[float]], list[Optional[str]]]:
+    """Compute normalized unit prices for a batch of price rows.
+
+    Args:
+        prices: Regular price of each row
+        sale_prices: Sale price of each row, if any
+        pack_sizes: Product (unit_size, unit_type) of each row
+
+    Returns:
+        Regular and sale price per base unit and the base unit, per row
+    """
+    base_sizes, base_units = to_base_many([size for size, _ in pack_sizes], [unit for _, unit in pack_sizes])
+    return (
+        _nullable(normalized_unit_prices(prices, base_sizes)),
+        _nullable(normalized_unit_prices(sale_prices, base_sizes)),
+        base_units,
+    )
+
+
+def normalize_price_rows(
+    rows: Iterable[dict[str, Any]], pack_sizes: Mapping[int, PackSize]
+) -> Iterator[dict[str, Any]]:
+    """Add normalized unit prices to price rows for bulk loading.
+
+    Args:
+        rows: Price rows with ``product_id``, ``price`` and ``sale_price``
+        pack_sizes: (unit_size, unit_type) by product ID
+
+    Yields:
+        The rows with their ``normalized_*`` values set
+    """
+    rows = iter(rows)
+    while batch := list(islice(rows, BATCH_ROWS)):
+        regular, sale, units = normalize_prices(
+            [row["price"] for row in batch],
+            [row.get("sale_price") for row in batch],
+            [pack_sizes.get(row["product_id"], _UNKNOWN) for row in batch],
+        )
+        for row, regular_value, sale_value, unit in zip(batch, regular, sale, units):
+            row["normalized_unit_price"] = regular_value
+            row["normalized_sale_unit_price"] = sale_value
+            row["normalized_unit"] = unit
+            yield row
+
+
+def backfill_normalized_unit_prices(
+    connection: Connection, product_ids: Optional[Collection[int]] = None
+) -> int:
+    """Recompute the normalized unit prices of stored price rows in the database.
+
+    Unit spellings are resolved in Python once per distinct spelling; the
+    prices are then updated by one ``UPDATE ... FROM`` joined to each
+    product's pack size in base units, without reading any price rows.
+
+    Args:
+        connection: Database connection; the caller commits
+        product_ids: Only recompute these products' prices (default all)
+
+    Returns:
+        Number of price rows updated
+    """
+    spellings = select(Product.unit_type).distinct().where(Product.unit_type.is_not(None))
+    if product_ids is not None:
+        spellings = spellings.where(Product.id.in_(list(product_ids)))
+    factors: dict[str, float] = {}
+    base_units: dict[str, str] = {}
+    for spelling in connection.scalars(spellings):
+        canonical = canonical_unit(spelling)
+        if spelling is not None and canonical is not None:
+            dimension, factors[spelling] = UNIT_FACTORS[canonical]
+            base_units[spelling] = BASE_UNITS[dimension]
+
+    # Pack size in base units, NULL where the size or unit is unusable
+    usable = Product.unit_size > 0
+    if factors:
+        base_size: ColumnElement[Any] = case(
+            (usable, Product.unit_size * case(factors, value=Product.unit_type))
+        )
+        base_unit: ColumnElement[Any] = case((usable, case(base_units, value=Product.unit_type)))
+    else:
+        base_size = base_unit = null()
+    packs = select(Product.id, base_size.label("base_size"), base_unit.label("base_unit"))
+    prices = update(Price)
+    if product_ids is not None:
+        packs = packs.where(Product.id.in_(list(product_ids)))
+        prices = prices.where(Price.product_id.in_(list(product_ids)))
+    pack = packs.subquery("pack")
+
+    result = connection.execute(
+        prices.where(Price.product_id == pack.c.id).values(
+            normalized_unit_price=Price.price / pack.c.base_size,
+            normalized_sale_unit_price=Price.sale_price / pack.c.base_size,
+            normalized_unit=pack.c.base_unit,
+        )
+    )
+    return cast(CursorResult[Any], result).rowcount
+
+
+def _needs_normalizing(session: Session, price: Price) -> bool:
+    """Check whether a price is new or one of its source columns changed."""
+    if price in session.new:
+        return True
+    attributes = inspect(price).attrs
+    return any(attributes[column].history.has_changes() for column in _SOURCE_COLUMNS)
+
+
+@event.listens_for(Session, "before_flush")
+def _normalize_price_writes(session: Session, flush_context: Any, instances: Any) -> None:
+    """Fill in normalized unit prices of prices about to be written."""
+    prices = [
+        instance
+        for instance in (*session.new, *session.dirty)
+        if isinstance(instance, Price) and _needs_normalizing(session, instance)
+    ]
+    if not prices:
+        return
+
+    # Products attached to the price (possibly pending) are used as is; the
+    # rest are looked up in one query
+    attached = [price.__dict__.get("product") for price in prices]
+    unknown = {
+        price.product_id
+        for price, product in zip(prices, attached)
+        if product is None and price.product_id is not None
+    }
+    stored: dict[int, PackSize] = {}
+    if unknown:
+        with session.no_autoflush:
+            rows = session.execute(
+                select(Product.id, Product.unit_size, Product.unit_type).where(Product.id.in_(unknown))
+            )
+            stored = {product_id: (size, unit) for product_id, size, unit in rows}
+
+    regular, sale, units = normalize_prices(
+        [price.price for price in prices],
+        [price.sale_price for price in prices],
+        [
+            (product.unit_size, product.unit_type) if product is not None else stored.get(price.product_id, _UNKNOWN)
+            for price, product in zip(prices, attached)
+        ],
+    )
+    for price, regular_value, sale_value, unit in zip(prices, regular, sale, units):
+        price.normalized_unit_price = regular_value
+        price.normalized_sale_unit_price = sale_value
+        price.normalized_unit = unit
+
+
+@event.listens_for(Session, "after_flush")
+def _backfill_pack_size_changes(session: Session, flush_context: Any) -> None:
+    """Recompute the stored prices of products whose pack size was just written."""
+    product_ids = {
+        instance.id
+        for instance in session.dirty
+        if isinstance(instance, Product)
+        and any(inspect(instance).attrs[column].history.has_changes() for column in _PACK_SIZE_COLUMNS)
+    }
+    if not product_ids:
+        return
+
+    backfill_normalized_unit_prices(session.connection(), product_ids)
+    # Loaded prices of those products hold the old values
+    for instance in list(session.identity_map.values()):
+        if isinstance(instance, Price) and instance.product_id in product_ids:
+            session.expire(instance, _NORMALIZED_COLUMNS)
@@ -0,0 +1,92 @@
+"""Unit tables shared by the parsers, the product matcher and unit conversion.
+
+Kept free of imports so the unit math can be loaded without the parsers'
+and matcher's dependencies.
+"""
+
+# Unit spellings in weekly ads -> the circular parser's unit names
+CIRCULAR_UNITS: dict[str, str] = {
+    "lb": "lb",
+    "lbs": "lb",
+    "pound": "lb",
+    "pounds": "lb",
+    "oz": "oz",
+    "ounce": "oz",
+    "ounces": "oz",
+    "ea": "each",
+    "each": "each",
+    "ct": "count",
+    "count": "count",
+}
+
+# Product unit spellings -> the product matcher's unit names
+PRODUCT_UNITS: dict[str, str] = {
+    "ounce": "oz",
+    "ounces": "oz",
+    "pound": "lb",
+    "pounds": "lb",
+    "lbs": "lb",
+    "gallon": "gal",
+    "gallons": "gal",
+    "liter": "l",
+    "liters": "l",
+    "litre": "l",
+    "litres": "l",
+    "count": "ct",
+    "ct": "ct",
+    "pack": "ct",
+    "each": "ea",
+    "piece": "ea",
+    "pieces": "ea",
+}
+
+MASS = "mass"
+VOLUME = "volume"
+COUNT = "count"
+
+# Base unit of each dimension; normalized unit prices are per base unit
+BASE_UNITS = {MASS: "oz", VOLUME: "fl oz", COUNT: "ct"}
+
+# Canonical unit -> (dimension, base units per unit)
+UNIT_FACTORS: dict[str, tuple[str, float]] = {
+    "oz": (MASS, 1.0),
+    "lb": (MASS, 16.0),
+    "g": (MASS, 1 / 28.349523125),
+    "kg": (MASS, 1000 / 28.349523125),
+    "fl oz": (VOLUME, 1.0),
+    "cup": (VOLUME, 8.0),
+    "pt": (VOLUME, 16.0),
+    "qt": (VOLUME, 32.0),
+    "gal": (VOLUME, 128.0),
+    "ml": (VOLUME, 1 / 29.5735295625),
+    "l": (VOLUME, 1000 / 29.5735295625),
+    "ct": (COUNT, 1.0),
+    "ea": (COUNT, 1.0),
+    "each": (COUNT, 1.0),
+    "count": (COUNT, 1.0),
+    "dozen": (COUNT, 12.0),
+}
+
+# Spelling -> canonical unit
+UNIT_ALIASES: dict[str, str] = {
+    **{unit: unit for unit in UNIT_FACTORS},
+    **CIRCULAR_UNITS,
+    **PRODUCT_UNITS,
+    "floz": "fl oz",
+    "fluid ounce": "fl oz",
+    "fluid ounces": "fl oz",
+    "gram": "g",
+    "grams": "g",
+    "kilogram": "kg",
+    "kilograms": "kg",
+    "milliliter": "ml",
+    "milliliters": "ml",
+    "millilitre": "ml",
+    "millilitres": "ml",
+    "cups": "cup",
+    "pint": "pt",
+    "pints": "pt",
+    "quart": "qt",
+    "quarts": "qt",
+    "doz": "dozen",
+}
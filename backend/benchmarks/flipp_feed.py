@@ -0,0 +1,124 @@
+"""Benchmark streaming Flipp feed parsing on a generated multi-hundred-MB feed.
+
+Writes a synthetic Flipp feed of the requested size to disk, one item at a
+time, then parses it with ``CircularParser.parse_flipp_stream`` and reports
+throughput and the process's peak memory before and after parsing. Memory
+should not grow with the feed size.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.flipp_feed --megabytes 300 --output flipp.json
+"""
+
+import argparse
+import json
+import random
+import resource
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from app.services.circular_parser import CircularParser
+
+PRODUCTS = ["Whole Milk", "Large Eggs", "Chicken Breast", "Bananas", "Cheerios", "Ground Coffee", "Greek Yogurt"]
+PRICE_FORMATS = [("", ""), ("2 for", ""), ("", "/lb"), ("10 for", ""), ("", " ea")]
+
+
+def flipp_item(rng: random.Random, index: int, today: date) -> dict[str, Any]:
+    """Generate one Flipp flyer item."""
+    pre_price_text, post_price_text = rng.choice(PRICE_FORMATS)
+    current_price = round(rng.uniform(0.5, 15.0), 2)
+    return {
+        "id": index,
+        "name": f"{rng.choice(PRODUCTS)} {index % 1000} selected varieties",
+        "current_price": current_price,
+        "original_price": round(current_price * rng.uniform(1.05, 1.6), 2),
+        "pre_price_text": pre_price_text,
+        "post_price_text": post_price_text,
+        "sale_story": rng.choice(["", "Buy 1 Get 1 Free", "Save $2", "With card"]),
+        "valid_from": f"{today.isoformat()}T04:00:00+00:00",
+        "valid_to": f"{(today + timedelta(days=6)).isoformat()}T03:59:59+00:00",
+        "category_names": [rng.choice(["Dairy", "Meat", "Produce", "Pantry"])],
+        "cutout_image_url": f"https://f.wishabi.net/page_items/{index}/cutout.jpg",
+        "description": "x" * rng.randint(40, 400),
+    }
+
+
+def write_flipp_feed(output: BinaryIO, target_bytes: int, seed: int = 42, today: date = date(2024, 6, 2)) -> int:
+    """Write a Flipp feed of about ``target_bytes``, one item at a time.
+
+    Args:
+        output: Binary file to write to
+        target_bytes: Approximate feed size
+        seed: Random seed
+        today: First valid day of the flyer
+
+    Returns:
+        Number of flyer items written
+    """
+    rng = random.Random(seed)
+    header = {"merchant": {"id": 1, "name": "Kroger"}, "valid_from": today.isoformat()}
+    written = output.write(json.dumps(header)[:-1].encode() + b', "flyer_items": [')
+    count = 0
+    while written < target_bytes:
+        separator = b"," if count else b""
+        written += output.write(separator + json.dumps(flipp_item(rng, count, today)).encode())
+        count += 1
+    output.write(b'], "valid_to": "' + (today + timedelta(days=6)).isoformat().encode() + b'"}')
+    return count
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB (Linux units)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Generate the feed, parse it and collect results."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "flipp.json"
+        started = time.perf_counter()
+        with open(path, "wb") as feed:
+            written_items = write_flipp_feed(feed, args.megabytes * 1024 * 1024, args.seed)
+        generate_seconds = time.perf_counter() - started
+        size_mb = path.stat().st_size / 1024 / 1024
+
+        rss_before = _peak_rss_mb()
+        started = time.perf_counter()
+        parsed = sum(1 for _ in CircularParser().parse_flipp_stream(path))
+        parse_seconds = time.perf_counter() - started
+
+    return {
+        "feed_mb": round(size_mb, 1),
+        "items_written": written_items,
+        "items_parsed": parsed,
+        "generate_seconds": round(generate_seconds, 2),
+        "parse_seconds": round(parse_seconds, 2),
+        "items_per_sec": round(parsed / parse_seconds),
+        "mb_per_sec": round(size_mb / parse_seconds, 1),
+        "peak_rss_mb_before_parse": round(rss_before, 1),
+        "peak_rss_mb_after_parse": round(_peak_rss_mb(), 1),
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and write JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this path instead of stdout")
+    args = parser.parse_args()
+
+    results = run(args)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Benchmark HTML weekly-ad parsing on saved per-chain page fixtures.
+
+Parses one weekly-ad page per chain template (plus a schema.org microdata
+page) with ``CircularParser.parse_html_circular`` and reports throughput.
+Pages are read from ``--fixtures`` when saved there (``<chain>.html``);
+missing ones are generated and saved, so later runs and other tools reuse
+the same pages.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.html_circular --fixtures fixtures/html --items 2000 --output html.json
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from html import escape
+from pathlib import Path
+from typing import Any, Callable
+
+from app.services.circular_parser import CircularParser
+
+PRODUCTS = [
+    "Whole Milk Gallon", "Large Eggs 12ct", "Chicken Breast", "Bananas", "Cheerios Cereal",
+    "Ground Coffee", "Greek Yogurt", "Sliced Bread", "Cheddar Cheese", "Orange Juice",
+]
+
+CATEGORIES = ["Dairy", "Meat", "Produce", "Pantry", "Bakery"]
+
+# Markup between items on real pages: tracking attributes, icons, promo copy
+FILLER = '<div class="promo-badge" aria-hidden="true"><svg viewBox="0 0 24 24"><path d="{path}"/></svg>{copy}</div>'
+
+
+def _filler(rng: random.Random) -> str:
+    """Generate non-item markup of random length."""
+    path = " ".join(f"M{rng.randint(0, 24)} {rng.randint(0, 24)}" for _ in range(rng.randint(10, 40)))
+    return FILLER.format(path=path, copy="Limit 4 per household. " * rng.randint(1, 6))
+
+
+def _price(rng: random.Random) -> tuple[str, float]:
+    """Generate a sale price text and its regular price."""
+    price = rng.uniform(0.5, 12.0)
+    text = rng.choice(["${price:.2f}", "${price:.2f}/lb", "2 for ${double:.2f}", "${price:.2f} ea"])
+    return text.format(price=price, double=price * 2), price * rng.uniform(1.1, 1.6)
+
+
+def kroger_item(rng: random.Random, index: int) -> str:
+    """Generate one Kroger weekly-ad item."""
+    price, regular = _price(rng)
+    return (
+        f'<div class="kds-Card" data-qa="weekly-ad-item" data-item-id="{index}">'
+        f'<img src="https://www.kroger.com/product/images/{index}.jpg" alt="">'
+        f'<h2 data-qa="item-title">{rng.choice(PRODUCTS)} {index}</h2>'
+        f'<span data-qa="item-price">{escape(price)}</span>'
+        f'<span data-qa="item-regular-price">Reg. ${regular:.2f}</span>{_filler(rng)}</div>'
+    )
+
+
+def walmart_item(rng: random.Random, index: int) -> str:
+    """Generate one Walmart weekly-ad item."""
+    price, regular = _price(rng)
+    return (
+        f'<li data-item-id="{index}"><img data-testid="productTileImage" '
+        f'src="https://i5.walmartimages.com/asr/{index}.jpeg">'
+        f'<span data-automation-id="product-title">{rng.choice(PRODUCTS)} {index}</span>'
+        f'<div data-automation-id="product-price">{escape(price)}</div>'
+        f'<span data-automation-id="was-price">Was ${regular:.2f}</span>'
+        f'<span data-automation-id="price-per-unit">${regular / 16:.2f}/oz</span>{_filler(rng)}</li>'
+    )
+
+
+def target_item(rng: random.Random, index: int) -> str:
+    """Generate one Target weekly-ad offer."""
+    price, regular = _price(rng)
+    return (
+        f'<div data-test="weekly-ad-offer"><picture><img src="https://target.scene7.com/is/image/{index}">'
+        f'</picture><h3>{rng.choice(PRODUCTS)} {index}</h3>'
+        f'<p data-test="offer-price">{escape(price)}</p><p data-test="offer-reg-price">Reg ${regular:.2f}</p>'
+        f'<p data-test="offer-category">{rng.choice(CATEGORIES)}</p>{_filler(rng)}</div>'
+    )
+
+
+def microdata_item(rng: random.Random, index: int) -> str:
+    """Generate one schema.org Product item."""
+    return (
+        f'<article itemscope itemtype="https://schema.org/Product">'
+        f'<img itemprop="image" src="https://cdn.example.com/{index}.jpg">'
+        f'<h2 itemprop="name">{rng.choice(PRODUCTS)} {index}</h2>'
+        f'<div itemprop="offers" itemscope itemtype="https://schema.org/Offer">'
+        f'<span itemprop="price" content="{rng.uniform(0.5, 12.0):.2f}">On sale</span></div>'
+        f'<span itemprop="category">{rng.choice(CATEGORIES)}</span>{_filler(rng)}</article>'
+    )
+
+
+# Item generator of each fixture page, by chain
+ITEM_GENERATORS: dict[str, Callable[[random.Random, int], str]] = {
+    "kroger": kroger_item,
+    "walmart": walmart_item,
+    "target": target_item,
+    "microdata": microdata_item,
+}
+
+
+def weekly_ad_page(chain: str, items: int, seed: int = 42) -> bytes:
+    """Generate a weekly-ad page for a chain.
+
+    Args:
+        chain: Key of ``ITEM_GENERATORS``
+        items: Sale items on the page
+        seed: Random seed
+
+    Returns:
+        The page as UTF-8 bytes
+    """
+    rng = random.Random(seed)
+    generate = ITEM_GENERATORS[chain]
+    if chain == "kroger":
+        # Kroger groups items into department sections
+        size = max(1, items // len(CATEGORIES))
+        body = "".join(
+            f'<section data-category="{CATEGORIES[start // size % len(CATEGORIES)]}">'
+            + "".join(generate(rng, index) for index in range(start, min(start + size, items)))
+            + "</section>"
+            for start in range(0, items, size)
+        )
+    else:
+        body = "".join(generate(rng, index) for index in range(items))
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Weekly Ad</title>'
+        f'<script>window.__STATE__ = {json.dumps({"items": items, "chain": chain})};</script></head>'
+        f"<body><main>{body}</main></body></html>"
+    ).encode()
+
+
+def load_fixture(directory: Path, chain: str, items: int, seed: int) -> bytes:
+    """Read a chain's saved page, generating and saving it if missing."""
+    path = directory / f"{chain}.html"
+    if not path.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(weekly_ad_page(chain, items, seed))
+    return path.read_bytes()
+
+
+def bench_page(chain: str, page: bytes, repeat: int) -> dict[str, Any]:
+    """Parse a page ``repeat`` times and report the best run."""
+    parser = CircularParser(store_chain=None if chain == "microdata" else chain)
+    best = float("inf")
+    parsed = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parsed = len(parser.parse_html_circular(page))
+        best = min(best, time.perf_counter() - started)
+    size_mb = len(page) / 1024 / 1024
+    return {
+        "page_mb": round(size_mb, 2),
+        "items": parsed,
+        "parse_seconds": round(best, 4),
+        "mb_per_sec": round(size_mb / best, 1),
+        "items_per_sec": round(parsed / best),
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Load or generate the fixtures, parse each and collect results."""
+    results: dict[str, Any] = {"repeat": args.repeat}
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = Path(args.fixtures) if args.fixtures else Path(scratch)
+        for chain in ITEM_GENERATORS:
+            page = load_fixture(directory, chain, args.items, args.seed)
+            results[chain] = bench_page(chain, page, args.repeat)
+    return results
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and write JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", help="Directory of saved <chain>.html pages (default a temporary one)")
+    parser.add_argument("--items", type=int, default=2000, help="Items per generated page")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this path instead of stdout")
+    args = parser.parse_args()
+
+    results = run(args)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
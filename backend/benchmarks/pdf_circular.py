@@ -0,0 +1,150 @@
+"""Benchmark page-parallel PDF circular parsing on a generated weekly ad.
+
+Writes a synthetic multi-page PDF circular, then parses it with
+``CircularParser.parse_pdf_circular`` serially, across a process pool, and
+again with every page served from the page cache.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.pdf_circular --pages 60 --items-per-page 40 --output pdf.json
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Union
+
+import fakeredis
+
+from app.config import get_settings
+from app.core.cache import CacheManager
+from app.services.circular_parser import CircularParser
+
+PRODUCTS = [
+    "Whole Milk Gallon", "Large Eggs 12ct", "Chicken Breast", "Bananas", "Cheerios Cereal",
+    "Ground Coffee", "Greek Yogurt", "Sliced Bread", "Cheddar Cheese", "Orange Juice",
+]
+
+PRICE_LINES = ["${price:.2f}", "${price:.2f}/lb", "2 for ${double:.2f}", "${price:.2f} ea"]
+
+
+def circular_page_lines(rng: random.Random, page: int, items: int) -> list[str]:
+    """Generate the text lines of one circular page."""
+    lines = [f"Weekly Specials - Page {page + 1}"]
+    for index in range(items):
+        price = rng.uniform(0.5, 12.0)
+        lines.append(f"{rng.choice(PRODUCTS)} {page * items + index}")
+        lines.append(rng.choice(PRICE_LINES).format(price=price, double=price * 2))
+        if rng.random() < 0.5:
+            lines.append(f"Reg. ${price * rng.uniform(1.1, 1.6):.2f}")
+    return lines
+
+
+def _escape(line: str) -> str:
+    """Escape text for a PDF string literal."""
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: Union[str, Path], pages: list[list[str]], font: str = "Helvetica") -> None:
+    """Write a PDF with one page of text lines per entry.
+
+    Args:
+        path: Output path
+        pages: Text lines of each page
+        font: Standard Type 1 font the text is set in
+    """
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content per page
+    objects: list[bytes] = [b"", b"", f"<< /Type /Font /Subtype /Type1 /BaseFont /{font} >>".encode()]
+    kids = []
+    for lines in pages:
+        # Long pages continue in further columns
+        rows = 70
+        text = []
+        for index, line in enumerate(lines):
+            column, row = divmod(index, rows)
+            text.append(f"BT /F1 9 Tf {36 + column * 190} {760 - row * 10.5:.1f} Td ({_escape(line)}) Tj ET")
+        content = "\n".join(text).encode("latin-1")
+        page_number = len(objects) + 1
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_number + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        kids.append(f"{page_number} 0 R")
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    body = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(body)
+    body += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    body += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    body += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    Path(path).write_bytes(bytes(body))
+
+
+def write_circular_pdf(path: Union[str, Path], pages: int, items_per_page: int, seed: int = 42) -> None:
+    """Write a synthetic weekly-ad PDF.
+
+    Args:
+        path: Output path
+        pages: Number of pages
+        items_per_page: Sale items per page
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+    write_pdf(path, [circular_page_lines(rng, page, items_per_page) for page in range(pages)])
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Generate the circular, parse it each way and collect results."""
+    get_settings().circular_page_cache = False
+    server = fakeredis.FakeServer()
+    cache = CacheManager()
+    cache._client = fakeredis.FakeRedis(server=server, decode_responses=True)
+
+    results: dict[str, Any] = {"pages": args.pages, "items_per_page": args.items_per_page}
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "circular.pdf"
+        write_circular_pdf(path, args.pages, args.items_per_page, args.seed)
+        parser = CircularParser()
+        runs = [
+            ("serial", {"workers": 1, "cache": None}),
+            ("parallel", {"workers": args.workers, "cache": cache}),
+            ("cached", {"workers": args.workers, "cache": cache}),
+        ]
+        for name, options in runs:
+            started = time.perf_counter()
+            items = parser.parse_pdf_circular(str(path), **options)
+            results[f"{name}_seconds"] = round(time.perf_counter() - started, 3)
+            results[f"{name}_items"] = len(items)
+    return results
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and write JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--items-per-page", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default one per CPU)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this path instead of stdout")
+    args = parser.parse_args()
+
+    results = run(args)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
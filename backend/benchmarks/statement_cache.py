@@ -0,0 +1,167 @@
+"""Measure per-query Python overhead of the hot list, product and price queries.
+
+Each query runs in its legacy form (``db.query(...)`` or a statement built on
+every call) and in its cached form (``app.db.queries`` lambda statements and
+the prebuilt ``PriceResolver`` statement) against a small in-memory SQLite
+database, where Python-side construction and compilation dominate the time.
+Run with ``--no-compiled-cache`` to also see what SQL compilation costs.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.statement_cache --output statement_cache.json
+"""
+
+import argparse
+import json
+import sys
+from collections.abc import Callable
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Select, create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.db.queries import (
+    grocery_list_by_id,
+    grocery_list_item_batch,
+    grocery_list_summaries,
+    product_by_upc,
+)
+from app.db.synthetic import SyntheticScale, load_synthetic_data
+from app.models import GroceryList, GroceryListItem, Price, PriceHistory, Product
+from app.services.price_resolver import PriceResolver, PriceRow
+from benchmarks.suite import measure
+
+
+def legacy_latest_prices_statement(product_ids: list[int], store_ids: list[int]) -> Select:
+    """Build the latest-price statement from scratch, as before it was prebuilt."""
+    hot_floor = func.coalesce(select(func.max(PriceHistory.valid_to)).scalar_subquery(), date(1, 1, 1))
+    ranked = (
+        select(
+            Price.product_id,
+            Price.store_id,
+            Price.price.label("regular_price"),
+            Price.current_price.label("current_price"),
+            Price.is_on_sale.label("is_on_sale"),
+            Price.unit_price,
+            Price.expiration_date,
+            Price.current_normalized_unit_price.label("normalized_price"),
+            Price.normalized_unit,
+            func.row_number()
+            .over(
+                partition_by=(Price.product_id, Price.store_id),
+                order_by=(Price.effective_date.desc(), Price.id.desc()),
+            )
+            .label("row_number"),
+        )
+        .where(
+            Price.product_id.in_(product_ids),
+            Price.store_id.in_(store_ids),
+            Price.effective_date >= hot_floor,
+        )
+        .subquery()
+    )
+    return select(*[column for column in ranked.c if column.name != "row_number"]).where(
+        ranked.c.row_number == 1
+    )
+
+
+def queries(
+    db: Session, list_id: int, upc: str, product_ids: list[int], store_ids: list[int]
+) -> dict[str, tuple[Callable[[], Any], Callable[[], Any]]]:
+    """Get the (legacy, cached) form of every benchmarked query."""
+    resolver = PriceResolver(db)
+
+    def legacy_summaries() -> list[tuple[GroceryList, int]]:
+        lists = db.query(GroceryList).filter(GroceryList.user_id == "bench_user_0").offset(0).limit(100).all()
+        return [(grocery_list, len(grocery_list.items)) for grocery_list in lists]
+
+    return {
+        "list_by_id": (
+            lambda: db.query(GroceryList).filter(GroceryList.id == list_id).first(),
+            lambda: db.execute(grocery_list_by_id(list_id)).scalar_one_or_none(),
+        ),
+        "list_summaries": (
+            legacy_summaries,
+            lambda: db.execute(grocery_list_summaries("bench_user_0", 0, 100)).all(),
+        ),
+        "list_item_batch": (
+            lambda: db.query(GroceryListItem)
+            .filter(GroceryListItem.grocery_list_id == list_id, GroceryListItem.id > 0)
+            .order_by(GroceryListItem.id)
+            .limit(50)
+            .all(),
+            lambda: db.scalars(grocery_list_item_batch(list_id, 0, 50)).all(),
+        ),
+        "product_by_upc": (
+            lambda: db.query(Product).filter(Product.upc == upc).first(),
+            lambda: db.execute(product_by_upc(upc)).scalar_one_or_none(),
+        ),
+        "latest_prices": (
+            lambda: {
+                (row.product_id, row.store_id): PriceRow(*row)
+                for row in db.execute(legacy_latest_prices_statement(product_ids, store_ids))
+            },
+            lambda: resolver.get_latest_prices(product_ids, store_ids),
+        ),
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Time every query in both forms."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        query_cache_size=0 if args.no_compiled_cache else 500,
+    )
+    data = load_synthetic_data(
+        engine,
+        SyntheticScale(
+            products=200, stores=5, zip_codes=1, price_history=2, users=2, lists_per_user=2, items_per_list=25
+        ),
+    )
+
+    results = {}
+    with Session(engine) as db:
+        upc = db.scalar(select(Product.upc).where(Product.id == data.product_ids[0]))
+        for name, (legacy, cached) in queries(
+            db, data.list_ids[0], upc, data.product_ids[:25], data.store_ids
+        ).items():
+            # Start each query with an empty identity map
+            db.expunge_all()
+            before = measure(legacy, args.iterations, warmup=20)
+            after = measure(cached, args.iterations, warmup=20)
+            results[name] = {
+                "legacy_us": round(before["p50_ms"] * 1000, 1),
+                "cached_us": round(after["p50_ms"] * 1000, 1),
+                "speedup": round(before["p50_ms"] / after["p50_ms"], 2),
+            }
+    return {"compiled_cache": not args.no_compiled_cache, "iterations": args.iterations, "results": results}
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and write JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--no-compiled-cache", action="store_true", help="Disable the engine's compiled SQL cache")
+    parser.add_argument("--output", help="Write JSON results to this path instead of stdout")
+    args = parser.parse_args()
+
+    results = run(args)
+    for name, stats in results["results"].items():
+        print(
+            f"{name:<18}{stats['legacy_us']:>10.1f} us{stats['cached_us']:>10.1f} us{stats['speedup']:>8.2f}x",
+            file=sys.stderr,
+        )
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
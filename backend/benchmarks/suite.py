@@ -0,0 +1,310 @@
+"""Benchmark the API hot paths on synthetic data.
+
+Loads a synthetic dataset (``app.db.synthetic``) at the given scale factor,
+then times ``POST /api/compare`` (computed, and served from the comparison
+cache), ``ProductMatcher.find_matches``, list CRUD, ``CacheManager``
+operations and circular price extraction. Results are written as JSON together with
+the git commit, so runs can be compared across commits with ``--baseline``.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.suite --scale 1 --output bench.json
+    python -m benchmarks.suite --scale 1 --baseline bench.json
+
+By default data is loaded into an in-memory SQLite database and Redis is
+simulated with fakeredis; pass ``--database-url`` (an empty PostgreSQL
+database) and ``--redis-url`` to benchmark real servers.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import get_settings
+from app.core.cache import CacheManager
+from app.db.database import get_db, get_read_db
+from app.db.synthetic import SyntheticData, SyntheticScale, load_synthetic_data
+from app.main import app
+from app.services import comparison_cache
+from app.services.circular_parser import CircularParser
+from app.services.product_catalog import get_product_catalog, invalidate_product_catalog
+from app.services.product_matcher import ProductMatcher
+from app.services.store_directory import invalidate_store_directory
+
+
+def measure(operation: Callable[[], Any], iterations: int, warmup: int = 3) -> dict[str, float]:
+    """Time repeated calls of an operation.
+
+    Args:
+        operation: Callable to time
+        iterations: Timed calls
+        warmup: Untimed calls made first
+
+    Returns:
+        Latency statistics in milliseconds and throughput
+    """
+    for _ in range(warmup):
+        operation()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "p50_ms": round(statistics.median(timings), 4),
+        "p95_ms": round(timings[min(int(len(timings) * 0.95), len(timings) - 1)], 4),
+        "min_ms": round(timings[0], 4),
+        "max_ms": round(timings[-1], 4),
+        "ops_per_sec": round(1000 / statistics.fmean(timings), 1) if any(timings) else 0.0,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Get the current commit hash, if run inside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _create_engine(database_url: str) -> Engine:
+    """Create the benchmark engine; in-memory SQLite is shared across threads."""
+    if database_url.startswith("sqlite"):
+        return create_engine(
+            database_url, connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+    return create_engine(database_url)
+
+
+def _cycle(values: list[Any]) -> Callable[[], Any]:
+    """Get a callable returning the values round-robin."""
+    iterator: Iterator[Any] = itertools.cycle(values)
+    return lambda: next(iterator)
+
+
+def bench_compare(client: TestClient, data: SyntheticData, iterations: int, cache: CacheManager) -> dict[str, Any]:
+    """Time POST /api/compare over the synthetic lists and ZIP codes.
+
+    ``compare_prices`` computes every comparison; ``compare_prices_cached``
+    serves gzip bodies precompressed in the comparison cache.
+    """
+    next_request = _cycle([
+        {"list_id": list_id, "zip_code": zip_code}
+        for list_id, zip_code in zip(data.list_ids, itertools.cycle(data.zip_codes))
+    ])
+
+    def compare() -> None:
+        response = client.post("/api/compare", json=next_request(), headers={"Accept-Encoding": "gzip"})
+        response.raise_for_status()
+
+    results = {"compare_prices": measure(compare, iterations)}
+    settings = get_settings()
+    settings.comparison_cache = True
+    comparison_cache._cache = cache
+    try:
+        results["compare_prices_cached"] = measure(compare, iterations, warmup=len(data.list_ids))
+    finally:
+        settings.comparison_cache = False
+        comparison_cache._cache = None
+    return results
+
+
+def bench_matcher(db: Session, iterations: int) -> dict[str, Any]:
+    """Time fuzzy product matching against the loaded catalog."""
+    catalog = get_product_catalog(db)
+    matcher = ProductMatcher(db, catalog=catalog)
+    next_query = _cycle([name.lower() for name in catalog.names[:200]])
+
+    return {"matcher_find_matches": measure(lambda: matcher.find_matches(next_query()), iterations)}
+
+
+# Weekly-ad snippets in every format the circular parser recognizes
+CIRCULAR_SNIPPETS = [
+    "Whole Milk $3.99",
+    "Yogurt 10 for $10 with card",
+    "Chicken Breast $2.99 / lb",
+    "Buy 1 Get 1 Free Cereal selected varieties",
+    "Bananas $0.49/lb limit 5",
+    "Save $2 Coffee 2 for $9",
+]
+
+
+def bench_circular_parser(iterations: int) -> dict[str, Any]:
+    """Time price extraction over a batch of weekly-ad snippets."""
+    parser = CircularParser()
+    texts = CIRCULAR_SNIPPETS * 200
+
+    return {"circular_extract_prices": measure(lambda: parser.extract_price_info_many(texts, workers=1), iterations)}
+
+
+def bench_list_crud(client: TestClient, data: SyntheticData, iterations: int) -> dict[str, Any]:
+    """Time creating, reading, updating and deleting lists through the API."""
+    items = [
+        {"name": f"Item {index}", "quantity": 1.0, "product_id": product_id}
+        for index, product_id in enumerate(data.product_ids[:data.scale.items_per_list])
+    ]
+    created: list[int] = []
+
+    def create() -> None:
+        response = client.post("/api/lists", json={"name": "Bench", "user_id": "bench_crud", "items": items})
+        response.raise_for_status()
+        created.append(response.json()["id"])
+
+    results = {"list_create": measure(create, iterations)}
+    next_list = _cycle(list(created))
+    results["list_get"] = measure(lambda: client.get(f"/api/lists/{next_list()}").raise_for_status(), iterations)
+    results["list_update"] = measure(
+        lambda: client.put(
+            f"/api/lists/{next_list()}", json={"name": "Renamed", "items": items[:10]}
+        ).raise_for_status(),
+        iterations,
+    )
+    results["list_delete"] = measure(
+        lambda: client.delete(f"/api/lists/{created.pop()}").raise_for_status(), iterations, warmup=0
+    )
+    return results
+
+
+def bench_cache(cache: CacheManager, iterations: int) -> dict[str, Any]:
+    """Time CacheManager reads and writes of comparison-sized payloads."""
+    payload = {
+        "store_totals": [{"store_id": store_id, "total_price": 42.5, "items_found": 25} for store_id in range(20)],
+        "items": [{"item_name": f"Item {index}", "prices": {"1": 2.99, "2": 3.49}} for index in range(25)],
+    }
+    next_key = _cycle(list(range(100)))
+    for list_id in range(100):
+        cache.set_comparison(list_id, "bench", payload)
+
+    return {
+        "cache_set": measure(lambda: cache.set_comparison(next_key(), "bench", payload), iterations),
+        "cache_get_hit": measure(lambda: cache.get_comparison(next_key(), "bench"), iterations),
+        "cache_get_miss": measure(lambda: cache.get_comparison(next_key(), "missing"), iterations),
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Load the dataset, run every benchmark and collect results."""
+    settings = get_settings()
+    settings.startup_warmup = False
+    settings.store_directory_cache = args.redis_url is not None
+    settings.comparison_cache = False
+    if args.redis_url:
+        settings.redis_url = args.redis_url
+
+    engine = _create_engine(args.database_url)
+    started = time.perf_counter()
+    data = load_synthetic_data(engine, SyntheticScale.for_factor(args.scale), seed=args.seed)
+    load_seconds = time.perf_counter() - started
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_bench_db() -> Iterator[Session]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    cache = CacheManager()
+    if not args.redis_url:
+        import fakeredis
+
+        server = fakeredis.FakeServer()
+        cache._client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        cache._binary_client = fakeredis.FakeRedis(server=server)
+
+    invalidate_product_catalog()
+    invalidate_store_directory()
+    app.dependency_overrides[get_db] = get_bench_db
+    app.dependency_overrides[get_read_db] = get_bench_db
+    results: dict[str, Any] = {}
+    try:
+        with TestClient(app) as client, session_factory() as db:
+            results.update(bench_compare(client, data, args.iterations, cache))
+            results.update(bench_matcher(db, args.iterations))
+            results.update(bench_list_crud(client, data, args.iterations))
+        results.update(bench_cache(cache, args.iterations))
+        results.update(bench_circular_parser(args.iterations))
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        invalidate_product_catalog()
+        invalidate_store_directory()
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "redis": "redis" if args.redis_url else "fakeredis",
+        "dataset": {**data.summary(), "load_seconds": round(load_seconds, 2)},
+        "results": results,
+    }
+
+
+def compare_runs(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """Describe the p50 change of each benchmark against a baseline run.
+
+    Args:
+        baseline: Results JSON of an earlier run
+        current: Results JSON of this run
+
+    Returns:
+        One formatted line per benchmark
+    """
+    lines = [f"{'benchmark':<24}{'baseline p50':>14}{'p50':>12}{'change':>10}"]
+    for name, stats in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None or not before["p50_ms"]:
+            lines.append(f"{name:<24}{'-':>14}{stats['p50_ms']:>12.3f}{'new':>10}")
+            continue
+        change = (stats["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+        lines.append(f"{name:<24}{before['p50_ms']:>14.3f}{stats['p50_ms']:>12.3f}{change:>+9.1f}%")
+    return lines
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and write JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="Synthetic data scale factor")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--redis-url", help="Benchmark this Redis instead of fakeredis")
+    parser.add_argument("--output", help="Write JSON results to this path instead of stdout")
+    parser.add_argument("--baseline", help="Print p50 changes against this earlier results file")
+    args = parser.parse_args()
+
+    results = run(args)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(payload + "\n")
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            print("\n".join(compare_runs(json.load(baseline), results)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
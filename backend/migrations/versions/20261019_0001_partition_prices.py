@@ -0,0 +1,151 @@
+"""Partition prices by month and add the price_history archive
+
+Runs against a database created with ``app.db.database.create_tables()``.
+On PostgreSQL the ``prices`` table is rebuilt as a range-partitioned table on
+``effective_date`` with one partition per month plus a default partition;
+other databases only get the archive table and the latest-price index.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00
+"""
+
+from collections.abc import Sequence
+from datetime import date
+from typing import Optional, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db.partitioning import DEFAULT_PARTITION, ensure_price_partitions
+
+revision: str = "0001"
+down_revision: Optional[str] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRICE_COLUMNS = (
+    "id, product_id, store_id, price, sale_price, unit_price, "
+    "effective_date, expiration_date, created_at, updated_at"
+)
+
+
+def _create_price_history() -> None:
+    """Create the price_history archive table if it does not exist."""
+    if sa.inspect(op.get_bind()).has_table("price_history"):
+        return
+    op.create_table(
+        "price_history",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("store_id", sa.Integer(), sa.ForeignKey("stores.id"), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("sale_price", sa.Float(), nullable=True),
+        sa.Column("unit_price", sa.Float(), nullable=True),
+        sa.Column("expiration_date", sa.Date(), nullable=True),
+        sa.Column("valid_from", sa.Date(), nullable=False),
+        sa.Column("valid_to", sa.Date(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+    )
+    op.create_index("ix_price_history_store_id", "price_history", ["store_id"])
+    op.create_index("ix_price_history_valid_to", "price_history", ["valid_to"])
+    op.create_index(
+        "ix_price_history_product_store_valid_to",
+        "price_history",
+        ["product_id", "store_id", "valid_to"],
+    )
+
+
+def _create_price_indexes() -> None:
+    """Create the prices indexes (recreated on the partitioned table)."""
+    existing = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("prices")}
+    for name, columns in (
+        ("ix_prices_product_id", ["product_id"]),
+        ("ix_prices_store_id", ["store_id"]),
+        ("ix_prices_product_store_effective", ["product_id", "store_id", "effective_date"]),
+    ):
+        if name not in existing:
+            op.create_index(name, "prices", columns)
+
+
+def upgrade() -> None:
+    """Partition prices (PostgreSQL) and create price_history."""
+    _create_price_history()
+
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        _create_price_indexes()
+        return
+
+    op.execute(
+        """
+        CREATE TABLE prices_partitioned (
+            id INTEGER NOT NULL DEFAULT nextval('prices_id_seq'),
+            product_id INTEGER NOT NULL REFERENCES products (id),
+            store_id INTEGER NOT NULL REFERENCES stores (id),
+            price DOUBLE PRECISION NOT NULL,
+            sale_price DOUBLE PRECISION,
+            unit_price DOUBLE PRECISION,
+            effective_date DATE NOT NULL,
+            expiration_date DATE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, effective_date)
+        ) PARTITION BY RANGE (effective_date)
+        """
+    )
+    first_month = bind.scalar(sa.text("SELECT min(effective_date) FROM prices")) or date.today()
+    ensure_price_partitions(bind, first_month, parent="prices_partitioned")
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF prices_partitioned DEFAULT")
+
+    op.execute(
+        f"INSERT INTO prices_partitioned ({PRICE_COLUMNS}) SELECT {PRICE_COLUMNS} FROM prices"
+    )
+    op.execute("ALTER SEQUENCE prices_id_seq OWNED BY NONE")
+    op.execute("DROP TABLE prices")
+    op.execute("ALTER TABLE prices_partitioned RENAME TO prices")
+    op.execute("ALTER SEQUENCE prices_id_seq OWNED BY prices.id")
+    _create_price_indexes()
+    op.execute("ANALYZE prices")
+
+
+def downgrade() -> None:
+    """Restore an unpartitioned prices table and drop price_history."""
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            """
+            CREATE TABLE prices_unpartitioned (
+                id SERIAL PRIMARY KEY,
+                product_id INTEGER NOT NULL REFERENCES products (id),
+                store_id INTEGER NOT NULL REFERENCES stores (id),
+                price DOUBLE PRECISION NOT NULL,
+                sale_price DOUBLE PRECISION,
+                unit_price DOUBLE PRECISION,
+                effective_date DATE NOT NULL,
+                expiration_date DATE,
+                created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+                updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+            )
+            """
+        )
+        op.execute(
+            f"INSERT INTO prices_unpartitioned ({PRICE_COLUMNS}) "
+            f"SELECT {PRICE_COLUMNS} FROM prices"
+        )
+        op.execute(
+            "SELECT setval('prices_unpartitioned_id_seq', "
+            "(SELECT coalesce(max(id), 0) + 1 FROM prices_unpartitioned), false)"
+        )
+        # Dropping the partitioned parent drops every partition with it
+        op.execute("DROP TABLE prices")
+        op.execute("DROP SEQUENCE IF EXISTS prices_id_seq")
+        op.execute("ALTER TABLE prices_unpartitioned RENAME TO prices")
+        op.execute("ALTER SEQUENCE prices_unpartitioned_id_seq RENAME TO prices_id_seq")
+        _create_price_indexes()
+    else:
+        op.drop_index("ix_prices_product_store_effective", table_name="prices")
+
+    op.drop_table("price_history")
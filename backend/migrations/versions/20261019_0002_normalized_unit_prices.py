@@ -0,0 +1,113 @@
+"""Store normalized unit prices on prices and price_history
+
+Adds the per-oz / per-fl-oz / per-count price columns and fills them in for
+existing prices from each product's pack size. Archived history rows keep
+NULL, which the comparison queries never read.
+
+The unit table below is frozen as of this revision, so the migration does
+not depend on application code that may change after it.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:00:00
+"""
+
+import re
+from collections.abc import Sequence
+from typing import Any, Optional, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: Optional[str] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("prices", "price_history")
+
+# Unit spelling -> (base units per unit, base unit), as of this revision
+UNITS: dict[str, tuple[float, str]] = {
+    **dict.fromkeys(("oz", "ounce", "ounces"), (1.0, "oz")),
+    **dict.fromkeys(("lb", "lbs", "pound", "pounds"), (16.0, "oz")),
+    **dict.fromkeys(("g", "gram", "grams"), (0.035273961949580414, "oz")),
+    **dict.fromkeys(("kg", "kilogram", "kilograms"), (35.27396194958041, "oz")),
+    **dict.fromkeys(("fl oz", "floz", "fluid ounce", "fluid ounces"), (1.0, "fl oz")),
+    **dict.fromkeys(("cup", "cups"), (8.0, "fl oz")),
+    **dict.fromkeys(("pt", "pint", "pints"), (16.0, "fl oz")),
+    **dict.fromkeys(("qt", "quart", "quarts"), (32.0, "fl oz")),
+    **dict.fromkeys(("gal", "gallon", "gallons"), (128.0, "fl oz")),
+    **dict.fromkeys(
+        ("ml", "milliliter", "milliliters", "millilitre", "millilitres"), (0.033814022701843, "fl oz")
+    ),
+    **dict.fromkeys(("l", "liter", "liters", "litre", "litres"), (33.814022701843, "fl oz")),
+    **dict.fromkeys(("ct", "count", "pack", "ea", "each", "piece", "pieces"), (1.0, "ct")),
+    **dict.fromkeys(("doz", "dozen"), (12.0, "ct")),
+}
+
+products = sa.table(
+    "products", sa.column("id", sa.Integer), sa.column("unit_size", sa.Float), sa.column("unit_type", sa.String)
+)
+
+
+def backfill_prices() -> None:
+    """Fill in the normalized unit prices of current prices with one ``UPDATE``.
+
+    Unit spellings are resolved once per distinct spelling, then the prices
+    are joined to each product's pack size in base units.
+    """
+    connection = op.get_bind()
+    factors: dict[str, float] = {}
+    base_units: dict[str, str] = {}
+    spellings = sa.select(products.c.unit_type).distinct().where(products.c.unit_type.is_not(None))
+    for spelling in connection.scalars(spellings):
+        unit = UNITS.get(re.sub(r"[.\s]+", " ", spelling.lower()).strip())
+        if unit is not None:
+            factors[spelling], base_units[spelling] = unit
+    if not factors:
+        return
+
+    usable = products.c.unit_size > 0
+    base_size: sa.ColumnElement[Any] = sa.case(
+        (usable, products.c.unit_size * sa.case(factors, value=products.c.unit_type))
+    )
+    base_unit: sa.ColumnElement[Any] = sa.case((usable, sa.case(base_units, value=products.c.unit_type)))
+    pack = sa.select(products.c.id, base_size.label("base_size"), base_unit.label("base_unit")).subquery("pack")
+    prices = sa.table(
+        "prices",
+        sa.column("product_id", sa.Integer),
+        sa.column("price", sa.Float),
+        sa.column("sale_price", sa.Float),
+        sa.column("normalized_unit_price", sa.Float),
+        sa.column("normalized_sale_unit_price", sa.Float),
+        sa.column("normalized_unit", sa.String),
+    )
+    connection.execute(
+        sa.update(prices)
+        .where(prices.c.product_id == pack.c.id)
+        .values(
+            normalized_unit_price=prices.c.price / pack.c.base_size,
+            normalized_sale_unit_price=prices.c.sale_price / pack.c.base_size,
+            normalized_unit=pack.c.base_unit,
+        )
+    )
+
+
+def upgrade() -> None:
+    """Add the normalized unit price columns and backfill current prices."""
+    for table in TABLES:
+        op.add_column(table, sa.Column("normalized_unit_price", sa.Float(), nullable=True))
+        op.add_column(table, sa.Column("normalized_sale_unit_price", sa.Float(), nullable=True))
+        op.add_column(table, sa.Column("normalized_unit", sa.String(length=8), nullable=True))
+
+    backfill_prices()
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ANALYZE prices")
+
+
+def downgrade() -> None:
+    """Drop the normalized unit price columns."""
+    for table in TABLES:
+        op.drop_column(table, "normalized_unit")
+        op.drop_column(table, "normalized_sale_unit_price")
+        op.drop_column(table, "normalized_unit_price")
@@ -0,0 +1,63 @@
+"""Add the ingest_jobs queue table
+
+Holds the scheduler's fetch jobs (circulars, base prices, promos) per chain
+and ZIP code. Workers claim due jobs with ``FOR UPDATE SKIP LOCKED``; a
+partial unique index keeps one pending or running job per target.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 15:00:00
+"""
+
+from collections.abc import Sequence
+from typing import Optional, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Optional[str] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status IN ('pending', 'running')")
+
+
+def upgrade() -> None:
+    """Create the ingest_jobs table and its indexes."""
+    op.create_table(
+        "ingest_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("source", sa.String(length=32), nullable=False),
+        sa.Column("store_chain", sa.String(length=100), nullable=False),
+        sa.Column("zip_code", sa.String(length=10), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("off_peak", sa.Boolean(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("run_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("items", sa.Integer(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("locked_by", sa.String(length=100), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+    )
+    op.create_index("ix_ingest_jobs_due", "ingest_jobs", ["status", "priority", "run_at"])
+    op.create_index(
+        "uq_ingest_jobs_active",
+        "ingest_jobs",
+        ["source", "store_chain", "zip_code"],
+        unique=True,
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+
+
+def downgrade() -> None:
+    """Drop the ingest_jobs table."""
+    op.drop_index("uq_ingest_jobs_active", table_name="ingest_jobs")
+    op.drop_index("ix_ingest_jobs_due", table_name="ingest_jobs")
+    op.drop_table("ingest_jobs")
@@ -1,13 +1,20 @@
 """Pytest fixtures and configuration."""
 
+from datetime import date, timedelta
 from typing import Generator
 
 import pytest
+from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from app.db.database import Base
-from app.models import Product
+from app.config import get_settings
+from app.db.database import Base, get_db, get_read_db
+from app.main import app
+from app.models import Price, Product, Store
+from app.services.product_catalog import invalidate_product_catalog
+from app.services.store_directory import invalidate_store_directory
 
 
 # Use SQLite in-memory database for tests
@@ -20,6 +27,7 @@ def db_engine():
     engine = create_engine(
         TEST_DATABASE_URL,
         connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
     )
     Base.metadata.create_all(bind=engine)
     yield engine
@@ -116,3 +124,74 @@ def sample_products(db_session: Session) -> list[Product]:
         db_session.refresh(product)
 
     return products
+
+
+@pytest.fixture
+def sample_stores(db_session: Session) -> list[Store]:
+    """Create two stores in the same ZIP code."""
+    stores = [
+        Store(name="Kroger - Main St", chain="Kroger", zip_code="92101"),
+        Store(name="Walmart Supercenter", chain="Walmart", zip_code="92101"),
+    ]
+    db_session.add_all(stores)
+    db_session.commit()
+    return stores
+
+
+@pytest.fixture
+def sample_prices(
+    db_session: Session, sample_products: list[Product], sample_stores: list[Store]
+) -> list[Price]:
+    """Create prices covering every sale/expiration combination."""
+    today = date.today()
+    milk, eggs, cheerios, bananas = sample_products[0], sample_products[2], sample_products[3], sample_products[7]
+    kroger, walmart = sample_stores
+    prices = [
+        # Active sale
+        Price(product_id=milk.id, store_id=kroger.id, price=5.99, sale_price=4.99,
+              effective_date=today, expiration_date=today + timedelta(days=3)),
+        # Sale expiring today is still active
+        Price(product_id=milk.id, store_id=walmart.id, price=5.49, sale_price=4.49,
+              effective_date=today, expiration_date=today),
+        # Expired sale
+        Price(product_id=eggs.id, store_id=kroger.id, price=4.99, sale_price=3.99,
+              effective_date=today, expiration_date=today - timedelta(days=1)),
+        # Sale without an expiration date is never applied
+        Price(product_id=eggs.id, store_id=walmart.id, price=4.79, sale_price=3.79,
+              effective_date=today, expiration_date=None),
+        # Expired sale equal to the regular price still counts as on sale
+        Price(product_id=cheerios.id, store_id=kroger.id, price=5.49, sale_price=5.49,
+              effective_date=today, expiration_date=today - timedelta(days=2)),
+        # No sale at all
+        Price(product_id=cheerios.id, store_id=walmart.id, price=5.29, unit_price=0.49,
+              effective_date=today),
+        # Older row superseded by a newer one
+        Price(product_id=bananas.id, store_id=kroger.id, price=0.69,
+              effective_date=today - timedelta(days=7)),
+        Price(product_id=bananas.id, store_id=kroger.id, price=0.59,
+              effective_date=today),
+    ]
+    db_session.add_all(prices)
+    db_session.commit()
+    return prices
+
+
+@pytest.fixture
+def client(db_session: Session, monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
+    """Create a test client whose requests share the test database session."""
+    # Keep tests off the configured database and Redis
+    monkeypatch.setattr(get_settings(), "startup_warmup", False)
+    monkeypatch.setattr(get_settings(), "store_directory_cache", False)
+    monkeypatch.setattr(get_settings(), "comparison_cache", False)
+    monkeypatch.setattr(get_settings(), "write_pin_cache", False)
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = lambda: db_session
+    invalidate_store_directory()
+    invalidate_product_catalog()
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
+        invalidate_store_directory()
+        invalidate_product_catalog()
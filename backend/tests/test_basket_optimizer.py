@@ -0,0 +1,90 @@
+"""Tests for the BasketOptimizer service."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from app.services.basket_optimizer import BasketOptimizer
+
+nan = np.nan
+
+
+def brute_force(line_costs: np.ndarray, max_stores: int) -> tuple[int, float]:
+    """Best (items found, total) over every subset of at most max_stores stores."""
+    costs = np.where(np.isnan(line_costs), np.inf, line_costs)
+    best = (0, 0.0)
+    for k in range(1, max_stores + 1):
+        for subset in itertools.combinations(range(costs.shape[1]), k):
+            per_item = costs[:, list(subset)].min(axis=1)
+            found = np.isfinite(per_item)
+            key = (int(found.sum()), float(per_item[found].sum()))
+            if key[0] > best[0] or (key[0] == best[0] and key[1] < best[1]):
+                best = key
+    return best
+
+
+class TestBasketOptimizer:
+    """Test suite for BasketOptimizer service."""
+
+    @pytest.mark.parametrize("max_stores", [1, 2, 3])
+    def test_matches_brute_force(self, max_stores: int):
+        """Test the exact search against every store subset."""
+        rng = np.random.default_rng(7)
+        line_costs = rng.uniform(1, 10, (25, 9))
+        line_costs[rng.random((25, 9)) < 0.3] = nan
+
+        plan = BasketOptimizer(line_costs).optimize(max_stores)
+        items_found, total = brute_force(line_costs, max_stores)
+
+        assert plan is not None
+        assert plan.exact is True
+        assert plan.items_found == items_found
+        assert plan.total == pytest.approx(total)
+        assert len(plan.store_indices) <= max_stores
+
+    def test_prefers_coverage_over_cost(self):
+        """Test that a cheaper plan missing items loses to a complete one."""
+        line_costs = np.array([
+            [1.0, 2.0, nan],
+            [nan, 3.0, 1.0],
+        ])
+
+        plan = BasketOptimizer(line_costs).optimize(1)
+
+        assert plan is not None
+        assert plan.store_indices == [1]
+        assert plan.items_found == 2
+        assert plan.total == pytest.approx(5.0)
+
+    def test_assignments_and_unused_stores(self):
+        """Test per-item assignments and dropping stores that supply nothing."""
+        line_costs = np.array([
+            [1.0, 2.0, 3.0],
+            [4.0, 1.0, 5.0],
+            [nan, nan, nan],
+        ])
+
+        plan = BasketOptimizer(line_costs).optimize(3)
+
+        assert plan is not None
+        assert plan.store_indices == [0, 1]
+        assert plan.assignments.tolist() == [0, 1, -1]
+        assert plan.total == pytest.approx(2.0)
+
+    def test_greedy_fallback(self):
+        """Test that oversized searches fall back to a flagged greedy plan."""
+        rng = np.random.default_rng(3)
+        line_costs = rng.uniform(1, 10, (30, 12))
+
+        plan = BasketOptimizer(line_costs, max_exact_subsets=10).optimize(3)
+        items_found, total = brute_force(line_costs, 3)
+
+        assert plan is not None
+        assert plan.exact is False
+        assert plan.items_found == items_found
+        assert plan.total >= total - 1e-9
+
+    def test_no_prices(self):
+        """Test a basket no store carries."""
+        assert BasketOptimizer(np.full((3, 2), nan)).optimize(2) is None
@@ -0,0 +1,415 @@
+"""Tests for the circular parser's price extraction."""
+
+import io
+import json
+import random
+import re
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import fakeredis
+import pytest
+
+from app.config import get_settings
+from app.core.cache import CacheManager
+from app.services import circular_parser
+from app.services.circular_parser import CircularParser, ParsedCircularItem
+from benchmarks.flipp_feed import write_flipp_feed
+from benchmarks.html_circular import ITEM_GENERATORS, weekly_ad_page
+from benchmarks.pdf_circular import circular_page_lines, write_circular_pdf, write_pdf
+
+
+def reference_extract(text: str) -> dict[str, Any]:
+    """Extract price information with one search per format, as extract_price_info did before the single scan."""
+    result: dict[str, Any] = {"price": None, "unit": None, "quantity": None, "is_bogo": False}
+    text_lower = text.lower()
+    simple = re.search(r"\$(\d+\.?\d*)", text)
+    if simple:
+        result["price"] = float(simple.group(1))
+    multi = re.search(r"(\d+)\s+for\s+\$(\d+\.?\d*)", text_lower)
+    if multi:
+        result["price"] = float(multi.group(2)) / int(multi.group(1))
+        result["quantity"] = int(multi.group(1))
+    unit = re.search(r"\$(\d+\.?\d*)\s*/\s*(\w+)", text_lower)
+    if unit:
+        result["price"] = float(unit.group(1))
+        result["unit"] = CircularParser.UNIT_MAP.get(unit.group(2), unit.group(2))
+    if "buy" in text_lower and "get" in text_lower and "free" in text_lower:
+        result["is_bogo"] = True
+        bogo = re.search(r"buy\s+(\d+)\s+get\s+(\d+)", text_lower)
+        if bogo:
+            result["quantity"] = int(bogo.group(1)) + int(bogo.group(2))
+    return result
+
+
+def random_snippets(count: int, seed: int = 3) -> list[str]:
+    """Generate weekly-ad snippets mixing every recognized format."""
+    rng = random.Random(seed)
+    parts = [
+        "$3.99", "$12", "$0.5", "2 for $5", "10 for $10.00", "$2.49 / lb", "$4/Ounces", "$1.99/ea",
+        "Buy 1 Get 1 Free", "BUY 2 GET 1", "get it free", "Save $2", "limit 4", "Milk", "12ct",
+        "with card", "$", "for", "/", "buy", "3  for  $7", "$5.00/", "abuy 3 get 4 free",
+    ]
+    return [" ".join(rng.choices(parts, k=rng.randint(0, 6))) for _ in range(count)]
+
+
+class TestExtractPriceInfo:
+    """Test suite for CircularParser.extract_price_info."""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("Whole Milk $3.99", {"price": 3.99, "unit": None, "quantity": None, "is_bogo": False}),
+            ("Yogurt 10 for $10", {"price": 1.0, "unit": None, "quantity": 10, "is_bogo": False}),
+            ("Chicken $2.99 / lbs", {"price": 2.99, "unit": "lb", "quantity": None, "is_bogo": False}),
+            ("Buy 2 Get 1 Free", {"price": None, "unit": None, "quantity": 3, "is_bogo": True}),
+            ("$12 for $5", {"price": 5 / 12, "unit": None, "quantity": 12, "is_bogo": False}),
+            ("", {"price": None, "unit": None, "quantity": None, "is_bogo": False}),
+        ],
+    )
+    def test_formats(self, text: str, expected: dict[str, Any]):
+        """Test each recognized price format."""
+        assert CircularParser().extract_price_info(text) == expected
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Milk $3.99 Eggs $2.49 Bread $1",
+            "2 for $5 or $3.99/lb",
+            "$3.99/lb 2 for $5",
+            "10 for $10 then 3 for $2",
+            "Buy 2 Get 1",
+            "Buy 2 Get 1 on Friday, limit 4, free parking",
+            "free gift: get 1 when you buy",
+            "Cheese $4.50 / Wedge",
+            "$4/Furlong and $2.50/lb",
+            "Oil $6.99\n/ quart",
+            "$5.00/ $ 3 for $",
+        ],
+    )
+    def test_edge_cases_match_reference(self, text: str):
+        """Test the single scan against one search per format where formats overlap."""
+        assert CircularParser().extract_price_info(text) == reference_extract(text)
+
+    def test_matches_reference(self):
+        """Test that the single scan agrees with one search per format on random snippets."""
+        parser = CircularParser()
+
+        for text in random_snippets(5000):
+            assert parser.extract_price_info(text) == reference_extract(text), text
+
+
+class TestExtractPriceInfoMany:
+    """Test suite for CircularParser.extract_price_info_many."""
+
+    def test_in_process(self):
+        """Test that small batches match one call per text."""
+        parser = CircularParser()
+        texts = random_snippets(200)
+
+        assert parser.extract_price_info_many(texts) == [reference_extract(text) for text in texts]
+
+    def test_process_pool(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that large batches come back from the pool in input order."""
+        monkeypatch.setattr(circular_parser, "PARALLEL_MIN_TEXTS", 100)
+        monkeypatch.setattr(circular_parser, "PARALLEL_CHUNK_TEXTS", 70)
+        parser = CircularParser()
+        texts = random_snippets(500, seed=11)
+
+        assert parser.extract_price_info_many(texts, workers=2) == [reference_extract(text) for text in texts]
+
+
+def generated_feed(megabytes: float) -> bytes:
+    """Generate a synthetic Flipp feed."""
+    feed = io.BytesIO()
+    write_flipp_feed(feed, int(megabytes * 1024 * 1024))
+    return feed.getvalue()
+
+
+class TestFlippParsing:
+    """Test suite for Flipp feed parsing."""
+
+    FEED = {
+        "merchant": {"id": 7, "name": "Kroger"},
+        "valid_from": "2024-06-02",
+        "flyer_items": [
+            {
+                "name": "Chicken Breast Limit 4",
+                "current_price": 2.99,
+                "post_price_text": "/lb",
+                "original_price": 4.99,
+                "category_names": ["Meat"],
+                "cutout_image_url": "https://example.com/chicken.jpg",
+            },
+            {
+                "name": "Yogurt",
+                "current_price": 10,
+                "pre_price_text": "10 for",
+                "valid_from": "2024-06-05T04:00:00+00:00",
+                "valid_to": "2024-06-11T03:59:59+00:00",
+            },
+            {"name": "Cereal", "price_text": "Buy 1 Get 1 Free $4.49"},
+            {"name": "Coupon booklet"},
+            {"current_price": 1.0},
+        ],
+        "valid_to": "2024-06-08",
+    }
+
+    def test_parse_decoded(self):
+        """Test that decoded feeds map onto parsed items."""
+        items = CircularParser().parse_flipp_data(self.FEED)
+
+        assert items == [
+            ParsedCircularItem(
+                product_name="Chicken Breast",
+                sale_price=2.99,
+                regular_price=4.99,
+                unit="lb",
+                valid_from=date(2024, 6, 2),
+                valid_until=date(2024, 6, 8),
+                store_chain="Kroger",
+                category="Meat",
+                image_url="https://example.com/chicken.jpg",
+            ),
+            ParsedCircularItem(
+                product_name="Yogurt",
+                sale_price=1.0,
+                quantity_required=10,
+                valid_from=date(2024, 6, 5),
+                valid_until=date(2024, 6, 11),
+                store_chain="Kroger",
+            ),
+            ParsedCircularItem(
+                product_name="Cereal",
+                sale_price=4.49,
+                quantity_required=2,
+                valid_from=date(2024, 6, 2),
+                valid_until=date(2024, 6, 8),
+                store_chain="Kroger",
+            ),
+        ]
+
+    def test_stream_applies_preceding_flyer_fields(self):
+        """Test that streamed items only see flyer fields read before them."""
+        items = list(CircularParser("Ralphs").parse_flipp_stream(json.dumps(self.FEED).encode()))
+
+        assert [item.product_name for item in items] == ["Chicken Breast", "Yogurt", "Cereal"]
+        assert items[0].valid_from == date(2024, 6, 2)
+        # valid_to follows flyer_items in the feed, so only item dates apply
+        assert items[0].valid_until is None
+        assert items[1].valid_until == date(2024, 6, 11)
+        assert {item.store_chain for item in items} == {"Ralphs"}
+
+    def test_stream_matches_decoded(self, tmp_path: Path):
+        """Test that paths, bytes and file objects stream the decoded items."""
+        feed = generated_feed(0.5)
+        path = tmp_path / "flipp.json"
+        path.write_bytes(feed)
+        parser = CircularParser()
+        decoded = json.loads(feed)
+        decoded.pop("valid_to")
+
+        expected = parser.parse_flipp_data(decoded)
+
+        assert len(expected) > 500
+        assert list(parser.parse_flipp_stream(path)) == expected
+        assert list(parser.parse_flipp_stream(str(path))) == expected
+        assert list(parser.parse_flipp_stream(feed)) == expected
+        assert list(parser.parse_flipp_stream(io.BytesIO(feed))) == expected
+
+    def test_stream_memory_is_flat(self):
+        """Test that peak memory while parsing does not grow with the feed."""
+        peaks = []
+        for megabytes in (0.5, 4):
+            feed = io.BytesIO(generated_feed(megabytes))
+            tracemalloc.start()
+            try:
+                count = sum(1 for _ in CircularParser().parse_flipp_stream(feed))
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            finally:
+                tracemalloc.stop()
+            assert count > 0
+
+        assert peaks[1] < peaks[0] * 1.5
+        assert peaks[1] < 4 * 1024 * 1024
+
+
+class TestPdfParsing:
+    """Test suite for page-parallel PDF circular parsing."""
+
+    @pytest.fixture(autouse=True)
+    def no_shared_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Keep tests off the configured Redis."""
+        monkeypatch.setattr(get_settings(), "circular_page_cache", False)
+
+    @pytest.fixture
+    def cache(self) -> CacheManager:
+        """Create a cache manager backed by an in-memory Redis."""
+        cache = CacheManager()
+        cache._client = fakeredis.FakeRedis(decode_responses=True)
+        return cache
+
+    def test_parse_circular_text(self):
+        """Test that price lines close items named by the line before."""
+        text = "Weekly Specials\nWhole Milk\n$2.99\nReg. $4.49\nYogurt\n10 for $10\nBananas $0.49/lb\n$5\n"
+
+        items = CircularParser("Kroger").parse_circular_text(text)
+
+        assert [(i.product_name, i.sale_price, i.regular_price, i.unit, i.quantity_required) for i in items] == [
+            ("Whole Milk", 2.99, 4.49, None, None),
+            ("Yogurt", 1.0, None, None, 10),
+            ("Bananas", 0.49, None, "lb", None),
+        ]
+        assert {item.store_chain for item in items} == {"Kroger"}
+
+    def test_parallel_matches_serial(self, tmp_path: Path):
+        """Test that the process pool yields every page's items in page order."""
+        path = tmp_path / "circular.pdf"
+        write_circular_pdf(path, pages=6, items_per_page=30)
+        parser = CircularParser("Kroger")
+
+        serial = parser.parse_pdf_circular(str(path), workers=1)
+        parallel = parser.parse_pdf_circular(str(path), workers=3)
+
+        assert len(serial) == 180
+        assert parallel == serial
+        assert serial[0].product_name.endswith(" 0")
+        assert serial[-1].product_name.endswith(" 179")
+
+    def test_unchanged_pages_come_from_cache(
+        self, tmp_path: Path, cache: CacheManager, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that a re-run only parses pages whose content changed."""
+        rng = random.Random(5)
+        pages = [circular_page_lines(rng, page, 10) for page in range(4)]
+        write_pdf(tmp_path / "week1.pdf", pages)
+        pages[2] = circular_page_lines(rng, 2, 12)
+        write_pdf(tmp_path / "week2.pdf", pages)
+
+        parsed_pages = []
+        parse_page = circular_parser._parse_pdf_page
+
+        def tracking_parse_page(pdf, page_number, store_chain):
+            parsed_pages.append(page_number)
+            return parse_page(pdf, page_number, store_chain)
+
+        monkeypatch.setattr(circular_parser, "_parse_pdf_page", tracking_parse_page)
+        first = CircularParser("Kroger").parse_pdf_circular(str(tmp_path / "week1.pdf"), workers=1, cache=cache)
+        second = CircularParser("Ralphs").parse_pdf_circular(str(tmp_path / "week2.pdf"), workers=1, cache=cache)
+
+        assert parsed_pages == [0, 1, 2, 3, 2]
+        assert len(first) == 40 and len(second) == 42
+        assert second[:20] == [
+            ParsedCircularItem(**{**item.__dict__, "store_chain": "Ralphs"}) for item in first[:20]
+        ]
+        assert second == CircularParser("Ralphs").parse_pdf_circular(str(tmp_path / "week2.pdf"), workers=1)
+
+    def test_changed_resources_invalidate_pages(
+        self, tmp_path: Path, cache: CacheManager, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that a page with the same content stream but other fonts is parsed again."""
+        pages = [circular_page_lines(random.Random(5), page, 10) for page in range(2)]
+        write_pdf(tmp_path / "helvetica.pdf", pages)
+        write_pdf(tmp_path / "courier.pdf", pages, font="Courier")
+
+        parsed_pages = []
+        parse_page = circular_parser._parse_pdf_page
+
+        def tracking_parse_page(pdf, page_number, store_chain):
+            parsed_pages.append(page_number)
+            return parse_page(pdf, page_number, store_chain)
+
+        monkeypatch.setattr(circular_parser, "_parse_pdf_page", tracking_parse_page)
+        for name in ("helvetica.pdf", "courier.pdf", "helvetica.pdf"):
+            CircularParser("Kroger").parse_pdf_circular(str(tmp_path / name), workers=1, cache=cache)
+
+        assert parsed_pages == [0, 1, 0, 1]
+
+
+class TestHtmlParsing:
+    """Test suite for template-based HTML weekly-ad parsing."""
+
+    KROGER_PAGE = """<html><head><meta charset="utf-8"></head><body>
+        <section data-category="Dairy">
+          <div data-qa="weekly-ad-item"><img src="/milk.jpg">
+            <h2 data-qa="item-title">  Kroger Whole Milk,
+              Gallon </h2>
+            <span data-qa="item-price">2 for $6</span>
+            <span data-qa="item-regular-price">Reg. $3.99</span>
+          </div>
+          <div data-qa="weekly-ad-item"><h2 data-qa="item-title">Crème Fraîche</h2>
+            <span data-qa="item-price">$4.49</span></div>
+          <div data-qa="weekly-ad-item"><h2 data-qa="item-title">Mystery Deal</h2>
+            <span data-qa="item-price">See store</span></div>
+        </section></body></html>"""
+
+    def test_chain_template(self):
+        """Test that a chain's template reads every field of its items."""
+        items = CircularParser("Kroger").parse_html_circular(self.KROGER_PAGE.encode())
+
+        assert items == [
+            ParsedCircularItem(
+                product_name="Kroger Whole Milk, Gallon",
+                sale_price=3.0,
+                regular_price=3.99,
+                quantity_required=2,
+                store_chain="Kroger",
+                category="Dairy",
+                image_url="/milk.jpg",
+            ),
+            ParsedCircularItem(
+                product_name="Crème Fraîche", sale_price=4.49, store_chain="Kroger", category="Dairy"
+            ),
+        ]
+
+    def test_bytes_use_declared_charset(self):
+        """Test that byte pages decode per their charset, like decoded text."""
+        page = self.KROGER_PAGE.replace("utf-8", "iso-8859-1")
+        parser = CircularParser("kroger")
+
+        assert parser.parse_html_circular(page.encode("latin-1")) == parser.parse_html_circular(page)
+
+    def test_unit_price(self):
+        """Test that a per-unit price is kept alongside the sale price."""
+        page = (
+            '<ul><li data-item-id="1"><span data-automation-id="product-title">Ground Beef</span>'
+            '<div data-automation-id="product-price">$5.98</div>'
+            '<span data-automation-id="price-per-unit">$0.37/oz</span></li></ul>'
+        )
+
+        [item] = CircularParser("Walmart").parse_html_circular(page)
+
+        assert (item.sale_price, item.unit_price, item.unit) == (5.98, 0.37, "oz")
+
+    def test_microdata_fallback(self):
+        """Test that unknown chains are read as schema.org Product microdata."""
+        page = (
+            '<div itemscope itemtype="https://schema.org/Product"><h2 itemprop="name">Bananas</h2>'
+            '<meta itemprop="price" content="0.59"><span itemprop="category">Produce</span></div>'
+            '<div itemscope itemtype="https://schema.org/Product"><h2 itemprop="name">Apples</h2>'
+            '<span itemprop="price">$1.29/lb</span></div>'
+        )
+
+        items = CircularParser("Corner Grocer").parse_html_circular(page.encode())
+
+        assert [(item.product_name, item.sale_price, item.unit, item.category) for item in items] == [
+            ("Bananas", 0.59, None, "Produce"),
+            ("Apples", 1.29, "lb", None),
+        ]
+
+    def test_empty_page(self):
+        """Test that empty content parses to no items."""
+        assert CircularParser("Kroger").parse_html_circular(b"") == []
+
+    @pytest.mark.parametrize("chain", list(ITEM_GENERATORS))
+    def test_benchmark_fixtures(self, chain: str):
+        """Test that every item of each benchmark fixture page is extracted."""
+        store_chain = None if chain == "microdata" else chain
+
+        items = CircularParser(store_chain).parse_html_circular(weekly_ad_page(chain, 50))
+
+        assert len(items) == 50
+        assert items[-1].product_name.endswith(" 49")
+        assert all(item.image_url for item in items)
@@ -0,0 +1,456 @@
+"""Tests for the price comparison API."""
+
+import json
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import GroceryList, GroceryListItem, Price, Product, Store
+
+
+@pytest.fixture
+def sample_list(db_session: Session, sample_products: list[Product]) -> GroceryList:
+    """Create a grocery list mixing linked, fuzzy-matched and unknown items."""
+    grocery_list = GroceryList(name="Weekly Basics", user_id="demo_user_1")
+    db_session.add(grocery_list)
+    db_session.flush()
+
+    items = [
+        GroceryListItem(grocery_list_id=grocery_list.id, product_id=sample_products[0].id,
+                        name="Whole Milk", quantity=2.0, position=0),
+        GroceryListItem(grocery_list_id=grocery_list.id, name="Egglands Best Large Eggs", quantity=1.0, position=1),
+        GroceryListItem(grocery_list_id=grocery_list.id, product_id=sample_products[7].id,
+                        name="Bananas", quantity=3.0, position=2),
+        GroceryListItem(grocery_list_id=grocery_list.id, name="xyzzy widget", quantity=1.0, position=3),
+    ]
+    db_session.add_all(items)
+    db_session.commit()
+    db_session.refresh(grocery_list)
+    return grocery_list
+
+
+class TestCompareApi:
+    """Test suite for POST /api/compare."""
+
+    def test_compare_totals(
+        self,
+        client: TestClient,
+        sample_list: GroceryList,
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test per-store totals, sale counts and cheapest store selection."""
+        response = client.post("/api/compare", json={"list_id": sample_list.id, "zip_code": "92101"})
+
+        assert response.status_code == 200
+        data = response.json()
+        kroger, walmart = sample_stores
+        totals = {st["store_id"]: st for st in data["store_totals"]}
+
+        # Kroger: milk on sale 4.99 x2, eggs 4.99 (sale expired), bananas 0.59 x3
+        assert totals[kroger.id]["total_price"] == round(4.99 * 2 + 4.99 + 0.59 * 3, 2)
+        assert totals[kroger.id]["items_found"] == 3
+        assert totals[kroger.id]["items_on_sale"] == 1
+        # Walmart: milk on sale 4.49 x2, eggs 4.79 (sale without expiry)
+        assert totals[walmart.id]["total_price"] == round(4.49 * 2 + 4.79, 2)
+        assert totals[walmart.id]["items_found"] == 2
+        assert totals[walmart.id]["items_on_sale"] == 1
+
+        assert data["cheapest_store_id"] == walmart.id
+        assert totals[walmart.id]["is_cheapest"] is True
+        assert data["potential_savings"] == round(
+            (4.99 * 2 + 4.99 + 0.59 * 3) - (4.49 * 2 + 4.79), 2
+        )
+
+    def test_compare_item_breakdown(
+        self,
+        client: TestClient,
+        sample_list: GroceryList,
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test the per-item breakdown in list order."""
+        response = client.post("/api/compare", json={"list_id": sample_list.id, "zip_code": "92101"})
+
+        breakdown = response.json()["item_breakdown"]
+        kroger, walmart = sample_stores
+
+        assert [item["item_name"] for item in breakdown] == [
+            "Whole Milk", "Egglands Best Large Eggs", "Bananas", "xyzzy widget",
+        ]
+        milk = breakdown[0]
+        assert milk["match_confidence"] == 100.0
+        assert milk["cheapest_store_id"] == walmart.id
+        assert [p["store_id"] for p in milk["prices_by_store"]] == [kroger.id, walmart.id]
+        assert milk["prices_by_store"][0]["is_on_sale"] is True
+        assert milk["prices_by_store"][0]["sale_expires"] is not None
+
+        assert breakdown[1]["product_id"] is not None
+        assert breakdown[1]["match_confidence"] < 100.0
+        assert breakdown[2]["cheapest_store_id"] == kroger.id
+        assert breakdown[3]["product_id"] is None
+        assert breakdown[3]["prices_by_store"] == []
+        assert breakdown[3]["cheapest_store_id"] is None
+
+    def test_compare_list_not_found(self, client: TestClient, sample_stores: list[Store]):
+        """Test comparing a list that does not exist."""
+        response = client.post("/api/compare", json={"list_id": 999, "zip_code": "92101"})
+
+        assert response.status_code == 404
+
+    def test_compare_no_stores(self, client: TestClient, sample_list: GroceryList):
+        """Test comparing in a ZIP code without stores."""
+        response = client.post("/api/compare", json={"list_id": sample_list.id, "zip_code": "10001"})
+
+        assert response.status_code == 404
+
+    def test_compare_within_radius(
+        self,
+        client: TestClient,
+        db_session: Session,
+        sample_list: GroceryList,
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test including nearby stores across a ZIP code border."""
+        kroger, walmart = sample_stores
+        kroger.lat, kroger.lng = 32.7157, -117.1611
+        walmart.lat, walmart.lng = 32.7190, -117.1625
+        far_away = Store(name="Trader Joe's", chain="Trader Joe's", zip_code="92109", lat=32.7970, lng=-117.2360)
+        neighbor = Store(name="Vons - Hillcrest", chain="Albertsons", zip_code="92103", lat=32.7300, lng=-117.1600)
+        db_session.add_all([far_away, neighbor])
+        db_session.commit()
+
+        response = client.post(
+            "/api/compare",
+            json={"list_id": sample_list.id, "zip_code": "92101", "radius_miles": 2},
+        )
+
+        assert response.status_code == 200
+        totals = response.json()["store_totals"]
+        assert {st["store_id"] for st in totals} == {kroger.id, walmart.id, neighbor.id}
+        distances = [st["distance_miles"] for st in totals]
+        assert distances == sorted(distances)
+        assert all(distance <= 2 for distance in distances)
+
+    def test_compare_radius_from_coordinates(
+        self, client: TestClient, db_session: Session, sample_list: GroceryList, sample_stores: list[Store]
+    ):
+        """Test searching around explicit coordinates."""
+        kroger, walmart = sample_stores
+        kroger.lat, kroger.lng = 32.7157, -117.1611
+        db_session.commit()
+
+        response = client.post(
+            "/api/compare",
+            json={"list_id": sample_list.id, "zip_code": "99999", "radius_miles": 1, "lat": 32.72, "lng": -117.16},
+        )
+
+        assert response.status_code == 200
+        assert [st["store_id"] for st in response.json()["store_totals"]] == [kroger.id]
+
+    def test_compare_nearest_to_coordinates(
+        self, client: TestClient, db_session: Session, sample_list: GroceryList, sample_stores: list[Store]
+    ):
+        """Test that coordinates without a radius compare the nearest stores."""
+        kroger, walmart = sample_stores
+        kroger.lat, kroger.lng = 32.7157, -117.1611
+        walmart.lat, walmart.lng = 32.9000, -117.2000
+        db_session.commit()
+
+        response = client.post(
+            "/api/compare",
+            json={"list_id": sample_list.id, "zip_code": "99999", "lat": 32.72, "lng": -117.16},
+        )
+
+        assert response.status_code == 200
+        assert [st["store_id"] for st in response.json()["store_totals"]] == [kroger.id, walmart.id]
+
+    def test_compare_zip_without_stores(
+        self, client: TestClient, db_session: Session, sample_list: GroceryList, sample_stores: list[Store]
+    ):
+        """Test that a ZIP code without stores falls back to its region's nearest stores."""
+        kroger, walmart = sample_stores
+        kroger.lat, kroger.lng = 32.7157, -117.1611
+        db_session.commit()
+
+        response = client.post("/api/compare", json={"list_id": sample_list.id, "zip_code": "92108"})
+
+        assert response.status_code == 200
+        assert [st["store_id"] for st in response.json()["store_totals"]] == [kroger.id]
+
+    def test_compare_split_basket(
+        self,
+        client: TestClient,
+        sample_list: GroceryList,
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test the split-basket plan across two stores."""
+        response = client.post(
+            "/api/compare",
+            json={"list_id": sample_list.id, "zip_code": "92101", "mode": "split_basket", "max_stores": 2},
+        )
+
+        assert response.status_code == 200
+        plan = response.json()["split_basket"]
+        kroger, walmart = sample_stores
+
+        # Milk and eggs from Walmart, bananas only at Kroger
+        assert sorted(plan["store_ids"]) == sorted([kroger.id, walmart.id])
+        assert plan["items_found"] == 3
+        assert plan["total_price"] == round(4.49 * 2 + 4.79 + 0.59 * 3, 2)
+        assert plan["single_store_total"] == round(4.99 * 2 + 4.99 + 0.59 * 3, 2)
+        assert plan["savings_vs_single_store"] == round(
+            plan["single_store_total"] - plan["total_price"], 2
+        )
+        assert {a["item_name"]: a["store_id"] for a in plan["assignments"]} == {
+            "Whole Milk": walmart.id,
+            "Egglands Best Large Eggs": walmart.id,
+            "Bananas": kroger.id,
+        }
+
+    def test_compare_default_mode_has_no_plan(
+        self, client: TestClient, sample_list: GroceryList, sample_stores: list[Store], sample_prices: list[Price]
+    ):
+        """Test that per-store mode skips the optimizer."""
+        response = client.post("/api/compare", json={"list_id": sample_list.id, "zip_code": "92101"})
+
+        assert response.json()["split_basket"] is None
+
+    def test_compare_unit_value(
+        self,
+        client: TestClient,
+        db_session: Session,
+        sample_list: GroceryList,
+        sample_products: list[Product],
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test that a cheaper half gallon beats the gallon on unit price."""
+        kroger, walmart = sample_stores
+        half_gallon = Product(name="Whole Milk", category="Dairy", unit_size=0.5, unit_type="gal")
+        db_session.add(half_gallon)
+        db_session.flush()
+        db_session.add(Price(product_id=half_gallon.id, store_id=kroger.id, price=2.00, effective_date=date.today()))
+        db_session.commit()
+
+        response = client.post(
+            "/api/compare", json={"list_id": sample_list.id, "zip_code": "92101", "mode": "unit_value"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        milk = data["item_breakdown"][0]
+        kroger_price = next(p for p in milk["prices_by_store"] if p["store_id"] == kroger.id)
+        walmart_price = next(p for p in milk["prices_by_store"] if p["store_id"] == walmart.id)
+        assert kroger_price["product_id"] == half_gallon.id
+        assert kroger_price["current_price"] == 2.00
+        assert kroger_price["normalized_unit_price"] == pytest.approx(2.00 / 64)
+        assert kroger_price["normalized_unit"] == "fl oz"
+        assert walmart_price["product_id"] == sample_products[0].id
+        assert milk["cheapest_store_id"] == kroger.id
+        # Two gallons of milk bought as half gallons at Kroger
+        totals = {total["store_id"]: total["total_price"] for total in data["store_totals"]}
+        assert totals[kroger.id] == round(2.00 * 4 + 4.99 + 0.59 * 3, 2)
+
+    def test_compare_summary_detail(
+        self, client: TestClient, sample_list: GroceryList, sample_stores: list[Store], sample_prices: list[Price]
+    ):
+        """Test that summary detail returns totals without an item breakdown."""
+        full = client.post("/api/compare", json={"list_id": sample_list.id, "zip_code": "92101"}).json()
+        response = client.post(
+            "/api/compare", json={"list_id": sample_list.id, "zip_code": "92101", "detail": "summary"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["item_breakdown"] == []
+        assert data["item_count"] == 4
+        assert data["store_totals"] == full["store_totals"]
+        assert data["cheapest_store_id"] == full["cheapest_store_id"]
+
+    def test_compare_cheapest_only_detail(
+        self, client: TestClient, sample_list: GroceryList, sample_stores: list[Store], sample_prices: list[Price]
+    ):
+        """Test that cheapest_only lists a single store price per item."""
+        response = client.post(
+            "/api/compare", json={"list_id": sample_list.id, "zip_code": "92101", "detail": "cheapest_only"}
+        )
+
+        breakdown = response.json()["item_breakdown"]
+        kroger, walmart = sample_stores
+        assert [[p["store_id"] for p in item["prices_by_store"]] for item in breakdown] == [
+            [walmart.id], [walmart.id], [kroger.id], [],
+        ]
+        assert breakdown[0]["prices_by_store"][0]["current_price"] == 4.49
+
+    def test_compare_paginated_breakdown(
+        self, client: TestClient, sample_list: GroceryList, sample_stores: list[Store], sample_prices: list[Price]
+    ):
+        """Test paging through the item breakdown."""
+        full = client.post("/api/compare", json={"list_id": sample_list.id, "zip_code": "92101"}).json()
+        pages = [
+            client.post(
+                "/api/compare",
+                json={"list_id": sample_list.id, "zip_code": "92101", "item_skip": skip, "item_limit": 3},
+            ).json()
+            for skip in (0, 3, 6)
+        ]
+
+        assert [len(page["item_breakdown"]) for page in pages] == [3, 1, 0]
+        assert all(page["item_count"] == 4 for page in pages)
+        assert pages[0]["item_breakdown"] + pages[1]["item_breakdown"] == full["item_breakdown"]
+        assert pages[2]["store_totals"] == full["store_totals"]
+
+
+class TestCompareStreamApi:
+    """Test suite for POST /api/compare/stream."""
+
+    @pytest.fixture(autouse=True)
+    def small_batches(self, monkeypatch: pytest.MonkeyPatch):
+        """Stream two items per batch so the sample list spans several batches."""
+        monkeypatch.setattr(get_settings(), "compare_stream_batch_size", 2)
+
+    def test_stream_matches_compare(
+        self, client: TestClient, sample_list: GroceryList, sample_stores: list[Store], sample_prices: list[Price]
+    ):
+        """Test that streamed items and final totals match the buffered response."""
+        body = {"list_id": sample_list.id, "zip_code": "92101"}
+        full = client.post("/api/compare", json=body).json()
+
+        response = client.post("/api/compare/stream", json=body)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [event["event"] for event in events] == ["item", "item", "totals", "item", "item", "totals"]
+        assert [event["data"] for event in events if event["event"] == "item"] == full["item_breakdown"]
+
+        running, final = (event["data"] for event in events if event["event"] == "totals")
+        assert running["items_processed"] == 2
+        assert running["complete"] is False
+        assert final["complete"] is True
+        assert final["items_processed"] == 4
+        assert final["store_totals"] == full["store_totals"]
+        assert final["cheapest_store_id"] == full["cheapest_store_id"]
+        assert final["potential_savings"] == full["potential_savings"]
+
+    def test_stream_server_sent_events(
+        self, client: TestClient, sample_list: GroceryList, sample_stores: list[Store], sample_prices: list[Price]
+    ):
+        """Test Server-Sent Events framing and summary detail."""
+        response = client.post(
+            "/api/compare/stream",
+            json={"list_id": sample_list.id, "zip_code": "92101", "detail": "summary"},
+            headers={"Accept": "text/event-stream"},
+        )
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = response.text.strip().split("\n\n")
+        assert [frame.splitlines()[0] for frame in frames] == ["event: totals", "event: totals"]
+        assert json.loads(frames[-1].splitlines()[1].removeprefix("data: "))["complete"] is True
+
+    def test_stream_page(
+        self, client: TestClient, sample_list: GroceryList, sample_stores: list[Store], sample_prices: list[Price]
+    ):
+        """Test that item_skip and item_limit select items across batches."""
+        response = client.post(
+            "/api/compare/stream",
+            json={"list_id": sample_list.id, "zip_code": "92101", "item_skip": 1, "item_limit": 2},
+        )
+
+        items = [
+            event["data"]["item_name"]
+            for event in map(json.loads, response.text.splitlines())
+            if event["event"] == "item"
+        ]
+        assert items == ["Egglands Best Large Eggs", "Bananas"]
+
+    def test_stream_rejects_split_basket(self, client: TestClient, sample_list: GroceryList):
+        """Test that split-basket mode cannot be streamed."""
+        response = client.post(
+            "/api/compare/stream",
+            json={"list_id": sample_list.id, "zip_code": "92101", "mode": "split_basket"},
+        )
+
+        assert response.status_code == 400
+
+    def test_stream_rejects_unit_value(self, client: TestClient, sample_list: GroceryList):
+        """Test that unit value mode cannot be streamed."""
+        response = client.post(
+            "/api/compare/stream",
+            json={"list_id": sample_list.id, "zip_code": "92101", "mode": "unit_value"},
+        )
+
+        assert response.status_code == 400
+
+    def test_stream_list_not_found(self, client: TestClient, sample_stores: list[Store]):
+        """Test that errors are reported before streaming starts."""
+        response = client.post("/api/compare/stream", json={"list_id": 999, "zip_code": "92101"})
+
+        assert response.status_code == 404
+
+
+class TestBatchCompareApi:
+    """Test suite for POST /api/compare:batch."""
+
+    def test_batch_matches_single_comparisons(
+        self,
+        client: TestClient,
+        db_session: Session,
+        db_engine,
+        sample_list: GroceryList,
+        sample_products: list[Product],
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test that each batch result equals the single comparison."""
+        second = GroceryList(name="Breakfast", user_id="demo_user_1")
+        db_session.add(second)
+        db_session.flush()
+        db_session.add_all([
+            GroceryListItem(grocery_list_id=second.id, product_id=sample_products[3].id,
+                            name="Cheerios", quantity=1.0, position=0),
+            GroceryListItem(grocery_list_id=second.id, name="Egglands Best Large Eggs", quantity=2.0, position=1),
+        ])
+        db_session.commit()
+
+        comparisons = [
+            {"list_id": sample_list.id, "zip_code": "92101"},
+            {"list_id": second.id, "zip_code": "92101", "detail": "cheapest_only"},
+            {"list_id": sample_list.id, "zip_code": "10001"},
+            {"list_id": 999, "zip_code": "92101"},
+        ]
+        expected = [client.post("/api/compare", json=body) for body in comparisons]
+
+        statements: list[str] = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+        event.listen(db_engine, "before_cursor_execute", listener)
+        try:
+            response = client.post("/api/compare:batch", json={"comparisons": comparisons})
+        finally:
+            event.remove(db_engine, "before_cursor_execute", listener)
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status_code"] for r in results] == [e.status_code for e in expected]
+        for result, single in zip(results, expected):
+            if single.status_code == 200:
+                assert result["result"] == single.json()
+                assert result["detail"] is None
+            else:
+                assert result["result"] is None
+                assert result["detail"] == single.json()["detail"]
+
+        assert sum("FROM prices" in statement for statement in statements) == 1
+
+    def test_batch_requires_comparisons(self, client: TestClient):
+        """Test that an empty batch is rejected."""
+        response = client.post("/api/compare:batch", json={"comparisons": []})
+
+        assert response.status_code == 422
@@ -0,0 +1,134 @@
+"""Tests for the vectorized comparison engine."""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.services.comparison_engine import MatchedItem, PriceMatrix
+from app.services.price_resolver import PriceRow
+
+
+def make_row(product_id: int, store_id: int, price: float, on_sale: bool = False) -> PriceRow:
+    """Create a resolved price row."""
+    return PriceRow(product_id, store_id, price + (0.5 if on_sale else 0.0), price, on_sale, None, None)
+
+
+def reference_aggregate(
+    items: list[MatchedItem], store_ids: list[int], rows: dict[tuple[int, int], PriceRow]
+) -> tuple[list[float], list[int], list[int], list, object, float]:
+    """Aggregate one pair at a time the way compare_prices used to."""
+    totals = {store_id: [0.0, 0, 0] for store_id in store_ids}
+    cheapest_per_item = []
+    for item in items:
+        cheapest_price, cheapest_store = float("inf"), None
+        for store_id in store_ids:
+            row = rows.get((item.product_id, store_id)) if item.product_id else None
+            if row is None:
+                continue
+            totals[store_id][0] += row.current_price * item.quantity
+            totals[store_id][1] += 1
+            totals[store_id][2] += int(row.is_on_sale)
+            if row.current_price < cheapest_price:
+                cheapest_price, cheapest_store = row.current_price, store_id
+        cheapest_per_item.append(cheapest_store)
+
+    with_items = sorted(
+        (store_id for store_id in store_ids if totals[store_id][1] > 0),
+        key=lambda store_id: totals[store_id][0],
+    )
+    cheapest_overall = with_items[0] if with_items else None
+    savings = totals[with_items[-1]][0] - totals[with_items[0]][0] if len(with_items) > 1 else 0.0
+    return (
+        [totals[s][0] for s in store_ids],
+        [totals[s][1] for s in store_ids],
+        [totals[s][2] for s in store_ids],
+        cheapest_per_item,
+        cheapest_overall,
+        savings,
+    )
+
+
+class TestPriceMatrix:
+    """Test suite for PriceMatrix."""
+
+    def test_build_lays_out_prices(self):
+        """Test that resolved rows land in the right cells with a NaN mask."""
+        items = [
+            MatchedItem("Milk", 1, 2.0, None, 100.0),
+            MatchedItem("Unknown", None, 1.0, None, 0.0),
+            MatchedItem("Eggs", 2, 1.0, "dozen", 90.0),
+        ]
+        rows = {
+            (1, 10): make_row(1, 10, 3.0),
+            (1, 20): make_row(1, 20, 2.5, on_sale=True),
+            (2, 20): make_row(2, 20, 4.0),
+            (2, 99): make_row(2, 99, 1.0),
+        }
+
+        matrix = PriceMatrix.build(items, [10, 20], rows)
+
+        assert matrix.found.tolist() == [[True, True], [False, False], [False, True]]
+        assert matrix.current_price[0].tolist() == [3.0, 2.5]
+        assert matrix.regular_price[0].tolist() == [3.0, 3.0]
+        assert matrix.on_sale.tolist() == [[False, True], [False, False], [False, False]]
+        assert matrix.quantities.tolist() == [2.0, 1.0, 1.0]
+        assert np.isnan(matrix.line_totals[1]).all()
+
+    def test_aggregate(self):
+        """Test totals, counts, cheapest stores and savings."""
+        items = [MatchedItem("Milk", 1, 2.0, None, 100.0), MatchedItem("Eggs", 2, 1.0, None, 100.0)]
+        rows = {
+            (1, 10): make_row(1, 10, 3.0),
+            (1, 20): make_row(1, 20, 2.5, on_sale=True),
+            (2, 20): make_row(2, 20, 4.0),
+        }
+
+        totals = PriceMatrix.build(items, [10, 20, 30], rows).aggregate()
+
+        assert totals.total_price.tolist() == [6.0, 9.0, 0.0]
+        assert totals.items_found.tolist() == [1, 2, 0]
+        assert totals.items_on_sale.tolist() == [0, 1, 0]
+        assert totals.cheapest_store.tolist() == [1, 1]
+        assert totals.cheapest_overall == 0
+        assert totals.potential_savings == pytest.approx(3.0)
+
+    def test_aggregate_without_prices(self):
+        """Test aggregating when no store prices any item."""
+        totals = PriceMatrix.build([MatchedItem("Milk", None, 1.0, None, 0.0)], [10], {}).aggregate()
+
+        assert totals.cheapest_store.tolist() == [-1]
+        assert totals.cheapest_overall is None
+        assert totals.potential_savings == 0.0
+
+    def test_aggregate_matches_pairwise_loop(self):
+        """Test the vectorized results bit-for-bit against the per-pair loop."""
+        rng = random.Random(7)
+        store_ids = list(range(1, 16))
+        items = [
+            MatchedItem(f"Item {i}", rng.choice([None, *range(1, 40)]), rng.choice([1.0, 2.0, 0.5, 3.0]), None, 80.0)
+            for i in range(60)
+        ]
+        rows = {
+            (product_id, store_id): make_row(
+                product_id, store_id, round(rng.uniform(0.5, 9.99), 2), rng.random() < 0.2
+            )
+            for product_id in range(1, 40)
+            for store_id in store_ids
+            if rng.random() < 0.7
+        }
+        # Force ties so tie-breaking is exercised
+        rows[(1, 3)] = make_row(1, 3, 1.0)
+        rows[(1, 5)] = make_row(1, 5, 1.0)
+
+        totals = PriceMatrix.build(items, store_ids, rows).aggregate()
+        expected = reference_aggregate(items, store_ids, rows)
+
+        assert totals.total_price.tolist() == expected[0]
+        assert totals.items_found.tolist() == expected[1]
+        assert totals.items_on_sale.tolist() == expected[2]
+        assert [
+            store_ids[column] if column >= 0 else None for column in totals.cheapest_store.tolist()
+        ] == expected[3]
+        assert store_ids[totals.cheapest_overall] == expected[4]
+        assert totals.potential_savings == expected[5]
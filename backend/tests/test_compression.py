@@ -0,0 +1,260 @@
+"""Tests for response compression and precompressed cached comparisons."""
+
+import gzip
+from collections.abc import Generator
+from typing import Optional
+
+import brotli
+import fakeredis
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import CacheManager
+from app.core.compression import CompressionMiddleware, compress, negotiate_encoding, precompress
+from app.models import GroceryList, GroceryListItem, Price, Product, Store
+from app.services import comparison_cache
+
+DECOMPRESS = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    "zstd": lambda body: zstandard.ZstdDecompressor().decompress(body),
+}
+
+
+@pytest.fixture
+def small_app() -> TestClient:
+    """Create an app with a 100-byte compression threshold."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/text")
+    def text(size: int) -> PlainTextResponse:
+        return PlainTextResponse("a" * size)
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"a" * 500, b"b" * 500]), media_type="application/x-ndjson")
+
+    @app.get("/png")
+    def png() -> PlainTextResponse:
+        return PlainTextResponse(b"\x89PNG" * 100, media_type="image/png")
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def cache() -> CacheManager:
+    """Create a cache manager backed by an in-memory Redis."""
+    server = fakeredis.FakeServer()
+    cache = CacheManager()
+    cache._client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    cache._binary_client = fakeredis.FakeRedis(server=server)
+    return cache
+
+
+@pytest.fixture
+def cached_client(
+    client: TestClient, cache: CacheManager, monkeypatch: pytest.MonkeyPatch
+) -> Generator[TestClient, None, None]:
+    """Create a test client with the comparison cache enabled."""
+    monkeypatch.setattr(get_settings(), "comparison_cache", True)
+    monkeypatch.setattr(get_settings(), "compression_minimum_size", 100)
+    monkeypatch.setattr(comparison_cache, "_cache", cache)
+    yield client
+
+
+@pytest.fixture
+def grocery_list(db_session: Session, sample_products: list[Product]) -> GroceryList:
+    """Create a list of linked products."""
+    grocery_list = GroceryList(name="Compressed", user_id="demo_user_1")
+    db_session.add(grocery_list)
+    db_session.flush()
+    db_session.add_all([
+        GroceryListItem(grocery_list_id=grocery_list.id, product_id=product.id, name=product.name, position=i)
+        for i, product in enumerate(sample_products[:5])
+    ])
+    db_session.commit()
+    return grocery_list
+
+
+class TestNegotiation:
+    """Test suite for Accept-Encoding negotiation and codecs."""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            (None, None),
+            ("", None),
+            ("gzip", "gzip"),
+            ("gzip, deflate, br", "br"),
+            ("gzip, deflate, br, zstd", "zstd"),
+            ("br;q=0, gzip;q=0.5", "gzip"),
+            ("zstd;q=0, br;q=0, gzip;q=0", None),
+            ("*", "zstd"),
+            ("identity", None),
+            ("GZIP;q=bogus, deflate", None),
+        ],
+    )
+    def test_negotiate_encoding(self, header: Optional[str], expected: Optional[str]):
+        """Test that the preferred accepted encoding is chosen."""
+        assert negotiate_encoding(header) == expected
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+    def test_compress_round_trip(self, encoding: str):
+        """Test that each encoding decompresses to the original body."""
+        body = b'{"store_totals":[]}' * 200
+
+        compressed = compress(body, encoding)
+
+        assert len(compressed) < len(body)
+        assert DECOMPRESS[encoding](compressed) == body
+
+    def test_precompress_threshold(self):
+        """Test that small bodies are only kept uncompressed."""
+        assert precompress(b"{}", 100) == {"identity": b"{}"}
+        assert set(precompress(b"x" * 200, 100)) == {"identity", "zstd", "br", "gzip"}
+
+    def test_unknown_encoding(self):
+        """Test that unsupported encodings are rejected."""
+        with pytest.raises(ValueError):
+            compress(b"{}", "deflate")
+
+
+class TestCompressionMiddleware:
+    """Test suite for CompressionMiddleware."""
+
+    def test_compresses_above_threshold(self, small_app: TestClient):
+        """Test that large bodies are compressed in the accepted encoding."""
+        response = small_app.get("/text", params={"size": 1000}, headers={"Accept-Encoding": "br"})
+
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < 1000
+        assert response.text == "a" * 1000
+
+    def test_skips_small_and_unaccepted(self, small_app: TestClient):
+        """Test that small bodies and clients without compression get identity."""
+        small = small_app.get("/text", params={"size": 99}, headers={"Accept-Encoding": "gzip"})
+        plain = small_app.get("/text", params={"size": 1000}, headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in plain.headers
+        assert plain.text == "a" * 1000
+
+    def test_skips_streams_and_binary(self, small_app: TestClient):
+        """Test that streaming and incompressible responses pass through."""
+        stream = small_app.get("/stream", headers={"Accept-Encoding": "gzip"})
+        image = small_app.get("/png", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in stream.headers
+        assert stream.content == b"a" * 500 + b"b" * 500
+        assert "content-encoding" not in image.headers
+
+    def test_installed_on_app(self, client: TestClient, db_session: Session):
+        """Test that API responses above the threshold are compressed."""
+        lists = [GroceryList(name=f"List {i}", user_id="many_lists") for i in range(30)]
+        db_session.add_all(lists)
+        db_session.commit()
+
+        response = client.get("/api/lists", params={"user_id": "many_lists"}, headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()) == 30
+
+
+class TestCachedComparisons:
+    """Test suite for precompressed cached comparisons."""
+
+    def test_hit_serves_precompressed_body(
+        self,
+        cached_client: TestClient,
+        cache: CacheManager,
+        grocery_list: GroceryList,
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test that a repeated comparison is served from the cache in the client's encoding."""
+        request = {"list_id": grocery_list.id, "zip_code": "92101"}
+
+        first = cached_client.post("/api/compare", json=request, headers={"Accept-Encoding": "zstd"})
+        second = cached_client.post("/api/compare", json=request, headers={"Accept-Encoding": "br"})
+        plain = cached_client.post("/api/compare", json=request, headers={"Accept-Encoding": "identity"})
+
+        assert first.headers["content-encoding"] == "zstd"
+        assert second.headers["content-encoding"] == "br"
+        assert "content-encoding" not in plain.headers
+        assert first.content == second.content == plain.content
+        assert "Accept-Encoding" in second.headers["vary"]
+        keys = cache.binary_client.keys(f"comparison:{grocery_list.id}:92101:*")
+        assert len(keys) == 1
+        assert set(cache.binary_client.hkeys(keys[0])) == {b"identity", b"gzip", b"br", b"zstd"}
+
+    def test_options_are_cached_separately(
+        self,
+        cached_client: TestClient,
+        cache: CacheManager,
+        grocery_list: GroceryList,
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test that different comparison options do not share an entry."""
+        full = cached_client.post("/api/compare", json={"list_id": grocery_list.id, "zip_code": "92101"})
+        summary = cached_client.post(
+            "/api/compare", json={"list_id": grocery_list.id, "zip_code": "92101", "detail": "summary"}
+        )
+
+        assert full.json()["item_breakdown"]
+        assert summary.json()["item_breakdown"] == []
+        assert len(cache.binary_client.keys("comparison:*")) == 2
+
+    def test_list_update_invalidates(
+        self,
+        cached_client: TestClient,
+        cache: CacheManager,
+        grocery_list: GroceryList,
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test that changing a list drops its cached comparisons."""
+        request = {"list_id": grocery_list.id, "zip_code": "92101"}
+        before = cached_client.post("/api/compare", json=request).json()
+
+        cached_client.put(f"/api/lists/{grocery_list.id}", json={"items": [{"name": "Bananas", "quantity": 1}]})
+
+        assert cache.binary_client.keys("comparison:*") == []
+        after = cached_client.post("/api/compare", json=request).json()
+        assert len(after["item_breakdown"]) == 1
+        assert len(before["item_breakdown"]) == 5
+
+    def test_unreachable_redis_is_skipped(
+        self,
+        cached_client: TestClient,
+        monkeypatch: pytest.MonkeyPatch,
+        grocery_list: GroceryList,
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test that comparisons stop calling Redis for a while once it is unreachable."""
+        server = fakeredis.FakeServer()
+        server.connected = False
+        down = CacheManager()
+        down._binary_client = fakeredis.FakeRedis(server=server)
+        monkeypatch.setattr(comparison_cache, "_cache", down)
+        request = {"list_id": grocery_list.id, "zip_code": "92101"}
+
+        first = cached_client.post("/api/compare", json=request)
+        assert first.status_code == 200
+        assert not down.reachable
+
+        calls = []
+        monkeypatch.setattr(down, "get_comparison_body", lambda *args: calls.append(args))
+        monkeypatch.setattr(down, "set_comparison_bodies", lambda *args: calls.append(args))
+        second = cached_client.post("/api/compare", json=request)
+
+        assert second.json() == first.json()
+        assert calls == []
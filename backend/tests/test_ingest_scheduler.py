@@ -0,0 +1,379 @@
+"""Tests for the ingest job scheduler."""
+
+import asyncio
+from collections import Counter
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import Engine, create_engine, event, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.config import get_settings
+from app.db.database import Base
+from app.models import IngestJob, Product, Store
+from app.services.ingest_scheduler import (
+    INGEST_SOURCES,
+    KROGER_PRICES_REUSE,
+    IngestScheduler,
+    default_handlers,
+    in_off_peak_window,
+    next_run_at,
+    retry_delay,
+)
+
+EASTERN = ZoneInfo("America/New_York")
+
+# 3 AM and noon Eastern: inside and outside the off-peak window
+OFF_PEAK = datetime(2026, 10, 14, 3, 0, tzinfo=EASTERN).astimezone(timezone.utc)
+PEAK = datetime(2026, 10, 14, 12, 0, tzinfo=EASTERN).astimezone(timezone.utc)
+
+
+class Clock:
+    """A settable clock."""
+
+    def __init__(self, now: datetime):
+        """Start the clock at ``now``."""
+        self.now = now
+
+    def __call__(self) -> datetime:
+        """Get the current time."""
+        return self.now
+
+
+@pytest.fixture
+def ingest_engine(tmp_path: Path) -> Iterator[Engine]:
+    """Create a file database with a connection per worker thread.
+
+    Transactions begin with ``BEGIN IMMEDIATE``, which takes SQLite's write
+    lock up front, so concurrent claims are serialized as ``SKIP LOCKED``
+    would on PostgreSQL.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'ingest.db'}", connect_args={"isolation_level": None})
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(ingest_engine: Engine) -> sessionmaker:
+    """Create a session factory on a database with two chains in one ZIP code."""
+    factory = sessionmaker(bind=ingest_engine)
+    with factory() as db:
+        db.add_all([
+            Store(name="Kroger Downtown", chain="Kroger", zip_code="45202"),
+            Store(name="Kroger Uptown", chain="Kroger", zip_code="45202"),
+            Store(name="Target Downtown", chain="Target", zip_code="45202"),
+        ])
+        db.commit()
+    return factory
+
+
+@pytest.fixture(autouse=True)
+def ingest_settings(monkeypatch: pytest.MonkeyPatch):
+    """Use the documented window and a short retry schedule."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "ingest_timezone", "America/New_York")
+    monkeypatch.setattr(settings, "ingest_window_start_hour", 2)
+    monkeypatch.setattr(settings, "ingest_window_end_hour", 6)
+    monkeypatch.setattr(settings, "ingest_max_attempts", 3)
+    monkeypatch.setattr(settings, "ingest_retry_base_seconds", 60.0)
+
+
+def recording_handlers(calls: list[tuple[str, str, str]], items: int = 10, delay: float = 0.0) -> dict:
+    """Create handlers that record their calls and return ``items``."""
+
+    def handler(source: str):
+        async def fetch(store_chain: str, zip_code: str) -> int:
+            calls.append((source, store_chain, zip_code))
+            await asyncio.sleep(delay)
+            return items
+
+        return fetch
+
+    return {source: handler(source) for source in INGEST_SOURCES}
+
+
+class FakeKroger:
+    """A Kroger client with one Kroger location that records price fetches."""
+
+    def __init__(self, delay: float = 0.0, failures: int = 0):
+        """Delay each price fetch by ``delay``; fail the first ``failures``."""
+        self.delay = delay
+        self.failures = failures
+        self.fetches: list[list[str]] = []
+
+    async def get_locations(self, zip_code: str) -> list[dict]:
+        """Get the one location."""
+        return [{"locationId": "01400943", "chain": "KROGER"}]
+
+    async def get_product_prices(self, location_id: str, product_ids: list[str]) -> list[dict]:
+        """Price every product, the first on promotion."""
+        self.fetches.append(product_ids)
+        await asyncio.sleep(self.delay)
+        if len(self.fetches) <= self.failures:
+            raise ConnectionError("connection reset")
+        return [
+            {"upc": upc, "price": {"regular": 3.99, "promo": 2.99 if number == 0 else None}}
+            for number, upc in enumerate(product_ids)
+        ]
+
+
+def jobs(session_factory: sessionmaker) -> list[IngestJob]:
+    """Load every job."""
+    with session_factory() as db:
+        return list(db.scalars(select(IngestJob).order_by(IngestJob.id)))
+
+
+class TestScheduling:
+    """Test suite for cadences and the off-peak window."""
+
+    def test_schedule_targets(self, session_factory: sessionmaker):
+        """Test that each chain gets the sources that apply to it, once."""
+        scheduler = IngestScheduler(session_factory, handlers={}, clock=Clock(OFF_PEAK))
+
+        assert scheduler.schedule() == 4
+        assert scheduler.schedule() == 0
+        assert sorted((job.source, job.store_chain) for job in jobs(session_factory)) == [
+            ("base_prices", "Kroger"),
+            ("circulars", "Kroger"),
+            ("circulars", "Target"),
+            ("promos", "Kroger"),
+        ]
+
+    def test_schedule_skips_concurrently_enqueued_target(self, session_factory: sessionmaker):
+        """Test that a target another scheduler enqueued mid-pass does not lose the rest."""
+
+        def racing_session():
+            db = session_factory()
+            statements = []
+
+            @event.listens_for(db, "do_orm_execute")
+            def enqueue_after_active_check(state):
+                statements.append(state.statement)
+                # The last lookup before inserting; the active jobs are already read
+                if len(statements) == 3:
+                    db.connection().execute(
+                        insert(IngestJob).values(
+                            source="promos", store_chain="Kroger", zip_code="45202", priority=30,
+                            off_peak=True, status=IngestJob.PENDING, run_at=OFF_PEAK, attempts=0,
+                        )
+                    )
+
+            return db
+
+        scheduler = IngestScheduler(racing_session, handlers={}, clock=Clock(OFF_PEAK))
+
+        assert scheduler.schedule() == 3
+        assert Counter(job.source for job in jobs(session_factory)) == {"circulars": 2, "promos": 1, "base_prices": 1}
+
+    def test_window(self):
+        """Test the 2-6 AM window in the configured timezone."""
+        assert in_off_peak_window(OFF_PEAK)
+        assert not in_off_peak_window(PEAK)
+        assert not in_off_peak_window(datetime(2026, 10, 14, 6, 0, tzinfo=EASTERN))
+
+    def test_next_run_at_window_start(self):
+        """Test that the next run is due at the window start on the due day."""
+        finished = datetime(2026, 10, 14, 5, 40, tzinfo=EASTERN)
+
+        assert next_run_at(INGEST_SOURCES["promos"], finished) == datetime(2026, 10, 15, 2, 0, tzinfo=EASTERN)
+        assert next_run_at(INGEST_SOURCES["base_prices"], finished) == datetime(2026, 10, 16, 2, 0, tzinfo=EASTERN)
+        assert next_run_at(INGEST_SOURCES["circulars"], finished) == datetime(2026, 10, 21, 2, 0, tzinfo=EASTERN)
+
+    def test_retry_delay(self):
+        """Test that retry delays double per attempt up to the cap."""
+        assert [retry_delay(attempts).total_seconds() for attempts in (1, 2, 3)] == [60, 120, 240]
+        assert retry_delay(20) == timedelta(hours=6)
+
+
+class TestRun:
+    """Test suite for running jobs with workers."""
+
+    async def test_waits_for_window(self, session_factory: sessionmaker):
+        """Test that off-peak jobs are not claimed outside the window."""
+        calls: list[tuple[str, str, str]] = []
+        clock = Clock(PEAK)
+        scheduler = IngestScheduler(session_factory, recording_handlers(calls), workers=2, clock=clock)
+
+        report = await scheduler.run()
+        assert report.scheduled == 4 and calls == []
+
+        clock.now = OFF_PEAK + timedelta(days=1)
+        report = await scheduler.run()
+        assert len(calls) == 4
+        assert report.sources["circulars"].succeeded == 2
+        assert report.sources["promos"].items == 10
+
+    async def test_priority_order(self, session_factory: sessionmaker):
+        """Test that a single worker runs due jobs by priority."""
+        calls: list[tuple[str, str, str]] = []
+        scheduler = IngestScheduler(session_factory, recording_handlers(calls), workers=1, clock=Clock(OFF_PEAK))
+
+        await scheduler.run()
+
+        assert [source for source, _, _ in calls] == ["promos", "circulars", "circulars", "base_prices"]
+
+    async def test_workers_run_concurrently(self, session_factory: sessionmaker):
+        """Test that workers overlap and never run a job twice."""
+        with session_factory() as db:
+            db.add_all([Store(name=f"Kroger {zip_code}", chain="Kroger", zip_code=zip_code) for zip_code in ("45203", "45204")])
+            db.commit()
+        calls: list[tuple[str, str, str]] = []
+        scheduler = IngestScheduler(
+            session_factory, recording_handlers(calls, delay=0.05), workers=4, clock=Clock(OFF_PEAK)
+        )
+
+        report = await scheduler.run()
+
+        assert len(calls) == 10 and len(set(calls)) == 10
+        assert report.wall_seconds < sum(stats.busy_seconds for stats in report.sources.values()) / 2
+        assert report.throughput()["promos"]["jobs_per_second"] > 0
+        assert {job.status for job in jobs(session_factory)} == {IngestJob.SUCCEEDED}
+
+    async def test_next_run_after_success(self, session_factory: sessionmaker):
+        """Test that finished targets are rescheduled per their cadence."""
+        clock = Clock(OFF_PEAK)
+        scheduler = IngestScheduler(session_factory, recording_handlers([]), clock=clock)
+        await scheduler.run()
+
+        clock.now = OFF_PEAK + timedelta(minutes=30)
+        assert scheduler.schedule() == 4
+        pending = {
+            (job.source, job.store_chain): job.run_at.replace(tzinfo=timezone.utc)
+            for job in jobs(session_factory)
+            if job.status == IngestJob.PENDING
+        }
+        assert pending[("promos", "Kroger")] == datetime(2026, 10, 15, 2, 0, tzinfo=EASTERN)
+        assert pending[("circulars", "Target")] == datetime(2026, 10, 21, 2, 0, tzinfo=EASTERN)
+
+    async def test_retry_with_backoff(self, session_factory: sessionmaker):
+        """Test that failed jobs are retried later, then failed after the last attempt."""
+        attempts = Counter()
+
+        async def flaky(store_chain: str, zip_code: str) -> int:
+            attempts[store_chain] += 1
+            raise ConnectionError("connection reset")
+
+        clock = Clock(OFF_PEAK)
+        scheduler = IngestScheduler(session_factory, {"circulars": flaky}, workers=2, clock=clock)
+
+        report = await scheduler.run()
+        [kroger] = [job for job in jobs(session_factory) if job.source == "circulars" and job.store_chain == "Kroger"]
+        assert report.sources["circulars"].retried == 2
+        assert report.sources["promos"].retried == 1  # no handler
+        assert (kroger.status, kroger.attempts) == (IngestJob.PENDING, 1)
+        assert kroger.run_at.replace(tzinfo=timezone.utc) == OFF_PEAK + timedelta(seconds=60)
+        assert kroger.last_error == "ConnectionError: connection reset"
+
+        # Not due again until the backoff has passed
+        clock.now = OFF_PEAK + timedelta(seconds=59)
+        assert (await scheduler.run()).sources == {}
+
+        clock.now = OFF_PEAK + timedelta(seconds=60)
+        await scheduler.run()
+        clock.now = OFF_PEAK + timedelta(seconds=180)
+        report = await scheduler.run()
+
+        assert attempts == {"Kroger": 3, "Target": 3}
+        assert report.sources["circulars"].failed == 2
+        assert {job.status for job in jobs(session_factory) if job.source == "circulars"} == {IngestJob.FAILED}
+
+    def test_finish_deleted_job(self, session_factory: sessionmaker):
+        """Test that finishing a job deleted while it ran reports it failed."""
+        scheduler = IngestScheduler(session_factory, handlers={}, clock=Clock(OFF_PEAK))
+        scheduler.schedule()
+        claimed = scheduler.claim("worker")
+        with session_factory() as db:
+            db.delete(db.get(IngestJob, claimed.id))
+            db.commit()
+
+        assert scheduler.finish(claimed, items=10) == IngestJob.FAILED
+
+    async def test_stale_running_job_requeued(self, session_factory: sessionmaker):
+        """Test that a job left running by a crashed worker is retried."""
+        clock = Clock(OFF_PEAK)
+        scheduler = IngestScheduler(session_factory, recording_handlers([]), clock=clock)
+        scheduler.schedule()
+        claimed = scheduler.claim("crashed-worker")
+
+        clock.now = OFF_PEAK + timedelta(hours=1, seconds=1)
+        report = await scheduler.run()
+
+        with session_factory() as db:
+            job = db.get(IngestJob, claimed.id)
+        assert report.requeued == 1
+        assert (job.status, job.last_error) == (IngestJob.PENDING, "Timed out")
+
+
+class TestDefaultHandlers:
+    """Test suite for the built-in Kroger handlers."""
+
+    @pytest.fixture(autouse=True)
+    def products(self, session_factory: sessionmaker):
+        """Add two products with UPCs and one without."""
+        with session_factory() as db:
+            db.add_all([Product(name="Milk", upc="0001"), Product(name="Eggs", upc="0002"), Product(name="Bananas")])
+            db.commit()
+
+    async def test_one_fetch_feeds_both_sources(self, session_factory: sessionmaker):
+        """Test that a target's promos and base_prices jobs share one fetch."""
+        kroger = FakeKroger()
+        clock = Clock(OFF_PEAK)
+        handlers = default_handlers(session_factory, kroger=kroger, clock=clock)
+
+        assert await handlers["promos"]("Kroger", "45202") == 1
+        assert await handlers["base_prices"]("Kroger", "45202") == 2
+        assert kroger.fetches == [["0001", "0002"]]
+
+        # The next night fetches afresh
+        clock.now = OFF_PEAK + KROGER_PRICES_REUSE
+        await handlers["promos"]("Kroger", "45202")
+        assert len(kroger.fetches) == 2
+
+    async def test_concurrent_jobs_share_fetch(self, session_factory: sessionmaker):
+        """Test that jobs started while a fetch is in flight wait for it."""
+        kroger = FakeKroger(delay=0.05)
+        scheduler = IngestScheduler(
+            session_factory,
+            default_handlers(session_factory, kroger=kroger, clock=Clock(OFF_PEAK)),
+            workers=4,
+            clock=Clock(OFF_PEAK),
+        )
+        scheduler.sources = {name: INGEST_SOURCES[name] for name in ("promos", "base_prices")}
+
+        report = await scheduler.run()
+
+        assert len(kroger.fetches) == 1
+        assert (report.sources["promos"].items, report.sources["base_prices"].items) == (1, 2)
+
+    async def test_upcs_loaded_per_fetch(self, session_factory: sessionmaker):
+        """Test that products added after the handlers were built are priced."""
+        kroger = FakeKroger()
+        clock = Clock(OFF_PEAK)
+        handlers = default_handlers(session_factory, kroger=kroger, clock=clock)
+        await handlers["base_prices"]("Kroger", "45202")
+        with session_factory() as db:
+            db.add(Product(name="Bread", upc="0003"))
+            db.commit()
+
+        clock.now = OFF_PEAK + timedelta(days=2)
+        assert await handlers["base_prices"]("Kroger", "45202") == 3
+        assert kroger.fetches[-1] == ["0001", "0002", "0003"]
+
+    async def test_failed_fetch_not_reused(self, session_factory: sessionmaker):
+        """Test that a retry after a failed fetch fetches again."""
+        kroger = FakeKroger(failures=1)
+        handlers = default_handlers(session_factory, kroger=kroger, clock=Clock(OFF_PEAK))
+
+        with pytest.raises(ConnectionError):
+            await handlers["promos"]("Kroger", "45202")
+        assert await handlers["promos"]("Kroger", "45202") == 1
+        assert len(kroger.fetches) == 2
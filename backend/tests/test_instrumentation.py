@@ -0,0 +1,124 @@
+"""Tests for per-request instrumentation."""
+
+import json
+import logging
+import re
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import CacheManager
+from app.core.instrumentation import collect_metrics, instrument_engine
+from app.models import GroceryList, GroceryListItem, Price, Product, Store
+
+
+@pytest.fixture
+def instrumented_client(client: TestClient, db_engine: Engine) -> TestClient:
+    """Create a test client whose database engine is instrumented."""
+    instrument_engine(db_engine)
+    return client
+
+
+@pytest.fixture
+def fuzzy_list(db_session: Session, sample_products: list[Product]) -> GroceryList:
+    """Create a list with one linked and one fuzzy-matched item."""
+    grocery_list = GroceryList(name="Timing", user_id="demo_user_1")
+    db_session.add(grocery_list)
+    db_session.flush()
+    db_session.add_all([
+        GroceryListItem(grocery_list_id=grocery_list.id, product_id=sample_products[0].id,
+                        name="Whole Milk", quantity=1.0, position=0),
+        GroceryListItem(grocery_list_id=grocery_list.id, name="Egglands Best Large Eggs", quantity=1.0, position=1),
+    ])
+    db_session.commit()
+    return grocery_list
+
+
+def parse_server_timing(header: str) -> dict[str, tuple[float, str]]:
+    """Parse a Server-Timing header into {metric: (duration, description)}."""
+    timings = {}
+    for entry in header.split(", "):
+        name, *params = entry.split(";")
+        values = dict(param.split("=", 1) for param in params)
+        timings[name] = (float(values["dur"]), values.get("desc", "").strip('"'))
+    return timings
+
+
+class TestInstrumentation:
+    """Test suite for the instrumentation middleware and trackers."""
+
+    def test_server_timing_header(
+        self,
+        instrumented_client: TestClient,
+        fuzzy_list: GroceryList,
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test that a comparison reports its DB queries and matcher work."""
+        response = instrumented_client.post("/api/compare", json={"list_id": fuzzy_list.id, "zip_code": "92101"})
+
+        assert response.status_code == 200
+        timings = parse_server_timing(response.headers["server-timing"])
+        assert set(timings) == {"db", "redis", "matcher", "total"}
+        assert int(re.match(r"\d+", timings["db"][1]).group()) > 0
+        assert timings["matcher"][1] == "1 matches"
+        assert timings["total"][0] >= timings["db"][0]
+
+    def test_request_log(
+        self,
+        instrumented_client: TestClient,
+        fuzzy_list: GroceryList,
+        sample_stores: list[Store],
+        caplog: pytest.LogCaptureFixture,
+    ):
+        """Test the structured log line for a normal request."""
+        with caplog.at_level(logging.INFO, logger="app.requests"):
+            instrumented_client.get(f"/api/lists/{fuzzy_list.id}")
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert caplog.records[-1].levelno == logging.INFO
+        assert record["method"] == "GET"
+        assert record["path"] == f"/api/lists/{fuzzy_list.id}"
+        assert record["status"] == 200
+        assert record["db_queries"] > 0
+        assert "statements" not in record
+
+    def test_slow_request_logs_statements(
+        self,
+        instrumented_client: TestClient,
+        fuzzy_list: GroceryList,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        """Test that slow requests are logged with their SQL statements."""
+        monkeypatch.setattr(get_settings(), "slow_request_threshold_ms", 0.0)
+
+        with caplog.at_level(logging.INFO, logger="app.requests"):
+            instrumented_client.get(f"/api/lists/{fuzzy_list.id}")
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert caplog.records[-1].levelno == logging.WARNING
+        assert record["slow"] is True
+        assert len(record["statements"]) == record["db_queries"]
+        assert any("grocery_lists" in statement["sql"] for statement in record["statements"])
+
+    def test_collect_metrics_outside_requests(self, db_engine: Engine):
+        """Test collecting DB and Redis work outside a request."""
+        instrument_engine(db_engine)
+        cache = CacheManager()
+        cache._client = fakeredis.FakeRedis(decode_responses=True)
+
+        with db_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))  # not collected
+            with collect_metrics() as metrics:
+                connection.execute(text("SELECT 2"))
+                cache.set("price:1:1", {"price": 1.0})
+                cache.get("price:1:1")
+
+        assert metrics.db_queries == 1
+        assert metrics.statements[0][0] == "SELECT 2"
+        assert metrics.redis_calls == 2
@@ -0,0 +1,53 @@
+"""Tests for the load-test harness."""
+
+import argparse
+from pathlib import Path
+
+import pytest
+
+from app.db.synthetic import SyntheticScale, load_synthetic_data
+from app.services import product_catalog, store_directory
+from benchmarks.load_test import DEFAULT_MIX, Workload, _sqlite_engine, _summarize, local_server, parse_mix, run_load
+
+TINY = SyntheticScale(
+    products=30, stores=4, zip_codes=2, price_history=2, users=2, lists_per_user=2, items_per_list=5
+)
+
+
+class TestLoadTest:
+    """Test suite for the load-test harness."""
+
+    def test_summarize(self):
+        """Test percentiles and throughput of recorded latencies."""
+        summary = _summarize([float(ms) for ms in range(1, 101)], errors=2, elapsed=10.0)
+
+        assert summary["requests"] == 100
+        assert summary["errors"] == 2
+        assert summary["rps"] == 10.0
+        assert summary["p50_ms"] == 50.5
+        assert summary["p95_ms"] == pytest.approx(95.05)
+        assert summary["p99_ms"] == pytest.approx(99.01)
+
+    def test_parse_mix(self):
+        """Test parsing scenario weights."""
+        assert parse_mix("compare=3,list_sync=1") == {"compare": 3, "list_sync": 1}
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_mix("checkout=1")
+
+    async def test_run_against_local_server(self, tmp_path: Path):
+        """Test a short run of every scenario against the in-process server."""
+        engine = _sqlite_engine(tmp_path / "load.db")
+        data = load_synthetic_data(engine, TINY)
+
+        try:
+            with local_server(engine) as base_url:
+                report = await run_load(base_url, Workload.from_data(data), users=3, duration=0.5, mix=DEFAULT_MIX)
+        finally:
+            product_catalog.invalidate_product_catalog()
+            store_directory.invalidate_store_directory()
+            engine.dispose()
+
+        requests = report["requests"]
+        assert requests["total"]["requests"] > 0
+        assert requests["total"]["errors"] == 0
+        assert {"compare", "list_sync:index", "list_sync:get"} <= set(requests)
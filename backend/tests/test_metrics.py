@@ -0,0 +1,171 @@
+"""Tests for Prometheus metrics."""
+
+import logging
+import threading
+import time
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheManager
+from app.db.database import TimedQueuePool
+from app.models import GroceryList, GroceryListItem, Price, Product, Store
+from app.services.product_matcher import ProductMatcher
+
+PHASES = ("list_load", "store_lookup", "matching", "price_resolution", "aggregation", "serialization")
+
+
+def sample(name: str, **labels: str) -> float:
+    """Get the current value of a metric sample, 0 if it was never recorded."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def cache() -> CacheManager:
+    """Create a cache manager backed by an in-memory Redis."""
+    cache = CacheManager()
+    cache._client = fakeredis.FakeRedis(decode_responses=True)
+    return cache
+
+
+@pytest.fixture
+def grocery_list(db_session: Session, sample_products: list[Product]) -> GroceryList:
+    """Create a list with one linked and one fuzzy-matched item."""
+    grocery_list = GroceryList(name="Metrics", user_id="demo_user_1")
+    db_session.add(grocery_list)
+    db_session.flush()
+    db_session.add_all([
+        GroceryListItem(grocery_list_id=grocery_list.id, product_id=sample_products[0].id,
+                        name="Whole Milk", quantity=1.0, position=0),
+        GroceryListItem(grocery_list_id=grocery_list.id, name="Egglands Best Large Eggs", quantity=1.0, position=1),
+    ])
+    db_session.commit()
+    return grocery_list
+
+
+class TestMetrics:
+    """Test suite for the metrics endpoint and recorded metrics."""
+
+    def test_metrics_endpoint(self, client: TestClient):
+        """Test that /metrics serves the Prometheus text format."""
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE compare_phase_seconds histogram" in response.text
+        assert "# TYPE cache_requests_total counter" in response.text
+
+    def test_compare_phases(
+        self,
+        client: TestClient,
+        grocery_list: GroceryList,
+        sample_stores: list[Store],
+        sample_prices: list[Price],
+    ):
+        """Test that a comparison observes every phase once."""
+        before = {phase: sample("compare_phase_seconds_count", phase=phase) for phase in PHASES}
+
+        response = client.post("/api/compare", json={"list_id": grocery_list.id, "zip_code": "92101"})
+
+        assert response.status_code == 200
+        assert response.json()["list_id"] == grocery_list.id
+        for phase in PHASES:
+            assert sample("compare_phase_seconds_count", phase=phase) == before[phase] + 1
+
+    def test_matcher_scores(self, db_session: Session, sample_products: list[Product]):
+        """Test that rejected matches still record their best score."""
+        matcher = ProductMatcher(db_session, min_score=101)
+        scores_before = sample("matcher_best_score_count")
+        empty_before = sample("matcher_candidates_bucket", le="0.0")
+
+        assert matcher.find_matches("Whole Milk") == []
+
+        assert sample("matcher_best_score_count") == scores_before + 1
+        assert sample("matcher_candidates_bucket", le="0.0") == empty_before + 1
+
+    def test_cache_hits_and_misses(self, cache: CacheManager):
+        """Test cache outcomes are counted by key prefix."""
+        hits = sample("cache_requests_total", prefix="price", result="hit")
+        misses = sample("cache_requests_total", prefix="price", result="miss")
+        other = sample("cache_requests_total", prefix="other", result="miss")
+
+        cache.set_price(1, 1, {"price": 1.0})
+        cache.get_price(1, 1)
+        cache.get_price(2, 1)
+        cache.get("unknown:key")
+
+        assert sample("cache_requests_total", prefix="price", result="hit") == hits + 1
+        assert sample("cache_requests_total", prefix="price", result="miss") == misses + 1
+        assert sample("cache_requests_total", prefix="other", result="miss") == other + 1
+
+    def test_cache_errors_are_logged(self, caplog: pytest.LogCaptureFixture):
+        """Test that Redis errors are counted and logged rather than swallowed."""
+        server = fakeredis.FakeServer()
+        server.connected = False
+        cache = CacheManager()
+        cache._client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        errors = sample("cache_requests_total", prefix="comparison", result="error")
+
+        with caplog.at_level(logging.WARNING, logger="app.core.cache"):
+            assert cache.get_comparison(1, "92101") is None
+            # Redis is skipped while it is known to be down
+            assert cache.set_comparison(1, "92101", {"total": 1}) is False
+
+        assert sample("cache_requests_total", prefix="comparison", result="error") == errors + 1
+        assert [record.levelno for record in caplog.records] == [logging.WARNING]
+        assert "comparison:1:92101" in caplog.records[0].getMessage()
+
+    def test_every_cache_skips_redis_while_down(self):
+        """Test that rosters, circular pages and write pins skip Redis after a connection failure."""
+        server = fakeredis.FakeServer()
+        cache = CacheManager()
+        cache._client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        cache.set_store_rosters("v1", {"92101": [{"id": 1}]})
+        cache.set_circular_pages({"abc": [{"product_name": "Milk"}]})
+        cache.set_write_pins(["list:1"], 5)
+
+        server.connected = False
+        assert cache.get_store_rosters() is None
+        assert not cache.reachable
+
+        # Back up, but not retried until the health check succeeds
+        server.connected = True
+        assert cache.get_store_rosters() is None
+        assert cache.get_circular_pages(["abc"]) == {}
+        assert cache.any_write_pinned(["list:1"]) is False
+        assert cache.set_store_rosters("v2", {}) is False
+
+        assert cache.health_check()
+        assert cache.get_store_rosters() == ("v1", {"92101": [{"id": 1}]})
+        assert cache.get_circular_pages(["abc"]) == {"abc": [{"product_name": "Milk"}]}
+        assert cache.any_write_pinned(["list:1"])
+
+    def test_pool_checkout_wait(self):
+        """Test that TimedQueuePool observes each checkout."""
+        engine = create_engine("sqlite://", poolclass=TimedQueuePool)
+        before = sample("db_pool_checkout_wait_seconds_count")
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        assert sample("db_pool_checkout_wait_seconds_count") == before + 2
+
+    def test_pool_checkout_wait_includes_queueing(self):
+        """Test that time spent waiting for a busy pool's connection is observed."""
+        engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=0)
+        held = engine.connect()
+        threading.Timer(0.1, held.close).start()
+        before = sample("db_pool_checkout_wait_seconds_sum")
+
+        started = time.perf_counter()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        assert sample("db_pool_checkout_wait_seconds_sum") - before >= 0.1
+        assert time.perf_counter() - started >= 0.1
@@ -0,0 +1,128 @@
+"""Tests for the PriceCompactor service."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.partitioning import month_start, partition_name
+from app.models import Price, PriceHistory, Product, Store
+from app.services.price_compaction import PriceCompactor
+from app.services.price_resolver import PriceResolver
+
+
+@pytest.fixture
+def price_history_rows(
+    db_session: Session, sample_products: list[Product], sample_stores: list[Store]
+) -> tuple[int, int, int]:
+    """Create a few months of price rows for two (product, store) pairs."""
+    milk, eggs = sample_products[0], sample_products[2]
+    store = sample_stores[0]
+    db_session.add_all([
+        # Milk: unchanged run in January, price change in February
+        Price(product_id=milk.id, store_id=store.id, price=1.0, effective_date=date(2024, 1, 5)),
+        Price(product_id=milk.id, store_id=store.id, price=1.0, effective_date=date(2024, 1, 20)),
+        Price(product_id=milk.id, store_id=store.id, price=1.2, effective_date=date(2024, 2, 3)),
+        # Eggs: February price superseded in March
+        Price(product_id=eggs.id, store_id=store.id, price=2.0, effective_date=date(2024, 2, 10)),
+        Price(product_id=eggs.id, store_id=store.id, price=2.5, effective_date=date(2024, 3, 5)),
+    ])
+    db_session.commit()
+    return milk.id, eggs.id, store.id
+
+
+def _intervals(db_session: Session, product_id: int) -> list[tuple[float, date, date]]:
+    """Get the archived intervals for a product in order."""
+    return [
+        tuple(row)
+        for row in db_session.execute(
+            select(PriceHistory.price, PriceHistory.valid_from, PriceHistory.valid_to)
+            .where(PriceHistory.product_id == product_id)
+            .order_by(PriceHistory.valid_from)
+        )
+    ]
+
+
+class TestPartitionHelpers:
+    """Test month arithmetic used for partition names."""
+
+    def test_month_start(self):
+        """Test shifting months across year boundaries."""
+        assert month_start(date(2024, 3, 17)) == date(2024, 3, 1)
+        assert month_start(date(2024, 1, 31), -1) == date(2023, 12, 1)
+        assert month_start(date(2024, 12, 1), 1) == date(2025, 1, 1)
+
+    def test_partition_name(self):
+        """Test partition naming."""
+        assert partition_name(date(2024, 3, 17)) == "prices_y2024m03"
+
+
+class TestPriceCompactor:
+    """Test suite for PriceCompactor service."""
+
+    def test_compact_collapses_runs(self, db_session: Session, price_history_rows: tuple[int, int, int]):
+        """Test archiving intervals, carrying forward and deleting old rows."""
+        milk_id, eggs_id, store_id = price_history_rows
+
+        result = PriceCompactor(db_session).compact(date(2024, 3, 1))
+
+        assert result.intervals_archived == 3
+        assert result.rows_carried_forward == 1
+        assert result.rows_deleted == 4
+        assert _intervals(db_session, milk_id) == [
+            (1.0, date(2024, 1, 5), date(2024, 2, 3)),
+            (1.2, date(2024, 2, 3), date(2024, 3, 1)),
+        ]
+        assert _intervals(db_session, eggs_id) == [(2.0, date(2024, 2, 10), date(2024, 3, 1))]
+
+        remaining = db_session.execute(
+            select(Price.product_id, Price.price, Price.effective_date).order_by(Price.product_id)
+        ).all()
+        assert [tuple(row) for row in remaining] == [
+            (milk_id, 1.2, date(2024, 3, 1)),
+            (eggs_id, 2.5, date(2024, 3, 5)),
+        ]
+
+    def test_compact_merges_across_runs(self, db_session: Session, price_history_rows: tuple[int, int, int]):
+        """Test that an unchanged price spanning two runs becomes one interval."""
+        milk_id, eggs_id, store_id = price_history_rows
+        compactor = PriceCompactor(db_session)
+
+        compactor.compact(date(2024, 3, 1))
+        result = compactor.compact(date(2024, 4, 1))
+
+        assert result.intervals_merged == 1
+        assert _intervals(db_session, milk_id) == [
+            (1.0, date(2024, 1, 5), date(2024, 2, 3)),
+            (1.2, date(2024, 2, 3), date(2024, 4, 1)),
+        ]
+        assert _intervals(db_session, eggs_id) == [
+            (2.0, date(2024, 2, 10), date(2024, 3, 1)),
+            (2.5, date(2024, 3, 5), date(2024, 4, 1)),
+        ]
+
+    def test_latest_prices_after_compaction(self, db_session: Session, price_history_rows: tuple[int, int, int]):
+        """Test that comparison lookups still see every pair's latest price."""
+        milk_id, eggs_id, store_id = price_history_rows
+        resolver = PriceResolver(db_session)
+        before = resolver.get_latest_prices([milk_id, eggs_id], [store_id])
+
+        PriceCompactor(db_session).compact(date(2024, 3, 1))
+        after = resolver.get_latest_prices([milk_id, eggs_id], [store_id])
+
+        assert {key: row.current_price for key, row in after.items()} == {
+            key: row.current_price for key, row in before.items()
+        }
+
+    def test_rejects_mid_month_cutoff(self, db_session: Session):
+        """Test that cutoffs must align with monthly partitions."""
+        with pytest.raises(ValueError):
+            PriceCompactor(db_session).compact(date(2024, 3, 15))
+
+    def test_default_cutoff(self, db_session: Session):
+        """Test that an explicit zero hot window is kept rather than replaced by the setting."""
+        today = date(2024, 3, 15)
+
+        assert PriceCompactor(db_session, hot_months=2).default_cutoff(today) == date(2024, 2, 1)
+        assert PriceCompactor(db_session, hot_months=0).default_cutoff(today) == date(2024, 4, 1)
@@ -0,0 +1,83 @@
+"""Tests for the Price SQL expressions and the PriceResolver service."""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Price, Product, Store
+from app.services.price_resolver import PriceResolver
+
+
+class TestPriceExpressions:
+    """The SQL forms of Price properties must match the Python ones."""
+
+    def test_current_price_matches_python(self, db_session: Session, sample_prices: list[Price]):
+        """Test current_price evaluated in SQL against the Python property."""
+        rows = db_session.execute(
+            select(Price.id, Price.current_price, Price.is_on_sale)
+        ).all()
+        by_id = {price.id: price for price in sample_prices}
+
+        assert len(rows) == len(sample_prices)
+        for price_id, current_price, is_on_sale in rows:
+            assert current_price == by_id[price_id].current_price
+            assert is_on_sale is by_id[price_id].is_on_sale
+
+    def test_filter_on_sale(self, db_session: Session, sample_prices: list[Price]):
+        """Test filtering by the on-sale expression."""
+        on_sale_ids = set(
+            db_session.scalars(select(Price.id).where(Price.is_on_sale)).all()
+        )
+
+        assert on_sale_ids == {p.id for p in sample_prices if p.is_on_sale}
+
+
+class TestPriceResolver:
+    """Test suite for PriceResolver service."""
+
+    def test_latest_prices(
+        self, db_session: Session, sample_products: list[Product], sample_stores: list[Store], sample_prices: list[Price]
+    ):
+        """Test resolving the latest row per (product, store)."""
+        resolver = PriceResolver(db_session)
+
+        latest = resolver.get_latest_prices(
+            [p.id for p in sample_products], [s.id for s in sample_stores]
+        )
+
+        assert len(latest) == 7
+        bananas = latest[(sample_products[7].id, sample_stores[0].id)]
+        assert bananas.regular_price == 0.59
+        assert bananas.is_on_sale is False
+
+        milk = latest[(sample_products[0].id, sample_stores[0].id)]
+        assert milk.current_price == 4.99
+        assert milk.is_on_sale is True
+        assert milk.expiration_date == date.today() + timedelta(days=3)
+
+    def test_latest_prices_empty_input(self, db_session: Session):
+        """Test that empty input does not query the database."""
+        resolver = PriceResolver(db_session)
+
+        assert resolver.get_latest_prices([], [1, 2]) == {}
+
+    def test_store_totals_match_python(
+        self, db_session: Session, sample_products: list[Product], sample_stores: list[Store], sample_prices: list[Price]
+    ):
+        """Test database-side totals against totals computed in Python."""
+        resolver = PriceResolver(db_session)
+        quantities = {sample_products[0].id: 2.0, sample_products[2].id: 1.0, sample_products[7].id: 3.0}
+        item_counts = {product_id: 1 for product_id in quantities}
+        store_ids = [s.id for s in sample_stores]
+
+        totals = resolver.get_store_totals(quantities, item_counts, store_ids)
+        latest = resolver.get_latest_prices(quantities, store_ids)
+
+        for store_id in store_ids:
+            rows = [row for (_, sid), row in latest.items() if sid == store_id]
+            expected = sum(row.current_price * quantities[row.product_id] for row in rows)
+            assert totals[store_id].total_price == pytest.approx(expected)
+            assert totals[store_id].items_found == len(rows)
+            assert totals[store_id].items_on_sale == sum(row.is_on_sale for row in rows)
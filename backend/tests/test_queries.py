@@ -0,0 +1,59 @@
+"""Tests for the cached hot-path statements."""
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from app.db.database import connect_args
+from app.db.queries import grocery_list_by_id, grocery_list_summaries, product_by_upc
+from app.models import GroceryList, GroceryListItem, Product
+from app.services.price_resolver import PriceResolver
+
+
+class TestCachedQueries:
+    """Test suite for app.db.queries and the prebuilt price statement."""
+
+    def test_cache_key_ignores_values(self):
+        """Test that different parameter values share one compiled statement."""
+        assert grocery_list_by_id(1)._generate_cache_key() == grocery_list_by_id(2)._generate_cache_key()
+        assert (
+            grocery_list_summaries("a", 0, 10)._generate_cache_key()
+            == grocery_list_summaries("b", 20, 50)._generate_cache_key()
+        )
+
+    def test_price_statement_compiles_once(self, db_engine: Engine, db_session: Session):
+        """Test that resolving prices for different IDs reuses one compiled statement."""
+        resolver = PriceResolver(db_session)
+        resolver.get_latest_prices([1], [1])
+        compiled = len(db_engine._compiled_cache)
+
+        resolver.get_latest_prices([1, 2, 3], [1, 2])
+        resolver.get_latest_prices(range(50), [7])
+
+        assert len(db_engine._compiled_cache) == compiled
+
+    def test_summaries_count_items(self, db_session: Session):
+        """Test list summaries with item counts in one statement."""
+        lists = [GroceryList(name=f"List {index}", user_id="summary_user") for index in range(3)]
+        db_session.add_all(lists)
+        db_session.flush()
+        db_session.add_all(
+            GroceryListItem(grocery_list_id=grocery_list.id, name="Item", quantity=1.0, position=position)
+            for index, grocery_list in enumerate(lists)
+            for position in range(index)
+        )
+        db_session.commit()
+
+        rows = db_session.execute(grocery_list_summaries("summary_user", 1, 5)).all()
+
+        assert [(grocery_list.name, count) for grocery_list, count in rows] == [("List 1", 1), ("List 2", 2)]
+
+    def test_lookups(self, db_session: Session, sample_products: list[Product]):
+        """Test the single-row lookups."""
+        assert db_session.execute(product_by_upc(sample_products[0].upc)).scalar_one() is sample_products[0]
+        assert db_session.execute(grocery_list_by_id(999)).scalar_one_or_none() is None
+
+    def test_prepared_statements(self):
+        """Test that server-side preparation is configured for psycopg 3 only."""
+        assert connect_args("postgresql+psycopg://localhost/grocery_compare") == {"prepare_threshold": 5}
+        assert connect_args("postgresql://localhost/grocery_compare") == {}
+        assert connect_args("sqlite://") == {}
@@ -0,0 +1,220 @@
+"""Tests for read-replica routing."""
+
+import shutil
+from collections.abc import Callable, Generator
+from pathlib import Path
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import get_settings
+from app.db.database import Base, get_db, get_read_db
+from app.core.cache import CacheManager
+from app.db.routing import RoutingSession, WritePins, clear_write_pins
+from app.main import app
+from app.models import GroceryList
+from app.services.product_catalog import invalidate_product_catalog
+from app.services.store_directory import invalidate_store_directory
+
+
+def sqlite_engine(path: Path) -> Engine:
+    """Create an engine on a SQLite database file."""
+    return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture
+def databases(tmp_path: Path) -> Generator[tuple[Engine, Engine], None, None]:
+    """Create a primary and a replica that lags behind it.
+
+    The replica is a copy of the primary taken after one list was created;
+    anything written to the primary afterwards is missing from the replica.
+    """
+    primary = sqlite_engine(tmp_path / "primary.db")
+    Base.metadata.create_all(primary)
+    with Session(primary) as db:
+        db.add(GroceryList(name="Replicated", user_id="alice"))
+        db.commit()
+    primary.dispose()
+    shutil.copy(tmp_path / "primary.db", tmp_path / "replica.db")
+
+    replica = sqlite_engine(tmp_path / "replica.db")
+    clear_write_pins()
+    yield primary, replica
+    clear_write_pins()
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def routing_factory(databases: tuple[Engine, Engine]) -> Callable[[], Session]:
+    """Create routing sessions over the primary and replica."""
+    primary, replica = databases
+    return sessionmaker(class_=RoutingSession, bind=primary, replicas=[replica], autoflush=False)
+
+
+@pytest.fixture
+def routed_client(
+    databases: tuple[Engine, Engine],
+    routing_factory: Callable[[], Session],
+    monkeypatch: pytest.MonkeyPatch,
+) -> Generator[TestClient, None, None]:
+    """Create a test client that writes to the primary and reads from the replica."""
+    monkeypatch.setattr(get_settings(), "startup_warmup", False)
+    monkeypatch.setattr(get_settings(), "store_directory_cache", False)
+    monkeypatch.setattr(get_settings(), "write_pin_cache", False)
+    primary_factory = sessionmaker(bind=databases[0], autoflush=False)
+
+    def session_from(factory: Callable[[], Session]) -> Callable[[], Generator[Session, None, None]]:
+        def dependency() -> Generator[Session, None, None]:
+            with factory() as db:
+                yield db
+        return dependency
+
+    app.dependency_overrides[get_db] = session_from(primary_factory)
+    app.dependency_overrides[get_read_db] = session_from(routing_factory)
+    invalidate_store_directory()
+    invalidate_product_catalog()
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
+        invalidate_store_directory()
+        invalidate_product_catalog()
+
+
+def add_list_to_primary(primary: Engine, name: str) -> int:
+    """Write a list to the primary only, as if the replica had not caught up."""
+    with Session(primary) as db:
+        grocery_list = GroceryList(name=name, user_id="bob")
+        db.add(grocery_list)
+        db.commit()
+        return grocery_list.id
+
+
+class TestRoutingSession:
+    """Test suite for RoutingSession."""
+
+    def test_reads_go_to_replica(self, databases: tuple[Engine, Engine], routing_factory: Callable[[], Session]):
+        """Test that ORM selects are served by the replica."""
+        list_id = add_list_to_primary(databases[0], "Lagging")
+
+        with routing_factory() as db:
+            assert db.get(GroceryList, list_id) is None
+            assert db.scalars(select(GroceryList.name)).all() == ["Replicated"]
+            assert db.reads_from_replica
+
+    def test_writes_pin_session_to_primary(
+        self, databases: tuple[Engine, Engine], routing_factory: Callable[[], Session]
+    ):
+        """Test that a session reads its own writes from the primary."""
+        with routing_factory() as db:
+            db.add(GroceryList(name="Mine", user_id="carol"))
+            db.commit()
+
+            assert not db.reads_from_replica
+            assert sorted(db.scalars(select(GroceryList.name))) == ["Mine", "Replicated"]
+
+        with Session(databases[1]) as replica:
+            assert replica.scalars(select(GroceryList.name)).all() == ["Replicated"]
+
+    def test_locking_and_textual_sql_use_primary(
+        self, databases: tuple[Engine, Engine], routing_factory: Callable[[], Session]
+    ):
+        """Test that statements that may write or lock go to the primary."""
+        add_list_to_primary(databases[0], "Lagging")
+
+        with routing_factory() as db:
+            assert len(db.scalars(select(GroceryList).with_for_update()).all()) == 2
+        with routing_factory() as db:
+            assert db.execute(text("SELECT count(*) FROM grocery_lists")).scalar() == 2
+            assert not db.reads_from_replica
+
+    def test_without_replicas(self, databases: tuple[Engine, Engine]):
+        """Test that a routing session without replicas uses the primary."""
+        add_list_to_primary(databases[0], "Lagging")
+
+        with RoutingSession(bind=databases[0]) as db:
+            assert len(db.scalars(select(GroceryList)).all()) == 2
+            assert not db.reads_from_replica
+
+
+class TestReadYourWrites:
+    """Test suite for replica routing of the list and compare routes."""
+
+    def test_list_reads_use_replica(self, routed_client: TestClient, databases: tuple[Engine, Engine]):
+        """Test that list reads without recent writes are served by the replica."""
+        list_id = add_list_to_primary(databases[0], "Lagging")
+
+        assert routed_client.get(f"/api/lists/{list_id}").status_code == 404
+        assert routed_client.get("/api/lists", params={"user_id": "bob"}).json() == []
+
+    def test_user_reads_own_writes(self, routed_client: TestClient):
+        """Test that a writer's reads are pinned to the primary for a while."""
+        created = routed_client.post("/api/lists", json={"name": "New", "user_id": "dave"}).json()
+
+        assert routed_client.get(f"/api/lists/{created['id']}").status_code == 200
+        assert [row["id"] for row in routed_client.get("/api/lists", params={"user_id": "dave"}).json()] == [
+            created["id"]
+        ]
+
+        clear_write_pins()
+        assert routed_client.get(f"/api/lists/{created['id']}").status_code == 404
+
+    def test_pin_window_can_be_disabled(self, routed_client: TestClient, monkeypatch: pytest.MonkeyPatch):
+        """Test that a zero window leaves reads on the replica."""
+        monkeypatch.setattr(get_settings(), "read_your_writes_seconds", 0.0)
+        created = routed_client.post("/api/lists", json={"name": "New", "user_id": "erin"}).json()
+
+        assert routed_client.get(f"/api/lists/{created['id']}").status_code == 404
+
+    def test_compare_after_update_reads_primary(self, routed_client: TestClient):
+        """Test that comparing a just-written list does not 404 on a lagging replica."""
+        created = routed_client.post("/api/lists", json={"name": "New", "user_id": "frank"}).json()
+
+        response = routed_client.post("/api/compare", json={"list_id": created["id"], "zip_code": "92101"})
+
+        # The list is found on the primary; there are simply no stores
+        assert response.status_code == 404
+        assert "store" in response.json()["detail"].lower()
+
+
+class TestWritePins:
+    """Test suite for read-your-writes pins shared between processes."""
+
+    @staticmethod
+    def process_pins(server: fakeredis.FakeServer) -> WritePins:
+        """Create the pin registry of one process on a shared Redis."""
+        cache = CacheManager()
+        cache._client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        return WritePins(cache)
+
+    def test_pin_visible_to_other_process(self):
+        """Test that a pin written by one process is seen by another."""
+        server = fakeredis.FakeServer()
+        writer, reader = self.process_pins(server), self.process_pins(server)
+
+        writer.pin(["list:7", "user:dave"], seconds=5)
+
+        assert reader.is_pinned(["list:7"])
+        assert reader.is_pinned(["user:dave", "list:8"])
+        assert not reader.is_pinned(["list:8"])
+        assert 0 < reader.cache.client.pttl("write_pin:list:7") <= 5000
+
+        writer.clear()
+        assert not reader.is_pinned(["list:7"])
+
+    def test_pins_without_redis(self):
+        """Test that pins still hold in the writing process when Redis is down."""
+        server = fakeredis.FakeServer()
+        pins = self.process_pins(server)
+        server.connected = False
+
+        pins.pin(["list:7"], seconds=5)
+
+        assert pins.is_pinned(["list:7"])
+        assert not WritePins(pins.cache).is_pinned(["list:7"])
+
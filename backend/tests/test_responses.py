@@ -0,0 +1,127 @@
+"""Tests for the JSON response serialization path."""
+
+from typing import Any
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.responses import ORJSONResponse
+from app.models import GroceryList
+from app.schemas.grocery_list import GroceryListResponse, GroceryListSummary
+
+
+def stdlib_json(content: Any) -> bytes:
+    """Encode content the way FastAPI's default JSONResponse does."""
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+@pytest.fixture
+def created(client: TestClient) -> dict[str, Any]:
+    """Create a list with non-ASCII text and fractional quantities."""
+    response = client.post(
+        "/api/lists",
+        json={
+            "name": "Épicerie — semaine 🛒",
+            "user_id": "résumé_user",
+            "items": [
+                {"name": "Jalapeño peppers", "quantity": 0.75, "unit": "lb", "notes": "«fresh»"},
+                {"name": "Milk", "quantity": 2, "unit": None},
+            ],
+        },
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+class TestORJSONResponse:
+    """Test suite for ORJSONResponse."""
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            {"status": "healthy"},
+            {"name": "Café", "emoji": "🥑", "quote": '"x"\n', "nested": [1, 2.5, None, True, {"a": []}]},
+            {"status": "warming", "checks": {"redis": "ok"}, "errors": {}, "warmup_seconds": 0.012345},
+            [],
+        ],
+    )
+    def test_matches_json_response(self, content: Any):
+        """Test that orjson output is byte-identical to Starlette's JSONResponse."""
+        assert ORJSONResponse(content=content).body == JSONResponse(content=content).body
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            (1e16, b"1e16"),
+            (1.5e-7, b"1.5e-7"),
+            (float("nan"), b"null"),
+            (float("inf"), b"null"),
+            (float("-inf"), b"null"),
+        ],
+    )
+    def test_floats_differing_from_json_response(self, value: float, expected: bytes):
+        """Test how exponents and non-finite floats are written, unlike Starlette's JSONResponse."""
+        assert ORJSONResponse(content={"value": value}).body == b'{"value":' + expected + b"}"
+
+    def test_is_app_default(self, client: TestClient):
+        """Test that routes without a response model render through orjson."""
+        response = client.get("/health")
+
+        assert response.content == b'{"status":"healthy"}'
+        assert response.headers["content-type"] == "application/json"
+
+
+class TestListResponses:
+    """Test suite for pre-serialized list responses."""
+
+    def test_get_list_bytes_match_stdlib(self, client: TestClient, db_session: Session, created: dict[str, Any]):
+        """Test that a list body matches the stdlib encoding of the same model."""
+        grocery_list = db_session.scalars(select(GroceryList).where(GroceryList.id == created["id"])).one()
+        expected = stdlib_json(GroceryListResponse.model_validate(grocery_list))
+
+        response = client.get(f"/api/lists/{created['id']}")
+
+        assert response.status_code == 200
+        assert response.content == expected
+        assert "Épicerie".encode() in response.content
+
+    def test_summaries_bytes_match_stdlib(self, client: TestClient, db_session: Session, created: dict[str, Any]):
+        """Test that list summaries match the stdlib encoding."""
+        grocery_list = db_session.get(GroceryList, created["id"])
+        expected = stdlib_json([
+            GroceryListSummary(
+                id=grocery_list.id,
+                name=grocery_list.name,
+                user_id=grocery_list.user_id,
+                item_count=2,
+                created_at=grocery_list.created_at,
+                updated_at=grocery_list.updated_at,
+            )
+        ])
+
+        response = client.get("/api/lists", params={"user_id": "résumé_user"})
+
+        assert response.content == expected
+
+    def test_create_and_update_keep_status_codes(self, client: TestClient, created: dict[str, Any]):
+        """Test that routes returning responses directly keep their status codes."""
+        assert created["items"][0]["quantity"] == 0.75
+
+        response = client.put(f"/api/lists/{created['id']}", json={"name": "Renamed"})
+
+        assert response.status_code == 200
+        assert response.json()["name"] == "Renamed"
+        assert len(response.json()["items"]) == 2
+
+    def test_openapi_keeps_response_models(self, client: TestClient):
+        """Test that response models still document the routes."""
+        paths = client.get("/openapi.json").json()["paths"]
+
+        created = paths["/api/lists"]["post"]["responses"]["201"]["content"]["application/json"]["schema"]
+        listed = paths["/api/lists"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert created == {"$ref": "#/components/schemas/GroceryListResponse"}
+        assert listed["items"] == {"$ref": "#/components/schemas/GroceryListSummary"}
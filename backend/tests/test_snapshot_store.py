@@ -0,0 +1,162 @@
+"""Tests for the raw circular snapshot store."""
+
+import io
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.config import get_settings
+from app.services import snapshot_store
+from app.services.circular_parser import HTML_CONTENT_TYPE, CircularParser
+from app.services.snapshot_store import (
+    LocalBlobStorage,
+    S3BlobStorage,
+    SnapshotStore,
+    get_snapshot_store,
+    open_snapshot_store,
+)
+
+FETCHED_AT = datetime(2026, 10, 14, 4, 30, tzinfo=timezone.utc)
+
+
+class InMemoryS3Client:
+    """The subset of the boto3 S3 client the store uses, in memory."""
+
+    def __init__(self, page_size: int = 1000):
+        """Create an empty bucket listing ``page_size`` keys per page."""
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.page_size = page_size
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes) -> None:
+        """Store an object."""
+        self.objects[Bucket, Key] = Body
+
+    def get_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        """Get an object."""
+        return {"Body": io.BytesIO(self.objects[Bucket, Key])}
+
+    def list_objects_v2(
+        self, Bucket: str, Prefix: str, MaxKeys: int = 1000, ContinuationToken: str = ""
+    ) -> dict[str, Any]:
+        """List keys after the continuation token, one page at a time."""
+        keys = sorted(
+            key for bucket, key in self.objects
+            if bucket == Bucket and key.startswith(Prefix) and key > ContinuationToken
+        )
+        page = keys[: min(MaxKeys, self.page_size)]
+        response: dict[str, Any] = {"Contents": [{"Key": key} for key in page], "IsTruncated": len(keys) > len(page)}
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = page[-1]
+        return response
+
+
+@pytest.fixture(params=["local", "s3"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> SnapshotStore:
+    """Create an empty snapshot store on each storage."""
+    if request.param == "local":
+        return SnapshotStore(LocalBlobStorage(tmp_path / "snapshots"))
+    return SnapshotStore(S3BlobStorage("circulars", "raw/", client=InMemoryS3Client(page_size=2)))
+
+
+class TestSnapshotStore:
+    """Test suite for storing, deduplicating and reading snapshots."""
+
+    def test_round_trip(self, store: SnapshotStore):
+        """Test that a snapshot reads back byte for byte."""
+        content = b"<html>" + b"<li>Milk $2.99</li>" * 500 + b"</html>"
+
+        snapshot = store.put("Kroger", "45202", content, HTML_CONTENT_TYPE, FETCHED_AT)
+        [blob] = store.storage.list("blobs/")
+
+        assert store.read(snapshot) == content
+        assert store.read(snapshot.content_hash) == content
+        assert snapshot.size == len(content)
+        assert len(store.storage.read(blob)) < len(content) / 10
+
+    def test_identical_fetches_share_a_blob(self, store: SnapshotStore):
+        """Test that repeated fetches add index entries but not blobs."""
+        week = [FETCHED_AT + timedelta(days=day) for day in range(3)]
+        snapshots = [store.put("Kroger", zip_code, b"same ad", "text/html", week[0]) for zip_code in ("45202", "45203")]
+        snapshots += [store.put("Kroger", "45202", b"same ad", "text/html", fetched_at) for fetched_at in week[1:]]
+        store.put("Kroger", "45202", b"next week's ad", "text/html", FETCHED_AT + timedelta(days=7))
+
+        assert len({snapshot.content_hash for snapshot in snapshots}) == 1
+        assert len(store.storage.list("blobs/")) == 2
+        assert len(store.history("kroger", "45202")) == 4
+
+    def test_index(self, store: SnapshotStore):
+        """Test that history is per chain and ZIP code, oldest first."""
+        later = FETCHED_AT + timedelta(days=7)
+        store.put("Kroger", "45202", b"week 2", "text/html", later)
+        store.put("Kroger", "45202", b"week 1", "text/html", FETCHED_AT)
+        store.put("Harris Teeter", "45202", b"other chain", "text/html", FETCHED_AT)
+
+        history = store.history("Kroger", "45202")
+
+        assert [snapshot.fetched_at for snapshot in history] == [FETCHED_AT, later]
+        assert store.latest("Kroger", "45202") == history[-1]
+        assert store.read(store.latest("harris teeter", "45202")) == b"other chain"
+        assert store.latest("Kroger", "10001") is None
+
+    def test_corrupt_blob(self, store: SnapshotStore):
+        """Test that a blob not matching its hash is rejected."""
+        snapshot = store.put("Kroger", "45202", b"ad", "text/html", FETCHED_AT)
+        other = store.put("Kroger", "45202", b"another ad", "text/html", FETCHED_AT)
+        store.storage.write(store.blob_key(snapshot.content_hash), store.storage.read(store.blob_key(other.content_hash)))
+
+        with pytest.raises(ValueError):
+            store.read(snapshot)
+        with pytest.raises(KeyError):
+            store.read("0" * 64)
+
+
+class TestConfiguredStore:
+    """Test suite for opening the configured store."""
+
+    def test_open_location(self, tmp_path: Path):
+        """Test that locations open the matching storage."""
+        local = open_snapshot_store(str(tmp_path))
+
+        assert isinstance(local.storage, LocalBlobStorage)
+        assert local.storage.root == tmp_path
+
+    def test_disabled(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that the store is off unless a location is set."""
+        monkeypatch.setattr(get_settings(), "snapshot_store_url", None)
+
+        assert get_snapshot_store() is None
+
+
+class TestFetchWriteThrough:
+    """Test suite for snapshots written by CircularParser.fetch_and_parse."""
+
+    async def test_replay_without_fetching(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that a stored fetch parses again to the same items."""
+        store = SnapshotStore(LocalBlobStorage(tmp_path))
+        monkeypatch.setattr(snapshot_store, "_store", store)
+        monkeypatch.setattr(get_settings(), "snapshot_store_url", str(tmp_path))
+        parser = CircularParser()
+
+        items = await parser.fetch_and_parse("Kroger", "45202")
+        await parser.fetch_and_parse("Kroger", "45202")
+
+        async def no_fetch(*args: Any) -> None:
+            raise AssertionError("replay must not fetch")
+
+        monkeypatch.setattr(parser, "_fetch_circular", no_fetch)
+        history = store.history("Kroger", "45202")
+
+        assert len(items) == 4 and items[0].store_chain == "Kroger"
+        assert len(history) == 2 and len(store.storage.list("blobs/")) == 1
+        assert parser.replay(history[-1]) == items
+
+    def test_parse_content_types(self):
+        """Test that snapshots are parsed by their content type."""
+        parser = CircularParser("Kroger")
+        page = b'<div data-qa="weekly-ad-item"><h2 data-qa="item-title">Milk</h2><b data-qa="item-price">$2.99</b></div>'
+
+        assert [item.product_name for item in parser.parse_content(page, "text/html; charset=utf-8")] == ["Milk"]
+        with pytest.raises(ValueError):
+            parser.parse_content(b"", "image/png")
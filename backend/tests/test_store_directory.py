@@ -0,0 +1,172 @@
+"""Tests for the store directory and its Redis cache."""
+
+from collections.abc import Generator
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.cache import CacheManager
+from app.models import GroceryList, GroceryListItem, Product, Store
+from app.services import store_directory
+from app.services.store_directory import (
+    StoreDirectory,
+    StoreEntry,
+    get_store_directory,
+    invalidate_store_directory,
+    load_store_directory,
+    sync_store_directory,
+)
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> Generator[CacheManager, None, None]:
+    """Share store rosters through an in-memory Redis."""
+    cache = CacheManager()
+    cache._client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(get_settings(), "store_directory_cache", True)
+    monkeypatch.setattr(store_directory, "_cache", cache)
+    invalidate_store_directory()
+    yield cache
+    invalidate_store_directory()
+
+
+@pytest.fixture
+def no_cache(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
+    """Keep the store directory in process only."""
+    monkeypatch.setattr(get_settings(), "store_directory_cache", False)
+    invalidate_store_directory()
+    yield
+    invalidate_store_directory()
+
+
+class TestStoreDirectory:
+    """Test suite for StoreDirectory."""
+
+    def test_lookups(self):
+        """Test per-ZIP rosters, ID lookups and the nearest-store index."""
+        directory = StoreDirectory([
+            StoreEntry(3, "Vons", "Albertsons", None, "92103", 32.73, -117.16),
+            StoreEntry(1, "Kroger", "Kroger", "1 Main St", "92101", 32.7157, -117.1611),
+            StoreEntry(2, "Walmart", "Walmart", None, "92101", None, None),
+        ])
+
+        assert [store.id for store in directory.for_zip("92101")] == [1, 2]
+        assert directory.for_zip("10001") == []
+        assert [store.id for store in directory.get_many([3, 99, 1])] == [3, 1]
+        assert directory.size == 3
+        assert directory.locator.size == 2
+
+    def test_roster_round_trip(self):
+        """Test rebuilding a directory from its cached rosters."""
+        directory = StoreDirectory([
+            StoreEntry(1, "Kroger", "Kroger", "1 Main St", "92101", 32.7157, -117.1611),
+            StoreEntry(2, "Vons", "Albertsons", None, "92103", None, None),
+        ])
+
+        copy = StoreDirectory.from_rosters(directory.version, directory.to_rosters())
+
+        assert copy.version == directory.version
+        assert copy.for_zip("92101") == directory.for_zip("92101")
+        assert copy.for_zip("92103") == directory.for_zip("92103")
+
+
+class TestStoreDirectoryLifecycle:
+    """Test loading, sharing and refreshing the process-wide directory."""
+
+    def test_load_publishes_and_reuses_rosters(
+        self, db_session: Session, sample_stores: list[Store], cache: CacheManager
+    ):
+        """Test that the first load publishes rosters that later loads reuse."""
+        directory = load_store_directory(db_session)
+
+        assert cache.get_store_directory_version() == directory.version
+        assert [store["id"] for store in cache.get_store_roster("92101")] == [s.id for s in sample_stores]
+
+        # Another process starting up reads Redis instead of the database
+        invalidate_store_directory()
+        statements: list[str] = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+        event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+        try:
+            reloaded = load_store_directory(db_session)
+        finally:
+            event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+        assert statements == []
+        assert reloaded.version == directory.version
+
+    def test_store_write_refreshes_directory(
+        self, db_session: Session, sample_stores: list[Store], cache: CacheManager
+    ):
+        """Test that committing a store change rebuilds and republishes the directory."""
+        before = load_store_directory(db_session)
+
+        db_session.add(Store(name="Ralphs", chain="Kroger", zip_code="92101"))
+        sample_stores[0].zip_code = "92102"
+        db_session.commit()
+
+        after = get_store_directory(db_session)
+        assert after.version != before.version
+        assert [store.name for store in after.for_zip("92101")] == ["Walmart Supercenter", "Ralphs"]
+        assert [store.name for store in after.for_zip("92102")] == ["Kroger - Main St"]
+        assert cache.get_store_directory_version() == after.version
+        assert cache.get_store_roster("92102")[0]["name"] == "Kroger - Main St"
+
+    def test_sync_picks_up_other_process(
+        self, db_session: Session, sample_stores: list[Store], cache: CacheManager
+    ):
+        """Test that a scheduled sync installs rosters published elsewhere."""
+        load_store_directory(db_session)
+        published = StoreDirectory([StoreEntry(42, "Sprouts", "Sprouts", None, "92101", None, None)])
+        cache.set_store_rosters(published.version, published.to_rosters())
+
+        synced = sync_store_directory(db_session)
+
+        assert synced.version == published.version
+        assert [store.id for store in synced.for_zip("92101")] == [42]
+        assert cache.get_store_roster("92103") is None
+
+    def test_sync_rebuilds_when_cache_is_empty(
+        self, db_session: Session, sample_stores: list[Store], cache: CacheManager
+    ):
+        """Test that a sync republishes rosters after Redis loses them."""
+        load_store_directory(db_session)
+        cache.client.flushall()
+
+        synced = sync_store_directory(db_session)
+
+        assert cache.get_store_directory_version() == synced.version
+
+    def test_compare_does_not_query_stores(
+        self,
+        client: TestClient,
+        db_session: Session,
+        sample_products: list[Product],
+        sample_stores: list[Store],
+        no_cache: None,
+    ):
+        """Test that comparisons read stores from the directory only."""
+        grocery_list = GroceryList(name="Milk run", user_id="demo_user_1")
+        db_session.add(grocery_list)
+        db_session.flush()
+        db_session.add(GroceryListItem(grocery_list_id=grocery_list.id, product_id=sample_products[0].id,
+                                       name="Whole Milk", quantity=1.0, position=0))
+        db_session.commit()
+        load_store_directory(db_session)
+
+        statements: list[str] = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+        event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+        try:
+            response = client.post("/api/compare", json={"list_id": grocery_list.id, "zip_code": "92101"})
+        finally:
+            event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+        assert response.status_code == 200
+        assert len(response.json()["store_totals"]) == 2
+        assert statements
+        assert not any("FROM stores" in statement for statement in statements)
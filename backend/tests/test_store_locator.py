@@ -0,0 +1,90 @@
+"""Tests for the StoreLocator service."""
+
+import math
+import random
+
+import pytest
+
+from app.services.store_locator import EARTH_RADIUS_MILES, StoreLocator
+
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Reference great-circle distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    h = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(h))
+
+
+@pytest.fixture
+def random_stores() -> list[tuple[int, str, float, float]]:
+    """Create stores scattered around San Diego."""
+    rng = random.Random(42)
+    return [
+        (store_id, f"921{store_id % 10:02d}", 32.7 + rng.uniform(-0.5, 0.5), -117.16 + rng.uniform(-0.5, 0.5))
+        for store_id in range(1, 2001)
+    ]
+
+
+class TestStoreLocator:
+    """Test suite for StoreLocator service."""
+
+    def test_radius_matches_brute_force(self, random_stores):
+        """Test radius search against haversine over every store."""
+        locator = StoreLocator(random_stores)
+
+        for lat, lng, radius in [(32.7157, -117.1611, 3.0), (32.9, -117.0, 10.0), (33.5, -116.0, 5.0)]:
+            expected = sorted(
+                (haversine_miles(lat, lng, s_lat, s_lng), store_id)
+                for store_id, _, s_lat, s_lng in random_stores
+                if haversine_miles(lat, lng, s_lat, s_lng) <= radius
+            )
+            result = locator.nearest(lat, lng, locator.size, radius)
+
+            assert [r.store_id for r in result] == [store_id for _, store_id in expected]
+            for r, (distance, _) in zip(result, expected):
+                assert r.distance_miles == pytest.approx(distance, abs=1e-6)
+
+    def test_nearest_matches_brute_force(self, random_stores):
+        """Test k-nearest search against haversine over every store."""
+        locator = StoreLocator(random_stores)
+
+        result = locator.nearest(32.7157, -117.1611, 10)
+        expected = sorted(
+            (haversine_miles(32.7157, -117.1611, s_lat, s_lng), store_id)
+            for store_id, _, s_lat, s_lng in random_stores
+        )[:10]
+
+        assert [r.store_id for r in result] == [store_id for _, store_id in expected]
+
+    def test_nearest_respects_radius(self, random_stores):
+        """Test that k-nearest search never exceeds the radius."""
+        locator = StoreLocator(random_stores)
+
+        result = locator.nearest(32.7157, -117.1611, 5, radius_miles=2.0)
+
+        assert result == locator.nearest(32.7157, -117.1611, locator.size, radius_miles=2.0)[:5]
+        assert all(r.distance_miles <= 2.0 for r in result)
+
+    def test_skips_stores_without_coordinates(self):
+        """Test that stores without coordinates are not indexed."""
+        locator = StoreLocator([(1, "92101", 32.7157, -117.1611), (2, "92101", None, None)])
+
+        assert locator.size == 1
+        assert [r.store_id for r in locator.nearest(32.7157, -117.1611, 5)] == [1]
+
+    def test_zip_centroid(self):
+        """Test ZIP code centroids used as default search origins."""
+        locator = StoreLocator([(1, "92101", 32.0, -117.0), (2, "92101", 33.0, -118.0)])
+
+        assert locator.zip_centroid("92101") == (32.5, -117.5)
+        assert locator.zip_centroid("92199") == (32.5, -117.5)
+        assert locator.zip_centroid("10001") is None
+
+    def test_empty_index(self):
+        """Test searching an empty index."""
+        locator = StoreLocator([])
+
+        assert locator.nearest(32.7, -117.1, 3, radius_miles=10) == []
+        assert locator.nearest(32.7, -117.1, 3) == []
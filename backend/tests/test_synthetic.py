@@ -0,0 +1,100 @@
+"""Tests for the synthetic data generator and benchmark reporting."""
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, func, select
+from sqlalchemy.orm import Session
+
+from app.db.synthetic import SyntheticScale, load_synthetic_data
+from app.models import GroceryList, GroceryListItem, Price, Product, Store
+from benchmarks.suite import compare_runs, measure
+
+TINY = SyntheticScale(
+    products=30, stores=4, zip_codes=2, price_history=3, users=2, lists_per_user=2, items_per_list=5
+)
+
+
+class TestSyntheticData:
+    """Test suite for load_synthetic_data."""
+
+    def test_scale_factor(self):
+        """Test that sizes grow with the scale factor."""
+        small, large = SyntheticScale.for_factor(1), SyntheticScale.for_factor(10)
+
+        assert large.products == 10 * small.products
+        assert large.stores == 10 * small.stores
+        with pytest.raises(ValueError):
+            SyntheticScale.for_factor(0)
+
+    def test_scale_shape(self):
+        """Test overriding the per-pair and per-user sizes."""
+        scale = SyntheticScale.for_factor(1, price_history=12, lists_per_user=1, items_per_list=200)
+
+        assert (scale.price_history, scale.lists_per_user, scale.items_per_list) == (12, 1, 200)
+        assert scale.products == SyntheticScale.for_factor(1).products
+        with pytest.raises(ValueError):
+            SyntheticScale.for_factor(1, items_per_list=0)
+
+    def test_loads_requested_rows(self, db_engine: Engine, db_session: Session):
+        """Test row counts and that every price belongs to a loaded pair."""
+        data = load_synthetic_data(db_engine, TINY, today=date(2024, 6, 1))
+
+        def count(model: type) -> int:
+            return db_session.scalar(select(func.count()).select_from(model))
+
+        assert count(Product) == data.rows["products"] == 30
+        assert count(Store) == data.rows["stores"] == 4
+        assert count(GroceryList) == len(data.list_ids) == 4
+        assert count(GroceryListItem) == 20
+        assert count(Price) == data.rows["prices"]
+        assert data.rows["prices"] % TINY.price_history == 0
+        assert db_session.scalar(select(func.max(Price.effective_date))) == date(2024, 6, 1)
+        assert {store.zip_code for store in db_session.scalars(select(Store))} == set(data.zip_codes)
+
+    def test_deterministic_and_appends(self, db_engine: Engine, db_session: Session):
+        """Test that a seed reproduces rows and new data gets fresh IDs."""
+        first = load_synthetic_data(db_engine, TINY, seed=7, today=date(2024, 6, 1))
+        second = load_synthetic_data(db_engine, TINY, seed=7, today=date(2024, 6, 1))
+
+        assert second.product_ids[0] == first.product_ids[-1] + 1
+        assert first.rows == second.rows
+
+        def prices(product_ids: list[int]) -> list[float]:
+            return list(db_session.scalars(
+                select(Price.price).where(Price.product_id.in_(product_ids)).order_by(Price.id)
+            ))
+
+        assert prices(first.product_ids) == prices(second.product_ids)
+
+    def test_lists_compare(self, client: TestClient, db_engine: Engine):
+        """Test that synthetic lists can be compared end to end."""
+        data = load_synthetic_data(db_engine, TINY)
+
+        response = client.post("/api/compare", json={"list_id": data.list_ids[0], "zip_code": data.zip_codes[0]})
+
+        assert response.status_code == 200
+        assert response.json()["item_count"] == TINY.items_per_list
+        assert response.json()["store_totals"]
+
+
+class TestBenchmarkReport:
+    """Test suite for benchmark statistics and run comparison."""
+
+    def test_measure(self):
+        """Test the statistics reported for an operation."""
+        stats = measure(lambda: None, iterations=20)
+
+        assert stats["iterations"] == 20
+        assert stats["min_ms"] <= stats["p50_ms"] <= stats["p95_ms"] <= stats["max_ms"]
+
+    def test_compare_runs(self):
+        """Test p50 changes against a baseline."""
+        baseline = {"results": {"compare_prices": {"p50_ms": 10.0}}}
+        current = {"results": {"compare_prices": {"p50_ms": 8.0}, "cache_set": {"p50_ms": 0.2}}}
+
+        lines = compare_runs(baseline, current)
+
+        assert lines[1].split()[-1] == "-20.0%"
+        assert lines[2].split()[-1] == "new"
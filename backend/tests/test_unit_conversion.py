@@ -0,0 +1,215 @@
+"""Tests for unit conversion and stored normalized unit prices."""
+
+import subprocess
+import sys
+from datetime import date
+
+import numpy as np
+import pytest
+from sqlalchemy import Engine, func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.synthetic import SyntheticScale, load_synthetic_data
+from app.models import Price, Product
+from app.services.comparison_engine import MatchedItem, PriceMatrix
+from app.services.price_resolver import PriceRow
+from app.services.product_catalog import CatalogProduct, ProductCatalog
+from app.services.unit_conversion import (
+    canonical_unit,
+    normalized_unit_price,
+    to_base,
+    to_base_many,
+    unit_dimension,
+)
+from app.services.unit_pricing import backfill_normalized_unit_prices
+
+
+class TestUnitConversion:
+    """Test suite for unit spellings and conversions."""
+
+    @pytest.mark.parametrize(
+        ("spelling", "expected"),
+        [
+            ("Gallon", "gal"),
+            ("lbs", "lb"),
+            ("Fl. Oz", "fl oz"),
+            ("fl oz", "fl oz"),
+            ("ounces", "oz"),
+            ("Liters", "l"),
+            ("count", "ct"),
+            ("pieces", "ea"),
+            ("dozen", "dozen"),
+            ("furlong", None),
+            (None, None),
+        ],
+    )
+    def test_canonical_unit(self, spelling, expected):
+        """Test that matcher, circular and metric spellings resolve."""
+        assert canonical_unit(spelling) == expected
+
+    def test_to_base(self):
+        """Test conversion to each dimension's base unit."""
+        assert to_base(0.5, "gallon") == (64.0, "fl oz")
+        assert to_base(2, "lb") == (32.0, "oz")
+        assert to_base(1, "dozen") == (12.0, "ct")
+        assert to_base(1, "l")[0] == pytest.approx(33.814, rel=1e-4)
+        assert to_base(1, "kg")[0] == pytest.approx(35.274, rel=1e-4)
+        assert to_base(0, "oz") is None
+        assert to_base(1, "bushel") is None
+        assert unit_dimension("oz") == "mass"
+        assert unit_dimension("ml") == "volume"
+
+    def test_half_gallon_against_gallon(self):
+        """Test that differently sized packs become comparable."""
+        half = normalized_unit_price(2.00, 0.5, "gal")
+        whole = normalized_unit_price(4.49, 1.0, "gallon")
+
+        assert half == (2.00 / 64, "fl oz")
+        assert half[0] < whole[0]
+
+    def test_vectorized_matches_scalar(self):
+        """Test that batch conversion agrees with one-at-a-time conversion."""
+        sizes = [0.5, 12.0, None, 500.0, 3.0, 2.0]
+        units = ["gallon", "count", "oz", "ml", "furlong", "lb"]
+
+        base_sizes, base_units = to_base_many(sizes, units)
+
+        for size, unit, base_size, base_unit in zip(sizes, units, base_sizes.tolist(), base_units):
+            expected = to_base(size, unit)
+            if expected is None:
+                assert np.isnan(base_size) and base_unit is None
+            else:
+                assert (base_size, base_unit) == pytest.approx(expected)
+
+    def test_import_is_light(self):
+        """Test that the unit math loads without the parsers and their dependencies."""
+        loaded = subprocess.run(
+            [sys.executable, "-c", "import sys, app.services.unit_conversion; print(' '.join(sys.modules))"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+
+        assert not {"app.services.circular_parser", "app.services.product_matcher", "lxml", "pypdf"} & set(loaded)
+
+
+class TestNormalizedUnitPrices:
+    """Test suite for the stored normalized unit price columns."""
+
+    def test_filled_on_flush(self, db_session: Session, sample_prices: list[Price]):
+        """Test that ORM writes store per-base-unit regular and sale prices."""
+        milk_sale = sample_prices[0]
+
+        assert milk_sale.normalized_unit == "fl oz"
+        assert milk_sale.normalized_unit_price == pytest.approx(5.99 / 128)
+        assert milk_sale.normalized_sale_unit_price == pytest.approx(4.99 / 128)
+        assert milk_sale.current_normalized_unit_price == pytest.approx(4.99 / 128)
+        # Expired sale: the regular unit price applies
+        assert sample_prices[2].current_normalized_unit_price == pytest.approx(4.99 / 12)
+
+    def test_recomputed_on_price_change(self, db_session: Session, sample_prices: list[Price]):
+        """Test that changing a price updates its normalized price."""
+        bananas = sample_prices[-1]
+        bananas.price = 0.80
+        db_session.commit()
+
+        assert bananas.normalized_unit_price == pytest.approx(0.80 / 16)
+        assert bananas.normalized_unit == "oz"
+
+    def test_backfill(self, db_session: Session, sample_products: list[Product], sample_prices: list[Price]):
+        """Test that the backfill recomputes only the given products' prices."""
+        db_session.execute(update(Price).values(normalized_unit_price=None, normalized_unit=None))
+        milk = sample_products[0]
+
+        updated = backfill_normalized_unit_prices(db_session.connection(), [milk.id])
+        db_session.commit()
+
+        assert updated == 2
+        stored = dict(db_session.execute(select(Price.product_id, Price.normalized_unit)).all())
+        assert stored[milk.id] == "fl oz"
+        assert stored[sample_products[-1].id] is None
+        assert backfill_normalized_unit_prices(db_session.connection()) == len(sample_prices)
+
+    def test_recomputed_on_pack_size_change(
+        self, db_session: Session, sample_products: list[Product], sample_prices: list[Price]
+    ):
+        """Test that flushing a product's new pack size updates its stored prices."""
+        milk = sample_products[0]
+        milk.unit_size, milk.unit_type = 2.0, "l"
+        db_session.flush()
+
+        assert sample_prices[1].normalized_unit_price == pytest.approx(5.49 / to_base(2.0, "l")[0])
+        assert sample_prices[1].normalized_unit == "fl oz"
+
+    def test_current_normalized_price_in_sql(self, db_session: Session, sample_prices: list[Price]):
+        """Test that the SQL form agrees with the Python form."""
+        stored = dict(db_session.execute(select(Price.id, Price.current_normalized_unit_price)).all())
+
+        for price in sample_prices:
+            assert stored[price.id] == pytest.approx(price.current_normalized_unit_price, nan_ok=True)
+
+    def test_synthetic_rows_are_normalized(self, db_engine: Engine, db_session: Session):
+        """Test that bulk-loaded prices get normalized unit prices."""
+        scale = SyntheticScale(
+            products=20, stores=2, zip_codes=1, price_history=2, users=1, lists_per_user=1, items_per_list=2
+        )
+        load_synthetic_data(db_engine, scale, today=date(2024, 6, 1))
+
+        missing = db_session.scalar(
+            select(func.count()).select_from(Price).where(Price.normalized_unit_price.is_(None))
+        )
+        price, size, unit, normalized = db_session.execute(
+            select(Price.price, Product.unit_size, Product.unit_type, Price.normalized_unit_price)
+            .join(Product, Product.id == Price.product_id)
+            .limit(1)
+        ).one()
+
+        assert missing == 0
+        assert normalized == pytest.approx(normalized_unit_price(price, size, unit)[0])
+
+
+class TestUnitValueMatrix:
+    """Test suite for PriceMatrix.build_unit_value."""
+
+    @pytest.fixture
+    def catalog(self) -> ProductCatalog:
+        """Create a catalog with two milk sizes and a product without a size."""
+        return ProductCatalog([
+            CatalogProduct(1, "Whole Milk", None, "Dairy", None, 1.0, "gal"),
+            CatalogProduct(2, "Whole Milk", None, "Dairy", None, 0.5, "gal"),
+            CatalogProduct(3, "Chicken Breast", None, "Meat", None, 1.0, "lb"),
+            CatalogProduct(4, "Gift Card", None, None, None, None, None),
+        ])
+
+    @staticmethod
+    def row(product_id: int, store_id: int, price: float, base_size: float, unit: str) -> PriceRow:
+        """Create a resolved price row with its normalized price."""
+        return PriceRow(product_id, store_id, price, price, False, None, None, price / base_size, unit)
+
+    def test_picks_best_unit_value(self, catalog: ProductCatalog):
+        """Test that the cheapest pack per base unit is chosen per store."""
+        items = [
+            MatchedItem("Whole Milk", 1, 2.0, None, 100.0),
+            MatchedItem("Chicken Breast", 3, 24.0, "oz", 100.0),
+            MatchedItem("Gift Card", 4, 1.0, None, 100.0),
+        ]
+        rows = {
+            (1, 10): self.row(1, 10, 4.00, 128, "fl oz"),
+            (2, 10): self.row(2, 10, 1.80, 64, "fl oz"),
+            (1, 20): self.row(1, 20, 3.50, 128, "fl oz"),
+            (2, 20): self.row(2, 20, 2.00, 64, "fl oz"),
+            (3, 10): self.row(3, 10, 4.80, 16, "oz"),
+            (4, 20): PriceRow(4, 20, 25.0, 25.0, False, None, None),
+        }
+
+        matrix = PriceMatrix.build_unit_value(items, [[1, 2], [3], [4]], catalog, [10, 20], rows)
+
+        assert matrix.products.tolist() == [[2, 1], [3, -1], [-1, 4]]
+        assert matrix.current_price[0].tolist() == pytest.approx([1.80 / 64, 3.50 / 128])
+        # Two gallons of milk, 24 oz of chicken, one gift card
+        assert matrix.quantities.tolist() == [256.0, 24.0, 1.0]
+        assert matrix.line_totals[0].tolist() == pytest.approx([7.20, 7.00])
+        assert matrix.line_totals[1, 0] == pytest.approx(7.20)
+        assert matrix.line_totals[2, 1] == 25.0
+        assert matrix.cheapest_stores().tolist() == [1, 0, 1]
+        assert matrix.product_id(0, 0) == 2
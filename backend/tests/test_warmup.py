@@ -0,0 +1,157 @@
+"""Tests for the startup warmup and readiness check."""
+
+import threading
+from collections.abc import Callable
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import get_settings
+from app.core.cache import CacheManager
+from app.core.warmup import FAILED, OK, PENDING, WarmupState, warm_up
+from app import main
+from app.main import app
+from app.models import Product, Store
+from app.services import product_catalog, store_directory
+
+
+@pytest.fixture
+def session_factory(db_engine: Engine) -> Callable[[], Session]:
+    """Create sessions on the test database."""
+    return sessionmaker(bind=db_engine)
+
+
+@pytest.fixture
+def cache() -> CacheManager:
+    """Create a cache manager backed by an in-memory Redis."""
+    server = fakeredis.FakeServer()
+    cache = CacheManager()
+    cache._client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    cache._binary_client = fakeredis.FakeRedis(server=server)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_caches(monkeypatch: pytest.MonkeyPatch):
+    """Drop the process-wide catalog and directory around each test."""
+    monkeypatch.setattr(get_settings(), "store_directory_cache", False)
+    product_catalog.invalidate_product_catalog()
+    store_directory.invalidate_store_directory()
+    yield
+    product_catalog.invalidate_product_catalog()
+    store_directory.invalidate_store_directory()
+
+
+class TestWarmup:
+    """Test suite for warm_up."""
+
+    async def test_warms_every_component(
+        self,
+        db_engine: Engine,
+        session_factory: Callable[[], Session],
+        cache: CacheManager,
+        sample_products: list[Product],
+        sample_stores: list[Store],
+    ):
+        """Test that a successful warmup loads the caches and reports ready."""
+        state = WarmupState()
+        assert not state.ready
+
+        await warm_up(state, db_engine, session_factory, cache)
+
+        assert state.ready
+        assert state.checks == {name: OK for name in WarmupState.COMPONENTS}
+        assert state.duration_seconds is not None
+        assert product_catalog._catalog.size == len(sample_products)
+        assert store_directory._directory.size == len(sample_stores)
+
+    async def test_redis_failure_does_not_block_readiness(
+        self, db_engine: Engine, session_factory: Callable[[], Session]
+    ):
+        """Test that an unreachable Redis is reported but optional."""
+        server = fakeredis.FakeServer()
+        server.connected = False
+        cache = CacheManager()
+        cache._client = fakeredis.FakeRedis(server=server, decode_responses=True)
+
+        state = WarmupState()
+        await warm_up(state, db_engine, session_factory, cache)
+
+        assert state.checks["redis"] == FAILED
+        assert "redis" in state.errors
+        assert state.ready
+
+    async def test_retries_required_components(
+        self, db_engine: Engine, session_factory: Callable[[], Session], cache: CacheManager
+    ):
+        """Test that a failing required component is retried until it loads."""
+        attempts = []
+
+        def flaky_factory() -> Session:
+            attempts.append(1)
+            if len(attempts) <= 2:
+                raise ConnectionError("database is starting")
+            return session_factory()
+
+        state = WarmupState()
+        await warm_up(state, db_engine, flaky_factory, cache, retry_seconds=0)
+
+        assert state.ready
+        assert state.errors == {}
+        assert len(attempts) == 4
+
+
+class TestCatalogSync:
+    """Test suite for syncing the product catalog with the products table."""
+
+    def test_picks_up_bulk_inserts(self, db_session: Session, sample_products: list[Product]):
+        """Test that rows written without the ORM reload the catalog."""
+        catalog = product_catalog.load_product_catalog(db_session)
+        assert product_catalog.sync_product_catalog(db_session) is catalog
+
+        db_session.execute(insert(Product).values(name="Oat Milk", category="Dairy"))
+        db_session.commit()
+        synced = product_catalog.sync_product_catalog(db_session)
+
+        assert synced is not catalog
+        assert synced.size == len(sample_products) + 1
+
+
+class TestHealthEndpoints:
+    """Test suite for liveness and readiness endpoints."""
+
+    def test_liveness(self, client: TestClient):
+        """Test that liveness is independent of warmup."""
+        app.state.warmup = WarmupState()
+
+        assert client.get("/health").json() == {"status": "healthy"}
+
+    def test_readiness_while_warming(self, client: TestClient):
+        """Test that readiness fails until warmup finishes."""
+        app.state.warmup = WarmupState()
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming"
+        assert set(response.json()["checks"].values()) == {PENDING}
+
+    def test_readiness_when_warm(self, client: TestClient):
+        """Test readiness once warmup is skipped or finished."""
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_store_directory_sync_without_warmup(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that the store directory is kept in sync when warmup is disabled."""
+        synced = threading.Event()
+        monkeypatch.setattr(get_settings(), "startup_warmup", False)
+        monkeypatch.setattr(get_settings(), "store_directory_refresh_seconds", 0)
+        monkeypatch.setattr(main, "_sync_store_directory", synced.set)
+
+        with TestClient(app):
+            assert synced.wait(timeout=5)